@@ -0,0 +1,87 @@
+"""Backfill the integer pub_year field on documents indexed before it existed.
+
+Adds the field to the mapping of each index and runs a throttled
+_update_by_query that derives the year from the legacy string fields
+(publication_year, year, start_date, ...). Documents that already have
+pub_year are skipped, so the job can be re-run safely:
+
+    python scripts/backfill_pub_year.py --rps 500
+    python scripts/backfill_pub_year.py clinical_trials
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.indexing import ElasticsearchClient, IndexManager
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+INDICES = ("pubmed_articles", "clinical_trials")
+
+
+def backfill(manager: IndexManager, index_name: str, requests_per_second: float = None) -> dict:
+    """Map and fill pub_year on one index.
+    
+    Args:
+        manager: Index manager
+        index_name: Index or alias
+        requests_per_second: Update throttle (None for unthrottled)
+    
+    Returns:
+        Final task status
+    """
+    client = manager.es_client.client
+    client.indices.put_mapping(
+        index=index_name,
+        body={"properties": {"pub_year": {"type": "integer"}}}
+    )
+    
+    missing = {"bool": {"must_not": {"exists": {"field": "pub_year"}}}}
+    pending = client.count(index=index_name, body={"query": missing})["count"]
+    logger.info(f"{index_name}: {pending} documents without pub_year")
+    if not pending:
+        return {}
+    
+    return manager.update_by_query(
+        index_name,
+        IndexManager.pub_year_script(),
+        query=missing,
+        requests_per_second=requests_per_second
+    )
+
+
+def main():
+    """Run the backfill."""
+    parser = argparse.ArgumentParser(description="Backfill the integer pub_year field.")
+    parser.add_argument("indices", nargs="*", default=list(INDICES), help="Indices or aliases")
+    parser.add_argument("--rps", type=float, default=None, help="Throttle (requests per second)")
+    args = parser.parse_args()
+    
+    es_client = ElasticsearchClient()
+    manager = IndexManager(es_client)
+    
+    try:
+        for index_name in args.indices:
+            if not manager.index_exists(index_name):
+                logger.warning(f"Skipping {index_name}: index does not exist")
+                continue
+            
+            result = backfill(manager, index_name, args.rps)
+            if result:
+                logger.info(
+                    f"✅ {index_name}: {result.get('updated', 0)} documents got a pub_year, "
+                    f"{result.get('noops', 0)} have no recognizable year"
+                )
+    except Exception as e:
+        logger.error(f"❌ Backfill failed: {e}", exc_info=True)
+        sys.exit(1)
+    finally:
+        es_client.close()
+
+
+if __name__ == "__main__":
+    main()
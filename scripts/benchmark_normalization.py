@@ -0,0 +1,172 @@
+"""Per-article cost of PubMed normalization: fast-path TextCleaner vs. always parsing.
+
+Loads raw articles saved by the fetchers (or a synthetic sample when there are
+none), normalizes them with the current TextCleaner and with a baseline that
+runs BeautifulSoup on every field, and reports the time per article and the
+share of fields that still needed the HTML parser:
+
+    python scripts/benchmark_normalization.py --limit 5000 --repeat 3
+"""
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bs4 import BeautifulSoup
+
+from src.data_pipeline import DataNormalizer, DataStorage
+from src.data_pipeline.text_cleaner import INLINE_TAG_PATTERN, TAG_PATTERN, TextCleaner
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class BaselineTextCleaner(TextCleaner):
+    """Previous behaviour: BeautifulSoup and uncompiled regexes on every call."""
+    
+    @classmethod
+    def remove_html(cls, text: str) -> str:
+        if not text:
+            return ""
+        return BeautifulSoup(text, "html.parser").get_text()
+    
+    @staticmethod
+    def normalize_whitespace(text: str) -> str:
+        if not text:
+            return ""
+        return re.sub(r'\s+', ' ', text).strip()
+    
+    @staticmethod
+    def normalize_unicode(text: str) -> str:
+        if not text:
+            return ""
+        for old, new in {'\u2018': "'", '\u2019': "'", '\u201c': '"', '\u201d': '"',
+                         '\u2013': '-', '\u2014': '-', '\u2026': '...', '\xa0': ' '}.items():
+            text = text.replace(old, new)
+        return text
+    
+    @staticmethod
+    def fix_encoding_issues(text: str) -> str:
+        if not text:
+            return ""
+        return text.encode('utf-8', errors='ignore').decode('utf-8')
+    
+    @classmethod
+    def clean_many(cls, texts, **options) -> List[str]:
+        return [cls.clean(text, **options) for text in texts]
+
+
+def load_articles(limit: int) -> List[Dict]:
+    """Load raw PubMed articles, newest files first.
+    
+    Args:
+        limit: Maximum number of articles
+    
+    Returns:
+        Raw article dictionaries
+    """
+    storage = DataStorage()
+    articles = []
+    for filename in reversed(storage.list_pubmed_files()):
+        articles.extend(storage.load_pubmed_articles(filename))
+        if len(articles) >= limit:
+            break
+    return articles[:limit]
+
+
+def synthetic_articles(count: int) -> List[Dict]:
+    """Articles shaped like efetch output, with occasional inline markup."""
+    articles = []
+    for i in range(count):
+        marked_up = i % 20 == 0
+        articles.append({
+            "pmid": str(30000000 + i),
+            "title": (
+                f"Effect of <i>Escherichia coli</i> strain {i} on IL-6 levels"
+                if marked_up else f"Effect of treatment {i} on IL-6 levels in adults"
+            ),
+            "abstract": " ".join(
+                ["Background: the incidence of disease was 10<sup>5</sup> per year."
+                 if marked_up and j == 0 else
+                 f"Sentence {j} of the abstract reports an odds ratio of 1.{j} (95% CI 1.1-1.9)."
+                 for j in range(12)]
+            ),
+            "authors": [f"Author{k} Surname{k}" for k in range(8)],
+            "journal": "The New England journal of medicine",
+            "publication_year": "2021",
+            "publication_month": "Mar",
+            "mesh_terms": ["Humans", "Adult", "Female", "Male", f"Term {i % 50}"],
+            "doi": f"10.1000/example.{i}",
+        })
+    return articles
+
+
+def time_normalization(articles: List[Dict], cleaner_cls, repeat: int) -> float:
+    """Best-of-N wall time per article in microseconds."""
+    normalizer = DataNormalizer()
+    normalizer.text_cleaner = cleaner_cls()
+    
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for article in articles:
+            normalizer.normalize_pubmed_article(article)
+        best = min(best, time.perf_counter() - start)
+    return best / len(articles) * 1e6
+
+
+def parser_share(articles: List[Dict]) -> Dict[str, float]:
+    """Share of fields with markup, and of those that still need BeautifulSoup."""
+    fields = markup = parsed = 0
+    for article in articles:
+        texts = [article.get("title"), article.get("abstract"), article.get("journal")]
+        texts += article.get("authors", []) + article.get("mesh_terms", [])
+        for text in texts:
+            if not text:
+                continue
+            fields += 1
+            if TextCleaner.has_markup(text):
+                markup += 1
+                if TAG_PATTERN.search(INLINE_TAG_PATTERN.sub('', text)):
+                    parsed += 1
+    return {
+        "fields": fields,
+        "with_markup": markup / max(fields, 1),
+        "parsed": parsed / max(fields, 1),
+    }
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark PubMed normalization cost.")
+    parser.add_argument("--limit", type=int, default=2000, help="Articles to normalize")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs (best is reported)")
+    parser.add_argument("--synthetic", action="store_true", help="Use generated articles")
+    args = parser.parse_args()
+    
+    articles = [] if args.synthetic else load_articles(args.limit)
+    if not articles:
+        logger.info("No raw PubMed files found - using synthetic articles")
+        articles = synthetic_articles(args.limit)
+    
+    baseline = time_normalization(articles, BaselineTextCleaner, args.repeat)
+    fast = time_normalization(articles, TextCleaner, args.repeat)
+    share = parser_share(articles)
+    
+    print(f"\nArticles:              {len(articles)}")
+    print(f"Cleaned fields:        {share['fields']}")
+    print(f"Fields with markup:    {share['with_markup']:.2%}")
+    print(f"Fields needing parser: {share['parsed']:.2%}")
+    print(f"\n{'cleaner':<12} {'us/article':>12} {'articles/s':>12}")
+    for name, cost in (("baseline", baseline), ("fast path", fast)):
+        print(f"{name:<12} {cost:>12.1f} {1e6 / cost:>12.0f}")
+    print(f"\nSpeed-up: {baseline / fast:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
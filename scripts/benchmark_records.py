@@ -0,0 +1,98 @@
+"""Memory and serialization cost of typed records vs. dict documents.
+
+Normalizes a synthetic PubMed batch, keeps it either as plain dicts or as
+ArticleRecord instances, and reports the retained memory per document and
+the time to serialize the batch to JSON:
+
+    python scripts/benchmark_records.py --count 50000
+"""
+
+import argparse
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.data_pipeline import DataNormalizer
+from src.utils.records import ArticleRecord, encode_json, to_builtins
+
+
+def synthetic_articles(count: int) -> List[Dict]:
+    """Raw articles shaped like efetch output."""
+    return [
+        {
+            "pmid": str(30000000 + i),
+            "title": f"Effect of treatment {i} on IL-6 levels in adults",
+            "abstract": " ".join(
+                f"Sentence {j} of the abstract reports an odds ratio of 1.{j} (95% CI 1.1-1.9)."
+                for j in range(12)
+            ),
+            "authors": [f"Author{k} Surname{k}" for k in range(8)],
+            "journal": "The New England journal of medicine",
+            "publication_year": "2021",
+            "publication_month": "Mar",
+            "mesh_terms": ["Humans", "Adult", "Female", "Male", f"Term {i % 50}"],
+            "doi": f"10.1000/example.{i}",
+        }
+        for i in range(count)
+    ]
+
+
+def retained_bytes(build: Callable[[], List]) -> float:
+    """Bytes still allocated after building a batch, per document."""
+    gc.collect()
+    tracemalloc.start()
+    batch = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current / len(batch)
+
+
+def best_time(func: Callable[[], object], repeat: int) -> float:
+    """Best-of-N wall time in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark typed records against dicts.")
+    parser.add_argument("--count", type=int, default=20000, help="Documents in the batch")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs (best is reported)")
+    args = parser.parse_args()
+    
+    normalizer = DataNormalizer()
+    normalized = [normalizer.normalize_pubmed_article(a) for a in synthetic_articles(args.count)]
+    
+    # Build from JSON so neither variant shares strings with `normalized`
+    payload = json.dumps(normalized)
+    dict_bytes = retained_bytes(lambda: json.loads(payload))
+    record_bytes = retained_bytes(lambda: [ArticleRecord.from_dict(d) for d in json.loads(payload)])
+    
+    records = [ArticleRecord.from_dict(d) for d in normalized]
+    dict_encode = best_time(lambda: json.dumps(normalized, ensure_ascii=False), args.repeat)
+    record_encode = best_time(lambda: encode_json(records), args.repeat)
+    legacy_encode = best_time(lambda: json.dumps(records, default=to_builtins), args.repeat)
+    
+    print(f"\nDocuments: {len(normalized)}")
+    print(f"\n{'layout':<10} {'bytes/doc':>12}")
+    print(f"{'dict':<10} {dict_bytes:>12.0f}")
+    print(f"{'record':<10} {record_bytes:>12.0f}")
+    print(f"Memory saved: {1 - record_bytes / dict_bytes:.1%}")
+    print(f"\n{'encoder':<22} {'ms/batch':>10}")
+    print(f"{'json (dicts)':<22} {dict_encode * 1e3:>10.1f}")
+    print(f"{'json (records)':<22} {legacy_encode * 1e3:>10.1f}")
+    print(f"{'msgspec (records)':<22} {record_encode * 1e3:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Build the query spell-correction index from the indexed vocabulary.
+
+Counts the words of titles, abstracts and keywords (MeSH terms, conditions,
+interventions) of every indexed document, optionally adds an external
+vocabulary such as MeSH entry terms (one term per line), and writes the
+memory-mapped symmetric-delete index loaded by QueryProcessor:
+
+    python scripts/build_spell_index.py
+    python scripts/build_spell_index.py --vocabulary data/mesh_entry_terms.txt --min-count 3
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Dict
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.indexing import DocumentIndexer, ElasticsearchClient
+from src.search_engine import SpellCorrector
+from src.search_engine.spell_corrector import count_words
+from src.utils.config import settings
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+INDICES = ("pubmed_articles", "clinical_trials")
+
+
+def count_index_words(indexer: DocumentIndexer, index_name: str, frequencies: Dict[str, int]) -> int:
+    """Add the words of one index to a frequency table.
+    
+    Args:
+        indexer: Document indexer
+        index_name: Index or alias
+        frequencies: Table to update
+    
+    Returns:
+        Number of documents read
+    """
+    documents = 0
+    for hit in indexer.iter_documents(index_name, source_includes=["title", "abstract", "keywords"]):
+        source = hit["_source"]
+        count_words([source.get("title"), source.get("abstract")], frequencies)
+        count_words(source.get("keywords") or [], frequencies)
+        documents += 1
+        if documents % 10000 == 0:
+            logger.info(f"{index_name}: {documents} documents, {len(frequencies)} distinct words")
+    return documents
+
+
+def main():
+    """Build and save the spell index."""
+    parser = argparse.ArgumentParser(description="Build the query spell-correction index.")
+    parser.add_argument("indices", nargs="*", default=list(INDICES), help="Indices to read")
+    parser.add_argument("--vocabulary", help="Extra terms, one per line (e.g. MeSH entry terms)")
+    parser.add_argument("--min-count", type=int, default=2, help="Drop rarer words")
+    parser.add_argument("--max-edit-distance", type=int, default=2, help="Largest correction distance")
+    parser.add_argument("--prefix-length", type=int, default=7, help="Characters used for delete variants")
+    parser.add_argument("--output", default=settings.spell_index_path, help="Output file")
+    args = parser.parse_args()
+    
+    start = time.time()
+    indexer = DocumentIndexer(ElasticsearchClient())
+    frequencies: Dict[str, int] = {}
+    for index_name in args.indices:
+        documents = count_index_words(indexer, index_name, frequencies)
+        logger.info(f"{index_name}: read {documents} documents")
+    
+    if args.vocabulary:
+        # Curated terms are kept even when they are rare in the corpus
+        with open(args.vocabulary, "r", encoding="utf-8") as f:
+            vocabulary = count_words(line.strip() for line in f)
+        for word in vocabulary:
+            frequencies[word] = max(frequencies.get(word, 0), args.min_count)
+        logger.info(f"Added {len(vocabulary)} vocabulary words from {args.vocabulary}")
+    
+    corrector = SpellCorrector.build(
+        frequencies,
+        max_edit_distance=args.max_edit_distance,
+        prefix_length=args.prefix_length,
+        min_count=args.min_count
+    )
+    corrector.save(args.output)
+    logger.info(f"Spell index with {len(corrector)} terms built in {time.time() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
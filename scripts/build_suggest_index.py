@@ -0,0 +1,127 @@
+"""Build the autocomplete index served by /api/v1/suggest.
+
+Suggestions come from three sources, ranked by frequency:
+
+- popular queries from the search query log (QUERY_LOG_PATH, if enabled);
+  only queries logged at least --min-query-count times are used
+- keywords (MeSH terms, conditions, interventions), by number of documents
+- document titles
+
+The index is written atomically to SUGGEST_INDEX_PATH; running API workers
+pick it up within SUGGEST_RELOAD_SECONDS:
+
+    python scripts/build_suggest_index.py
+    python scripts/build_suggest_index.py --min-query-count 50 --no-titles
+"""
+
+import argparse
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.indexing import DocumentIndexer, ElasticsearchClient
+from src.search_engine import QueryLog, QuerySuggester
+from src.search_engine.suggester import KINDS, MAX_QUERY_LENGTH, normalize_prefix
+from src.utils.config import settings
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+INDICES = ("pubmed_articles", "clinical_trials")
+
+
+def add_entry(entries: Dict[str, List], text: str, score: float, kind: str):
+    """Add a suggestion; scores of the same normalized text are summed.
+    
+    The display text and kind of the first source that added it are kept,
+    so sources are added in priority order (queries, keywords, titles).
+    """
+    key = normalize_prefix(text)
+    if not key or len(key) > MAX_QUERY_LENGTH:
+        return
+    if key in entries:
+        entries[key][1] += score
+    else:
+        entries[key] = [" ".join(text.split()), score, KINDS.index(kind)]
+
+
+def count_index_texts(
+    indexer: DocumentIndexer,
+    index_name: str,
+    keywords: Counter,
+    titles: Counter
+) -> int:
+    """Count the keywords and titles of one index.
+    
+    Args:
+        indexer: Document indexer
+        index_name: Index or alias
+        keywords: Keyword -> number of documents
+        titles: Title -> number of documents
+    
+    Returns:
+        Number of documents read
+    """
+    documents = 0
+    for hit in indexer.iter_documents(index_name, source_includes=["title", "keywords"]):
+        source = hit["_source"]
+        keywords.update({keyword for keyword in source.get("keywords") or [] if keyword})
+        if source.get("title"):
+            titles[source["title"]] += 1
+        documents += 1
+        if documents % 10000 == 0:
+            logger.info(f"{index_name}: {documents} documents")
+    return documents
+
+
+def main():
+    """Build and save the suggestion index."""
+    parser = argparse.ArgumentParser(description="Build the query autocomplete index.")
+    parser.add_argument("indices", nargs="*", default=list(INDICES), help="Indices to read")
+    parser.add_argument("--query-log", default=settings.query_log_path, help="Search query log")
+    parser.add_argument(
+        "--min-query-count", type=int, default=20,
+        help="Drop rarer logged queries (keeps one-off queries, which may identify patients, out)"
+    )
+    parser.add_argument("--query-weight", type=float, default=5.0, help="Score per logged search")
+    parser.add_argument("--no-titles", action="store_true", help="Do not suggest document titles")
+    parser.add_argument("--top-k", type=int, default=20, help="Largest number of suggestions per lookup")
+    parser.add_argument("--output", default=settings.suggest_index_path, help="Output file")
+    args = parser.parse_args()
+    
+    start = time.time()
+    entries: Dict[str, List] = {}
+    
+    queries = Counter(normalize_prefix(query) for query in QueryLog.iter_queries(args.query_log))
+    for query, count in queries.items():
+        if count >= args.min_query_count:
+            add_entry(entries, query, count * args.query_weight, "query")
+    logger.info(f"{len(entries)} popular queries from {args.query_log}")
+    
+    indexer = DocumentIndexer(ElasticsearchClient())
+    keywords: Counter = Counter()
+    titles: Counter = Counter()
+    for index_name in args.indices:
+        documents = count_index_texts(indexer, index_name, keywords, titles)
+        logger.info(f"{index_name}: read {documents} documents")
+    
+    for keyword, count in keywords.items():
+        add_entry(entries, keyword, float(count), "term")
+    if not args.no_titles:
+        for title, count in titles.items():
+            add_entry(entries, title, float(count), "title")
+    
+    suggestions: Dict[str, Tuple[str, float, int]] = {
+        key: (display, score, kind) for key, (display, score, kind) in entries.items()
+    }
+    suggester = QuerySuggester.build(suggestions, top_k=args.top_k)
+    suggester.save(args.output)
+    logger.info(f"Suggest index with {len(suggester)} suggestions built in {time.time() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Compile the abbreviation/synonym lexicon used for query expansion.
+
+Groups come from the built-in MEDICAL_SYNONYMS, a MeSH descriptor file
+(each descriptor with its entry terms) and tab-separated files with one
+synonym group per line (e.g. an abbreviation list). Phrases are normalized
+like queries and compiled into the memory-mapped automaton loaded by
+QueryProcessor:
+
+    python scripts/build_synonym_lexicon.py --mesh data/mesh/desc2025.xml
+    python scripts/build_synonym_lexicon.py --groups data/abbreviations.tsv
+"""
+
+import argparse
+import sys
+import time
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Iterator, List
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.search_engine import QueryProcessor, SynonymExpander
+from src.search_engine.query_processor import MEDICAL_SYNONYMS
+from src.utils.config import settings
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def iter_mesh_groups(path: str) -> Iterator[List[str]]:
+    """Read descriptor names and entry terms from a MeSH descriptor XML file.
+    
+    Inverted entry terms ('Infarction, Myocardial') are skipped; they never
+    occur in queries in that form.
+    
+    Args:
+        path: descXXXX.xml from the NLM MeSH download
+    
+    Yields:
+        Terms of one descriptor, preferred term first
+    """
+    for _, element in ET.iterparse(path, events=("end",)):
+        if element.tag != "DescriptorRecord":
+            continue
+        terms = [element.findtext("DescriptorName/String") or ""]
+        terms += [term.text or "" for term in element.iterfind("ConceptList/Concept/TermList/Term/String")]
+        yield [term for term in terms if term and "," not in term]
+        element.clear()
+
+
+def iter_tsv_groups(path: str) -> Iterator[List[str]]:
+    """Read one tab-separated synonym group per line ('#' starts a comment)."""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip() and not line.startswith("#"):
+                yield line.rstrip("\n").split("\t")
+
+
+def main():
+    """Compile and save the lexicon."""
+    parser = argparse.ArgumentParser(description="Compile the query synonym lexicon.")
+    parser.add_argument("--mesh", help="MeSH descriptor XML file")
+    parser.add_argument("--groups", action="append", default=[], help="Tab-separated synonym groups")
+    parser.add_argument("--max-words", type=int, default=6, help="Skip longer phrases")
+    parser.add_argument("--output", default=settings.synonym_lexicon_path, help="Output file")
+    args = parser.parse_args()
+    
+    start = time.time()
+    sources = [iter(MEDICAL_SYNONYMS)]
+    if args.mesh:
+        sources.append(iter_mesh_groups(args.mesh))
+    sources.extend(iter_tsv_groups(path) for path in args.groups)
+    
+    groups = []
+    for source in sources:
+        for group in source:
+            phrases = [QueryProcessor.clean_query(phrase) for phrase in group]
+            groups.append([p for p in phrases if p and len(p.split()) <= args.max_words])
+    
+    expander = SynonymExpander.build(groups)
+    expander.save(args.output)
+    logger.info(f"Lexicon with {len(expander)} synonym groups compiled in {time.time() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
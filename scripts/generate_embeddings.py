@@ -1,144 +1,152 @@
-"""Script to generate and update embeddings for indexed documents."""
+"""Script to generate and update embeddings for indexed documents.
 
+By default only processed documents that are not yet indexed with an
+embedding are embedded; --all re-embeds the whole processed corpus.
+"""
+
+import argparse
 import sys
-import json
 from pathlib import Path
+from typing import List, Set
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from src.nlp_engine import ModelLoader, EmbeddingGenerator
-from src.indexing import ElasticsearchClient, DocumentIndexer
+from src.nlp_engine import ModelLoader, EmbeddingGenerator, EmbeddingQuantizer, EmbeddingCache
+from src.data_pipeline import DataStorage
+from src.indexing import ElasticsearchClient, DocumentIndexer, BulkIndexResult
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 
-def generate_embeddings_for_pubmed():
-    """Generate embeddings for PubMed articles and update index."""
-    logger.info("=" * 60)
-    logger.info("Generating Embeddings for PubMed Articles")
-    logger.info("=" * 60)
-    
-    # Load processed documents
-    processed_dir = Path("data/processed/pubmed")
-    processed_files = list(processed_dir.glob("processed_pubmed_*.json"))
-    
-    if not processed_files:
-        logger.warning("No processed PubMed files found")
-        return
-    
-    latest_file = max(processed_files, key=lambda p: p.stat().st_mtime)
-    logger.info(f"Loading documents from: {latest_file.name}")
-    
-    with open(latest_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
-    # Extract articles from wrapper
-    if isinstance(data, dict) and 'articles' in data:
-        documents = data['articles']
-    else:
-        documents = data if isinstance(data, list) else []
-    
-    logger.info(f"Loaded {len(documents)} PubMed articles")
-    
-    # Initialize embedding generator (using BioBERT)
-    logger.info("Initializing BioBERT model...")
-    embedding_gen = EmbeddingGenerator(model_type="biobert", batch_size=4)
-    
-    # Generate embeddings
-    logger.info("Generating embeddings...")
-    embeddings = embedding_gen.generate_batch_embeddings(
-        documents,
-        fields=['title', 'abstract'],
-        show_progress=True
+def embedded_ids(es_client: ElasticsearchClient, index_name: str, doc_ids: List[str]) -> Set[str]:
+    """Get the IDs that are already indexed with an embedding.
+    
+    Args:
+        es_client: Elasticsearch client
+        index_name: Index to check
+        doc_ids: Document IDs
+    
+    Returns:
+        Subset of doc_ids
+    """
+    if not doc_ids:
+        return set()
+    response = es_client.client.search(
+        index=index_name,
+        body={
+            "size": len(doc_ids),
+            "_source": False,
+            "docvalue_fields": ["id"],
+            "query": {
+                "bool": {
+                    "filter": [
+                        {"terms": {"id": doc_ids}},
+                        {"exists": {"field": "embedding"}}
+                    ]
+                }
+            }
+        }
     )
+    return {
+        hit["fields"]["id"][0]
+        for hit in response["hits"]["hits"]
+        if hit.get("fields", {}).get("id")
+    }
+
+
+def embed_and_index(
+    kind: str,
+    index_name: str,
+    model_type: str,
+    fields: List[str],
+    batch_size: int = 256,
+    embed_all: bool = False
+):
+    """Stream processed documents, generate embeddings and update the index.
+    
+    Args:
+        kind: Processed snapshot kind ('articles' or 'trials')
+        index_name: Target index
+        model_type: Embedding model ('biobert' or 'clinicalbert')
+        fields: Fields combined into the embedded text
+        batch_size: Documents per embedding/indexing batch
+        embed_all: Also re-embed documents that are indexed with an embedding
+    """
+    storage = DataStorage()
+    embedding_gen = EmbeddingGenerator(model_type=model_type, batch_size=4, cache=EmbeddingCache())
     
-    # Create new documents with embeddings
-    updated_documents = []
-    for doc, embedding in zip(documents, embeddings):
-        updated_doc = doc.copy()
-        updated_doc['embedding'] = embedding.tolist()
-        updated_documents.append(updated_doc)
-    
-    logger.info(f"✅ Generated embeddings for {len(updated_documents)} articles")
-    
-    # Update Elasticsearch index
-    logger.info("Updating Elasticsearch index...")
     es_client = ElasticsearchClient()
-    indexer = DocumentIndexer(es_client)
+    quantizer = EmbeddingQuantizer.from_settings()
+    indexer = DocumentIndexer(es_client, vector_encoder=quantizer.bulk_encoder(es_client))
     
-    success, failed = indexer.index_batch("pubmed_articles", updated_documents)
-    logger.info(f"✅ Updated {success} documents in Elasticsearch")
+    total = BulkIndexResult()
+    skipped = 0
+    seen_ids = set()
+    try:
+        for batch, _ in storage.iter_processed(kind, batch_size=batch_size):
+            # The snapshot and legacy JSON files can hold the same document
+            documents = [
+                doc for doc in batch
+                if doc.get('id') and str(doc['id']) not in seen_ids
+            ]
+            seen_ids.update(str(doc['id']) for doc in documents)
+            if not embed_all:
+                done = embedded_ids(es_client, index_name, [str(doc['id']) for doc in documents])
+                skipped += len(done)
+                documents = [doc for doc in documents if str(doc['id']) not in done]
+            if not documents:
+                continue
+            
+            embeddings = embedding_gen.generate_batch_embeddings(
+                documents,
+                fields=fields,
+                show_progress=True
+            )
+            for doc, embedding in zip(documents, embeddings):
+                doc['embedding'] = embedding
+            
+            total.merge(indexer.index_batch(index_name, documents))
+            logger.info(f"  {total.success} documents updated so far")
+    finally:
+        es_client.close()
+    
+    if skipped:
+        logger.info(f"Skipped {skipped} documents that already have an embedding (--all to redo)")
+    if total.success == 0 and total.failed == 0:
+        if not skipped:
+            logger.warning(f"No processed {kind} found")
+        return
     
-    if failed > 0:
-        logger.warning(f"⚠️  {failed} documents failed to update")
+    logger.info(f"✅ Updated {total.success} documents in {index_name}")
+    if total.failed > 0:
+        logger.warning(f"⚠️  {total.failed} documents failed to update")
+
+
+def generate_embeddings_for_pubmed(embed_all: bool = False):
+    """Generate embeddings for PubMed articles and update index."""
+    logger.info("=" * 60)
+    logger.info("Generating Embeddings for PubMed Articles")
+    logger.info("=" * 60)
     
-    # Cleanup
-    es_client.close()
+    # BioBERT over title + abstract
+    embed_and_index(
+        "articles", "pubmed_articles", "biobert", ['title', 'abstract'],
+        embed_all=embed_all
+    )
 
 
-def generate_embeddings_for_trials():
+def generate_embeddings_for_trials(embed_all: bool = False):
     """Generate embeddings for clinical trials and update index."""
     logger.info("\n" + "=" * 60)
     logger.info("Generating Embeddings for Clinical Trials")
     logger.info("=" * 60)
     
-    # Load processed documents
-    processed_dir = Path("data/processed/clinical_trials")
-    processed_files = list(processed_dir.glob("processed_trials_*.json"))
-    
-    if not processed_files:
-        logger.warning("No processed trial files found")
-        return
-    
-    latest_file = max(processed_files, key=lambda p: p.stat().st_mtime)
-    logger.info(f"Loading documents from: {latest_file.name}")
-    
-    with open(latest_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
-    # Extract trials from wrapper
-    if isinstance(data, dict) and 'trials' in data:
-        documents = data['trials']
-    else:
-        documents = data if isinstance(data, list) else []
-    
-    logger.info(f"Loaded {len(documents)} clinical trials")
-    
-    # Initialize embedding generator (using ClinicalBERT)
-    logger.info("Initializing ClinicalBERT model...")
-    embedding_gen = EmbeddingGenerator(model_type="clinicalbert", batch_size=4)
-    
-    # Generate embeddings
-    logger.info("Generating embeddings...")
-    embeddings = embedding_gen.generate_batch_embeddings(
-        documents,
-        fields=['title', 'summary'],
-        show_progress=True
+    # ClinicalBERT over title + summary (normalized trials keep the summary in 'abstract')
+    embed_and_index(
+        "trials", "clinical_trials", "clinicalbert", ['title', 'abstract'],
+        embed_all=embed_all
     )
-    
-    # Create new documents with embeddings
-    updated_documents = []
-    for doc, embedding in zip(documents, embeddings):
-        updated_doc = doc.copy()
-        updated_doc['embedding'] = embedding.tolist()
-        updated_documents.append(updated_doc)
-    
-    logger.info(f"✅ Generated embeddings for {len(updated_documents)} trials")
-    
-    # Update Elasticsearch index
-    logger.info("Updating Elasticsearch index...")
-    es_client = ElasticsearchClient()
-    indexer = DocumentIndexer(es_client)
-    
-    success, failed = indexer.index_batch("clinical_trials", updated_documents)
-    logger.info(f"✅ Updated {success} documents in Elasticsearch")
-    
-    if failed > 0:
-        logger.warning(f"⚠️  {failed} documents failed to update")
-    
-    # Cleanup
-    es_client.close()
 
 
 def test_similarity():
@@ -173,12 +181,18 @@ def test_similarity():
 
 def main():
     """Main execution function."""
+    parser = argparse.ArgumentParser(description="Embed processed documents and update indices.")
+    parser.add_argument("--all", action="store_true", dest="embed_all",
+                        help="Re-embed every processed document, not only those "
+                             "without an embedding")
+    args = parser.parse_args()
+    
     try:
         # Generate embeddings for PubMed articles
-        generate_embeddings_for_pubmed()
+        generate_embeddings_for_pubmed(embed_all=args.embed_all)
         
         # Generate embeddings for clinical trials
-        generate_embeddings_for_trials()
+        generate_embeddings_for_trials(embed_all=args.embed_all)
         
         # Test similarity
         test_similarity()
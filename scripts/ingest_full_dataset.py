@@ -1,6 +1,7 @@
 """Full dataset ingestion script - fetches and indexes large amounts of data."""
 
 import sys
+from contextlib import ExitStack
 from pathlib import Path
 from typing import List, Dict
 import time
@@ -8,9 +9,9 @@ import time
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from src.data_pipeline import PubMedFetcher, ClinicalTrialsFetcher, DataProcessor
-from src.indexing import ElasticsearchClient, DocumentIndexer
-from src.nlp_engine import EmbeddingGenerator
+from src.data_pipeline import PubMedFetcher, ClinicalTrialsFetcher, DataProcessor, DedupIndex
+from src.indexing import ElasticsearchClient, DocumentIndexer, IndexManager
+from src.nlp_engine import EmbeddingGenerator, EmbeddingQuantizer, EmbeddingCache
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -21,12 +22,15 @@ class DataIngestionPipeline:
     
     def __init__(self):
         """Initialize pipeline components."""
-        self.pubmed_fetcher = PubMedFetcher()
+        # Persistent seen-set: records ingested by earlier runs are skipped
+        self.dedup = DedupIndex()
+        self.pubmed_fetcher = PubMedFetcher(dedup=self.dedup)
         self.trials_fetcher = ClinicalTrialsFetcher()
-        self.processor = DataProcessor()
+        self.processor = DataProcessor(dedup=self.dedup)
         self.es_client = ElasticsearchClient()
         self.indexer = DocumentIndexer(self.es_client)
-        self.embedding_generator = EmbeddingGenerator(model_type="biobert")
+        self.embedding_generator = EmbeddingGenerator(model_type="biobert", cache=EmbeddingCache())
+        self.quantizer = EmbeddingQuantizer.from_settings()
         
         logger.info("✅ Pipeline initialized")
     
@@ -132,6 +136,15 @@ class DataIngestionPipeline:
         processed, invalid = self.processor.process_pubmed_articles(articles)
         logger.info(f"  ✅ Processed {len(processed)} articles ({len(invalid)} invalid)")
         
+        # One _mget per 1000 IDs instead of embedding unchanged documents again
+        changed = self.indexer.filter_unchanged('pubmed_articles', processed)
+        logger.info(f"  ♻️  {len(processed) - len(changed)} articles already indexed with identical content")
+        
+        # Only documents that are in the index are recorded as ingested
+        changed_ids = {article.get('id') for article in changed}
+        indexed_ids = [a['id'] for a in processed if a.get('id') and a['id'] not in changed_ids]
+        processed = changed
+        
         # Generate embeddings and index
         logger.info("  🧠 Generating embeddings and indexing...")
         indexed_count = 0
@@ -145,16 +158,19 @@ class DataIngestionPipeline:
                         article,
                         fields=['title', 'abstract']
                     )
-                    article['embedding'] = embedding.tolist()
+                    article['embedding'] = self.quantizer.encode(embedding)
                 
                 # Index document
-                doc_id = article.get('pmid', f"pubmed_{i}")
-                self.indexer.index_document(
+                doc_id = article.get('id') or f"pubmed_{i}"
+                if not self.indexer.index_document(
                     index_name='pubmed_articles',
                     doc_id=str(doc_id),
                     document=article
-                )
+                ):
+                    failed_count += 1
+                    continue
                 indexed_count += 1
+                indexed_ids.append(str(doc_id))
                 
                 if indexed_count % 10 == 0:
                     logger.info(f"    Indexed {indexed_count}/{len(processed)} articles...")
@@ -164,6 +180,7 @@ class DataIngestionPipeline:
                 failed_count += 1
                 continue
         
+        self.processor.mark_indexed('pubmed', indexed_ids)
         logger.info(f"  ✅ Indexed {indexed_count} articles ({failed_count} failed)")
     
     def process_and_index_trials(self, trials: List[Dict]):
@@ -178,6 +195,15 @@ class DataIngestionPipeline:
         processed, invalid = self.processor.process_clinical_trials(trials)
         logger.info(f"  ✅ Processed {len(processed)} trials ({len(invalid)} invalid)")
         
+        # One _mget per 1000 IDs instead of embedding unchanged documents again
+        changed = self.indexer.filter_unchanged('clinical_trials', processed)
+        logger.info(f"  ♻️  {len(processed) - len(changed)} trials already indexed with identical content")
+        
+        # Only documents that are in the index are recorded as ingested
+        changed_ids = {trial.get('id') for trial in changed}
+        indexed_ids = [t['id'] for t in processed if t.get('id') and t['id'] not in changed_ids]
+        processed = changed
+        
         # Generate embeddings and index
         logger.info("  🧠 Generating embeddings and indexing...")
         indexed_count = 0
@@ -185,22 +211,25 @@ class DataIngestionPipeline:
         
         for i, trial in enumerate(processed, 1):
             try:
-                # Generate embedding for summary
-                if trial.get('summary'):
+                # Generate embedding for the summary (kept in 'abstract' after normalization)
+                if trial.get('abstract'):
                     embedding = self.embedding_generator.generate_document_embedding(
                         trial,
-                        fields=['title', 'summary']
+                        fields=['title', 'abstract']
                     )
-                    trial['embedding'] = embedding.tolist()
+                    trial['embedding'] = self.quantizer.encode(embedding)
                 
                 # Index document
-                doc_id = trial.get('nct_id', f"trial_{i}")
-                self.indexer.index_document(
+                doc_id = trial.get('id') or f"trial_{i}"
+                if not self.indexer.index_document(
                     index_name='clinical_trials',
                     doc_id=str(doc_id),
                     document=trial
-                )
+                ):
+                    failed_count += 1
+                    continue
                 indexed_count += 1
+                indexed_ids.append(str(doc_id))
                 
                 if indexed_count % 10 == 0:
                     logger.info(f"    Indexed {indexed_count}/{len(processed)} trials...")
@@ -210,9 +239,32 @@ class DataIngestionPipeline:
                 failed_count += 1
                 continue
         
+        self.processor.mark_indexed('clinicaltrials', indexed_ids)
         logger.info(f"  ✅ Indexed {indexed_count} trials ({failed_count} failed)")
 
 
+def bulk_load_mode(pipeline: DataIngestionPipeline, index_name: str, args) -> ExitStack:
+    """Return the IndexManager bulk-load context when --bulk-load is set.
+    
+    Args:
+        pipeline: Ingestion pipeline (provides the ES client)
+        index_name: Index about to be loaded
+        args: Parsed command line arguments
+    
+    Returns:
+        Context manager wrapping the indexing step
+    """
+    stack = ExitStack()
+    if args.bulk_load:
+        stack.enter_context(
+            IndexManager(pipeline.es_client).bulk_load(
+                index_name,
+                max_num_segments=args.force_merge_segments
+            )
+        )
+    return stack
+
+
 def main():
     """Run full data ingestion pipeline."""
     import argparse
@@ -220,6 +272,10 @@ def main():
     parser = argparse.ArgumentParser(description='Ingest biomedical data.')
     parser.add_argument('--max-per-query', type=int, default=500, help='Max articles per query')
     parser.add_argument('--max-per-condition', type=int, default=500, help='Max trials per condition')
+    parser.add_argument('--bulk-load', action='store_true',
+                        help='Disable refresh/replicas while indexing, restore afterwards')
+    parser.add_argument('--force-merge-segments', type=int, default=None,
+                        help='Force-merge indices to this many segments after a --bulk-load run')
     args = parser.parse_args()
 
     logger.info("="*80)
@@ -314,14 +370,16 @@ def main():
             logger.info("\n" + "="*80)
             logger.info("📊 PROCESSING & INDEXING PUBMED ARTICLES")
             logger.info("="*80)
-            pipeline.process_and_index_pubmed(articles)
+            with bulk_load_mode(pipeline, 'pubmed_articles', args):
+                pipeline.process_and_index_pubmed(articles)
         
         # Process and index Clinical Trials
         if trials:
             logger.info("\n" + "="*80)
             logger.info("🧪 PROCESSING & INDEXING CLINICAL TRIALS")
             logger.info("="*80)
-            pipeline.process_and_index_trials(trials)
+            with bulk_load_mode(pipeline, 'clinical_trials', args):
+                pipeline.process_and_index_trials(trials)
         
         # Summary
         elapsed_time = time.time() - start_time
@@ -330,6 +388,11 @@ def main():
         logger.info("="*80)
         logger.info(f"📚 PubMed Articles: {len(articles)}")
         logger.info(f"🧪 Clinical Trials: {len(trials)}")
+        for source, counts in pipeline.dedup.stats()["session"].items():
+            logger.info(
+                f"♻️  {source}: skipped {counts['skipped']}/{counts['checked']} "
+                f"already ingested ({counts['skip_rate']:.1%})"
+            )
         logger.info(f"⏱️  Total Time: {elapsed_time/60:.2f} minutes")
         logger.info("="*80)
         
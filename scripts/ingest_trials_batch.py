@@ -6,9 +6,9 @@ import time
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from src.data_pipeline import ClinicalTrialsFetcher, DataProcessor
+from src.data_pipeline import ClinicalTrialsFetcher, DataProcessor, DedupIndex
 from src.indexing import ElasticsearchClient, DocumentIndexer
-from src.nlp_engine import EmbeddingGenerator
+from src.nlp_engine import EmbeddingGenerator, EmbeddingCache
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -17,12 +17,13 @@ def run_trials_ingestion(conditions, max_per_condition=10):
     """Run indexing for clinical trials with embeddings."""
     logger.info("🚀 Starting Clinical Trials Ingestion with Embeddings")
     
+    dedup = DedupIndex()
     fetcher = ClinicalTrialsFetcher()
-    processor = DataProcessor()
+    processor = DataProcessor(dedup=dedup)
     es_client = ElasticsearchClient()
     indexer = DocumentIndexer(es_client)
     # Using biobert as it's already in the cache
-    embedding_generator = EmbeddingGenerator(model_type="biobert")
+    embedding_generator = EmbeddingGenerator(model_type="biobert", cache=EmbeddingCache())
     
     all_trials = []
     seen_ids = set()
@@ -42,10 +43,18 @@ def run_trials_ingestion(conditions, max_per_condition=10):
             
     if not all_trials:
         logger.warning("No trials fetched.")
+        logger.info(f"Dedup stats: {dedup.stats()}")
         return
 
     logger.info(f"📊 Processing and Indexing {len(all_trials)} unique trials...")
     processed, _ = processor.process_clinical_trials(all_trials)
+    changed = indexer.filter_unchanged('clinical_trials', processed)
+    logger.info(f"🆕 {len(changed)} trials are new or changed in the index")
+    
+    # Only documents that are in the index are recorded as ingested
+    changed_ids = {trial['id'] for trial in changed}
+    indexed_ids = [trial['id'] for trial in processed if trial['id'] not in changed_ids]
+    processed = changed
     
     indexed_count = 0
     for i, trial in enumerate(processed, 1):
@@ -55,18 +64,22 @@ def run_trials_ingestion(conditions, max_per_condition=10):
                 embedding = embedding_generator.generate_document_embedding(trial, fields=['title', 'abstract'])
                 trial['embedding'] = embedding.tolist()
             
-            indexer.index_document(
+            if not indexer.index_document(
                 index_name='clinical_trials',
                 doc_id=trial['id'],
                 document=trial
-            )
+            ):
+                continue
             indexed_count += 1
+            indexed_ids.append(trial['id'])
             if indexed_count % 5 == 0:
                 print(f"Indexed {indexed_count}/{len(processed)}...")
         except Exception as e:
             logger.error(f"Error indexing {trial.get('nct_id')}: {e}")
             
+    processor.mark_indexed('clinicaltrials', indexed_ids)
     logger.info(f"✨ Successfully indexed {indexed_count} clinical trials with embeddings.")
+    logger.info(f"Dedup stats: {dedup.stats()}")
 
 if __name__ == "__main__":
     expanded_queries = [
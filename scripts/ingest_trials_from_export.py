@@ -0,0 +1,148 @@
+"""Ingest clinical trials from a local ClinicalTrials.gov all-studies ZIP export.
+
+Download the export once (https://clinicaltrials.gov/data-api/how-to#download-all)
+and load it from disk instead of paging through the v2 API:
+
+    python scripts/ingest_trials_from_export.py data/raw/ctg-studies.json.zip
+    python scripts/ingest_trials_from_export.py data/raw/ctg-studies.json.zip --delta
+"""
+
+import argparse
+import json
+import sys
+import time
+from contextlib import ExitStack
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.data_pipeline import ClinicalTrialsBulkLoader, DataStorage
+from src.indexing import ElasticsearchClient, DocumentIndexer, IndexManager
+from src.utils.config import PROJECT_ROOT
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+STATE_FILE = PROJECT_ROOT / "data" / "state" / "clinical_trials_export.json"
+
+
+def load_watermark() -> str:
+    """Read the LastUpdatePostDate watermark of the previous run."""
+    if not STATE_FILE.exists():
+        return ""
+    with open(STATE_FILE, "r", encoding="utf-8") as f:
+        return json.load(f).get("latest_update", "")
+
+
+def save_watermark(latest_update: str, archive: Path):
+    """Persist the watermark so the next --delta run skips unchanged studies."""
+    STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    with open(STATE_FILE, "w", encoding="utf-8") as f:
+        json.dump({
+            "latest_update": latest_update,
+            "archive": archive.name,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S")
+        }, f)
+
+
+def main():
+    """Load the export and stream it into the clinical trials index."""
+    parser = argparse.ArgumentParser(description="Ingest the ClinicalTrials.gov JSON export.")
+    parser.add_argument("archive", type=Path, help="Path to the all-studies ZIP export")
+    parser.add_argument("--index", default="clinical_trials", help="Target index")
+    parser.add_argument("--workers", type=int, default=None, help="Parser processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=500, help="Studies per worker task")
+    parser.add_argument("--since", default=None, help="Only index studies updated on/after YYYY-MM-DD")
+    parser.add_argument("--delta", action="store_true", help="Use the watermark of the previous run as --since")
+    parser.add_argument("--embed", action="store_true", help="Generate BioBERT embeddings before indexing")
+    parser.add_argument("--snapshot", action="store_true",
+                        help="Also append the trials (and embeddings) to the processed Parquet snapshot")
+    parser.add_argument("--bulk-load", action="store_true",
+                        help="Disable refresh/replicas while indexing, restore afterwards")
+    parser.add_argument("--force-merge-segments", type=int, default=None,
+                        help="Force-merge the index to this many segments after a --bulk-load run")
+    args = parser.parse_args()
+    
+    since = args.since
+    if args.delta and not since:
+        since = load_watermark() or None
+        if since:
+            logger.info(f"Delta mode: indexing studies updated since {since}")
+        else:
+            logger.warning("Delta mode requested but no previous watermark found - loading everything")
+    
+    loader = ClinicalTrialsBulkLoader(args.archive, workers=args.workers, chunk_size=args.chunk_size)
+    es_client = ElasticsearchClient()
+    indexer = DocumentIndexer(es_client)
+    
+    snapshot = DataStorage().snapshot("trials") if args.snapshot else None
+    
+    embedding_generator = None
+    if args.embed:
+        from src.nlp_engine import EmbeddingGenerator, EmbeddingQuantizer, EmbeddingCache
+        embedding_generator = EmbeddingGenerator(model_type="biobert", cache=EmbeddingCache())
+        indexer.vector_encoder = EmbeddingQuantizer.from_settings().bulk_encoder(es_client)
+    
+    start_time = time.time()
+    indexed_count = 0
+    failed_count = 0
+    
+    try:
+        with ExitStack() as stack:
+            if args.bulk_load:
+                stack.enter_context(
+                    IndexManager(es_client).bulk_load(
+                        args.index,
+                        max_num_segments=args.force_merge_segments
+                    )
+                )
+            
+            for batch in loader.iter_batches(since=since):
+                embeddings = None
+                if embedding_generator is not None:
+                    embeddings = embedding_generator.generate_batch_embeddings(
+                        batch,
+                        fields=['title', 'abstract'],
+                        show_progress=False
+                    )
+                    for trial, embedding in zip(batch, embeddings):
+                        trial['embedding'] = embedding
+                
+                if snapshot is not None:
+                    snapshot.write(
+                        batch,
+                        embeddings=np.vstack(embeddings) if embeddings else None,
+                        metadata={"archive": args.archive.name}
+                    )
+                
+                success, failed = indexer.index_batch(args.index, batch)
+                indexed_count += success
+                failed_count += failed
+                
+                elapsed = time.time() - start_time
+                logger.info(
+                    f"Indexed {indexed_count} trials ({failed_count} failed), "
+                    f"{loader.stats['read']}/{loader.stats['total']} studies read, "
+                    f"{indexed_count / max(elapsed, 1e-6):.0f} docs/s"
+                )
+    
+    except KeyboardInterrupt:
+        logger.warning("Interrupted by user - watermark not updated")
+        sys.exit(1)
+    finally:
+        es_client.close()
+    
+    failed_count += loader.stats.get("failed", 0)
+    if failed_count == 0 and loader.stats.get("latest_update"):
+        save_watermark(loader.stats["latest_update"], args.archive)
+    elif failed_count:
+        logger.warning("Some documents failed - keeping the previous watermark so they are retried")
+    
+    logger.info(f"✅ Done: {indexed_count} trials indexed in {(time.time() - start_time) / 60:.1f} minutes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""Recall-vs-size report for quantized embedding storage.
+
+Samples stored float embeddings, calibrates the int8 quantizer and compares
+exact cosine top-k against float16 and int8 vectors, next to the storage and
+bulk payload size of each encoding:
+
+    python scripts/quantization_report.py --index pubmed_articles --sample 5000 --save
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.indexing import ElasticsearchClient
+from src.nlp_engine import EmbeddingQuantizer
+from src.utils.config import settings
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def sample_embeddings(es_client: ElasticsearchClient, index_name: str, size: int) -> np.ndarray:
+    """Fetch a random sample of stored float embeddings.
+    
+    Args:
+        es_client: Elasticsearch client
+        index_name: Index or alias to sample
+        size: Number of documents
+    
+    Returns:
+        Array of shape [n, dims]
+    """
+    response = es_client.client.search(
+        index=index_name,
+        body={
+            "size": size,
+            "_source": ["embedding"],
+            "query": {
+                "function_score": {
+                    "query": {"exists": {"field": "embedding"}},
+                    "random_score": {"seed": 42, "field": "_seq_no"}
+                }
+            }
+        }
+    )
+    vectors = [
+        hit["_source"]["embedding"] for hit in response["hits"]["hits"]
+        if isinstance(hit["_source"].get("embedding"), list)
+    ]
+    if not vectors:
+        raise ValueError(f"No float embeddings found in {index_name}")
+    return np.asarray(vectors, dtype=np.float32)
+
+
+def top_k(queries: np.ndarray, corpus: np.ndarray, k: int) -> np.ndarray:
+    """Exact cosine top-k (each query's own row excluded).
+    
+    Args:
+        queries: Row indices into corpus used as queries
+        corpus: Vectors of shape [n, dims]
+        k: Neighbours per query
+    
+    Returns:
+        Array of shape [len(queries), k] with corpus row indices
+    """
+    normed = corpus / np.maximum(np.linalg.norm(corpus, axis=1, keepdims=True), 1e-12)
+    scores = normed[queries] @ normed.T
+    scores[np.arange(len(queries)), queries] = -np.inf
+    return np.argsort(-scores, axis=1)[:, :k]
+
+
+def recall_at_k(exact: np.ndarray, approx: np.ndarray) -> float:
+    """Mean overlap of approximate and exact neighbour sets."""
+    k = exact.shape[1]
+    return float(np.mean([len(set(e) & set(a)) / k for e, a in zip(exact, approx)]))
+
+
+def payload_size(values: List) -> int:
+    """Length of a vector as it appears in a bulk request."""
+    return len(json.dumps(values, separators=(',', ':')))
+
+
+def build_report(embeddings: np.ndarray, quantizer: EmbeddingQuantizer, queries: int, k: int) -> List[Dict]:
+    """Compare float32, float16 and int8 storage.
+    
+    Args:
+        embeddings: Float sample of shape [n, dims]
+        quantizer: Calibrated quantizer
+        queries: Number of sample rows used as queries
+        k: Recall cut-off
+    
+    Returns:
+        One row per encoding
+    """
+    rng = np.random.default_rng(42)
+    query_rows = rng.choice(len(embeddings), size=min(queries, len(embeddings)), replace=False)
+    dims = embeddings.shape[1]
+    exact = top_k(query_rows, embeddings, k)
+    
+    float16 = embeddings.astype(np.float16).astype(np.float32)
+    quantized = quantizer.quantize(embeddings)
+    first = embeddings[0]
+    
+    byte_quantizer = EmbeddingQuantizer(scale=quantizer.scale, element_type="byte")
+    half_quantizer = EmbeddingQuantizer(element_type="float16")
+    
+    return [
+        {
+            "encoding": "float32",
+            "recall": 1.0,
+            "vector_bytes": dims * 4,
+            "bulk_chars": payload_size(first.tolist())
+        },
+        {
+            "encoding": "float16",
+            "recall": recall_at_k(exact, top_k(query_rows, float16, k)),
+            "vector_bytes": dims * 2,
+            "bulk_chars": payload_size(half_quantizer.encode(first))
+        },
+        {
+            "encoding": "int8",
+            "recall": recall_at_k(exact, top_k(query_rows, quantized.astype(np.float32), k)),
+            "vector_bytes": dims,
+            "bulk_chars": payload_size(byte_quantizer.encode(first))
+        },
+        {
+            "encoding": "int8 (hex)",
+            "recall": None,
+            "vector_bytes": dims,
+            "bulk_chars": payload_size(byte_quantizer.encode(first, hex_bytes=True))
+        }
+    ]
+
+
+def main():
+    """Print the report and optionally save the calibration."""
+    parser = argparse.ArgumentParser(description="Recall vs size of quantized embeddings.")
+    parser.add_argument("--index", default="pubmed_articles", help="Index with float embeddings")
+    parser.add_argument("--sample", type=int, default=5000, help="Documents sampled")
+    parser.add_argument("--queries", type=int, default=200, help="Sample rows used as queries")
+    parser.add_argument("--k", type=int, default=10, help="Recall cut-off")
+    parser.add_argument("--percentile", type=float, default=99.9, help="Calibration percentile of |x|")
+    parser.add_argument("--save", action="store_true",
+                        help=f"Save the calibration to {settings.embedding_quantizer_path}")
+    args = parser.parse_args()
+    
+    es_client = ElasticsearchClient()
+    try:
+        embeddings = sample_embeddings(es_client, args.index, args.sample)
+    finally:
+        es_client.close()
+    
+    logger.info(f"Sampled {len(embeddings)} embeddings ({embeddings.shape[1]} dims) from {args.index}")
+    
+    quantizer = EmbeddingQuantizer(percentile=args.percentile, model_name=settings.biobert_model)
+    quantizer.calibrate(embeddings)
+    
+    rows = build_report(embeddings, quantizer, args.queries, args.k)
+    baseline = rows[0]
+    
+    print(f"\n{'encoding':<12} {'recall@' + str(args.k):>10} {'bytes/vec':>10} {'bulk chars':>11} {'size':>7}")
+    for row in rows:
+        recall = f"{row['recall']:.4f}" if row["recall"] is not None else "-"
+        ratio = baseline["bulk_chars"] / row["bulk_chars"]
+        print(
+            f"{row['encoding']:<12} {recall:>10} {row['vector_bytes']:>10} "
+            f"{row['bulk_chars']:>11} {ratio:>6.1f}x"
+        )
+    
+    if args.save:
+        quantizer.save()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""Rebuild an index as a new alias version without downtime.
+
+Examples:
+    # One-off: turn the concrete 'pubmed_articles' index into an alias
+    python scripts/rebuild_index.py pubmed_articles --migrate
+    
+    # Apply the current mappings: reindex server-side into pubmed_articles_v<N+1>
+    python scripts/rebuild_index.py pubmed_articles --rps 500
+    
+    # Load from the processed snapshot on disk instead of copying from the cluster
+    python scripts/rebuild_index.py clinical_trials --from-processed
+    
+    # Switch to int8 embeddings (EMBEDDING_ELEMENT_TYPE=byte, calibrated quantizer)
+    python scripts/rebuild_index.py pubmed_articles --quantize
+    
+    # Move to the 'search_text' copy_to field and drop title+abstract full_text copies
+    python scripts/rebuild_index.py pubmed_articles --drop-combined-full-text
+
+Searches keep working throughout. Writes to the index are rejected until the
+alias has moved to the new version, so ingestion runs in the meantime report
+their documents as failed (and retry them on the next run) rather than losing
+them; --allow-writes accepts them, but they do not reach the new version.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.data_pipeline import DataNormalizer, DataStorage
+from src.indexing import ElasticsearchClient, IndexManager
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+SNAPSHOT_KINDS = {
+    "pubmed_articles": "articles",
+    "clinical_trials": "trials",
+}
+
+
+def combine_scripts(scripts: List[Dict]) -> Optional[Dict]:
+    """Chain painless reindex scripts into one.
+    
+    Args:
+        scripts: Script dictionaries (parameter names must not clash)
+    
+    Returns:
+        Combined script, or None if there is none
+    """
+    if not scripts:
+        return None
+    if len(scripts) == 1:
+        return scripts[0]
+    
+    params = {}
+    for script in scripts:
+        params.update(script.get("params", {}))
+    return {
+        "lang": "painless",
+        "source": " ".join("{ " + script["source"] + " }" for script in scripts),
+        "params": params
+    }
+
+
+def iter_processed_documents(
+    alias: str,
+    model_type: str,
+    es_client: ElasticsearchClient,
+    batch_size: int = 64
+) -> Iterator[Dict]:
+    """Stream processed documents from disk with embeddings.
+    
+    Embeddings stored in the snapshot are reused; documents without one
+    are embedded.
+    
+    Args:
+        alias: Index alias (selects the processed snapshot)
+        model_type: Embedding model ('biobert' or 'clinicalbert')
+        es_client: Client of the target cluster (selects the vector encoding)
+        batch_size: Documents embedded per batch
+    
+    Yields:
+        Documents ready for indexing
+    """
+    from src.nlp_engine import EmbeddingGenerator, EmbeddingQuantizer, EmbeddingCache
+    
+    encode = EmbeddingQuantizer.from_settings().bulk_encoder(es_client)
+    embedding_generator = EmbeddingGenerator(model_type=model_type, cache=EmbeddingCache())
+    storage = DataStorage()
+    seen_ids = set()
+    found = False
+    
+    for batch, stored in storage.iter_processed(
+        SNAPSHOT_KINDS[alias],
+        batch_size=batch_size,
+        with_embeddings=True
+    ):
+        found = True
+        keep = [
+            i for i, doc in enumerate(batch)
+            if doc.get("id") and doc["id"] not in seen_ids
+        ]
+        seen_ids.update(batch[i]["id"] for i in keep)
+        
+        missing = [i for i in keep if stored is None or not stored[i].any()]
+        computed = {}
+        if missing:
+            embeddings = embedding_generator.generate_batch_embeddings(
+                [batch[i] for i in missing],
+                fields=['title', 'abstract'],
+                show_progress=False
+            )
+            computed = dict(zip(missing, embeddings))
+        
+        for i in keep:
+            doc = batch[i]
+            # Older snapshots stored title + abstract as full_text
+            combined = f"{doc.get('title') or ''}. {doc.get('abstract') or ''}".strip()
+            if doc.get("full_text") in ("", combined):
+                doc.pop("full_text")
+            if doc.get("pub_year") is None:
+                doc["pub_year"] = DataNormalizer.parse_year(
+                    doc.get("publication_year"), doc.get("publication_date"), doc.get("start_date")
+                )
+            doc["embedding"] = encode(computed[i] if i in computed else stored[i])
+            yield doc
+    
+    if not found:
+        raise FileNotFoundError(f"No processed documents found for {alias}")
+
+
+def main():
+    """Run the rebuild."""
+    parser = argparse.ArgumentParser(description="Zero-downtime index rebuild via aliases.")
+    parser.add_argument("alias", choices=sorted(SNAPSHOT_KINDS), help="Alias to rebuild")
+    parser.add_argument("--migrate", action="store_true",
+                        help="Convert an existing concrete index into <alias>_v1 behind an alias")
+    parser.add_argument("--rps", type=float, default=None, help="Reindex throttle (requests per second)")
+    parser.add_argument("--keep", type=int, default=1, help="Old versions to keep for rollback")
+    parser.add_argument("--from-processed", action="store_true",
+                        help="Load documents from the processed snapshot instead of _reindex")
+    parser.add_argument("--model", default="biobert", help="Embedding model for --from-processed")
+    parser.add_argument("--quantize", action="store_true",
+                        help="Convert stored float embeddings to int8 during _reindex "
+                             "(when moving to EMBEDDING_ELEMENT_TYPE=byte)")
+    parser.add_argument("--drop-combined-full-text", action="store_true",
+                        help="Remove full_text values that only repeat title + abstract during "
+                             "_reindex (now covered by the search_text copy_to field)")
+    parser.add_argument("--allow-writes", action="store_true",
+                        help="Do not block writes during the copy (documents written meanwhile "
+                             "are lost when the alias moves)")
+    args = parser.parse_args()
+    
+    es_client = ElasticsearchClient()
+    manager = IndexManager(es_client)
+    
+    try:
+        if args.migrate:
+            manager.migrate_to_alias(
+                args.alias,
+                requests_per_second=args.rps,
+                allow_writes=args.allow_writes
+            )
+            return
+        
+        documents = None
+        scripts = []
+        if args.from_processed:
+            documents = iter_processed_documents(args.alias, args.model, es_client)
+        else:
+            if args.quantize:
+                from src.nlp_engine import EmbeddingQuantizer
+                scripts.append(EmbeddingQuantizer.load().reindex_script())
+            if args.drop_combined_full_text:
+                scripts.append(IndexManager.drop_combined_full_text_script())
+        script = combine_scripts(scripts)
+        
+        new_index = manager.rebuild_index(
+            args.alias,
+            documents=documents,
+            requests_per_second=args.rps,
+            script=script,
+            keep_versions=args.keep,
+            allow_writes=args.allow_writes
+        )
+        logger.info(f"✅ {args.alias} now points to {new_index}")
+    
+    except Exception as e:
+        logger.error(f"❌ Rebuild failed: {e}", exc_info=True)
+        sys.exit(1)
+    finally:
+        es_client.close()
+
+
+if __name__ == "__main__":
+    main()
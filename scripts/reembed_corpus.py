@@ -0,0 +1,298 @@
+"""Re-embed an indexed corpus with K worker processes, resumable per shard.
+
+Documents are streamed from the index (point in time + search_after, sorted
+by id, K contiguous ID ranges sampled on the first run) or from the processed
+snapshot on disk (K shards by a hash of the document ID), embedded and written
+back with partial ``update`` bulk requests. Each shard keeps a checkpoint file
+that is only advanced after the page was written, so an interrupted run
+continues where it stopped. Checkpoints are kept per source, so index and
+--from-processed runs never resume each other's shards:
+
+    python scripts/reembed_corpus.py pubmed_articles --workers 4
+    python scripts/reembed_corpus.py clinical_trials --workers 4 --from-processed
+    python scripts/reembed_corpus.py pubmed_articles --workers 4 --reset   # start over
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils.config import PROJECT_ROOT
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+CHECKPOINT_DIR = PROJECT_ROOT / "data" / "state" / "reembed"
+
+SNAPSHOT_KINDS = {
+    "pubmed_articles": "articles",
+    "clinical_trials": "trials",
+}
+
+
+def checkpoint_dir(index_name: str, from_processed: bool) -> Path:
+    """Checkpoint directory of one index and source (shards differ per source)."""
+    return CHECKPOINT_DIR / index_name / ("processed" if from_processed else "index")
+
+
+def checkpoint_path(index_name: str, from_processed: bool, shard: int, num_shards: int) -> Path:
+    """Checkpoint file of one shard."""
+    name = f"shard_{shard:03d}_of_{num_shards:03d}.json"
+    return checkpoint_dir(index_name, from_processed) / name
+
+
+def boundaries_path(index_name: str, num_shards: int) -> Path:
+    """File with the ID ranges of the index-source shards."""
+    return checkpoint_dir(index_name, False) / f"ranges_of_{num_shards:03d}.json"
+
+
+def load_boundaries(index_name: str, num_shards: int) -> List[Optional[str]]:
+    """Get the ID ranges of the shards, sampling them on the first run.
+    
+    They are stored next to the checkpoints, since a resumed shard must keep
+    its range.
+    """
+    path = boundaries_path(index_name, num_shards)
+    if path.exists():
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)["boundaries"]
+    
+    from src.indexing import ElasticsearchClient, DocumentIndexer
+    
+    es_client = ElasticsearchClient()
+    try:
+        boundaries = DocumentIndexer(es_client).id_boundaries(index_name, num_shards)
+    finally:
+        es_client.close()
+    
+    save_checkpoint(path, {"boundaries": boundaries})
+    logger.info(f"Sampled {num_shards} ID ranges of {index_name}: {boundaries[1:-1]}")
+    return boundaries
+
+
+def load_checkpoint(path: Path) -> Dict:
+    """Read a shard checkpoint (empty state if there is none)."""
+    if not path.exists():
+        return {"search_after": None, "position": 0, "processed": 0, "finished": False}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_checkpoint(path: Path, state: Dict):
+    """Write a shard checkpoint atomically."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({**state, "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S")}, f)
+    os.replace(tmp_path, path)
+
+
+def iter_index_pages(indexer, args: Dict, shard: int, state: Dict) -> Iterator[Tuple[List[Dict], Dict]]:
+    """Pages of documents of one shard, streamed from the index.
+    
+    Yields:
+        Tuple of (documents, checkpoint state after the page)
+    """
+    query = None
+    if args["missing_only"]:
+        query = {"bool": {"must_not": {"exists": {"field": "embedding"}}}}
+    
+    hits = indexer.iter_documents(
+        args["index"],
+        query=query,
+        source_includes=["id"] + args["fields"],
+        page_size=args["page_size"],
+        search_after=state["search_after"],
+        id_range=tuple(args["boundaries"][shard:shard + 2])
+    )
+    
+    page = []
+    for hit in hits:
+        page.append(hit)
+        if len(page) >= args["page_size"]:
+            yield [h["_source"] for h in page], {"search_after": page[-1]["sort"]}
+            page = []
+    if page:
+        yield [h["_source"] for h in page], {"search_after": page[-1]["sort"]}
+
+
+def iter_processed_pages(args: Dict, shard: int, state: Dict) -> Iterator[Tuple[List[Dict], Dict]]:
+    """Pages of documents of one shard, read from the processed snapshot.
+    
+    Yields:
+        Tuple of (documents, checkpoint state after the page)
+    """
+    from src.data_pipeline import DataStorage
+    
+    batches = DataStorage().iter_processed(
+        SNAPSHOT_KINDS[args["index"]],
+        columns=["id"] + args["fields"]
+    )
+    
+    position = 0
+    page = []
+    for documents, _ in batches:
+        for doc in documents:
+            doc_id = doc.get("id")
+            if not doc_id or zlib.crc32(str(doc_id).encode("utf-8")) % args["workers"] != shard:
+                continue
+            position += 1
+            if position <= state["position"]:
+                continue
+            
+            page.append(doc)
+            if len(page) >= args["page_size"]:
+                yield page, {"position": position}
+                page = []
+    
+    if page:
+        yield page, {"position": position}
+
+
+def run_shard(shard: int, args: Dict) -> Dict:
+    """Re-embed one shard inside a worker process.
+    
+    Args:
+        shard: Shard number
+        args: Parsed command line arguments (as a dict)
+    
+    Returns:
+        Final checkpoint state of the shard
+    """
+    import torch
+    from src.indexing import ElasticsearchClient, DocumentIndexer
+    from src.nlp_engine import EmbeddingCache, EmbeddingGenerator, EmbeddingQuantizer
+    
+    torch.set_num_threads(args["threads"])
+    
+    path = checkpoint_path(args["index"], args["from_processed"], shard, args["workers"])
+    state = load_checkpoint(path)
+    if state["finished"]:
+        logger.info(f"Shard {shard}: already finished ({state['processed']} documents)")
+        return state
+    
+    es_client = ElasticsearchClient()
+    quantizer = EmbeddingQuantizer.from_settings()
+    indexer = DocumentIndexer(es_client, vector_encoder=quantizer.bulk_encoder(es_client))
+    embedding_generator = EmbeddingGenerator(
+        model_type=args["model"],
+        batch_size=args["batch_size"],
+        cache=EmbeddingCache()
+    )
+    
+    if args["from_processed"]:
+        pages = iter_processed_pages(args, shard, state)
+    else:
+        pages = iter_index_pages(indexer, args, shard, state)
+    
+    start_time = time.time()
+    processed_before = state["processed"]
+    
+    try:
+        for documents, position in pages:
+            embeddings = embedding_generator.generate_batch_embeddings(
+                documents,
+                fields=args["fields"],
+                show_progress=False
+            )
+            updates = (
+                {"id": doc["id"], "embedding": embedding}
+                for doc, embedding in zip(documents, embeddings)
+            )
+            result = indexer.index_batch(args["target"], updates, op_type="update")
+            if result.failed:
+                raise RuntimeError(
+                    f"Shard {shard}: {result.failed} updates failed - checkpoint not advanced"
+                )
+            
+            state.update(position)
+            state["processed"] += len(documents)
+            save_checkpoint(path, state)
+            
+            done = state["processed"] - processed_before
+            logger.info(
+                f"Shard {shard}: {state['processed']} documents "
+                f"({done / max(time.time() - start_time, 1e-6):.1f} docs/s)"
+            )
+        
+        state["finished"] = True
+        save_checkpoint(path, state)
+        return state
+    
+    finally:
+        es_client.close()
+
+
+def main():
+    """Run all shards in a process pool."""
+    parser = argparse.ArgumentParser(description="Resumable multi-process corpus re-embedding.")
+    parser.add_argument("index", choices=sorted(SNAPSHOT_KINDS), help="Index (alias) to re-embed")
+    parser.add_argument("--target", default=None, help="Index the updates are written to (default: index)")
+    parser.add_argument("--model", default="biobert", help="Embedding model ('biobert' or 'clinicalbert')")
+    parser.add_argument("--fields", nargs="+", default=["title", "abstract"], help="Fields that are embedded")
+    parser.add_argument("--workers", type=int, default=2, help="Worker processes (= shards)")
+    parser.add_argument("--threads", type=int, default=None,
+                        help="Torch intra-op threads per worker (default: cores / workers)")
+    parser.add_argument("--batch-size", type=int, default=32, help="Texts per forward pass")
+    parser.add_argument("--page-size", type=int, default=256, help="Documents per page and checkpoint")
+    parser.add_argument("--from-processed", action="store_true",
+                        help="Read documents from the processed snapshot instead of the index")
+    parser.add_argument("--missing-only", action="store_true",
+                        help="Only documents without an embedding (index source)")
+    parser.add_argument("--reset", action="store_true", help="Delete checkpoints and start over")
+    args = vars(parser.parse_args())
+    
+    args["target"] = args["target"] or args["index"]
+    args["threads"] = args["threads"] or max(1, (os.cpu_count() or 1) // args["workers"])
+    
+    if args["reset"]:
+        for shard in range(args["workers"]):
+            path = checkpoint_path(args["index"], args["from_processed"], shard, args["workers"])
+            path.unlink(missing_ok=True)
+        if not args["from_processed"]:
+            boundaries_path(args["index"], args["workers"]).unlink(missing_ok=True)
+    
+    if not args["from_processed"]:
+        args["boundaries"] = load_boundaries(args["index"], args["workers"])
+    
+    logger.info(
+        f"Re-embedding {args['index']} -> {args['target']} with {args['workers']} workers "
+        f"x {args['threads']} threads"
+    )
+    start_time = time.time()
+    total = 0
+    failed_shards = []
+    
+    # spawn: torch and HTTP clients do not survive fork reliably
+    with ProcessPoolExecutor(
+        max_workers=args["workers"],
+        mp_context=multiprocessing.get_context("spawn")
+    ) as pool:
+        futures = {pool.submit(run_shard, shard, args): shard for shard in range(args["workers"])}
+        for future in as_completed(futures):
+            shard = futures[future]
+            try:
+                total += future.result()["processed"]
+            except Exception as e:
+                logger.error(f"❌ Shard {shard} failed: {e} - rerun to resume from its checkpoint")
+                failed_shards.append(shard)
+    
+    elapsed = time.time() - start_time
+    logger.info(f"Re-embedded {total} documents in {elapsed / 60:.1f} minutes")
+    
+    if failed_shards:
+        sys.exit(1)
+    logger.info("✅ All shards finished")
+
+
+if __name__ == "__main__":
+    main()
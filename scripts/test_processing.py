@@ -46,7 +46,7 @@ def test_processing():
             logger.info("\nSample normalized article:")
             logger.info(f"  ID: {sample['id']}")
             logger.info(f"  Title: {sample['title'][:80]}...")
-            logger.info(f"  Full text length: {len(sample['full_text'])} chars")
+            logger.info(f"  Full text length: {len(sample.get('full_text') or '')} chars")
             logger.info(f"  Keywords: {', '.join(sample['keywords'][:5])}")
             logger.info(f"  Publication date: {sample['publication_date']}")
     
@@ -73,7 +73,7 @@ def test_processing():
             logger.info("\nSample normalized trial:")
             logger.info(f"  ID: {sample['id']}")
             logger.info(f"  Title: {sample['title'][:80]}...")
-            logger.info(f"  Full text length: {len(sample['full_text'])} chars")
+            logger.info(f"  Full text length: {len(sample.get('full_text') or '')} chars")
             logger.info(f"  Conditions: {', '.join(sample['conditions'][:3])}")
             logger.info(f"  Status: {sample['status']}")
             logger.info(f"  Phases: {', '.join(sample['phases'])}")
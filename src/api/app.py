@@ -7,6 +7,7 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import RedirectResponse
 
+from src.api.responses import MsgspecJSONResponse
 from src.api.routes import router
 from src.api.dependencies import initialize_services, cleanup_services
 from src.utils.logger import logger
@@ -82,6 +83,7 @@ def create_app() -> FastAPI:
         version="1.0.0",
         docs_url="/docs",
         redoc_url="/redoc",
+        default_response_class=MsgspecJSONResponse,
         lifespan=lifespan
     )
     
@@ -3,14 +3,21 @@ FastAPI dependencies for shared resources.
 """
 
 import os
+import threading
+import time
 from functools import lru_cache
+from pathlib import Path
 from typing import Optional
 
 from src.utils.config import Settings
 from src.search_engine.hybrid_search import HybridSearchEngine
+from src.search_engine.suggester import QuerySuggester, QueryLog
+from src.search_engine.facets import FacetService
+from src.search_engine.pagination import SearchPager
 from src.search_engine.reranker import CrossEncoderReranker
 from src.qa_module.qa_engine import QuestionAnsweringEngine
 from src.indexing.document_indexer import DocumentIndexer
+from src.indexing.document_cache import DocumentCache
 from src.utils.logger import logger
 
 
@@ -20,6 +27,13 @@ _search_engine: Optional[HybridSearchEngine] = None
 _reranker: Optional[CrossEncoderReranker] = None
 _qa_engine: Optional[QuestionAnsweringEngine] = None
 _document_indexer: Optional[DocumentIndexer] = None
+_suggester: Optional[QuerySuggester] = None
+_suggester_version: Optional[int] = None
+_suggester_checked: float = float("-inf")
+_query_log: Optional[QueryLog] = None
+_facet_service: Optional[FacetService] = None
+_search_pager: Optional[SearchPager] = None
+_document_cache: Optional[DocumentCache] = None
 
 # Check if running on low-memory environment
 IS_LOW_MEMORY = os.getenv('LOW_MEMORY_MODE', 'false').lower() == 'true'
@@ -82,11 +96,82 @@ def get_document_indexer() -> DocumentIndexer:
     return _document_indexer
 
 
+def get_document_cache() -> DocumentCache:
+    """Get single-document cache instance (singleton)."""
+    global _document_cache
+    if _document_cache is None:
+        _document_cache = DocumentCache(get_document_indexer())
+        logger.info("DocumentCache initialized")
+    return _document_cache
+
+
+def get_suggester() -> Optional[QuerySuggester]:
+    """Get the autocomplete index, reloading it when the file was rebuilt.
+    
+    The file's mtime is checked at most every SUGGEST_RELOAD_SECONDS. The
+    build script replaces the file atomically and the new index is swapped
+    in with one assignment; requests still using the old mapping finish on it.
+    """
+    global _suggester, _suggester_version, _suggester_checked
+    
+    settings = get_settings()
+    now = time.monotonic()
+    if now - _suggester_checked < settings.suggest_reload_seconds:
+        return _suggester
+    _suggester_checked = now
+    
+    path = Path(settings.suggest_index_path)
+    try:
+        version = path.stat().st_mtime_ns
+    except OSError:
+        version = None
+    
+    if version != _suggester_version:
+        try:
+            _suggester = QuerySuggester.load(path) if version is not None else None
+            _suggester_version = version
+            if _suggester is not None:
+                logger.info(f"Suggest index loaded: {len(_suggester)} keys")
+        except Exception as e:
+            logger.error(f"Could not load suggest index {path}: {e}")
+    return _suggester
+
+
+def get_query_log() -> Optional[QueryLog]:
+    """Get the search query log (singleton, None if disabled)."""
+    global _query_log
+    settings = get_settings()
+    if _query_log is None and settings.query_log_path:
+        _query_log = QueryLog(settings.query_log_path, settings.query_log_max_bytes)
+    return _query_log
+
+
+def get_facet_service() -> FacetService:
+    """Get facet service instance (singleton)."""
+    global _facet_service
+    if _facet_service is None:
+        _facet_service = FacetService(get_search_engine())
+        logger.info("FacetService initialized")
+    return _facet_service
+
+
+def get_search_pager() -> SearchPager:
+    """Get search pager instance (singleton)."""
+    global _search_pager
+    if _search_pager is None:
+        _search_pager = SearchPager(get_search_engine())
+        logger.info("SearchPager initialized")
+    return _search_pager
+
+
 def initialize_services():
     """Initialize all services at startup."""
     logger.info("Initializing API services...")
     get_settings()
     get_search_engine()
+    get_suggester()
+    # Unfiltered facet counts are precomputed without delaying startup
+    threading.Thread(target=get_facet_service().warm, daemon=True).start()
     
     if not IS_LOW_MEMORY:
         get_reranker()
@@ -99,7 +184,7 @@ def initialize_services():
 
 def cleanup_services():
     """Cleanup services on shutdown."""
-    global _search_engine, _reranker, _qa_engine
+    global _search_engine, _reranker, _qa_engine, _query_log, _facet_service, _search_pager, _document_cache
     
     logger.info("Cleaning up API services...")
     
@@ -107,6 +192,20 @@ def cleanup_services():
         _search_engine.es_client.close()
         _search_engine = None
     
+    if _query_log is not None:
+        _query_log.close()
+        _query_log = None
+    
+    if _facet_service is not None:
+        _facet_service.close()
+        _facet_service = None
+    
+    _search_pager = None
+    
+    if _document_cache is not None:
+        _document_cache.close()
+        _document_cache = None
+    
     _reranker = None
     _qa_engine = None
     
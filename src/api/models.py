@@ -2,7 +2,7 @@
 Pydantic models for API requests and responses.
 """
 
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Union
 from pydantic import BaseModel, Field
 
 
@@ -20,6 +20,13 @@ class SearchRequest(BaseModel):
     article_types: Optional[List[str]] = Field(default_factory=list, description="List of article types to filter by")
     subject: Optional[str] = Field(None, description="Subject filter (human, animal, etc.)")
     availability: Optional[str] = Field(None, description="Availability filter (abstract, full_text, open_access)")
+    hybrid_mode: Optional[str] = Field(
+        None,
+        description="'fusion' (keyword and vector queries fused by the API), 'native' (fused by the cluster in one request), 'rescore' or 'rescore_client' (top keyword hits re-scored by vector similarity on the cluster or in the API); default: server setting",
+        pattern="^(fusion|native|rescore|rescore_client)$"
+    )
+    paginate: Optional[bool] = Field(False, description="Return a cursor for the next page (max_results per page)")
+    cursor: Optional[str] = Field(None, description="Cursor from the previous page; the other fields must be unchanged")
 
 
 class DocumentResult(BaseModel):
@@ -40,6 +47,7 @@ class SearchResponse(BaseModel):
     total_results: int = Field(..., description="Total number of results found")
     results: List[DocumentResult] = Field(default_factory=list, description="Search results")
     search_time_ms: float = Field(..., description="Search execution time in milliseconds")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page (paginated searches, absent after the last page)")
 
 
 class QuestionRequest(BaseModel):
@@ -99,6 +107,49 @@ class DocumentResponse(BaseModel):
     embedding: Optional[List[float]] = Field(None, description="Document embedding vector")
 
 
+class DocumentsResponse(BaseModel):
+    """Response model for multi-document retrieval endpoint."""
+    
+    documents: List[DocumentResponse] = Field(default_factory=list, description="Documents found, in request order")
+    missing: List[str] = Field(default_factory=list, description="Requested IDs that were not found")
+    retrieval_time_ms: float = Field(..., description="Retrieval time in milliseconds")
+
+
+class Suggestion(BaseModel):
+    """Model for a single autocomplete suggestion."""
+    
+    text: str = Field(..., description="Suggested query")
+    kind: str = Field(..., description="Origin: 'query' (popular search), 'term' (MeSH term, condition) or 'title'")
+    score: float = Field(0.0, description="Ranking score (frequency based)")
+
+
+class SuggestResponse(BaseModel):
+    """Response model for autocomplete endpoint."""
+    
+    prefix: str = Field(..., description="Text typed so far")
+    suggestions: List[Suggestion] = Field(default_factory=list, description="Completions, best first")
+
+
+class FacetValue(BaseModel):
+    """Model for one value of a facet with its document count."""
+    
+    value: Union[int, str] = Field(..., description="Filter value (a year for 'years')")
+    count: int = Field(0, description="Number of matching documents")
+
+
+class FacetsResponse(BaseModel):
+    """Response model for facets endpoint."""
+    
+    query: str = Field("", description="Search query the counts are for")
+    total: int = Field(0, description="Number of matching documents")
+    facets: Dict[str, List[FacetValue]] = Field(
+        default_factory=dict,
+        description="Counts per filter: article_types, subjects, availability, years, sources"
+    )
+    cached: bool = Field(False, description="Whether the counts were served from the cache")
+    facet_time_ms: float = Field(..., description="Time to get the counts in milliseconds")
+
+
 class HealthResponse(BaseModel):
     """Response model for health check endpoint."""
     
@@ -0,0 +1,96 @@
+"""
+Response classes for the API.
+"""
+
+import csv
+import io
+import json
+from typing import Any, Dict, Iterable, Iterator, List
+
+from fastapi.responses import JSONResponse
+
+from src.utils.records import encode_json
+
+
+class MsgspecJSONResponse(JSONResponse):
+    """JSON response rendered with msgspec.
+    
+    Faster than the standard library encoder for large result lists, and
+    serializes records and NumPy values returned by the services directly.
+    """
+    
+    def render(self, content: Any) -> bytes:
+        return encode_json(content)
+
+
+# Rows per chunk of a streamed export
+EXPORT_CHUNK_ROWS = 100
+
+
+def project(hit: Dict, fields: List[str]) -> Dict[str, Any]:
+    """Select fields of a search hit's source (dotted paths for nested fields).
+    
+    Args:
+        hit: Search result with 'id' and 'source'
+        fields: Field names; 'id' and 'score' come from the hit itself
+    
+    Returns:
+        Field -> value (None when missing)
+    """
+    source = hit.get("source") or {}
+    row = {}
+    for field in fields:
+        if field == "id" and "id" not in source:
+            row[field] = hit.get("id")
+        elif field == "score":
+            row[field] = hit.get("score")
+        else:
+            value = source
+            for part in field.split("."):
+                value = value.get(part) if isinstance(value, dict) else None
+            row[field] = value
+    return row
+
+
+def ndjson_chunks(rows: Iterable[Dict]) -> Iterator[bytes]:
+    """Encode rows as newline-delimited JSON, a few rows per chunk."""
+    chunk = []
+    for row in rows:
+        chunk.append(encode_json(row))
+        if len(chunk) >= EXPORT_CHUNK_ROWS:
+            yield b"\n".join(chunk) + b"\n"
+            chunk = []
+    if chunk:
+        yield b"\n".join(chunk) + b"\n"
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, list):
+        return "; ".join(
+            json.dumps(item, ensure_ascii=False) if isinstance(item, (dict, list)) else str(item)
+            for item in value
+        )
+    if isinstance(value, dict):
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+
+def csv_chunks(rows: Iterable[Dict], fields: List[str]) -> Iterator[bytes]:
+    """Encode rows as CSV with a header line, a few rows per chunk.
+    
+    Lists are joined with '; ' and objects written as JSON.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    count = 0
+    for row in rows:
+        writer.writerow([_csv_value(row.get(field)) for field in fields])
+        count += 1
+        if count % EXPORT_CHUNK_ROWS == 0:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode("utf-8")
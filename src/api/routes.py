@@ -2,14 +2,21 @@
 API route handlers for biomedical search engine. Updated: 2026-03-07
 """
 
+import re
 import time
 import httpx
+from email.utils import formatdate, parsedate_to_datetime
+from itertools import chain
+from typing import List, Optional
 from src.api.models import (
     SearchRequest,
     SearchResponse,
     QuestionRequest,
     QuestionResponse,
     DocumentResponse,
+    DocumentsResponse,
+    SuggestResponse,
+    FacetsResponse,
     HealthResponse,
     BatchQuestionRequest,
     BatchQuestionResponse,
@@ -28,22 +35,39 @@ from src.api.dependencies import (
     get_search_engine,
     get_reranker,
     get_qa_engine,
-    get_document_indexer
+    get_document_indexer,
+    get_suggester,
+    get_query_log,
+    get_facet_service,
+    get_search_pager,
+    get_document_cache
 )
 from src.search_engine.hybrid_search import HybridSearchEngine
 from src.search_engine.reranker import CrossEncoderReranker
+from src.search_engine.suggester import QuerySuggester, QueryLog
+from src.search_engine.facets import FacetService
+from src.search_engine.pagination import SearchPager, CursorError
 from src.qa_module.qa_engine import QuestionAnsweringEngine
 from src.indexing.document_indexer import DocumentIndexer
+from src.indexing.document_cache import DocumentCache
+from src.api.responses import csv_chunks, ndjson_chunks, project
 from src.utils.config import Settings
 from src.utils.logger import logger
-from fastapi import APIRouter, HTTPException, Depends, Query
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
 
 import sqlite3
 import os
 
 router = APIRouter(prefix="/api/v1", tags=["api"])
 
+# Indices that /documents looks up IDs in
+DOCUMENT_INDICES = ["pubmed_articles", "clinical_trials"]
+
+# Fields exported when none are chosen
+EXPORT_FIELDS = ("id", "source", "title", "authors", "journal", "pub_year", "publication_date", "doi", "abstract")
+EXPORT_FIELD_PATTERN = re.compile(r"^[A-Za-z0-9_]+(\.[A-Za-z0-9_]+)*$")
+
 # Shared Maverick DB - Must match app_maverick.py
 MAVERICK_DB = "/tmp/conversation_history.db" if os.path.exists("/tmp") else "local_memory.db"
 
@@ -116,14 +140,27 @@ async def search_documents(
     request: SearchRequest,
     search_engine: HybridSearchEngine = Depends(get_search_engine),
     reranker: CrossEncoderReranker = Depends(get_reranker),
-    settings: Settings = Depends(get_settings)
+    settings: Settings = Depends(get_settings),
+    query_log: Optional[QueryLog] = Depends(get_query_log),
+    search_pager: SearchPager = Depends(get_search_pager)
 ):
     """
     Search for documents using hybrid search or Google Serper.
+    
+    With `paginate` (or a `cursor`), `max_results` is the page size and the
+    response carries `next_cursor` for the following page. Reranking then
+    applies once to the whole hybrid candidate list; keyword-only pages
+    (alpha 1) keep their BM25 order.
     """
     try:
         start_time = time.time()
         document_results = []
+        next_cursor = None
+        by_relevance = (request.sort_by or "relevance") == "relevance"
+        
+        # Popular queries feed the autocomplete index
+        if query_log is not None:
+            query_log.record(request.query)
         
         if request.index == "google":
             # Perform Google Search via Serper
@@ -181,31 +218,56 @@ async def search_documents(
             else:  # both
                 index_name = "all"
             
-            # Perform hybrid search
-            logger.info(f"Searching '{request.query}' in {index_name}")
-            results = search_engine.hybrid_search(
-                index_name=index_name,
-                query=request.query,
-                size=request.max_results,
-                alpha=request.alpha,
-                sort_by=request.sort_by,
-                date_from=request.date_from,
-                date_to=request.date_to,
-                article_types=request.article_types,
-                subject=request.subject,
-                availability=request.availability
-            )
+            paged = bool(request.paginate or request.cursor)
+            rerank = request.use_reranking and by_relevance
+            if rerank and reranker is None:
+                logger.warning("Reranking requested but disabled (LOW_MEMORY_MODE)")
+                rerank = False
             
-            # Apply reranking if requested and available
-            if request.use_reranking and results:
-                if reranker is not None:
-                    logger.info("Applying cross-encoder reranking")
-                    results = reranker.rerank(request.query, results)
-                else:
-                    logger.warning("Reranking requested but disabled (LOW_MEMORY_MODE)")
+            if paged:
+                logger.info(f"Searching '{request.query}' in {index_name} (page)")
+                # The candidate list is reranked once, not page by page
+                results, next_cursor = search_pager.page(
+                    index_name,
+                    request.query,
+                    size=request.max_results,
+                    cursor=request.cursor,
+                    alpha=request.alpha,
+                    sort_by=request.sort_by,
+                    mode=request.hybrid_mode,
+                    date_from=request.date_from,
+                    date_to=request.date_to,
+                    article_types=request.article_types,
+                    subject=request.subject,
+                    availability=request.availability,
+                    rerank=(lambda hits: reranker.rerank(request.query, hits)) if rerank else None
+                )
+            else:
+                # Perform hybrid search
+                logger.info(f"Searching '{request.query}' in {index_name}")
+                results = search_engine.hybrid_search(
+                    index_name=index_name,
+                    query=request.query,
+                    size=request.max_results,
+                    alpha=request.alpha,
+                    sort_by=request.sort_by,
+                    date_from=request.date_from,
+                    date_to=request.date_to,
+                    article_types=request.article_types,
+                    subject=request.subject,
+                    availability=request.availability,
+                    mode=request.hybrid_mode
+                )
+            
+            # Apply reranking if requested and available (date-sorted
+            # results keep their order)
+            if rerank and results and not paged:
+                logger.info("Applying cross-encoder reranking")
+                results = reranker.rerank(request.query, results)
             
             # Ensure results are sorted by score (descending)
-            results.sort(key=lambda x: x.get('score', 0), reverse=True)
+            if by_relevance:
+                results.sort(key=lambda x: x.get('score', 0), reverse=True)
             
             # Convert to response format
             for result in results:
@@ -242,9 +304,12 @@ async def search_documents(
             query=request.query,
             total_results=len(document_results),
             results=document_results,
-            search_time_ms=round(search_time_ms, 2)
+            search_time_ms=round(search_time_ms, 2),
+            next_cursor=next_cursor
         )
         
+    except CursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Search failed: {e}")
         raise HTTPException(status_code=500, detail=f"Search failed: {str(e)}")
@@ -411,65 +476,318 @@ async def batch_answer_questions(
         raise HTTPException(status_code=500, detail=f"Batch question answering failed: {str(e)}")
 
 
+def _build_document_response(
+    document_id: str,
+    index: str,
+    source: dict,
+    include_embedding: bool = False
+) -> DocumentResponse:
+    """Convert an indexed document source to a DocumentResponse."""
+    source_type = "pubmed" if index == "pubmed_articles" else "clinical_trials"
+    
+    # Build full text from sections
+    full_text_sections = []
+    if source.get("abstract"):
+        full_text_sections.append(source["abstract"])
+    
+    for key, value in source.items():
+        if key.startswith("full_text_") and value:
+            full_text_sections.append(value)
+    
+    full_text = "\n\n".join(full_text_sections) if full_text_sections else None
+    
+    response = DocumentResponse(
+        id=document_id,
+        title=source.get("title") or "No Title",
+        abstract=source.get("abstract"),
+        full_text=full_text,
+        source=source_type,
+        metadata={
+            "authors": source.get("authors", []),
+            # For clinical trials, fallback to start_date if publication_date not available
+            "publication_date": source.get("publication_date") or source.get("publication_year") or source.get("year") or source.get("start_date") or "N/A",
+            "journal": source.get("journal") or "N/A",
+            "pmid": source.get("pmid"),
+            "nct_id": source.get("nct_id"),
+            "study_type": source.get("study_type"),
+            "conditions": source.get("conditions", []),
+            "interventions": source.get("interventions", [])
+        }
+    )
+    
+    if include_embedding and "embedding" in source:
+        response.embedding = source["embedding"]
+    
+    return response
+
+
 @router.get("/document/{document_id}", response_model=DocumentResponse)
 async def get_document(
     document_id: str,
+    request: Request,
+    response: Response,
     index: str = Query(..., description="Index name: 'pubmed_articles' or 'clinical_trials'"),
     include_embedding: bool = Query(False, description="Include embedding vector in response"),
-    search_engine: HybridSearchEngine = Depends(get_search_engine)
+    document_cache: DocumentCache = Depends(get_document_cache)
 ):
     """
     Retrieve a specific document by ID.
     
     Returns full document details including metadata and optionally the embedding vector.
+    Responses carry an ETag (from the document's index and version) and
+    Last-Modified, and conditional requests for an unchanged document get
+    304 Not Modified.
     """
     try:
         logger.info(f"Retrieving document {document_id} from {index}")
+        document = document_cache.get(index, document_id, include_embedding=include_embedding)
+    except Exception as e:
+        logger.error(f"Document retrieval failed: {e}")
+        raise HTTPException(status_code=404, detail=f"Document not found: {str(e)}")
+    
+    if document is None:
+        raise HTTPException(status_code=404, detail=f"Document not found: {document_id}")
+    
+    headers = {
+        "ETag": document.etag,
+        "Last-Modified": formatdate(document.last_modified, usegmt=True),
+        # Stored by clients and CDNs, but revalidated before each use
+        "Cache-Control": "no-cache"
+    }
+    if _not_modified(request, document.etag, document.last_modified):
+        return Response(status_code=304, headers=headers)
+    
+    response.headers.update(headers)
+    return _build_document_response(document_id, index, document.source, include_embedding)
+
+
+def _not_modified(request: Request, etag: str, last_modified: float) -> bool:
+    """Evaluate If-None-Match (preferred) or If-Modified-Since."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        return "*" in tags or etag in tags or f"W/{etag}" in tags
+    
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        # HTTP dates have a resolution of one second
+        return int(last_modified) <= since
+    return False
+
+
+@router.get("/documents", response_model=DocumentsResponse)
+async def get_documents(
+    ids: str = Query(..., description="Comma-separated document IDs (max 1000), optionally prefixed with their index ('clinical_trials:NCT01234567')"),
+    index: Optional[str] = Query(None, description="Index name: 'pubmed_articles' or 'clinical_trials' (default: both)"),
+    include_embedding: bool = Query(False, description="Include embedding vectors in response"),
+    indexer: DocumentIndexer = Depends(get_document_indexer)
+):
+    """
+    Retrieve several documents by ID with a single multi-get request.
+    
+    IDs can come from different indices: an ID prefixed with an index name
+    is looked up there, any other ID in `index`, or in both indices when
+    `index` is not given. IDs that are not found are listed in `missing`
+    instead of failing the request.
+    """
+    start_time = time.time()
+    
+    document_ids = list(dict.fromkeys(i.strip() for i in ids.split(",") if i.strip()))
+    if not document_ids:
+        raise HTTPException(status_code=400, detail="No document IDs given")
+    if len(document_ids) > 1000:
+        raise HTTPException(status_code=400, detail="At most 1000 document IDs per request")
+    
+    # (index, ID) candidates per requested ID, in lookup order
+    candidates = []
+    for requested in document_ids:
+        prefix, _, doc_id = requested.partition(":")
+        if doc_id and prefix in DOCUMENT_INDICES:
+            candidates.append([(prefix, doc_id)])
+        else:
+            indices = [index] if index else DOCUMENT_INDICES
+            candidates.append([(index_name, requested) for index_name in indices])
+    
+    try:
+        logger.info(f"Retrieving {len(document_ids)} documents from {index or 'all indices'}")
+        
+        refs = [ref for refs in candidates for ref in refs]
+        entries = iter(indexer.get_many_across(
+            refs,
+            source_excludes=None if include_embedding else ["embedding"]
+        ))
+        
+        documents = []
+        missing = []
+        for requested, refs in zip(document_ids, candidates):
+            found = [(ref, entry) for ref, entry in zip(refs, entries) if entry is not None]
+            if found:
+                (index_name, doc_id), entry = found[0]
+                documents.append(
+                    _build_document_response(doc_id, index_name, entry.get("_source", {}), include_embedding)
+                )
+            else:
+                missing.append(requested)
         
-        # Get document from Elasticsearch
-        doc = search_engine.es_client.client.get(index=index, id=document_id)
-        
-        source = doc["_source"]
-        source_type = "pubmed" if index == "pubmed_articles" else "clinical_trials"
-        
-        # Build full text from sections
-        full_text_sections = []
-        if source.get("abstract"):
-            full_text_sections.append(source["abstract"])
-        
-        for key, value in source.items():
-            if key.startswith("full_text_") and value:
-                full_text_sections.append(value)
-        
-        full_text = "\n\n".join(full_text_sections) if full_text_sections else None
-        
-        response = DocumentResponse(
-            id=document_id,
-            title=source.get("title") or "No Title",
-            abstract=source.get("abstract"),
-            full_text=full_text,
-            source=source_type,
-            metadata={
-                "authors": source.get("authors", []),
-                # For clinical trials, fallback to start_date if publication_date not available
-                "publication_date": source.get("publication_date") or source.get("publication_year") or source.get("year") or source.get("start_date") or "N/A",
-                "journal": source.get("journal") or "N/A",
-                "pmid": source.get("pmid"),
-                "nct_id": source.get("nct_id"),
-                "study_type": source.get("study_type"),
-                "conditions": source.get("conditions", []),
-                "interventions": source.get("interventions", [])
-            }
+        return DocumentsResponse(
+            documents=documents,
+            missing=missing,
+            retrieval_time_ms=round((time.time() - start_time) * 1000, 2)
         )
         
-        if include_embedding and "embedding" in source:
-            response.embedding = source["embedding"]
-        
-        return response
-        
     except Exception as e:
-        logger.error(f"Document retrieval failed: {e}")
-        raise HTTPException(status_code=404, detail=f"Document not found: {str(e)}")
+        logger.error(f"Multi-document retrieval failed: {e}")
+        raise HTTPException(status_code=500, detail=f"Document retrieval failed: {str(e)}")
+
+
+@router.get("/suggest", response_model=SuggestResponse)
+async def suggest(
+    q: str = Query(..., min_length=1, max_length=200, description="Text typed so far"),
+    limit: int = Query(10, ge=1, le=20, description="Number of suggestions"),
+    suggester: Optional[QuerySuggester] = Depends(get_suggester)
+):
+    """
+    Autocomplete a query from titles, MeSH terms and popular searches.
+    
+    Served from the in-process prefix index built by
+    scripts/build_suggest_index.py; the search cluster is not queried.
+    Without a built index no suggestions are returned.
+    """
+    if suggester is None:
+        return SuggestResponse(prefix=q, suggestions=[])
+    return SuggestResponse(prefix=q, suggestions=suggester.suggest(q, limit=limit))
+
+
+@router.get("/export")
+def export_documents(
+    q: str = Query(..., min_length=1, max_length=500, description="Search query"),
+    index: str = Query("both", description="Index: 'pubmed', 'clinical_trials', or 'both'"),
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$", description="'ndjson' or 'csv'"),
+    fields: Optional[str] = Query(None, description="Comma-separated source fields (dotted for nested fields); 'score' adds the relevance score"),
+    sort_by: str = Query("relevance", pattern="^(relevance|date_desc|date_asc)$", description="Sort criteria"),
+    limit: Optional[int] = Query(None, ge=1, description="Maximum number of rows (default: EXPORT_MAX_ROWS)"),
+    date_from: Optional[int] = Query(None, description="Start year filter"),
+    date_to: Optional[int] = Query(None, description="End year filter"),
+    article_types: Optional[List[str]] = Query(None, description="Article types to filter by"),
+    subject: Optional[str] = Query(None, description="Subject filter"),
+    availability: Optional[str] = Query(None, description="Availability filter"),
+    search_engine: HybridSearchEngine = Depends(get_search_engine),
+    settings: Settings = Depends(get_settings)
+):
+    """
+    Stream all keyword matches of a query as NDJSON or CSV.
+    
+    Documents are read page by page from a point in time and written as
+    they arrive, so exports of any size start immediately and use constant
+    memory. Rows are in keyword relevance (or date) order; the semantic
+    ranking of /search is not applied.
+    """
+    export_fields = [f.strip() for f in fields.split(",") if f.strip()] if fields else list(EXPORT_FIELDS)
+    if not export_fields or len(export_fields) > 50:
+        raise HTTPException(status_code=400, detail="Choose between 1 and 50 fields")
+    invalid = [f for f in export_fields if not EXPORT_FIELD_PATTERN.match(f)]
+    if invalid:
+        raise HTTPException(status_code=400, detail=f"Invalid field names: {', '.join(invalid)}")
+    if limit is not None and limit > settings.export_max_rows:
+        raise HTTPException(status_code=400, detail=f"At most {settings.export_max_rows} rows per export")
+    
+    if index == "pubmed":
+        index_name = "pubmed_articles"
+    elif index == "clinical_trials":
+        index_name = "clinical_trials"
+    else:  # both
+        index_name = "all"
+    
+    logger.info(f"Exporting '{q}' from {index_name} as {format}")
+    hits = search_engine.iter_keyword_results(
+        index_name,
+        q,
+        sort_by=sort_by,
+        limit=limit or settings.export_max_rows,
+        page_size=settings.export_page_size,
+        source_includes=[f for f in export_fields if f != "score"],
+        date_from=date_from,
+        date_to=date_to,
+        article_types=article_types,
+        subject=subject,
+        availability=availability
+    )
+    
+    # The first page is read before the response starts, so a failing
+    # search still gets an error status
+    try:
+        first = next(hits, None)
+    except Exception as e:
+        logger.error(f"Export failed: {e}")
+        raise HTTPException(status_code=500, detail=f"Export failed: {str(e)}")
+    
+    rows = (project(hit, export_fields) for hit in chain([first] if first is not None else [], hits))
+    if format == "csv":
+        content, media_type = csv_chunks(rows, export_fields), "text/csv; charset=utf-8"
+    else:
+        content, media_type = ndjson_chunks(rows), "application/x-ndjson"
+    
+    return StreamingResponse(
+        content,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="export.{format}"'}
+    )
+
+
+# Plain function: a cache miss waits on the cluster, so it runs in the
+# thread pool instead of blocking the event loop for other searches
+@router.get("/facets", response_model=FacetsResponse)
+def get_facets(
+    q: str = Query("", max_length=500, description="Search query (empty: all documents)"),
+    index: str = Query("both", description="Index: 'pubmed', 'clinical_trials', or 'both'"),
+    date_from: Optional[int] = Query(None, description="Start year filter"),
+    date_to: Optional[int] = Query(None, description="End year filter"),
+    article_types: Optional[List[str]] = Query(None, description="Article types to filter by"),
+    subject: Optional[str] = Query(None, description="Subject filter"),
+    availability: Optional[str] = Query(None, description="Availability filter"),
+    facet_service: FacetService = Depends(get_facet_service)
+):
+    """
+    Get document counts per filter value for a search.
+    
+    Counts come from one aggregation request over the keyword matches of
+    the query, cached until the index is written to. Without a query or
+    filter, precomputed counts are returned.
+    """
+    start_time = time.time()
+    
+    if index == "pubmed":
+        index_name = "pubmed_articles"
+    elif index == "clinical_trials":
+        index_name = "clinical_trials"
+    else:  # both
+        index_name = "all"
+    
+    try:
+        result = facet_service.get_facets(
+            index_name,
+            query=q.strip(),
+            date_from=date_from,
+            date_to=date_to,
+            article_types=article_types,
+            subject=subject,
+            availability=availability
+        )
+    except Exception as e:
+        logger.error(f"Facet counts failed: {e}")
+        raise HTTPException(status_code=500, detail=f"Facet counts failed: {str(e)}")
+    
+    return FacetsResponse(
+        query=q,
+        total=result["total"],
+        facets=result["facets"],
+        cached=result["cached"],
+        facet_time_ms=round((time.time() - start_time) * 1000, 2)
+    )
 
 
 @router.get("/statistics")
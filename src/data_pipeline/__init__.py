@@ -2,18 +2,24 @@
 
 from .pubmed_fetcher import PubMedFetcher
 from .clinical_trials_fetcher import ClinicalTrialsFetcher
+from .clinical_trials_bulk_loader import ClinicalTrialsBulkLoader
 from .storage import DataStorage
+from .snapshot import CorpusSnapshot
 from .text_cleaner import TextCleaner
 from .normalizer import DataNormalizer
 from .validator import DataValidator
 from .processor import DataProcessor
+from .dedup_index import DedupIndex
 
 __all__ = [
     "PubMedFetcher",
     "ClinicalTrialsFetcher",
+    "ClinicalTrialsBulkLoader",
     "DataStorage",
+    "CorpusSnapshot",
     "TextCleaner",
     "DataNormalizer",
     "DataValidator",
-    "DataProcessor"
+    "DataProcessor",
+    "DedupIndex"
 ]
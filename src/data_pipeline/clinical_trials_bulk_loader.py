@@ -0,0 +1,255 @@
+"""Bulk loader for the ClinicalTrials.gov full JSON export."""
+
+import json
+import os
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .clinical_trials_fetcher import ClinicalTrialsFetcher
+from .normalizer import DataNormalizer
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Per-process state for pool workers, populated by _init_worker
+_worker_state: Dict = {}
+
+
+def _init_worker(zip_path: str):
+    """Open the export archive once per worker process.
+    
+    Args:
+        zip_path: Path to the all-studies ZIP export
+    """
+    _worker_state["zip"] = zipfile.ZipFile(zip_path)
+    _worker_state["fetcher"] = ClinicalTrialsFetcher(rate_limit=0)
+    _worker_state["normalizer"] = DataNormalizer()
+
+
+def _last_update_date(study: Dict) -> str:
+    """Get the LastUpdatePostDate of a raw study record.
+    
+    Args:
+        study: Raw study JSON from the export
+    
+    Returns:
+        Date string (YYYY-MM-DD or YYYY-MM), empty if missing
+    """
+    status_module = study.get("protocolSection", {}).get("statusModule", {})
+    return status_module.get("lastUpdatePostDateStruct", {}).get("date", "")
+
+
+def _date_parts(date: str) -> Tuple[int, ...]:
+    """Split an ISO date of any precision (YYYY, YYYY-MM, YYYY-MM-DD) into integers.
+    
+    Args:
+        date: Date string
+    
+    Returns:
+        Tuple of year[, month[, day]], empty if the date cannot be parsed
+    """
+    try:
+        return tuple(int(part) for part in date.strip().split("-")[:3])
+    except ValueError:
+        return ()
+
+
+def _updated_before(last_update: str, since: str) -> bool:
+    """Whether a study was last updated before the delta cut-off.
+    
+    Dates are compared at the precision of the coarser one: a study updated
+    in "2024-03" may have changed on any day of March, so it is not before
+    "2024-03-01". Unparseable dates are never before the cut-off.
+    
+    Args:
+        last_update: LastUpdatePostDate of the study
+        since: Delta cut-off date
+    
+    Returns:
+        True if the study is unchanged since the cut-off
+    """
+    update_parts = _date_parts(last_update)
+    since_parts = _date_parts(since)
+    precision = min(len(update_parts), len(since_parts))
+    return precision > 0 and update_parts[:precision] < since_parts[:precision]
+
+
+def _load_chunk(names: List[str], since: Optional[str]) -> Tuple[List[Dict], Dict]:
+    """Parse and normalize a chunk of studies inside a worker process.
+    
+    Args:
+        names: Archive member names to load
+        since: Only keep studies updated on or after this date (delta mode)
+    
+    Returns:
+        Tuple of (normalized_trials, chunk_stats)
+    """
+    archive = _worker_state["zip"]
+    fetcher = _worker_state["fetcher"]
+    normalizer = _worker_state["normalizer"]
+    
+    trials = []
+    stats = {"read": 0, "unchanged": 0, "failed": 0, "latest_update": ""}
+    
+    for name in names:
+        stats["read"] += 1
+        try:
+            study = json.loads(archive.read(name))
+            
+            last_update = _last_update_date(study)
+            if last_update > stats["latest_update"]:
+                stats["latest_update"] = last_update
+            
+            if since and last_update and _updated_before(last_update, since):
+                stats["unchanged"] += 1
+                continue
+            
+            parsed = fetcher.parse_trial_data(study)
+            normalized = normalizer.normalize_clinical_trial(parsed) if parsed else {}
+            if normalized and normalized.get("id"):
+                trials.append(normalized)
+            else:
+                stats["failed"] += 1
+        
+        except Exception as e:
+            logger.error(f"Failed to load {name} from export: {e}")
+            stats["failed"] += 1
+    
+    return trials, stats
+
+
+class ClinicalTrialsBulkLoader:
+    """Streams normalized trials from a ClinicalTrials.gov all-studies ZIP export.
+    
+    The export (one JSON file per study) is read straight from disk; parsing
+    and normalization run in a process pool while the caller indexes the
+    batches that are already done.
+    """
+    
+    def __init__(
+        self,
+        zip_path: Path,
+        workers: Optional[int] = None,
+        chunk_size: int = 500
+    ):
+        """Initialize bulk loader.
+        
+        Args:
+            zip_path: Path to the downloaded all-studies ZIP export
+            workers: Number of worker processes (default: CPU count)
+            chunk_size: Studies parsed per worker task
+        """
+        self.zip_path = Path(zip_path)
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.stats = {}
+        
+        if not self.zip_path.exists():
+            raise FileNotFoundError(f"Export archive not found: {self.zip_path}")
+        
+        logger.info(
+            f"ClinicalTrials bulk loader initialized "
+            f"(archive={self.zip_path.name}, workers={self.workers}, chunk_size={chunk_size})"
+        )
+    
+    def _list_studies(self) -> List[str]:
+        """List study JSON members of the archive.
+        
+        Returns:
+            Sorted list of member names
+        """
+        with zipfile.ZipFile(self.zip_path) as archive:
+            return sorted(
+                name for name in archive.namelist()
+                if name.lower().endswith(".json")
+            )
+    
+    def iter_batches(self, since: Optional[str] = None) -> Iterator[List[Dict]]:
+        """Stream normalized trials in batches.
+        
+        Batches come back in archive order. At most two tasks per worker are
+        in flight so memory stays bounded when indexing is the slower side.
+        
+        Args:
+            since: Delta mode - only studies whose LastUpdatePostDate is on or
+                after this date (YYYY-MM-DD) are returned
+        
+        Yields:
+            Lists of normalized trial dictionaries
+        """
+        names = self._list_studies()
+        chunks = [
+            names[i:i + self.chunk_size]
+            for i in range(0, len(names), self.chunk_size)
+        ]
+        
+        self.stats = {
+            "total": len(names),
+            "read": 0,
+            "unchanged": 0,
+            "failed": 0,
+            "loaded": 0,
+            "latest_update": ""
+        }
+        logger.info(
+            f"Loading {len(names)} studies from export"
+            + (f" (delta since {since})" if since else "")
+        )
+        
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(str(self.zip_path),)
+        ) as pool:
+            pending = deque()
+            chunk_iter = iter(chunks)
+            
+            for chunk in chunk_iter:
+                pending.append(pool.submit(_load_chunk, chunk, since))
+                if len(pending) >= self.workers * 2:
+                    break
+            
+            while pending:
+                trials, chunk_stats = pending.popleft().result()
+                
+                next_chunk = next(chunk_iter, None)
+                if next_chunk is not None:
+                    pending.append(pool.submit(_load_chunk, next_chunk, since))
+                
+                self._merge_stats(chunk_stats, len(trials))
+                if trials:
+                    yield trials
+        
+        logger.info(
+            f"Export load complete: {self.stats['loaded']} trials loaded, "
+            f"{self.stats['unchanged']} unchanged, {self.stats['failed']} failed"
+        )
+    
+    def iter_trials(self, since: Optional[str] = None) -> Iterator[Dict]:
+        """Stream normalized trials one at a time.
+        
+        Args:
+            since: Delta mode cut-off date (see iter_batches)
+        
+        Yields:
+            Normalized trial dictionaries
+        """
+        for batch in self.iter_batches(since=since):
+            yield from batch
+    
+    def _merge_stats(self, chunk_stats: Dict, loaded: int):
+        """Accumulate per-chunk statistics.
+        
+        Args:
+            chunk_stats: Statistics returned by a worker
+            loaded: Number of trials loaded from the chunk
+        """
+        for key in ("read", "unchanged", "failed"):
+            self.stats[key] += chunk_stats[key]
+        self.stats["loaded"] += loaded
+        
+        if chunk_stats["latest_update"] > self.stats["latest_update"]:
+            self.stats["latest_update"] = chunk_stats["latest_update"]
@@ -1,8 +1,11 @@
 """ClinicalTrials.gov data fetcher."""
 
+import asyncio
 import time
-from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Dict, List, Optional
 
+import aiohttp
 import requests
 from tenacity import retry, stop_after_attempt, wait_exponential
 
@@ -16,6 +19,20 @@ class ClinicalTrialsFetcher:
     
     BASE_URL = "https://clinicaltrials.gov/api/v2"
     
+    # Modules read by parse_trial_data; requested via the `fields` parameter
+    # so the API does not ship results, derived and annotation sections.
+    PARSED_FIELDS = [
+        "protocolSection.identificationModule",
+        "protocolSection.statusModule",
+        "protocolSection.descriptionModule",
+        "protocolSection.conditionsModule",
+        "protocolSection.designModule",
+        "protocolSection.armsInterventionsModule",
+        "protocolSection.outcomesModule",
+        "protocolSection.sponsorCollaboratorsModule",
+        "protocolSection.contactsLocationsModule",
+    ]
+    
     def __init__(self, rate_limit: int = 5):
         """Initialize ClinicalTrials fetcher.
         
@@ -59,35 +76,72 @@ class ClinicalTrialsFetcher:
         
         return response
     
-    def search(
+    async def _rate_limit_wait_async(self):
+        """Enforce rate limiting between requests without blocking the event loop."""
+        if self.rate_limit > 0:
+            min_interval = 1.0 / self.rate_limit
+            elapsed = time.time() - self.last_request_time
+            if elapsed < min_interval:
+                await asyncio.sleep(min_interval - elapsed)
+        self.last_request_time = time.time()
+    
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=2, max=10)
+    )
+    async def _make_request_async(
+        self,
+        session: aiohttp.ClientSession,
+        endpoint: str,
+        params: Dict
+    ) -> Dict:
+        """Make async HTTP request with retry logic.
+        
+        Args:
+            session: Open aiohttp session
+            endpoint: API endpoint
+            params: Query parameters
+        
+        Returns:
+            Decoded JSON response
+        """
+        await self._rate_limit_wait_async()
+        url = f"{self.BASE_URL}/{endpoint}"
+        
+        logger.debug(f"Async request: {endpoint} with params: {params}")
+        async with session.get(url, params=params, timeout=aiohttp.ClientTimeout(total=30)) as response:
+            response.raise_for_status()
+            return await response.json()
+    
+    def _build_search_params(
         self,
         query: Optional[str] = None,
         condition: Optional[str] = None,
         intervention: Optional[str] = None,
         status: Optional[List[str]] = None,
         page_size: int = 100,
-        page_token: Optional[str] = None
+        page_token: Optional[str] = None,
+        fields: Optional[List[str]] = None
     ) -> Dict:
-        """Search for clinical trials.
+        """Build query parameters for the studies endpoint.
         
         Args:
             query: General search query
             condition: Specific condition/disease
             intervention: Specific intervention/treatment
-            status: List of recruitment statuses (e.g., ['RECRUITING', 'COMPLETED'])
+            status: List of recruitment statuses
             page_size: Number of results per page (max 1000)
             page_token: Token for pagination
+            fields: Study fields/modules to return (default: all)
             
         Returns:
-            Dictionary with studies and next page token
+            Parameter dictionary
         """
         params = {
             "format": "json",
             "pageSize": min(page_size, 1000)
         }
         
-        # Build query filter
-        filters = []
         if query:
             params["query.term"] = query
         if condition:
@@ -96,10 +150,48 @@ class ClinicalTrialsFetcher:
             params["query.intr"] = intervention
         if status:
             params["filter.overallStatus"] = ",".join(status)
+        if fields:
+            params["fields"] = ",".join(fields)
         
         if page_token:
             params["pageToken"] = page_token
         
+        return params
+    
+    def search(
+        self,
+        query: Optional[str] = None,
+        condition: Optional[str] = None,
+        intervention: Optional[str] = None,
+        status: Optional[List[str]] = None,
+        page_size: int = 100,
+        page_token: Optional[str] = None,
+        fields: Optional[List[str]] = None
+    ) -> Dict:
+        """Search for clinical trials.
+        
+        Args:
+            query: General search query
+            condition: Specific condition/disease
+            intervention: Specific intervention/treatment
+            status: List of recruitment statuses (e.g., ['RECRUITING', 'COMPLETED'])
+            page_size: Number of results per page (max 1000)
+            page_token: Token for pagination
+            fields: Study fields/modules to return (e.g., PARSED_FIELDS)
+        
+        Returns:
+            Dictionary with studies and next page token
+        """
+        params = self._build_search_params(
+            query=query,
+            condition=condition,
+            intervention=intervention,
+            status=status,
+            page_size=page_size,
+            page_token=page_token,
+            fields=fields
+        )
+        
         try:
             response = self._make_request("studies", params)
             data = response.json()
@@ -136,10 +228,13 @@ class ClinicalTrialsFetcher:
         
         for nct_id in nct_ids:
             try:
-                response = self._make_request(f"studies/{nct_id}", {})
+                response = self._make_request(
+                    f"studies/{nct_id}",
+                    {"fields": ",".join(self.PARSED_FIELDS)}
+                )
                 trial_data = response.json()
                 
-                parsed_trial = self._parse_trial_data(trial_data)
+                parsed_trial = self.parse_trial_data(trial_data)
                 if parsed_trial:
                     all_trials.append(parsed_trial)
                 
@@ -152,8 +247,8 @@ class ClinicalTrialsFetcher:
         logger.info(f"Fetched {len(all_trials)} trial details")
         return all_trials
     
-    def _parse_trial_data(self, trial_data: Dict) -> Optional[Dict]:
-        """Parse trial data into structured format.
+    def parse_trial_data(self, trial_data: Dict) -> Optional[Dict]:
+        """Parse a raw study record (API v2 or export JSON) into structured format.
         
         Args:
             trial_data: Raw trial data from API
@@ -211,6 +306,7 @@ class ClinicalTrialsFetcher:
             overall_status = status_module.get("overallStatus", "")
             start_date = status_module.get("startDateStruct", {}).get("date", "")
             completion_date = status_module.get("completionDateStruct", {}).get("date", "")
+            last_update_date = status_module.get("lastUpdatePostDateStruct", {}).get("date", "")
             
             # Extract sponsor
             sponsor_info = protocol.get("sponsorCollaboratorsModule", {})
@@ -238,6 +334,7 @@ class ClinicalTrialsFetcher:
                 "status": overall_status,
                 "start_date": start_date,
                 "completion_date": completion_date,
+                "last_update_date": last_update_date,
                 "sponsor": lead_sponsor,
                 "locations": locations,
                 "source": "clinicaltrials"
@@ -268,33 +365,123 @@ class ClinicalTrialsFetcher:
         logger.info(f"Searching ClinicalTrials.gov (max_results={max_results})")
         
         all_trials = []
-        page_token = None
         
-        while len(all_trials) < max_results:
-            page_size = min(100, max_results - len(all_trials))
-            
-            result = self.search(
+        def fetch_page(page_token: Optional[str], remaining: int) -> Dict:
+            return self.search(
                 query=query,
                 condition=condition,
                 intervention=intervention,
-                page_size=page_size,
-                page_token=page_token
+                page_size=min(1000, remaining),
+                page_token=page_token,
+                fields=self.PARSED_FIELDS
             )
+        
+        # One background thread keeps the next page request in flight while
+        # the current page is parsed
+        with ThreadPoolExecutor(max_workers=1) as prefetcher:
+            pending = prefetcher.submit(fetch_page, None, max_results)
             
-            studies = result["studies"]
-            if not studies:
-                break
-            
-            # Parse trials directly from search results
-            for study in studies:
-                parsed = self._parse_trial_data(study)
-                if parsed:
-                    all_trials.append(parsed)
-            
-            # Check if there are more pages
-            page_token = result.get("next_page_token")
-            if not page_token or len(all_trials) >= max_results:
-                break
+            while pending is not None:
+                result = pending.result()
+                pending = None
+                
+                studies = result["studies"]
+                if not studies:
+                    break
+                
+                page_token = result.get("next_page_token")
+                remaining = max_results - len(all_trials) - len(studies)
+                if page_token and remaining > 0:
+                    pending = prefetcher.submit(fetch_page, page_token, remaining)
+                
+                # Parse trials directly from search results
+                for study in studies:
+                    parsed = self.parse_trial_data(study)
+                    if parsed:
+                        all_trials.append(parsed)
         
         logger.info(f"Successfully fetched {len(all_trials)} clinical trials")
         return all_trials[:max_results]
+    
+    async def iter_studies(
+        self,
+        query: Optional[str] = None,
+        condition: Optional[str] = None,
+        intervention: Optional[str] = None,
+        status: Optional[List[str]] = None,
+        max_results: Optional[int] = None,
+        page_size: int = 1000,
+        parse: bool = True
+    ) -> AsyncIterator[Dict]:
+        """Asynchronously iterate over matching studies.
+        
+        Only PARSED_FIELDS are requested, and the request for the next page
+        is issued as soon as its token is known, so it overlaps with the
+        consumer processing the current page.
+        
+        Args:
+            query: General search query
+            condition: Specific condition
+            intervention: Specific intervention
+            status: List of recruitment statuses
+            max_results: Maximum number of studies (default: all)
+            page_size: Number of results per page (max 1000)
+            parse: Yield parsed trial dictionaries instead of raw studies
+        
+        Yields:
+            Trial dictionaries (or raw study records if parse is False)
+        """
+        yielded = 0
+        
+        def page_params(page_token: Optional[str], already: int) -> Dict:
+            size = page_size
+            if max_results is not None:
+                size = min(page_size, max_results - already)
+            return self._build_search_params(
+                query=query,
+                condition=condition,
+                intervention=intervention,
+                status=status,
+                page_size=size,
+                page_token=page_token,
+                fields=self.PARSED_FIELDS
+            )
+        
+        async with aiohttp.ClientSession() as session:
+            pending = asyncio.ensure_future(
+                self._make_request_async(session, "studies", page_params(None, 0))
+            )
+            
+            try:
+                while pending is not None:
+                    data = await pending
+                    pending = None
+                    
+                    studies = data.get("studies", [])
+                    page_token = data.get("nextPageToken")
+                    
+                    # Prefetch the next page before handing this one to the consumer
+                    after_page = yielded + len(studies)
+                    if studies and page_token and (max_results is None or after_page < max_results):
+                        pending = asyncio.ensure_future(
+                            self._make_request_async(
+                                session, "studies", page_params(page_token, after_page)
+                            )
+                        )
+                    
+                    for study in studies:
+                        if max_results is not None and yielded >= max_results:
+                            break
+                        
+                        if parse:
+                            study = self.parse_trial_data(study)
+                            if not study:
+                                continue
+                        
+                        yielded += 1
+                        yield study
+            finally:
+                if pending is not None and not pending.done():
+                    pending.cancel()
+        
+        logger.info(f"Streamed {yielded} clinical trials")
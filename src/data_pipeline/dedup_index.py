@@ -0,0 +1,246 @@
+"""Persistent cross-run deduplication index for ingestion."""
+
+import hashlib
+import json
+import math
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from src.utils.config import PROJECT_ROOT
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Keys per SELECT ... IN (...) - stays below SQLite's host parameter limit
+LOOKUP_CHUNK = 500
+
+# Raw record fields that define "changed" per source
+FINGERPRINT_FIELDS = {
+    "pubmed": ("title", "abstract", "authors", "journal", "publication_year", "mesh_terms", "doi"),
+    "clinicaltrials": ("title", "summary", "status", "phases", "conditions", "interventions",
+                       "enrollment", "completion_date", "last_update_date"),
+}
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over string keys (double hashing on blake2b)."""
+    
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        """Initialize filter.
+        
+        Args:
+            capacity: Expected number of keys
+            error_rate: Target false positive rate at capacity
+        """
+        capacity = max(capacity, 1000)
+        self.num_bits = int(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.capacity = capacity
+        self.count = 0
+        self._bits = bytearray((self.num_bits + 7) // 8)
+    
+    def _positions(self, key: str) -> Iterable[int]:
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.num_bits for i in range(self.num_hashes))
+    
+    def add(self, key: str):
+        """Add a key."""
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+    
+    def __contains__(self, key: str) -> bool:
+        return all(self._bits[p >> 3] & (1 << (p & 7)) for p in self._positions(key))
+
+
+class DedupIndex:
+    """Seen-set of ingested records keyed by (source, source_id).
+    
+    Each entry keeps a fingerprint of the record content (the
+    LastUpdatePostDate for trials when available, otherwise a hash of the
+    relevant fields). An in-memory Bloom filter answers most "never seen"
+    lookups without touching SQLite.
+    """
+    
+    def __init__(self, path: Optional[Path] = None, expected_records: int = 2_000_000):
+        """Initialize deduplication index.
+        
+        Args:
+            path: SQLite file (default: data/state/dedup.sqlite)
+            expected_records: Bloom filter capacity; the filter is rebuilt
+                larger when the stored records outgrow it
+        """
+        self.path = Path(path or PROJECT_ROOT / "data" / "state" / "dedup.sqlite")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=60, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS seen ("
+            " source TEXT NOT NULL,"
+            " source_id TEXT NOT NULL,"
+            " fingerprint TEXT,"
+            " first_seen REAL NOT NULL,"
+            " last_seen REAL NOT NULL,"
+            " PRIMARY KEY (source, source_id)"
+            ") WITHOUT ROWID"
+        )
+        self._conn.commit()
+        
+        self._session = {}
+        self._load_bloom(expected_records)
+    
+    def _load_bloom(self, expected_records: int):
+        """Build the Bloom filter from the stored keys."""
+        stored = self._conn.execute("SELECT COUNT(*) FROM seen").fetchone()[0]
+        self._bloom = BloomFilter(max(expected_records, stored * 2))
+        for source, source_id in self._conn.execute("SELECT source, source_id FROM seen"):
+            self._bloom.add(f"{source}:{source_id}")
+        logger.info(f"Dedup index opened: {self.path} ({stored} records)")
+    
+    @staticmethod
+    def fingerprint(source: str, record: Dict) -> str:
+        """Fingerprint of a raw record's content.
+        
+        Args:
+            source: 'pubmed' or 'clinicaltrials'
+            record: Raw record as returned by the fetcher
+        
+        Returns:
+            Version string or content hash
+        """
+        if source == "clinicaltrials" and record.get("last_update_date"):
+            return f"updated:{record['last_update_date']}"
+        
+        fields = FINGERPRINT_FIELDS.get(source) or sorted(record)
+        content = json.dumps(
+            {field: record.get(field) for field in fields},
+            sort_keys=True,
+            ensure_ascii=False,
+            default=str
+        )
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+    
+    def _lookup(self, source: str, source_ids: Sequence[str]) -> Dict[str, Optional[str]]:
+        """Fetch stored fingerprints of the IDs the Bloom filter may know.
+        
+        Returns:
+            Mapping of source_id to fingerprint, for IDs that are stored
+        """
+        candidates = [sid for sid in source_ids if f"{source}:{sid}" in self._bloom]
+        found = {}
+        
+        with self._lock:
+            for i in range(0, len(candidates), LOOKUP_CHUNK):
+                chunk = candidates[i:i + LOOKUP_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    "SELECT source_id, fingerprint FROM seen "
+                    f"WHERE source = ? AND source_id IN ({placeholders})",
+                    [source, *chunk]
+                )
+                found.update(rows)
+        
+        return found
+    
+    def _count(self, source: str, checked: int, skipped: int):
+        stats = self._session.setdefault(source, {"checked": 0, "skipped": 0})
+        stats["checked"] += checked
+        stats["skipped"] += skipped
+    
+    def filter_unseen(self, source: str, source_ids: Iterable[str]) -> List[str]:
+        """Keep only IDs that were never ingested.
+        
+        Args:
+            source: 'pubmed' or 'clinicaltrials'
+            source_ids: Candidate IDs (order is kept)
+        
+        Returns:
+            Unseen IDs
+        """
+        source_ids = [str(sid) for sid in source_ids]
+        known = self._lookup(source, source_ids)
+        unseen = [sid for sid in source_ids if sid not in known]
+        
+        self._count(source, len(source_ids), len(source_ids) - len(unseen))
+        return unseen
+    
+    def filter_changed(self, source: str, fingerprints: Dict[str, str]) -> List[str]:
+        """Keep IDs that are new or whose fingerprint differs from the stored one.
+        
+        Args:
+            source: 'pubmed' or 'clinicaltrials'
+            fingerprints: Mapping of source_id to current fingerprint
+        
+        Returns:
+            IDs that need processing
+        """
+        known = self._lookup(source, list(fingerprints))
+        changed = [
+            sid for sid, fingerprint in fingerprints.items()
+            if sid not in known or known[sid] != fingerprint
+        ]
+        
+        self._count(source, len(fingerprints), len(fingerprints) - len(changed))
+        return changed
+    
+    def mark_seen_many(self, source: str, fingerprints: Dict[str, Optional[str]]):
+        """Record IDs as ingested.
+        
+        Args:
+            source: 'pubmed' or 'clinicaltrials'
+            fingerprints: Mapping of source_id to fingerprint (None if unknown)
+        """
+        if not fingerprints:
+            return
+        
+        now = time.time()
+        rows = [(source, str(sid), fingerprint, now, now) for sid, fingerprint in fingerprints.items()]
+        
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO seen (source, source_id, fingerprint, first_seen, last_seen) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (source, source_id) DO UPDATE SET "
+                " fingerprint = COALESCE(excluded.fingerprint, seen.fingerprint),"
+                " last_seen = excluded.last_seen",
+                rows
+            )
+            self._conn.commit()
+        
+        for sid in fingerprints:
+            self._bloom.add(f"{source}:{sid}")
+        
+        if self._bloom.count > self._bloom.capacity:
+            self._load_bloom(self._bloom.count * 2)
+    
+    def stats(self) -> Dict:
+        """Get index and skip-rate statistics.
+        
+        Returns:
+            Dictionary with stored records per source and this session's
+            checked/skipped counts and skip rates
+        """
+        with self._lock:
+            stored = dict(self._conn.execute("SELECT source, COUNT(*) FROM seen GROUP BY source"))
+        
+        session = {
+            source: {
+                **counts,
+                "skip_rate": counts["skipped"] / counts["checked"] if counts["checked"] else 0.0
+            }
+            for source, counts in self._session.items()
+        }
+        return {"stored": stored, "session": session}
+    
+    def close(self):
+        """Close the database."""
+        with self._lock:
+            self._conn.close()
@@ -1,5 +1,6 @@
 """Data normalization for PubMed articles and clinical trials."""
 
+import re
 from typing import Dict, List, Optional
 
 from .text_cleaner import TextCleaner
@@ -7,6 +8,9 @@ from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Plausible publication / start years
+YEAR_PATTERN = re.compile(r'(?<!\d)(1[89]\d{2}|2[01]\d{2})(?!\d)')
+
 
 class DataNormalizer:
     """Normalizes and standardizes biomedical data."""
@@ -29,9 +33,6 @@ class DataNormalizer:
             title = self.text_cleaner.clean(article.get("title", ""))
             abstract = self.text_cleaner.clean(article.get("abstract", ""))
             
-            # Combine title and abstract for full text
-            full_text = f"{title}. {abstract}".strip()
-            
             # Clean journal name
             journal = self.text_cleaner.clean(
                 article.get("journal", ""),
@@ -39,16 +40,10 @@ class DataNormalizer:
             )
             
             # Clean author names
-            authors = [
-                self.text_cleaner.clean(author, remove_special=False)
-                for author in article.get("authors", [])
-            ]
+            authors = self.text_cleaner.clean_many(article.get("authors", []), remove_special=False)
             
             # Clean MeSH terms
-            mesh_terms = [
-                self.text_cleaner.clean(term, remove_special=False)
-                for term in article.get("mesh_terms", [])
-            ]
+            mesh_terms = self.text_cleaner.clean_many(article.get("mesh_terms", []), remove_special=False)
             
             # Build normalized article
             normalized = {
@@ -57,10 +52,13 @@ class DataNormalizer:
                 "type": "article",
                 "title": title,
                 "abstract": abstract,
-                "full_text": full_text,
                 "authors": authors,
                 "journal": journal,
                 "publication_year": article.get("publication_year", ""),
+                "pub_year": self.parse_year(
+                    article.get("publication_year"),
+                    article.get("publication_date")
+                ),
                 "publication_month": article.get("publication_month", ""),
                 "publication_date": self._build_publication_date(
                     article.get("publication_year", ""),
@@ -78,6 +76,12 @@ class DataNormalizer:
                 }
             }
             
+            # Body text is indexed only when the source provides more than
+            # the abstract; title + abstract are combined by the mapping
+            body = self.text_cleaner.clean(article.get("full_text", ""))
+            if body and body != abstract:
+                normalized["full_text"] = body
+            
             return normalized
             
         except Exception as e:
@@ -98,14 +102,8 @@ class DataNormalizer:
             title = self.text_cleaner.clean(trial.get("title", ""))
             summary = self.text_cleaner.clean(trial.get("summary", ""))
             
-            # Combine title and summary for full text
-            full_text = f"{title}. {summary}".strip()
-            
             # Clean conditions
-            conditions = [
-                self.text_cleaner.clean(cond, remove_special=False)
-                for cond in trial.get("conditions", [])
-            ]
+            conditions = self.text_cleaner.clean_many(trial.get("conditions", []), remove_special=False)
             
             # Clean interventions
             interventions = []
@@ -135,31 +133,23 @@ class DataNormalizer:
             intervention_names = [i["name"] for i in interventions if i["name"]]
             
             # Clean outcomes
-            primary_outcomes = [
-                self.text_cleaner.clean(str(outcome), remove_special=False)
-                for outcome in trial.get("primary_outcomes", [])
-            ]
+            primary_outcomes = self.text_cleaner.clean_many(
+                (str(outcome) for outcome in trial.get("primary_outcomes", [])),
+                remove_special=False
+            )
             
-            secondary_outcomes = [
-                self.text_cleaner.clean(str(outcome), remove_special=False)
-                for outcome in trial.get("secondary_outcomes", [])
-            ]
+            secondary_outcomes = self.text_cleaner.clean_many(
+                (str(outcome) for outcome in trial.get("secondary_outcomes", [])),
+                remove_special=False
+            )
             
             # Clean locations
-            locations = [
-                self.text_cleaner.clean(loc, remove_special=False)
-                for loc in trial.get("locations", [])
-            ]
+            locations = self.text_cleaner.clean_many(trial.get("locations", []), remove_special=False)
             
             # Extract year from start_date
             publication_date = trial.get("start_date") or None
-            publication_year = ""
-            if publication_date:
-                # Try to extract YYYY from various formats
-                import re
-                year_match = re.search(r'\d{4}', str(publication_date))
-                if year_match:
-                    publication_year = year_match.group(0)
+            pub_year = self.parse_year(publication_date)
+            publication_year = str(pub_year) if pub_year else ""
             
             normalized = {
                 "id": trial.get("nct_id", ""),
@@ -167,7 +157,6 @@ class DataNormalizer:
                 "type": "clinical_trial",
                 "title": title,
                 "abstract": summary,
-                "full_text": full_text,
                 "conditions": conditions,
                 "interventions": interventions,
                 "primary_outcomes": primary_outcomes,
@@ -177,8 +166,10 @@ class DataNormalizer:
                 "enrollment": trial.get("enrollment", 0),
                 "start_date": trial.get("start_date") or None,
                 "completion_date": trial.get("completion_date") or None,
+                "last_update_date": trial.get("last_update_date") or None,
                 "publication_date": publication_date,
                 "publication_year": publication_year,
+                "pub_year": pub_year,
                 "sponsor": self.text_cleaner.clean(
                     trial.get("sponsor", ""),
                     remove_special=False
@@ -239,6 +230,28 @@ class DataNormalizer:
         logger.info(f"Normalized {len(normalized)}/{len(trials)} clinical trials")
         return normalized
     
+    @staticmethod
+    def parse_year(*values) -> Optional[int]:
+        """Extract a year as an integer from the first value that has one.
+        
+        Handles "2021", "2021-03", "March 2021" and similar formats.
+        
+        Args:
+            *values: Candidate year or date values (None is skipped)
+        
+        Returns:
+            Year, or None if no value contains a plausible year
+        """
+        for value in values:
+            if value is None:
+                continue
+            if isinstance(value, int):
+                return value
+            match = YEAR_PATTERN.search(str(value))
+            if match:
+                return int(match.group(1))
+        return None
+    
     def _build_publication_date(self, year: str, month: str) -> str:
         """Build a publication date string.
         
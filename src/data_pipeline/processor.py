@@ -1,23 +1,253 @@
 """Complete data processing pipeline."""
 
-from typing import Dict, List, Tuple
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
 
+from .dedup_index import DedupIndex
 from .normalizer import DataNormalizer
 from .validator import DataValidator
 from .storage import DataStorage
+from src.utils.config import settings
 from src.utils.logger import get_logger
+from src.utils.records import RECORD_TYPES
 
 logger = get_logger(__name__)
 
+# Normalizer of a pool worker, created on its first chunk
+_worker_normalizer: Optional[DataNormalizer] = None
+
+
+def _process_chunk(
+    kind: str,
+    records: List[Dict],
+    validate: bool,
+    as_records: bool = False,
+    normalizer: Optional[DataNormalizer] = None
+) -> Tuple[List[Dict], List[Dict]]:
+    """Normalize and validate a chunk of raw records.
+    
+    Runs inside pool workers (and in-process for serial processing). Each
+    record is handled on its own, so a failing record ends up in the
+    invalid list instead of failing the chunk.
+    
+    Args:
+        kind: 'articles' or 'trials'
+        records: Raw records
+        validate: Whether to validate normalized documents
+        as_records: Return valid documents as typed records (smaller in
+            memory and to pickle back from workers)
+        normalizer: Normalizer to use (default: the worker's own)
+    
+    Returns:
+        Tuple of (valid documents, invalid documents with errors), in input order
+    """
+    global _worker_normalizer
+    if normalizer is None:
+        if _worker_normalizer is None:
+            _worker_normalizer = DataNormalizer()
+        normalizer = _worker_normalizer
+    
+    if kind == "articles":
+        normalize = normalizer.normalize_pubmed_article
+        validate_document = DataValidator.validate_pubmed_article
+    else:
+        normalize = normalizer.normalize_clinical_trial
+        validate_document = DataValidator.validate_clinical_trial
+    record_type = RECORD_TYPES[kind] if as_records else None
+    
+    valid = []
+    invalid = []
+    for record in records:
+        try:
+            document = normalize(record)
+            if not document:
+                invalid.append({"document": record, "errors": ["Normalization failed"]})
+                continue
+            
+            if validate:
+                is_valid, errors = validate_document(document)
+                if not is_valid:
+                    invalid.append({"document": document, "errors": errors})
+                    continue
+            
+            valid.append(record_type.from_dict(document) if record_type else document)
+        except Exception as e:
+            invalid.append({"document": record, "errors": [f"Processing failed: {e}"]})
+    
+    return valid, invalid
+
 
 class DataProcessor:
     """End-to-end data processing pipeline."""
     
-    def __init__(self):
-        """Initialize data processor."""
+    def __init__(
+        self,
+        dedup: Optional[DedupIndex] = None,
+        workers: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+        typed_records: bool = True
+    ):
+        """Initialize data processor.
+        
+        Args:
+            dedup: Optional dedup index; trials ingested by earlier runs
+                with unchanged content are skipped (PubMed articles are
+                checked by PubMedFetcher before their details are fetched).
+                Valid records are only recorded once the caller reports them
+                indexed (mark_indexed)
+            workers: Processes for normalization and validation (default:
+                PROCESSING_WORKERS; 0 = one per core, 1 = serial, for debugging)
+            chunk_size: Records per worker task (default: PROCESSING_CHUNK_SIZE)
+            typed_records: Return ArticleRecord/TrialRecord instances (which
+                also support dict access) instead of plain dicts
+        """
         self.normalizer = DataNormalizer()
         self.validator = DataValidator()
         self.storage = DataStorage()
+        self.dedup = dedup
+        
+        workers = settings.processing_workers if workers is None else workers
+        self.workers = workers if workers > 0 else (os.cpu_count() or 1)
+        self.chunk_size = chunk_size or settings.processing_chunk_size
+        self.typed_records = typed_records
+        self._pool: Optional[ProcessPoolExecutor] = None
+        # source -> {document ID: fingerprint} of valid records not yet indexed
+        self._pending: Dict[str, Dict[str, Optional[str]]] = {}
+    
+    def _get_pool(self) -> ProcessPoolExecutor:
+        """Get the worker pool (created on first use)."""
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            logger.info(f"Started processing pool with {self.workers} workers")
+        return self._pool
+    
+    def close(self):
+        """Shut down the worker pool."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+    
+    @staticmethod
+    def _log_invalid(invalid: List[Dict], id_key: str):
+        """Log the first invalid documents of a batch."""
+        if not invalid:
+            return
+        
+        logger.warning(f"Found {len(invalid)} invalid documents")
+        for item in invalid[:5]:  # Log first 5
+            document = item["document"]
+            logger.warning(
+                f"  ID: {document.get('id') or document.get(id_key, 'unknown')}, "
+                f"Errors: {', '.join(item['errors'])}"
+            )
+    
+    def _normalize_and_validate(
+        self,
+        kind: str,
+        records: List[Dict],
+        validate: bool
+    ) -> Tuple[List[Dict], List[Dict]]:
+        """Normalize and validate records, in chunks across the worker pool.
+        
+        Results keep the input order. A chunk whose worker fails (e.g. a
+        crashed process) is processed again in this process; batches that
+        fit in one chunk are never sent to the pool.
+        
+        Args:
+            kind: 'articles' or 'trials'
+            records: Raw records
+            validate: Whether to validate normalized documents
+        
+        Returns:
+            Tuple of (valid documents, invalid documents with errors)
+        """
+        if self.workers <= 1 or len(records) <= self.chunk_size:
+            return _process_chunk(kind, records, validate, self.typed_records, self.normalizer)
+        
+        chunks = [records[i:i + self.chunk_size] for i in range(0, len(records), self.chunk_size)]
+        pool = self._get_pool()
+        futures = [
+            pool.submit(_process_chunk, kind, chunk, validate, self.typed_records)
+            for chunk in chunks
+        ]
+        
+        valid = []
+        invalid = []
+        pool_failed = False
+        for number, (chunk, future) in enumerate(zip(chunks, futures)):
+            try:
+                chunk_valid, chunk_invalid = future.result()
+            except Exception as e:
+                logger.warning(f"Chunk {number} failed in worker ({e}), processing it serially")
+                pool_failed = True
+                chunk_valid, chunk_invalid = _process_chunk(
+                    kind, chunk, validate, self.typed_records, self.normalizer
+                )
+            valid.extend(chunk_valid)
+            invalid.extend(chunk_invalid)
+        
+        if pool_failed:
+            # A broken pool rejects all further work - start a new one next time
+            self.close()
+        
+        return valid, invalid
+    
+    @staticmethod
+    def _fingerprints(source: str, records: List[Dict], id_key: str) -> Dict[str, str]:
+        """Content fingerprints of records by source ID."""
+        return {
+            str(record[id_key]): DedupIndex.fingerprint(source, record)
+            for record in records if record.get(id_key)
+        }
+    
+    def _skip_seen(self, source: str, records: List[Dict], id_key: str) -> Tuple[List[Dict], Dict[str, str]]:
+        """Drop records whose content was already processed.
+        
+        Args:
+            source: Dedup source ('pubmed' or 'clinicaltrials')
+            records: Raw records
+            id_key: Field holding the source ID
+        
+        Returns:
+            Tuple of (records to process, fingerprints by ID)
+        """
+        fingerprints = self._fingerprints(source, records, id_key)
+        changed = set(self.dedup.filter_changed(source, fingerprints))
+        
+        remaining = [
+            record for record in records
+            if not record.get(id_key) or str(record[id_key]) in changed
+        ]
+        if len(remaining) < len(records):
+            logger.info(f"Skipping {len(records) - len(remaining)} unchanged {source} records")
+        return remaining, fingerprints
+    
+    def _remember_fingerprints(self, source: str, valid: List[Dict], fingerprints: Dict[str, str]):
+        """Keep the fingerprints of valid documents until they are indexed."""
+        pending = self._pending.setdefault(source, {})
+        for doc in valid:
+            if doc.get("id"):
+                pending[str(doc["id"])] = fingerprints.get(str(doc["id"]))
+    
+    def mark_indexed(self, source: str, doc_ids: Iterable[str]):
+        """Record documents in the dedup index once they are in the search index.
+        
+        Records that fail to embed or index (or are lost to a crash) are
+        not recorded, so the next run processes them again.
+        
+        Args:
+            source: Dedup source ('pubmed' or 'clinicaltrials')
+            doc_ids: IDs of documents that were indexed (or were already
+                indexed with identical content)
+        """
+        if self.dedup is None:
+            return
+        pending = self._pending.get(source, {})
+        self.dedup.mark_seen_many(source, {
+            str(doc_id): pending.pop(str(doc_id), None)
+            for doc_id in doc_ids
+        })
     
     def process_pubmed_articles(
         self,
@@ -39,39 +269,21 @@ class DataProcessor:
         """
         logger.info(f"Processing {len(articles)} PubMed articles...")
         
-        # Step 1: Normalize
-        normalized = self.normalizer.normalize_batch_pubmed(articles)
+        # PMIDs were already checked against the dedup index by PubMedFetcher,
+        # so only keep their fingerprints (checking again would count them twice)
+        if self.dedup is not None:
+            fingerprints = self._fingerprints("pubmed", articles, "pmid")
         
-        # Step 2: Validate
-        if validate:
-            valid, invalid = self.validator.validate_batch(
-                normalized,
-                doc_type="article"
-            )
-        else:
-            valid = normalized
-            invalid = []
+        # Step 1+2: Normalize and validate (across the worker pool)
+        valid, invalid = self._normalize_and_validate("articles", articles, validate)
+        self._log_invalid(invalid, "pmid")
         
         # Step 3: Save processed data
         if save and valid:
-            filepath = self.storage.processed_dir / "pubmed"
-            filepath.mkdir(parents=True, exist_ok=True)
-            
-            import json
-            from datetime import datetime
-            
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"processed_pubmed_{timestamp}.json"
-            
-            with open(filepath / filename, "w", encoding="utf-8") as f:
-                json.dump({
-                    "query": query,
-                    "timestamp": datetime.now().isoformat(),
-                    "count": len(valid),
-                    "articles": valid
-                }, f, indent=2, ensure_ascii=False)
-            
-            logger.info(f"Saved {len(valid)} processed articles to: {filepath / filename}")
+            self.storage.save_processed("articles", valid, query=query)
+        
+        if self.dedup is not None:
+            self._remember_fingerprints("pubmed", valid, fingerprints)
         
         logger.info(
             f"Processing complete: {len(valid)} valid, {len(invalid)} invalid"
@@ -99,39 +311,19 @@ class DataProcessor:
         """
         logger.info(f"Processing {len(trials)} clinical trials...")
         
-        # Step 1: Normalize
-        normalized = self.normalizer.normalize_batch_trials(trials)
+        if self.dedup is not None:
+            trials, fingerprints = self._skip_seen("clinicaltrials", trials, "nct_id")
         
-        # Step 2: Validate
-        if validate:
-            valid, invalid = self.validator.validate_batch(
-                normalized,
-                doc_type="trial"
-            )
-        else:
-            valid = normalized
-            invalid = []
+        # Step 1+2: Normalize and validate (across the worker pool)
+        valid, invalid = self._normalize_and_validate("trials", trials, validate)
+        self._log_invalid(invalid, "nct_id")
         
         # Step 3: Save processed data
         if save and valid:
-            filepath = self.storage.processed_dir / "clinical_trials"
-            filepath.mkdir(parents=True, exist_ok=True)
-            
-            import json
-            from datetime import datetime
-            
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"processed_trials_{timestamp}.json"
-            
-            with open(filepath / filename, "w", encoding="utf-8") as f:
-                json.dump({
-                    "query": query,
-                    "timestamp": datetime.now().isoformat(),
-                    "count": len(valid),
-                    "trials": valid
-                }, f, indent=2, ensure_ascii=False)
-            
-            logger.info(f"Saved {len(valid)} processed trials to: {filepath / filename}")
+            self.storage.save_processed("trials", valid, query=query)
+        
+        if self.dedup is not None:
+            self._remember_fingerprints("clinicaltrials", valid, fingerprints)
         
         logger.info(
             f"Processing complete: {len(valid)} valid, {len(invalid)} invalid"
@@ -9,6 +9,7 @@ from tenacity import retry, stop_after_attempt, wait_exponential
 
 from src.utils.config import settings, yaml_config
 from src.utils.logger import get_logger
+from .dedup_index import DedupIndex
 
 logger = get_logger(__name__)
 
@@ -22,7 +23,8 @@ class PubMedFetcher:
         self,
         api_key: Optional[str] = None,
         email: Optional[str] = None,
-        rate_limit: int = 10
+        rate_limit: int = 10,
+        dedup: Optional[DedupIndex] = None
     ):
         """Initialize PubMed fetcher.
         
@@ -30,6 +32,8 @@ class PubMedFetcher:
             api_key: NCBI API key (optional, increases rate limit)
             email: Email address (required by NCBI)
             rate_limit: Requests per second (10 with key, 3 without)
+            dedup: Optional dedup index; PMIDs ingested by earlier runs are
+                not fetched again by search_and_fetch
         """
         self.api_key = api_key or settings.pubmed_api_key
         # Check for placeholder default value and ignore it
@@ -47,6 +51,7 @@ class PubMedFetcher:
 
         self.rate_limit = rate_limit
         self.last_request_time = 0
+        self.dedup = dedup
         
         if not self.email:
             logger.warning("No email provided for PubMed API. This is required by NCBI.")
@@ -326,6 +331,13 @@ class PubMedFetcher:
             logger.warning(f"No results found for query: '{query}'")
             return []
         
+        if self.dedup is not None:
+            found = len(pmids)
+            pmids = self.dedup.filter_unseen("pubmed", pmids)
+            logger.info(f"Skipping {found - len(pmids)} of {found} PMIDs ingested by earlier runs")
+            if not pmids:
+                return []
+        
         # Fetch detailed article data
         articles = self.fetch_details(pmids)
         
@@ -0,0 +1,301 @@
+"""Columnar corpus snapshots (Parquet + Arrow) for processed documents."""
+
+import json
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as pa_dataset
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pa_dataset = None
+    pq = None
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+EMBEDDING_DIMS = 768
+
+# Free-form dictionaries are stored as JSON strings
+JSON_COLUMNS = ("metadata",)
+
+
+def _string_list():
+    return pa.list_(pa.string())
+
+
+def article_schema(dims: int = EMBEDDING_DIMS) -> "pa.Schema":
+    """Arrow schema of a normalized PubMed article."""
+    return pa.schema([
+        ("id", pa.string()),
+        ("source", pa.string()),
+        ("type", pa.string()),
+        ("title", pa.string()),
+        ("abstract", pa.string()),
+        ("full_text", pa.string()),
+        ("authors", _string_list()),
+        ("journal", pa.string()),
+        ("publication_year", pa.string()),
+        ("pub_year", pa.int32()),
+        ("publication_month", pa.string()),
+        ("publication_date", pa.string()),
+        ("mesh_terms", _string_list()),
+        ("keywords", _string_list()),
+        ("doi", pa.string()),
+        ("metadata", pa.string()),
+        ("embedding", pa.list_(pa.float32(), dims)),
+    ])
+
+
+def trial_schema(dims: int = EMBEDDING_DIMS) -> "pa.Schema":
+    """Arrow schema of a normalized clinical trial."""
+    intervention = pa.struct([
+        ("type", pa.string()),
+        ("name", pa.string()),
+        ("description", pa.string()),
+    ])
+    return pa.schema([
+        ("id", pa.string()),
+        ("source", pa.string()),
+        ("type", pa.string()),
+        ("title", pa.string()),
+        ("abstract", pa.string()),
+        ("full_text", pa.string()),
+        ("conditions", _string_list()),
+        ("interventions", pa.list_(intervention)),
+        ("primary_outcomes", _string_list()),
+        ("secondary_outcomes", _string_list()),
+        ("phases", _string_list()),
+        ("status", pa.string()),
+        ("enrollment", pa.int64()),
+        ("start_date", pa.string()),
+        ("completion_date", pa.string()),
+        ("last_update_date", pa.string()),
+        ("publication_date", pa.string()),
+        ("publication_year", pa.string()),
+        ("pub_year", pa.int32()),
+        ("sponsor", pa.string()),
+        ("locations", _string_list()),
+        ("keywords", _string_list()),
+        ("metadata", pa.string()),
+        ("embedding", pa.list_(pa.float32(), dims)),
+    ])
+
+
+SCHEMAS = {
+    "articles": article_schema,
+    "trials": trial_schema,
+}
+
+
+class CorpusSnapshot:
+    """Append-only, partitioned Parquet snapshot of processed documents.
+    
+    Every write adds one zstd-compressed file under an ``ingest_date=``
+    partition, so concurrent writers never touch the same file. Readers
+    stream record batches with column projection; the embedding column is a
+    fixed-size list that maps to a NumPy matrix without copying.
+    """
+    
+    def __init__(self, root: Path, kind: str, dims: int = EMBEDDING_DIMS):
+        """Initialize snapshot.
+        
+        Args:
+            root: Snapshot directory
+            kind: 'articles' or 'trials'
+            dims: Embedding dimensions
+        """
+        if pa is None:
+            raise ImportError("pyarrow is required for corpus snapshots (pip install pyarrow)")
+        if kind not in SCHEMAS:
+            raise ValueError(f"Unknown snapshot kind: {kind}. Use one of {sorted(SCHEMAS)}")
+        
+        self.root = Path(root)
+        self.kind = kind
+        self.dims = dims
+        self.schema = SCHEMAS[kind](dims)
+    
+    def exists(self) -> bool:
+        """Check whether the snapshot holds any data files."""
+        return self.root.exists() and any(self.root.rglob("*.parquet"))
+    
+    def write(
+        self,
+        documents: List[Dict],
+        embeddings: Optional[np.ndarray] = None,
+        partition: Optional[str] = None,
+        metadata: Optional[Dict[str, str]] = None
+    ) -> Optional[Path]:
+        """Append documents as a new Parquet file.
+        
+        Args:
+            documents: Normalized documents
+            embeddings: Optional float matrix [n, dims]; otherwise the
+                documents' 'embedding' values are used (if any)
+            partition: Partition value (default: today's date)
+            metadata: Key/value file metadata (e.g. the search query)
+        
+        Returns:
+            Path of the written file, None if there was nothing to write
+        """
+        if not documents:
+            return None
+        
+        columns = {}
+        for field in self.schema:
+            if field.name == "embedding":
+                continue
+            values = [doc.get(field.name) for doc in documents]
+            if field.name in JSON_COLUMNS:
+                values = [json.dumps(v, ensure_ascii=False) if v is not None else None for v in values]
+            columns[field.name] = pa.array(values, type=field.type)
+        
+        columns["embedding"] = self._embedding_array(documents, embeddings)
+        table = pa.Table.from_pydict(columns, schema=self.schema)
+        if metadata:
+            table = table.replace_schema_metadata({
+                key: str(value) for key, value in metadata.items() if value is not None
+            })
+        
+        partition = partition or datetime.now().strftime("%Y-%m-%d")
+        directory = self.root / f"ingest_date={partition}"
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"part-{datetime.now().strftime('%H%M%S')}-{uuid.uuid4().hex[:12]}.parquet"
+        
+        # Write under a hidden name so readers never see partial files
+        tmp_path = directory / f".{path.name}.tmp"
+        pq.write_table(table, tmp_path, compression="zstd", row_group_size=8192)
+        tmp_path.rename(path)
+        
+        logger.info(f"Wrote {len(documents)} {self.kind} to snapshot: {path}")
+        return path
+    
+    def _embedding_array(self, documents: List[Dict], embeddings: Optional[np.ndarray]) -> "pa.Array":
+        """Build the fixed-size-list embedding column."""
+        list_type = self.schema.field("embedding").type
+        
+        if embeddings is not None:
+            matrix = np.ascontiguousarray(embeddings, dtype=np.float32).reshape(-1)
+            return pa.FixedSizeListArray.from_arrays(pa.array(matrix), self.dims)
+        
+        values = [doc.get("embedding") for doc in documents]
+        if all(v is None for v in values):
+            return pa.nulls(len(documents), type=list_type)
+        return pa.array(
+            [np.asarray(v, dtype=np.float32) if v is not None else None for v in values],
+            type=list_type
+        )
+    
+    def _dataset(self) -> "pa_dataset.Dataset":
+        return pa_dataset.dataset(
+            str(self.root),
+            schema=self.schema,
+            format="parquet",
+            partitioning="hive",
+            exclude_invalid_files=True
+        )
+    
+    def iter_batches(
+        self,
+        columns: Optional[Sequence[str]] = None,
+        batch_size: int = 1024,
+        filter_expression=None
+    ) -> Iterator["pa.RecordBatch"]:
+        """Stream record batches.
+        
+        Args:
+            columns: Columns to read (default: all)
+            batch_size: Maximum rows per batch
+            filter_expression: Optional pyarrow.dataset expression
+        
+        Yields:
+            Arrow record batches
+        """
+        if not self.exists():
+            return
+        
+        scanner = self._dataset().scanner(
+            columns=list(columns) if columns else None,
+            filter=filter_expression,
+            batch_size=batch_size
+        )
+        for batch in scanner.to_batches():
+            if batch.num_rows:
+                yield batch
+    
+    def iter_documents(
+        self,
+        columns: Optional[Sequence[str]] = None,
+        batch_size: int = 1024
+    ) -> Iterator[List[Dict]]:
+        """Stream documents as lists of dictionaries.
+        
+        The embedding column is left out of the dictionaries; read it with
+        embedding_matrix() on the record batches instead.
+        
+        Args:
+            columns: Columns to read (default: all but the embedding)
+            batch_size: Maximum documents per list
+        
+        Yields:
+            Lists of document dictionaries
+        """
+        if columns is None:
+            columns = [name for name in self.schema.names if name != "embedding"]
+        
+        for batch in self.iter_batches(columns, batch_size):
+            yield self.batch_to_documents(batch)
+    
+    @staticmethod
+    def batch_to_documents(batch: "pa.RecordBatch") -> List[Dict]:
+        """Convert a record batch to document dictionaries (without embeddings).
+        
+        Args:
+            batch: Arrow record batch
+        
+        Returns:
+            List of document dictionaries
+        """
+        names = [name for name in batch.schema.names if name != "embedding"]
+        documents = batch.select(names).to_pylist()
+        for doc in documents:
+            for name in JSON_COLUMNS:
+                if doc.get(name) is not None:
+                    doc[name] = json.loads(doc[name])
+        return documents
+    
+    def embedding_matrix(self, batch: "pa.RecordBatch") -> np.ndarray:
+        """View the embedding column of a batch as a float32 matrix.
+        
+        Zero-copy when no row is null; rows without an embedding are
+        zero-filled (which needs a copy).
+        
+        Args:
+            batch: Record batch that includes the embedding column
+        
+        Returns:
+            Array of shape [num_rows, dims]
+        """
+        column = batch.column(batch.schema.get_field_index("embedding"))
+        start = column.offset * self.dims
+        values = column.values.slice(start, len(column) * self.dims)
+        
+        if column.null_count == 0 and values.null_count == 0:
+            return values.to_numpy(zero_copy_only=True).reshape(len(column), self.dims)
+        
+        matrix = values.to_numpy(zero_copy_only=False).reshape(len(column), self.dims).copy()
+        matrix[np.asarray(column.is_null())] = 0.0
+        return np.nan_to_num(matrix, copy=False)
+    
+    def count(self) -> int:
+        """Number of documents in the snapshot."""
+        if not self.exists():
+            return 0
+        return self._dataset().count_rows()
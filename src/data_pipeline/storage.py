@@ -3,13 +3,23 @@
 import json
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
 
+import numpy as np
+
+from .snapshot import CorpusSnapshot
 from src.utils.config import PROJECT_ROOT
+from src.utils.records import to_builtins
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Snapshot kind -> (processed subdirectory, legacy JSON prefix, legacy JSON key)
+PROCESSED_KINDS = {
+    "articles": ("pubmed", "processed_pubmed_", "articles"),
+    "trials": ("clinical_trials", "processed_trials_", "trials"),
+}
+
 
 class DataStorage:
     """Handles storage of fetched data to disk."""
@@ -62,7 +72,7 @@ class DataStorage:
         }
         
         with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+            json.dump(data, f, ensure_ascii=False)
         
         logger.info(f"Saved {len(articles)} PubMed articles to: {filepath}")
         return filepath
@@ -102,7 +112,7 @@ class DataStorage:
         }
         
         with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+            json.dump(data, f, ensure_ascii=False)
         
         logger.info(f"Saved {len(trials)} clinical trials to: {filepath}")
         return filepath
@@ -168,3 +178,103 @@ class DataStorage:
         
         files = [f.name for f in trials_dir.glob("*.json")]
         return sorted(files)
+    
+    def snapshot(self, kind: str) -> CorpusSnapshot:
+        """Get the Parquet snapshot of processed documents.
+        
+        Args:
+            kind: 'articles' or 'trials'
+        
+        Returns:
+            CorpusSnapshot instance
+        """
+        subdir = PROCESSED_KINDS[kind][0]
+        return CorpusSnapshot(self.processed_dir / subdir / "snapshot", kind)
+    
+    def save_processed(
+        self,
+        kind: str,
+        documents: List[Dict],
+        query: str = None,
+        embeddings: Optional[np.ndarray] = None
+    ) -> Path:
+        """Append processed documents to the snapshot.
+        
+        Falls back to a JSON file when pyarrow is not installed.
+        
+        Args:
+            kind: 'articles' or 'trials'
+            documents: Processed documents
+            query: Search query used (stored as file metadata)
+            embeddings: Optional embedding matrix aligned with documents
+        
+        Returns:
+            Path to the written file
+        """
+        try:
+            return self.snapshot(kind).write(
+                documents,
+                embeddings=embeddings,
+                metadata={"query": query, "timestamp": datetime.now().isoformat()}
+            )
+        except ImportError as e:
+            logger.warning(f"{e} - saving processed {kind} as JSON")
+        
+        subdir, prefix, key = PROCESSED_KINDS[kind]
+        filepath = self.processed_dir / subdir / f"{prefix}{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+        
+        with open(filepath, "w", encoding="utf-8") as f:
+            json.dump({
+                "query": query,
+                "timestamp": datetime.now().isoformat(),
+                "count": len(documents),
+                key: documents
+            }, f, ensure_ascii=False, default=to_builtins)
+        
+        logger.info(f"Saved {len(documents)} processed {kind} to: {filepath}")
+        return filepath
+    
+    def iter_processed(
+        self,
+        kind: str,
+        columns: Optional[Sequence[str]] = None,
+        batch_size: int = 1024,
+        with_embeddings: bool = False
+    ) -> Iterator[Tuple[List[Dict], Optional[np.ndarray]]]:
+        """Stream processed documents: the Parquet snapshot, then legacy JSON files.
+        
+        Args:
+            kind: 'articles' or 'trials'
+            columns: Fields to read (default: all); projection only applies
+                to the snapshot
+            batch_size: Documents per batch
+            with_embeddings: Also return the stored embeddings (zero-copy
+                matrix view for the snapshot, None for JSON files)
+        
+        Yields:
+            Tuples of (documents, embeddings or None)
+        """
+        try:
+            snapshot = self.snapshot(kind)
+        except ImportError:
+            snapshot = None
+        
+        if snapshot is not None and snapshot.exists():
+            read_columns = list(columns) if columns else [
+                name for name in snapshot.schema.names if name != "embedding"
+            ]
+            if with_embeddings:
+                read_columns.append("embedding")
+            
+            for batch in snapshot.iter_batches(read_columns, batch_size):
+                documents = snapshot.batch_to_documents(batch)
+                embeddings = snapshot.embedding_matrix(batch) if with_embeddings else None
+                yield documents, embeddings
+        
+        subdir, prefix, key = PROCESSED_KINDS[kind]
+        for filepath in sorted((self.processed_dir / subdir).glob(f"{prefix}*.json")):
+            with open(filepath, "r", encoding="utf-8") as f:
+                documents = json.load(f).get(key, [])
+            for i in range(0, len(documents), batch_size):
+                yield documents[i:i + batch_size], None
@@ -1,16 +1,61 @@
 """Text cleaning and normalization utilities."""
 
+import html
 import re
-from typing import Optional
+from typing import Iterable, List, Optional
 
 from bs4 import BeautifulSoup
 
+# Anything that could be a tag or a character reference
+MARKUP_PATTERN = re.compile(r'<[A-Za-z/!?]|&(?:#[0-9]+|#[xX][0-9A-Fa-f]+|[A-Za-z][A-Za-z0-9]*);')
+
+# Inline tags used in PubMed titles and abstracts (stripped without parsing)
+INLINE_TAG_PATTERN = re.compile(
+    r'</?(?:i|b|u|em|strong|sup|sub|sc|italic|bold|underline|span|br|p)(?:\s[^<>]*)?/?>',
+    re.IGNORECASE
+)
+
+# Any remaining tag, comment or declaration: needs a real parser
+TAG_PATTERN = re.compile(r'<[A-Za-z/!?][^<>]*>')
+
+WHITESPACE_PATTERN = re.compile(r'\s+')
+SPECIAL_CHARS_PATTERN = re.compile(r'[^\w\s.,;:!?()\-\'\"]+')
+NON_WORD_PATTERN = re.compile(r'[^\w\s]+')
+
+UNICODE_REPLACEMENTS = str.maketrans({
+    '\u2018': "'",  # Left single quote
+    '\u2019': "'",  # Right single quote
+    '\u201c': '"',  # Left double quote
+    '\u201d': '"',  # Right double quote
+    '\u2013': '-',  # En dash
+    '\u2014': '-',  # Em dash
+    '\u2026': '...',  # Ellipsis
+    '\xa0': ' ',  # Non-breaking space
+})
+
 
 class TextCleaner:
-    """Cleans and normalizes biomedical text."""
+    """Cleans and normalizes biomedical text.
+    
+    Most titles, author names and MeSH terms are plain text, so every step
+    checks for its cheap no-op case first; BeautifulSoup only runs when the
+    text contains tags other than the common inline ones.
+    """
     
     @staticmethod
-    def remove_html(text: str) -> str:
+    def has_markup(text: str) -> bool:
+        """Check whether text may contain tags or character references.
+        
+        Args:
+            text: Text to check
+        
+        Returns:
+            True if the text needs HTML processing
+        """
+        return ('<' in text or '&' in text) and MARKUP_PATTERN.search(text) is not None
+    
+    @classmethod
+    def remove_html(cls, text: str) -> str:
         """Remove HTML tags from text.
         
         Args:
@@ -22,6 +67,13 @@ class TextCleaner:
         if not text:
             return ""
         
+        if not cls.has_markup(text):
+            return text
+        
+        stripped = INLINE_TAG_PATTERN.sub('', text)
+        if TAG_PATTERN.search(stripped) is None:
+            return html.unescape(stripped)
+        
         soup = BeautifulSoup(text, "html.parser")
         return soup.get_text()
     
@@ -39,7 +91,7 @@ class TextCleaner:
             return ""
         
         # Replace multiple whitespaces with single space
-        text = re.sub(r'\s+', ' ', text)
+        text = WHITESPACE_PATTERN.sub(' ', text)
         
         # Remove leading/trailing whitespace
         text = text.strip()
@@ -62,10 +114,10 @@ class TextCleaner:
         
         if keep_punctuation:
             # Keep letters, numbers, spaces, and basic punctuation
-            text = re.sub(r'[^\w\s.,;:!?()\-\'\"]+', ' ', text)
+            text = SPECIAL_CHARS_PATTERN.sub(' ', text)
         else:
             # Keep only letters, numbers, and spaces
-            text = re.sub(r'[^\w\s]+', ' ', text)
+            text = NON_WORD_PATTERN.sub(' ', text)
         
         return text
     
@@ -79,25 +131,10 @@ class TextCleaner:
         Returns:
             Normalized text
         """
-        if not text:
-            return ""
+        if not text or text.isascii():
+            return text or ""
         
-        # Common replacements
-        replacements = {
-            '\u2018': "'",  # Left single quote
-            '\u2019': "'",  # Right single quote
-            '\u201c': '"',  # Left double quote
-            '\u201d': '"',  # Right double quote
-            '\u2013': '-',  # En dash
-            '\u2014': '-',  # Em dash
-            '\u2026': '...',  # Ellipsis
-            '\xa0': ' ',  # Non-breaking space
-        }
-        
-        for old, new in replacements.items():
-            text = text.replace(old, new)
-        
-        return text
+        return text.translate(UNICODE_REPLACEMENTS)
     
     @staticmethod
     def fix_encoding_issues(text: str) -> str:
@@ -109,10 +146,10 @@ class TextCleaner:
         Returns:
             Fixed text
         """
-        if not text:
-            return ""
+        if not text or text.isascii():
+            return text or ""
         
-        # Fix common encoding issues
+        # Drop lone surrogates left by broken decoding
         text = text.encode('utf-8', errors='ignore').decode('utf-8')
         
         return text
@@ -159,3 +196,26 @@ class TextCleaner:
             text = cls.normalize_whitespace(text)
         
         return text
+    
+    @classmethod
+    def clean_many(cls, texts: Iterable[Optional[str]], **options) -> List[str]:
+        """Clean a batch of texts with the same options.
+        
+        Repeated values (MeSH terms, journal and sponsor names) are cleaned
+        once per batch. Being a classmethod on plain lists, it can be passed
+        directly to process pool workers.
+        
+        Args:
+            texts: Texts to clean
+            **options: Keyword arguments of clean()
+        
+        Returns:
+            Cleaned texts, in input order
+        """
+        cleaned = {}
+        results = []
+        for text in texts:
+            if text not in cleaned:
+                cleaned[text] = cls.clean(text, **options)
+            results.append(cleaned[text])
+        return results
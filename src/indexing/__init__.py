@@ -2,10 +2,14 @@
 
 from .es_client import ElasticsearchClient
 from .index_manager import IndexManager
-from .document_indexer import DocumentIndexer
+from .document_indexer import DocumentIndexer, BulkIndexResult
+from .document_cache import DocumentCache, CachedDocument
 
 __all__ = [
     "ElasticsearchClient",
     "IndexManager",
-    "DocumentIndexer"
+    "DocumentIndexer",
+    "BulkIndexResult",
+    "DocumentCache",
+    "CachedDocument"
 ]
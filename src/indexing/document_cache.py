@@ -0,0 +1,156 @@
+"""Small in-process cache of documents with their version validators."""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from src.utils.config import settings
+from src.utils.logger import get_logger
+from .document_indexer import DocumentIndexer
+
+logger = get_logger(__name__)
+
+
+class CachedDocument(NamedTuple):
+    """A document source with its HTTP validators."""
+    
+    source: Dict
+    etag: str
+    # When this process first saw this version of the document (epoch seconds)
+    last_modified: float
+
+
+class DocumentCache:
+    """LRU cache of single documents, revalidated by version.
+    
+    An entry is served without a cluster request for ``ttl`` seconds. After
+    that only the document's ``_seq_no``/``_primary_term`` are read: an
+    unchanged document keeps its cached source, a changed one is fetched
+    again. Writes through a DocumentIndexer of this process drop the cached
+    documents of the written index at once.
+    
+    The ETag is derived from the concrete index behind the alias,
+    ``_primary_term``, ``_seq_no`` (on clusters that have them) and
+    ``_version``, so it is identical in every API worker and changes when an
+    alias is moved to a rebuilt index, whose sequence numbers start over.
+    Elasticsearch keeps no modification time, so Last-Modified is the time
+    the version was first seen here.
+    """
+    
+    def __init__(
+        self,
+        indexer: DocumentIndexer,
+        max_entries: Optional[int] = None,
+        ttl: Optional[float] = None
+    ):
+        """Initialize document cache.
+        
+        Args:
+            indexer: Document indexer used for fetching
+            max_entries: Cached documents, least recently used dropped first
+                (default: DOCUMENT_CACHE_SIZE setting)
+            ttl: Seconds an entry is served without revalidation
+                (default: DOCUMENT_CACHE_TTL setting)
+        """
+        self.indexer = indexer
+        self.max_entries = max_entries if max_entries is not None else settings.document_cache_size
+        self.ttl = ttl if ttl is not None else settings.document_cache_ttl
+        
+        # (index, ID, with embedding) -> (revalidate after, document)
+        self._entries: "OrderedDict[Tuple[str, str, bool], Tuple[float, CachedDocument]]" = OrderedDict()
+        self._lock = threading.Lock()
+        
+        DocumentIndexer.add_write_listener(self._on_write)
+    
+    @staticmethod
+    def etag(version: Dict, include_embedding: bool = False) -> str:
+        """Entity tag of a document version.
+        
+        Args:
+            version: ``_index``, ``_seq_no``, ``_primary_term`` and
+                ``_version`` of an _mget entry
+            include_embedding: Whether the representation includes the embedding
+        
+        Returns:
+            Quoted strong ETag
+        """
+        suffix = "-e" if include_embedding else ""
+        if version.get("_seq_no") is not None:
+            position = f'{version.get("_primary_term", 0)}.{version["_seq_no"]}.'
+        else:
+            position = ""
+        return f'"{version.get("_index", "")}.{position}v{version.get("_version", 0)}{suffix}"'
+    
+    def get(self, index_name: str, doc_id: str, include_embedding: bool = False) -> Optional[CachedDocument]:
+        """Get a document, from the cache if its version is unchanged.
+        
+        Args:
+            index_name: Index or alias
+            doc_id: Document ID
+            include_embedding: Include the embedding in the source
+        
+        Returns:
+            CachedDocument, or None if the document does not exist
+        """
+        key = (index_name, doc_id, include_embedding)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        
+        if entry is not None:
+            if entry[0] > now:
+                return entry[1]
+            
+            versions = self.indexer.get_versions_many(index_name, [doc_id]).get(doc_id)
+            version = versions and {
+                "_index": versions["index"],
+                "_seq_no": versions["seq_no"],
+                "_primary_term": versions["primary_term"],
+                "_version": versions["version"]
+            }
+            if version and self.etag(version, include_embedding) == entry[1].etag:
+                self._store(key, entry[1])
+                return entry[1]
+        
+        found = self.indexer.get_many_across(
+            [(index_name, doc_id)],
+            source_excludes=None if include_embedding else ["embedding"]
+        )[0]
+        if found is None:
+            with self._lock:
+                self._entries.pop(key, None)
+            return None
+        
+        document = CachedDocument(
+            source=found.get("_source", {}),
+            etag=self.etag(found, include_embedding),
+            last_modified=time.time()
+        )
+        self._store(key, document)
+        return document
+    
+    def clear(self):
+        """Drop all cached documents."""
+        with self._lock:
+            self._entries.clear()
+    
+    def close(self):
+        """Stop listening to writes and drop all cached documents."""
+        DocumentIndexer.remove_write_listener(self._on_write)
+        self.clear()
+    
+    def _store(self, key: Tuple[str, str, bool], document: CachedDocument):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, document)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def _on_write(self, written: str):
+        """Write listener: drop the cached documents of the written index."""
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == written]:
+                del self._entries[key]
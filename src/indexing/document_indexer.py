@@ -1,26 +1,158 @@
 """Document indexing for Elasticsearch."""
 
+import hashlib
+import json
+import threading
+import time
 import traceback
-from typing import Dict, List, Optional
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
-from elasticsearch import helpers
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
 
 from src.utils.logger import get_logger
+from src.utils.records import Record
 from .es_client import ElasticsearchClient
 
 logger = get_logger(__name__)
 
+# Bulk item errors that mean "cluster is overloaded, try again later"
+RETRYABLE_STATUSES = {429, 502, 503, 504}
+REJECTION_ERROR_TYPES = ("es_rejected_execution_exception", "rejected_execution_exception")
+
+# Source field holding a hash of the indexed content (see content_hash())
+CONTENT_HASH_FIELD = "content_hash"
+
+# Fields that are not part of the content hash: derived or volatile values
+CONTENT_HASH_EXCLUDES = {"embedding", "metadata", CONTENT_HASH_FIELD}
+
+# IDs per _mget request
+MGET_CHUNK_SIZE = 1000
+
+# Writes made through any DocumentIndexer of this process, per index name:
+# caches of data derived from an index (facet counts) compare its generation,
+# and listeners are told about every write
+_write_generations: Dict[str, int] = {}
+_write_listeners: List[Callable[[str], None]] = []
+_write_lock = threading.Lock()
+
+
+class BulkIndexResult:
+    """Outcome of a bulk indexing run.
+    
+    Unpacks as ``(success, failed)`` so callers that only need the counts
+    keep working; ``failures`` holds one entry per document that could not
+    be indexed.
+    """
+    
+    def __init__(self):
+        """Initialize an empty result."""
+        self.success = 0
+        self.failures: List[Dict] = []
+        self.retries = 0
+    
+    @property
+    def failed(self) -> int:
+        """Number of documents that could not be indexed."""
+        return len(self.failures)
+    
+    def merge(self, other: "BulkIndexResult"):
+        """Add the counts of another (chunk) result to this one.
+        
+        Args:
+            other: Result to merge in
+        """
+        self.success += other.success
+        self.failures.extend(other.failures)
+        self.retries += other.retries
+    
+    def __iter__(self):
+        return iter((self.success, self.failed))
+    
+    def __repr__(self) -> str:
+        return f"BulkIndexResult(success={self.success}, failed={self.failed}, retries={self.retries})"
+
 
 class DocumentIndexer:
     """Indexes documents into Elasticsearch."""
     
-    def __init__(self, es_client: ElasticsearchClient):
+    def __init__(
+        self,
+        es_client: ElasticsearchClient,
+        vector_encoder: Optional[Callable[[Any], Any]] = None
+    ):
         """Initialize document indexer.
         
         Args:
             es_client: Elasticsearch client instance
+            vector_encoder: Converts numpy embeddings in documents to their bulk
+                representation (e.g. ``EmbeddingQuantizer.encode``); plain
+                float lists are used when not set
         """
         self.es_client = es_client
+        self.vector_encoder = vector_encoder
+        
+        # msgspec encodes bulk sources several times faster than json.dumps
+        self._json_encoder = (
+            msgspec.json.Encoder(enc_hook=self._encode_value) if msgspec is not None else None
+        )
+        
+        # Delay applied before each bulk request, shared by all in-flight
+        # requests: grows on rejections, decays on clean responses
+        self._backoff = 0.0
+        self._backoff_lock = threading.Lock()
+    
+    @staticmethod
+    def generation(index_name: str) -> int:
+        """Number of writes made to an index (or comma-separated indices) so far.
+        
+        Args:
+            index_name: Index name as used for writing
+        
+        Returns:
+            Write generation (0 before the first write)
+        """
+        with _write_lock:
+            return sum(_write_generations.get(name, 0) for name in index_name.split(","))
+    
+    @staticmethod
+    def add_write_listener(listener: Callable[[str], None]):
+        """Call a function with the index name after every write.
+        
+        Listeners run on the writing thread and must return quickly.
+        
+        Args:
+            listener: Function taking the index name
+        """
+        with _write_lock:
+            _write_listeners.append(listener)
+    
+    @staticmethod
+    def remove_write_listener(listener: Callable[[str], None]):
+        """Stop calling a function added by add_write_listener (no-op if absent).
+        
+        Args:
+            listener: Function passed to add_write_listener
+        """
+        with _write_lock:
+            if listener in _write_listeners:
+                _write_listeners.remove(listener)
+    
+    @staticmethod
+    def _record_write(index_name: str):
+        """Bump the write generation of an index and notify listeners."""
+        with _write_lock:
+            _write_generations[index_name] = _write_generations.get(index_name, 0) + 1
+            listeners = list(_write_listeners)
+        for listener in listeners:
+            try:
+                listener(index_name)
+            except Exception as e:
+                logger.warning(f"Write listener failed for {index_name}: {e}")
     
     def index_document(
         self,
@@ -37,6 +169,11 @@ class DocumentIndexer:
                 logger.error("Document must have an ID")
                 return False
             
+            if CONTENT_HASH_FIELD not in document:
+                document = {**document, CONTENT_HASH_FIELD: self.content_hash(document)}
+            elif not isinstance(document, dict):
+                document = dict(document)
+            
             client = self.es_client.client
             
             # Universal indexing approach:
@@ -44,11 +181,13 @@ class DocumentIndexer:
             try:
                 # Attempt newer ES style
                 client.index(index=index_name, id=doc_id, document=document)
+                self._record_write(index_name)
                 return True
             except TypeError:
                 # Fallback to body (OpenSearch / older ES)
                 try:
                     client.index(index=index_name, id=doc_id, body=document)
+                    self._record_write(index_name)
                     return True
                 except Exception as inner_e:
                     logger.error(f"Fallback indexing failed for document {doc_id}: {inner_e}")
@@ -67,51 +206,595 @@ class DocumentIndexer:
     def index_batch(
         self,
         index_name: str,
-        documents: List[Dict],
-        batch_size: int = 500
-    ) -> tuple[int, int]:
-        """Index a batch of documents using bulk API."""
-        if not documents:
-            logger.warning("No documents to index")
-            return 0, 0
+        documents: Iterable[Dict],
+        batch_size: int = 500,
+        max_chunk_bytes: int = 5 * 1024 * 1024,
+        max_in_flight: int = 4,
+        max_retries: int = 5,
+        initial_backoff: float = 1.0,
+        max_backoff: float = 60.0,
+        op_type: str = "index"
+    ) -> BulkIndexResult:
+        """Index documents using the bulk API.
         
-        try:
-            # Prepare bulk actions
-            actions = []
+        Documents are consumed lazily (generators are fine) and grouped into
+        chunks bounded by both document count and serialized size, with up to
+        ``max_in_flight`` bulk requests running concurrently. Items rejected
+        with 429 / ``es_rejected_execution_exception`` are retried on their
+        own with adaptive backoff; every other failure is reported per item.
+        
+        Args:
+            index_name: Target index
+            documents: Iterable of documents (each must carry an 'id')
+            batch_size: Maximum documents per bulk request
+            max_chunk_bytes: Maximum serialized bytes per bulk request
+            max_in_flight: Number of concurrent bulk requests
+            max_retries: Retry rounds for rejected items
+            initial_backoff: First backoff delay in seconds
+            max_backoff: Upper bound for the backoff delay in seconds
+            op_type: 'index' (full document) or 'update' (partial document)
+        
+        Returns:
+            BulkIndexResult (unpacks as (success_count, failed_count))
+        """
+        result = BulkIndexResult()
+        skipped = 0
+        
+        with ThreadPoolExecutor(max_workers=max_in_flight) as pool:
+            in_flight = deque()
+            
+            def collect(block: bool):
+                while in_flight and (block or len(in_flight) >= max_in_flight):
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        in_flight.remove(future)
+                        result.merge(future.result())
+            
+            chunk: List[Tuple[str, str]] = []
+            chunk_bytes = 0
+            
             for doc in documents:
                 doc_id = doc.get('id')
                 if not doc_id:
+                    skipped += 1
                     continue
                 
-                action = {
-                    '_index': index_name,
-                    '_id': doc_id,
-                    '_source': doc
-                }
-                actions.append(action)
+                lines = self._build_action(index_name, str(doc_id), doc, op_type)
+                size = len(lines.encode('utf-8'))
+                
+                if chunk and (len(chunk) >= batch_size or chunk_bytes + size > max_chunk_bytes):
+                    collect(block=False)
+                    in_flight.append(pool.submit(
+                        self._send_chunk, chunk, max_retries, initial_backoff, max_backoff
+                    ))
+                    chunk, chunk_bytes = [], 0
+                
+                chunk.append((str(doc_id), lines))
+                chunk_bytes += size
             
-            # Execute bulk indexing
-            success_count = 0
-            failed_count = 0
+            if chunk:
+                collect(block=False)
+                in_flight.append(pool.submit(
+                    self._send_chunk, chunk, max_retries, initial_backoff, max_backoff
+                ))
             
-            for i in range(0, len(actions), batch_size):
-                batch = actions[i:i + batch_size]
-                
-                success, failed = helpers.bulk(
-                    self.es_client.client,
-                    batch,
-                    stats_only=True,
-                    raise_on_error=False
+            collect(block=True)
+        
+        if result.success:
+            self._record_write(index_name)
+        
+        if skipped:
+            logger.warning(f"Skipped {skipped} documents without an ID")
+        
+        if result.success == 0 and result.failed == 0:
+            logger.warning("No documents to index")
+        
+        if result.failures:
+            logger.warning(f"Bulk indexing into {index_name}: {result.failed} documents failed")
+            for failure in result.failures[:5]:
+                logger.warning(
+                    f"  ID: {failure['id']}, Status: {failure['status']}, Error: {failure['error']}"
+                )
+        
+        logger.info(
+            f"Bulk indexed {result.success} documents into {index_name} "
+            f"({result.failed} failed, {result.retries} retried)"
+        )
+        return result
+    
+    def _build_action(self, index_name: str, doc_id: str, doc: Dict, op_type: str) -> str:
+        """Serialize one bulk action (header and source lines).
+        
+        Args:
+            index_name: Target index
+            doc_id: Document ID
+            doc: Document (or partial document for updates)
+            op_type: 'index' or 'update'
+        
+        Returns:
+            NDJSON lines for the action, newline-terminated
+        """
+        header = {op_type: {'_index': index_name, '_id': doc_id}}
+        # Records are serialized through their dict view (derived keys included)
+        body = doc if isinstance(doc, dict) else dict(doc)
+        if op_type == 'update':
+            body = {'doc': body}
+        elif CONTENT_HASH_FIELD not in body:
+            body = {**body, CONTENT_HASH_FIELD: self.content_hash(body)}
+        
+        return (
+            json.dumps(header, separators=(',', ':')) + "\n"
+            + self._dumps(body) + "\n"
+        )
+    
+    def _dumps(self, body: Dict) -> str:
+        """Serialize a bulk source line (msgspec when available).
+        
+        Args:
+            body: Document source
+        
+        Returns:
+            Compact JSON string
+        """
+        if self._json_encoder is not None:
+            return self._json_encoder.encode(body).decode('utf-8')
+        return json.dumps(
+            body,
+            ensure_ascii=False,
+            separators=(',', ':'),
+            default=self._encode_value
+        )
+    
+    @staticmethod
+    def content_hash(doc: Dict) -> str:
+        """Hash of a document's content, stored with every indexed document.
+        
+        Embeddings and metadata (fetch timestamps) are left out, so the hash
+        only changes when the text or bibliographic fields change.
+        
+        Args:
+            doc: Document
+        
+        Returns:
+            Hex SHA-256 digest
+        """
+        content = {k: v for k, v in doc.items() if k not in CONTENT_HASH_EXCLUDES}
+        serialized = json.dumps(content, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+    
+    def _encode_value(self, value: Any) -> Any:
+        """JSON fallback for values json cannot serialize (numpy embeddings).
+        
+        Args:
+            value: Non-JSON value found in a document
+        
+        Returns:
+            JSON-serializable value
+        """
+        if isinstance(value, Record):
+            return value.to_dict()
+        if hasattr(value, 'tolist'):
+            if self.vector_encoder is not None and getattr(value, 'ndim', 0) == 1:
+                return self.vector_encoder(value)
+            return value.tolist()
+        raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+    
+    def _send_chunk(
+        self,
+        chunk: List[Tuple[str, str]],
+        max_retries: int,
+        initial_backoff: float,
+        max_backoff: float
+    ) -> BulkIndexResult:
+        """Send one bulk request, retrying only the rejected items.
+        
+        Args:
+            chunk: List of (doc_id, action_lines)
+            max_retries: Retry rounds for rejected items
+            initial_backoff: First backoff delay in seconds
+            max_backoff: Upper bound for the backoff delay in seconds
+        
+        Returns:
+            Result for this chunk
+        """
+        result = BulkIndexResult()
+        pending = chunk
+        
+        for attempt in range(max_retries + 1):
+            delay = self._backoff
+            if delay > 0:
+                time.sleep(delay)
+            
+            retry = []
+            try:
+                response = self.es_client.client.bulk(
+                    body="".join(lines for _, lines in pending)
                 )
                 
-                success_count += success
-                failed_count += len(batch) - success
+                for (doc_id, lines), item in zip(pending, response.get('items', [])):
+                    outcome = next(iter(item.values()))
+                    status = outcome.get('status', 500)
+                    error = outcome.get('error')
+                    
+                    if not error and 200 <= status < 300:
+                        result.success += 1
+                    elif self._is_rejection(status, error):
+                        retry.append((doc_id, lines))
+                    else:
+                        result.failures.append({
+                            'id': doc_id,
+                            'status': status,
+                            'error': self._format_error(error)
+                        })
+            
+            except Exception as e:
+                status = self._error_status(e)
+                if status is not None and status not in RETRYABLE_STATUSES and status != 413:
+                    # Whole request refused (bad request, auth...): not worth retrying
+                    result.failures.extend(
+                        {'id': doc_id, 'status': status, 'error': str(e)}
+                        for doc_id, _ in pending
+                    )
+                    return result
                 
-            return success_count, failed_count
+                if status == 413 and len(pending) > 1:
+                    # Payload too large: split and send the halves separately
+                    middle = len(pending) // 2
+                    for half in (pending[:middle], pending[middle:]):
+                        result.merge(self._send_chunk(half, max_retries, initial_backoff, max_backoff))
+                    return result
+                
+                logger.warning(f"Bulk request failed (attempt {attempt + 1}): {e}")
+                retry = pending
             
-        except Exception as e:
-            logger.error(f"Failed to index batch: {e}")
-            raise
+            if not retry:
+                self._adjust_backoff(rejected=False, initial=initial_backoff, maximum=max_backoff)
+                return result
+            
+            self._adjust_backoff(rejected=True, initial=initial_backoff, maximum=max_backoff)
+            if attempt < max_retries:
+                result.retries += len(retry)
+            pending = retry
+        
+        result.failures.extend(
+            {'id': doc_id, 'status': 429, 'error': f'Rejected after {max_retries} retries'}
+            for doc_id, _ in pending
+        )
+        return result
+    
+    def _adjust_backoff(self, rejected: bool, initial: float, maximum: float):
+        """Grow the shared backoff on rejections and decay it on success.
+        
+        Args:
+            rejected: Whether the last request had rejected items
+            initial: First backoff delay in seconds
+            maximum: Upper bound for the backoff delay in seconds
+        """
+        with self._backoff_lock:
+            if rejected:
+                self._backoff = min(maximum, max(initial, self._backoff * 2))
+            elif self._backoff > 0:
+                self._backoff = self._backoff / 2 if self._backoff / 2 >= initial / 4 else 0.0
+    
+    @staticmethod
+    def _is_rejection(status: int, error) -> bool:
+        """Check whether a bulk item failed because the cluster was overloaded."""
+        if status in RETRYABLE_STATUSES:
+            return True
+        error_type = error.get('type', '') if isinstance(error, dict) else str(error or '')
+        return any(t in error_type for t in REJECTION_ERROR_TYPES)
+    
+    @staticmethod
+    def _format_error(error) -> str:
+        """Render a bulk item error as a short string."""
+        if isinstance(error, dict):
+            return f"{error.get('type', 'error')}: {error.get('reason', '')}"
+        return str(error)
+    
+    @staticmethod
+    def _error_status(error: Exception) -> Optional[int]:
+        """Extract the HTTP status from an Elasticsearch/OpenSearch client error."""
+        meta = getattr(error, 'meta', None)
+        status = getattr(meta, 'status', None) or getattr(error, 'status_code', None)
+        return status if isinstance(status, int) else None
+    
+    def iter_documents(
+        self,
+        index_name: str,
+        query: Optional[Dict] = None,
+        source_includes: Optional[List[str]] = None,
+        page_size: int = 500,
+        shard: Optional[int] = None,
+        num_shards: Optional[int] = None,
+        search_after: Optional[List] = None,
+        keep_alive: str = "10m",
+        id_range: Optional[Tuple[Optional[str], Optional[str]]] = None
+    ) -> Iterator[Dict]:
+        """Stream documents with a point in time and search_after.
+        
+        Hits are sorted by the ``id`` keyword, so the ``sort`` value of the
+        last processed hit can be stored and passed back as ``search_after``
+        to resume, even with a new PIT. ``shard``/``num_shards`` split the
+        index on a hash of ``id`` (stable across runs, unlike PIT slices),
+        but every shard still reads the doc values of the whole index;
+        ``id_range`` selects a contiguous part through the terms index.
+        
+        Args:
+            index_name: Index or alias
+            query: Query to filter documents (default: all)
+            source_includes: Source fields to return (default: all)
+            page_size: Hits per request
+            shard: Shard of the documents to return (0 <= shard < num_shards)
+            num_shards: Number of shards the documents are split into
+            search_after: Sort values of the last hit already processed
+            keep_alive: PIT keep-alive between pages
+            id_range: (first ID, end ID) - IDs ``>= first`` and ``< end``;
+                None leaves that side open
+        
+        Yields:
+            Raw hits (with ``_id``, ``_source`` and ``sort``)
+        """
+        filters = [query] if query else []
+        if id_range is not None and any(bound is not None for bound in id_range):
+            bounds = {}
+            if id_range[0] is not None:
+                bounds["gte"] = id_range[0]
+            if id_range[1] is not None:
+                bounds["lt"] = id_range[1]
+            filters.append({"range": {"id": bounds}})
+        if num_shards and num_shards > 1:
+            filters.append({
+                "script": {
+                    "script": {
+                        "source": "Math.floorMod(doc['id'].value.hashCode(), params.n) == params.shard",
+                        "params": {"n": num_shards, "shard": shard}
+                    }
+                }
+            })
+        
+        body = {
+            "size": page_size,
+            "query": {"bool": {"filter": filters}} if filters else {"match_all": {}},
+            "sort": [{"id": "asc"}],
+            "track_total_hits": False
+        }
+        if source_includes is not None:
+            body["_source"] = source_includes
+        
+        pit_id = self.es_client.open_point_in_time(index_name, keep_alive=keep_alive)
+        try:
+            while True:
+                body["pit"] = {"id": pit_id, "keep_alive": keep_alive}
+                if search_after:
+                    body["search_after"] = search_after
+                
+                response = self.es_client.client.search(body=body)
+                pit_id = response.get("pit_id", pit_id)
+                hits = response["hits"]["hits"]
+                
+                yield from hits
+                
+                if len(hits) < page_size:
+                    break
+                search_after = hits[-1]["sort"]
+        finally:
+            self.es_client.close_point_in_time(pit_id)
+    
+    def id_boundaries(self, index_name: str, parts: int, sample_size: int = 10000) -> List[Optional[str]]:
+        """Split the ``id`` key space into ranges of about equal size.
+        
+        The boundaries are quantiles of a random sample of IDs (one request),
+        for use as ``id_range`` of iter_documents. Callers that resume should
+        store them: another sample gives slightly different ranges.
+        
+        Args:
+            index_name: Index or alias
+            parts: Number of ranges
+            sample_size: IDs sampled (at most the index's max_result_window)
+        
+        Returns:
+            ``parts + 1`` boundaries; range i is ``[b[i], b[i + 1])``, the
+            first and last boundary are None (open)
+        """
+        if parts <= 1:
+            return [None, None]
+        
+        response = self.es_client.client.search(
+            index=index_name,
+            body={
+                "size": sample_size,
+                "_source": False,
+                "docvalue_fields": ["id"],
+                "query": {
+                    "function_score": {
+                        "query": {"exists": {"field": "id"}},
+                        "random_score": {"seed": 0, "field": "_seq_no"}
+                    }
+                }
+            }
+        )
+        ids = sorted({
+            hit["fields"]["id"][0]
+            for hit in response["hits"]["hits"]
+            if hit.get("fields", {}).get("id")
+        })
+        if not ids:
+            return [None] * (parts + 1)
+        return [None] + [ids[len(ids) * i // parts] for i in range(1, parts)] + [None]
+    
+    def _mget(
+        self,
+        index_name: str,
+        doc_ids: Iterable[str],
+        source: Any = False,
+        chunk_size: int = MGET_CHUNK_SIZE
+    ) -> Iterator[Dict]:
+        """Fetch documents with one _mget request per chunk of IDs.
+        
+        Args:
+            index_name: Index or alias
+            doc_ids: Document IDs (duplicates are fetched once)
+            source: Per-document ``_source`` (False, or an includes dict)
+            chunk_size: IDs per request
+        
+        Yields:
+            Raw _mget entries of found documents
+        """
+        doc_ids = list(dict.fromkeys(str(doc_id) for doc_id in doc_ids))
+        
+        for i in range(0, len(doc_ids), chunk_size):
+            chunk = doc_ids[i:i + chunk_size]
+            response = self.es_client.client.mget(
+                index=index_name,
+                body={"docs": [{"_id": doc_id, "_source": source} for doc_id in chunk]}
+            )
+            for entry in response["docs"]:
+                if entry.get("found"):
+                    yield entry
+    
+    def exists_many(
+        self,
+        index_name: str,
+        doc_ids: Iterable[str],
+        chunk_size: int = MGET_CHUNK_SIZE
+    ) -> Set[str]:
+        """Check which documents exist, without transferring their source.
+        
+        Args:
+            index_name: Index or alias
+            doc_ids: Document IDs
+            chunk_size: IDs per _mget request
+        
+        Returns:
+            Set of the IDs that exist
+        """
+        return {entry["_id"] for entry in self._mget(index_name, doc_ids, chunk_size=chunk_size)}
+    
+    def get_many(
+        self,
+        index_name: str,
+        doc_ids: Iterable[str],
+        source_includes: Optional[List[str]] = None,
+        source_excludes: Optional[List[str]] = None,
+        chunk_size: int = MGET_CHUNK_SIZE
+    ) -> Dict[str, Dict]:
+        """Get several documents by ID.
+        
+        Args:
+            index_name: Index or alias
+            doc_ids: Document IDs
+            source_includes: Source fields to return (default: all)
+            source_excludes: Source fields to leave out (e.g. ['embedding'])
+            chunk_size: IDs per _mget request
+        
+        Returns:
+            Mapping of ID to document source, for the IDs found (in request order)
+        """
+        source = {}
+        if source_includes is not None:
+            source["includes"] = source_includes
+        if source_excludes:
+            source["excludes"] = source_excludes
+        return {
+            entry["_id"]: entry.get("_source", {})
+            for entry in self._mget(index_name, doc_ids, source=source or True, chunk_size=chunk_size)
+        }
+    
+    def get_many_across(
+        self,
+        refs: Iterable[Tuple[str, str]],
+        source_includes: Optional[List[str]] = None,
+        source_excludes: Optional[List[str]] = None,
+        chunk_size: int = MGET_CHUNK_SIZE
+    ) -> List[Optional[Dict]]:
+        """Get documents from several indices with one _mget request per chunk.
+        
+        Args:
+            refs: (index, document ID) pairs
+            source_includes: Source fields to return (default: all)
+            source_excludes: Source fields to leave out (e.g. ['embedding'])
+            chunk_size: Documents per _mget request
+        
+        Returns:
+            Raw _mget entries (``_index``, ``_id``, ``_source``, ``_version``,
+            ``_seq_no``, ``_primary_term``) in the order of ``refs``, None
+            for documents not found
+        """
+        source = {}
+        if source_includes is not None:
+            source["includes"] = source_includes
+        if source_excludes:
+            source["excludes"] = source_excludes
+        
+        refs = [(index_name, str(doc_id)) for index_name, doc_id in refs]
+        entries: List[Optional[Dict]] = []
+        for i in range(0, len(refs), chunk_size):
+            response = self.es_client.client.mget(body={"docs": [
+                {"_index": index_name, "_id": doc_id, "_source": source or True}
+                for index_name, doc_id in refs[i:i + chunk_size]
+            ]})
+            entries.extend(entry if entry.get("found") else None for entry in response["docs"])
+        return entries
+    
+    def get_versions_many(
+        self,
+        index_name: str,
+        doc_ids: Iterable[str],
+        chunk_size: int = MGET_CHUNK_SIZE
+    ) -> Dict[str, Dict]:
+        """Get version information of several documents.
+        
+        Only the stored content hash is read from the source, so callers can
+        decide whether a document needs re-indexing without fetching it.
+        
+        Args:
+            index_name: Index or alias
+            doc_ids: Document IDs
+            chunk_size: IDs per _mget request
+        
+        Returns:
+            Mapping of ID to ``index`` (the concrete index behind an alias),
+            ``version``, ``seq_no``, ``primary_term`` and ``content_hash``
+            (None for documents indexed before hashes were stored), for the
+            IDs found
+        """
+        entries = self._mget(
+            index_name,
+            doc_ids,
+            source={"includes": [CONTENT_HASH_FIELD]},
+            chunk_size=chunk_size
+        )
+        return {
+            entry["_id"]: {
+                "index": entry.get("_index"),
+                "version": entry.get("_version"),
+                "seq_no": entry.get("_seq_no"),
+                "primary_term": entry.get("_primary_term"),
+                "content_hash": entry.get("_source", {}).get(CONTENT_HASH_FIELD)
+            }
+            for entry in entries
+        }
+    
+    def filter_unchanged(self, index_name: str, documents: List[Dict], id_field: str = "id") -> List[Dict]:
+        """Drop documents whose indexed copy has the same content hash.
+        
+        Args:
+            index_name: Index or alias
+            documents: Documents about to be indexed
+            id_field: Field holding the document ID
+        
+        Returns:
+            Documents that are new or changed
+        """
+        versions = self.get_versions_many(
+            index_name,
+            (doc[id_field] for doc in documents if doc.get(id_field))
+        )
+        return [
+            doc for doc in documents
+            if not doc.get(id_field)
+            or versions.get(str(doc[id_field]), {}).get("content_hash") != self.content_hash(doc)
+        ]
     
     def update_document(self, index_name: str, doc_id: str, updates: Dict) -> bool:
         """Update a document."""
@@ -122,6 +805,7 @@ class DocumentIndexer:
                 id=doc_id,
                 body={'doc': updates}
             )
+            self._record_write(index_name)
             return True
         except Exception as e:
             logger.error(f"Failed to update document {doc_id}: {e}")
@@ -131,6 +815,7 @@ class DocumentIndexer:
         """Delete a document."""
         try:
             self.es_client.client.delete(index=index_name, id=doc_id)
+            self._record_write(index_name)
             return True
         except Exception as e:
             logger.error(f"Failed to delete document {doc_id}: {e}")
@@ -1,6 +1,6 @@
 """Elasticsearch/OpenSearch client and connection manager."""
 
-from typing import Optional, Union, Any
+from typing import Optional, Tuple, Union, Any
 
 try:
     from elasticsearch import Elasticsearch
@@ -51,6 +51,7 @@ class ElasticsearchClient:
              
         self._client: Optional[Union[Elasticsearch, OpenSearch]] = None
         self._is_opensearch = False
+        self.version: Optional[str] = None
         
     @property
     def client(self) -> Union[Elasticsearch, OpenSearch]:
@@ -91,6 +92,7 @@ class ElasticsearchClient:
                         logger.info(f"✅ Connected to OpenSearch/Elasticsearch {version} ({dist})")
                         self._client = os_client
                         self._is_opensearch = True
+                        self.version = version
                         return
                     else:
                          logger.warning("OpenSearch ping failed.")
@@ -119,6 +121,7 @@ class ElasticsearchClient:
                     logger.info(f"✅ Connected to Elasticsearch {version}")
                     self._client = es_client
                     self._is_opensearch = False
+                    self.version = version
                     return
                 else:
                     logger.error("Elasticsearch ping failed.")
@@ -143,6 +146,50 @@ class ElasticsearchClient:
             self._client = None
             logger.info("Connection closed")
     
+    def version_at_least(self, *minimum: int) -> bool:
+        """Check the server version (connects if needed).
+        
+        Args:
+            minimum: Version components, e.g. ``(8, 14)``
+        
+        Returns:
+            True if the connected server is at least that version
+        """
+        self.client
+        current: Tuple[int, ...] = tuple(
+            int(part) for part in (self.version or "0").split("-")[0].split(".") if part.isdigit()
+        )
+        return current >= tuple(minimum)
+    
+    def open_point_in_time(self, index: str, keep_alive: str = "5m") -> str:
+        """Open a point in time on an index (Elasticsearch or OpenSearch PIT API).
+        
+        Args:
+            index: Index or alias
+            keep_alive: How long the PIT stays open between requests
+        
+        Returns:
+            PIT ID
+        """
+        client = self.client
+        if self._is_opensearch:
+            return client.create_pit(index=index, keep_alive=keep_alive)["pit_id"]
+        return client.open_point_in_time(index=index, keep_alive=keep_alive)["id"]
+    
+    def close_point_in_time(self, pit_id: str):
+        """Release a point in time.
+        
+        Args:
+            pit_id: PIT ID returned by open_point_in_time
+        """
+        try:
+            if self._is_opensearch:
+                self.client.delete_pit(body={"pit_id": [pit_id]})
+            else:
+                self.client.close_point_in_time(body={"id": pit_id})
+        except Exception as e:
+            logger.warning(f"Failed to close point in time: {e}")
+    
     def get_cluster_health(self) -> dict:
         """Get cluster health."""
         return self.client.cluster.health()
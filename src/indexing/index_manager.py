@@ -1,7 +1,12 @@
 """Index management for Elasticsearch."""
 
-from typing import Dict, List, Optional
+import copy
+import re
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional
 
+from src.utils.config import settings as app_settings
 from src.utils.logger import get_logger
 from .es_client import ElasticsearchClient
 
@@ -38,15 +43,24 @@ class IndexManager:
                 "title": {
                     "type": "text",
                     "analyzer": "biomedical_analyzer",
+                    "copy_to": "search_text",
                     "fields": {
                         "keyword": {"type": "keyword"}
                     }
                 },
                 "abstract": {
                     "type": "text",
-                    "analyzer": "biomedical_analyzer"
+                    "analyzer": "biomedical_analyzer",
+                    "copy_to": "search_text"
                 },
+                # Body text, only present when more than the abstract is available
                 "full_text": {
+                    "type": "text",
+                    "analyzer": "biomedical_analyzer",
+                    "copy_to": "search_text"
+                },
+                # Combined search field, filled by copy_to (not part of _source)
+                "search_text": {
                     "type": "text",
                     "analyzer": "biomedical_analyzer"
                 },
@@ -58,12 +72,15 @@ class IndexManager:
                     }
                 },
                 "publication_year": {"type": "keyword"},
+                # Integer year for range filters and date sorting
+                "pub_year": {"type": "integer"},
                 "publication_month": {"type": "keyword"},
                 "publication_date": {"type": "keyword"},
                 "mesh_terms": {"type": "keyword"},
                 "keywords": {"type": "keyword"},
                 "doi": {"type": "keyword"},
                 "metadata": {"type": "object"},
+                "content_hash": {"type": "keyword", "index": False},
                 "embedding": {
                     "type": "dense_vector",
                     "dims": 768,
@@ -100,15 +117,24 @@ class IndexManager:
                 "title": {
                     "type": "text",
                     "analyzer": "biomedical_analyzer",
+                    "copy_to": "search_text",
                     "fields": {
                         "keyword": {"type": "keyword"}
                     }
                 },
                 "abstract": {
                     "type": "text",
-                    "analyzer": "biomedical_analyzer"
+                    "analyzer": "biomedical_analyzer",
+                    "copy_to": "search_text"
                 },
+                # Body text, only present when more than the abstract is available
                 "full_text": {
+                    "type": "text",
+                    "analyzer": "biomedical_analyzer",
+                    "copy_to": "search_text"
+                },
+                # Combined search field, filled by copy_to (not part of _source)
+                "search_text": {
                     "type": "text",
                     "analyzer": "biomedical_analyzer"
                 },
@@ -121,7 +147,10 @@ class IndexManager:
                 "enrollment": {"type": "integer"},
                 "start_date": {"type": "keyword"},
                 "completion_date": {"type": "keyword"},
+                "last_update_date": {"type": "keyword"},
                 "publication_year": {"type": "keyword"},
+                # Integer year for range filters and date sorting
+                "pub_year": {"type": "integer"},
                 "sponsor": {
                     "type": "text",
                     "fields": {
@@ -131,6 +160,7 @@ class IndexManager:
                 "locations": {"type": "text"},
                 "keywords": {"type": "keyword"},
                 "metadata": {"type": "object"},
+                "content_hash": {"type": "keyword", "index": False},
                 "embedding": {
                     "type": "dense_vector",
                     "dims": 768,
@@ -141,13 +171,16 @@ class IndexManager:
         }
     }
     
-    def __init__(self, es_client: ElasticsearchClient):
+    def __init__(self, es_client: ElasticsearchClient, embedding_element_type: Optional[str] = None):
         """Initialize index manager.
         
         Args:
             es_client: Elasticsearch client instance
+            embedding_element_type: Storage type of the embedding field - 'float',
+                'float16' or 'byte' (default: EMBEDDING_ELEMENT_TYPE setting)
         """
         self.es_client = es_client
+        self.embedding_element_type = embedding_element_type or app_settings.embedding_element_type
     
     def create_index(
         self,
@@ -178,6 +211,7 @@ class IndexManager:
             # Create index
             if settings is None:
                 settings = self._get_default_settings(index_name)
+            settings = self._with_embedding_mapping(settings)
             
             self.es_client.client.indices.create(
                 index=index_name,
@@ -280,6 +314,613 @@ class IndexManager:
         except Exception as e:
             logger.error(f"Failed to refresh index {index_name}: {e}")
     
+    @contextmanager
+    def bulk_load(
+        self,
+        index_name: str,
+        max_num_segments: Optional[int] = None,
+        translog_flush_threshold: str = "2gb"
+    ) -> Iterator[None]:
+        """Tune an index for a large load and restore it afterwards.
+        
+        For the duration of the block refresh is disabled, replicas are set
+        to zero and the translog flush threshold is raised. On exit the
+        original settings are put back, the index is refreshed and, if the
+        block completed, optionally force-merged down to ``max_num_segments``
+        segments.
+        
+        Args:
+            index_name: Index (or alias) being loaded
+            max_num_segments: Force-merge target after the load (None to skip)
+            translog_flush_threshold: Flush threshold used during the load
+        
+        Yields:
+            None
+        """
+        client = self.es_client.client
+        original = {}
+        
+        try:
+            response = client.indices.get_settings(index=index_name, include_defaults=True)
+            for concrete_index, data in response.items():
+                explicit = data.get("settings", {}).get("index", {})
+                translog = explicit.get("translog", {})
+                # None resets a setting to its default when restoring
+                original[concrete_index] = {
+                    "refresh_interval": explicit.get("refresh_interval"),
+                    "number_of_replicas": explicit.get("number_of_replicas"),
+                    "translog.flush_threshold_size": translog.get("flush_threshold_size")
+                }
+            
+            client.indices.put_settings(
+                index=index_name,
+                body={
+                    "index": {
+                        "refresh_interval": "-1",
+                        "number_of_replicas": 0,
+                        "translog.flush_threshold_size": translog_flush_threshold
+                    }
+                }
+            )
+            logger.info(f"Bulk-load mode enabled for {index_name}")
+        
+        except Exception as e:
+            # Hosted clusters may refuse some settings; load anyway
+            logger.warning(f"Could not enable bulk-load mode for {index_name}: {e}")
+        
+        completed = False
+        try:
+            yield
+            completed = True
+        finally:
+            for concrete_index, settings in original.items():
+                try:
+                    client.indices.put_settings(
+                        index=concrete_index,
+                        body={"index": settings}
+                    )
+                except Exception as e:
+                    logger.error(f"Failed to restore settings of {concrete_index}: {e}")
+            
+            self.refresh_index(index_name)
+            
+            # A failed load is usually dropped right away; don't merge it first
+            if max_num_segments and completed:
+                logger.info(f"Force-merging {index_name} to {max_num_segments} segment(s)...")
+                try:
+                    client.indices.forcemerge(index=index_name, max_num_segments=max_num_segments)
+                except Exception as e:
+                    # The merge keeps running server-side if the request times out
+                    logger.warning(f"Force-merge of {index_name} did not complete: {e}")
+            
+            logger.info(f"Bulk-load mode finished for {index_name}")
+    
+    @contextmanager
+    def block_writes(self, indices: List[str]) -> Iterator[None]:
+        """Reject writes to concrete indices for the duration of the block.
+        
+        Used while an index is copied to a new version: documents written in
+        the meantime fail (and are retried by the ingestion scripts) instead
+        of being silently lost when the alias moves to the copy. Reads are
+        not affected.
+        
+        Args:
+            indices: Concrete indices to make read-only
+        
+        Yields:
+            None
+        """
+        client = self.es_client.client
+        blocked = []
+        for index_name in indices:
+            try:
+                client.indices.put_settings(
+                    index=index_name,
+                    body={"index": {"blocks.write": True}}
+                )
+                blocked.append(index_name)
+                logger.info(f"Writes to {index_name} blocked")
+            except Exception as e:
+                logger.warning(
+                    f"Could not block writes to {index_name} - documents written "
+                    f"during the copy will be lost: {e}"
+                )
+        
+        try:
+            yield
+        finally:
+            for index_name in blocked:
+                # A migrated index was replaced by an alias of the same name
+                if self.get_alias_targets(index_name) or not self.index_exists(index_name):
+                    continue
+                try:
+                    client.indices.put_settings(
+                        index=index_name,
+                        body={"index": {"blocks.write": None}}
+                    )
+                    logger.info(f"Writes to {index_name} unblocked")
+                except Exception as e:
+                    logger.error(f"Failed to unblock writes to {index_name}: {e}")
+    
+    def get_alias_targets(self, alias: str) -> List[str]:
+        """Get the concrete indices an alias points to.
+        
+        Args:
+            alias: Alias name
+        
+        Returns:
+            List of index names (empty if the alias does not exist)
+        """
+        try:
+            if not self.es_client.client.indices.exists_alias(name=alias):
+                return []
+            return sorted(self.es_client.client.indices.get_alias(name=alias).keys())
+        except Exception as e:
+            logger.error(f"Failed to resolve alias {alias}: {e}")
+            return []
+    
+    def list_versions(self, alias: str) -> List[str]:
+        """List the versioned indices (``<alias>_v<N>``) behind an alias.
+        
+        Args:
+            alias: Alias name
+        
+        Returns:
+            Index names sorted by version number
+        
+        Raises:
+            Exception: If the indices cannot be listed (an empty list would
+                make the next version collide with an existing one)
+        """
+        pattern = re.compile(rf"^{re.escape(alias)}_v(\d+)$")
+        indices = self.es_client.client.indices.get_alias(index=f"{alias}_v*")
+        versions = []
+        for index_name in indices:
+            match = pattern.match(index_name)
+            if match:
+                versions.append((int(match.group(1)), index_name))
+        return [name for _, name in sorted(versions)]
+    
+    def create_versioned_index(self, alias: str, settings: Optional[Dict] = None) -> str:
+        """Create the next version of an aliased index (without moving the alias).
+        
+        Args:
+            alias: Alias name (e.g. 'pubmed_articles')
+            settings: Index settings and mappings (default: by alias name)
+        
+        Returns:
+            Name of the new index (e.g. 'pubmed_articles_v3')
+        
+        Raises:
+            RuntimeError: If the next version already exists or cannot be created
+        """
+        targets = self.get_alias_targets(alias)
+        pattern = re.compile(rf"^{re.escape(alias)}_v(\d+)$")
+        numbers = [
+            int(match.group(1))
+            for match in map(pattern.match, self.list_versions(alias) + targets)
+            if match
+        ]
+        index_name = f"{alias}_v{max(numbers, default=0) + 1}"
+        
+        # Callers drop the new index on failure, so it must never be one
+        # that already holds data (e.g. the live version or a leftover)
+        if index_name in targets or self.index_exists(index_name):
+            raise RuntimeError(f"Index {index_name} already exists - not reusing it for {alias}")
+        if not self.create_index(index_name, settings or self._get_default_settings(alias)):
+            raise RuntimeError(f"Failed to create {index_name} for {alias}")
+        return index_name
+    
+    def swap_alias(self, alias: str, new_index: str):
+        """Atomically point an alias at a new index.
+        
+        Args:
+            alias: Alias name
+            new_index: Index the alias should point to afterwards
+        """
+        client = self.es_client.client
+        
+        if client.indices.exists(index=alias) and not client.indices.exists_alias(name=alias):
+            raise ValueError(
+                f"'{alias}' is a concrete index, not an alias - run migrate_to_alias('{alias}') first"
+            )
+        
+        actions = [
+            {"remove": {"index": old_index, "alias": alias}}
+            for old_index in self.get_alias_targets(alias)
+            if old_index != new_index
+        ]
+        actions.append({"add": {"index": new_index, "alias": alias}})
+        
+        client.indices.update_aliases(body={"actions": actions})
+        logger.info(f"Alias {alias} -> {new_index}")
+    
+    def reindex(
+        self,
+        source: str,
+        dest: str,
+        requests_per_second: Optional[float] = None,
+        script: Optional[Dict] = None,
+        poll_interval: float = 10.0
+    ) -> Dict:
+        """Copy documents server-side with ``_reindex`` and wait for the task.
+        
+        The copy runs as a background task on the cluster; throttling via
+        ``requests_per_second`` keeps it from competing with live searches.
+        
+        Args:
+            source: Source index or alias
+            dest: Destination index
+            requests_per_second: Throttle (None for unthrottled)
+            script: Optional painless script applied to each document
+            poll_interval: Seconds between task status checks
+        
+        Returns:
+            Final task status (created, updated, failures, ...)
+        """
+        client = self.es_client.client
+        body = {
+            "source": {"index": source},
+            "dest": {"index": dest}
+        }
+        if script:
+            body["script"] = script
+        
+        params = {"wait_for_completion": False, "slices": "auto"}
+        if requests_per_second:
+            params["requests_per_second"] = requests_per_second
+        
+        task_id = client.reindex(body=body, **params)["task"]
+        logger.info(f"Reindex {source} -> {dest} started (task {task_id})")
+        
+        result = self._wait_for_task(task_id, f"Reindex {source} -> {dest}", poll_interval)
+        
+        logger.info(
+            f"Reindex {source} -> {dest} complete: "
+            f"{result.get('created', 0)} created, {result.get('updated', 0)} updated"
+        )
+        return result
+    
+    def update_by_query(
+        self,
+        index_name: str,
+        script: Dict,
+        query: Optional[Dict] = None,
+        requests_per_second: Optional[float] = None,
+        poll_interval: float = 10.0
+    ) -> Dict:
+        """Rewrite documents in place with ``_update_by_query`` and wait for the task.
+        
+        Args:
+            index_name: Index or alias
+            script: Painless script applied to each matching document
+            query: Documents to update (default: all)
+            requests_per_second: Throttle (None for unthrottled)
+            poll_interval: Seconds between task status checks
+        
+        Returns:
+            Final task status (updated, noops, failures, ...)
+        """
+        client = self.es_client.client
+        body = {"script": script}
+        if query:
+            body["query"] = query
+        
+        params = {"wait_for_completion": False, "slices": "auto", "conflicts": "proceed"}
+        if requests_per_second:
+            params["requests_per_second"] = requests_per_second
+        
+        task_id = client.update_by_query(index=index_name, body=body, **params)["task"]
+        logger.info(f"Update by query on {index_name} started (task {task_id})")
+        
+        result = self._wait_for_task(task_id, f"Update by query on {index_name}", poll_interval)
+        
+        logger.info(
+            f"Update by query on {index_name} complete: "
+            f"{result.get('updated', 0)} updated, {result.get('noops', 0)} unchanged"
+        )
+        return result
+    
+    def _wait_for_task(self, task_id: str, label: str, poll_interval: float) -> Dict:
+        """Poll a background task (reindex, update by query) until it completes.
+        
+        Args:
+            task_id: Task ID returned by the request
+            label: Operation name for log and error messages
+            poll_interval: Seconds between task status checks
+        
+        Returns:
+            Final task response
+        
+        Raises:
+            RuntimeError: If the task failed or reported document failures
+        """
+        client = self.es_client.client
+        
+        while True:
+            task = client.tasks.get(task_id=task_id)
+            status = task.get("task", {}).get("status", {})
+            if task.get("completed"):
+                break
+            
+            logger.info(
+                f"  {label} progress: "
+                f"{status.get('created', 0) + status.get('updated', 0) + status.get('noops', 0)}"
+                f"/{status.get('total', '?')} documents"
+            )
+            time.sleep(poll_interval)
+        
+        if task.get("error"):
+            raise RuntimeError(f"{label} failed: {task['error']}")
+        
+        result = task.get("response", status)
+        failures = result.get("failures", [])
+        if failures:
+            raise RuntimeError(f"{label} finished with {len(failures)} failures: {failures[:3]}")
+        return result
+    
+    def rebuild_index(
+        self,
+        alias: str,
+        settings: Optional[Dict] = None,
+        documents: Optional[Iterable[Dict]] = None,
+        requests_per_second: Optional[float] = None,
+        script: Optional[Dict] = None,
+        keep_versions: int = 1,
+        allow_writes: bool = False
+    ) -> str:
+        """Build a new version of an aliased index and switch to it.
+        
+        Reads keep hitting the current version through the alias while the
+        new one is filled, either server-side from the current version or
+        from the given documents (e.g. re-embedded local snapshots). The
+        alias is then swapped atomically and old versions are retired.
+        
+        Writes to the current version are blocked until the swap (see
+        block_writes), since they would not reach the new one.
+        
+        Args:
+            alias: Alias name (e.g. 'pubmed_articles')
+            settings: Settings/mappings for the new version (default: by alias name)
+            documents: Documents to load instead of reindexing from the alias
+            requests_per_second: Reindex throttle (None for unthrottled)
+            script: Optional painless script applied during reindex
+            keep_versions: Previous versions to keep for rollback
+            allow_writes: Keep accepting writes to the current version during
+                the rebuild (they are lost at the swap)
+        
+        Returns:
+            Name of the new index
+        """
+        current = self.get_alias_targets(alias)
+        if self.index_exists(alias) and not current:
+            raise ValueError(
+                f"'{alias}' is a concrete index, not an alias - run migrate_to_alias('{alias}') first"
+            )
+        
+        new_index = self.create_versioned_index(alias, settings)
+        
+        with self.block_writes([] if allow_writes else current):
+            try:
+                with self.bulk_load(new_index, max_num_segments=1):
+                    if documents is not None:
+                        from .document_indexer import DocumentIndexer
+                        result = DocumentIndexer(self.es_client).index_batch(new_index, documents)
+                        if result.failed:
+                            raise RuntimeError(f"{result.failed} documents failed to load into {new_index}")
+                    elif current:
+                        self.reindex(alias, new_index, requests_per_second=requests_per_second, script=script)
+            except Exception:
+                logger.error(f"Rebuild of {alias} failed - leaving alias unchanged and dropping {new_index}")
+                self.delete_index(new_index)
+                raise
+            
+            logger.info(f"{new_index} holds {self.get_document_count(new_index)} documents")
+            
+            self.swap_alias(alias, new_index)
+        
+        self.retire_old_versions(alias, keep=keep_versions)
+        return new_index
+    
+    def retire_old_versions(self, alias: str, keep: int = 1) -> List[str]:
+        """Delete old versions that the alias no longer points to.
+        
+        Args:
+            alias: Alias name
+            keep: Number of most recent unused versions to keep for rollback
+        
+        Returns:
+            Names of deleted indices
+        """
+        active = set(self.get_alias_targets(alias))
+        unused = [name for name in self.list_versions(alias) if name not in active]
+        retired = unused[:-keep] if keep > 0 else unused
+        
+        for index_name in retired:
+            self.delete_index(index_name)
+        
+        return retired
+    
+    def migrate_to_alias(
+        self,
+        index_name: str,
+        requests_per_second: Optional[float] = None,
+        allow_writes: bool = False
+    ) -> str:
+        """Turn a concrete index into ``<name>_v1`` behind an alias of the same name.
+        
+        The data is copied with ``_reindex``; the old index is then removed
+        and the alias added in a single atomic ``_aliases`` call. Writes to
+        the old index are blocked during the copy unless ``allow_writes`` is
+        set, in which case they are not carried over.
+        
+        Args:
+            index_name: Existing concrete index (e.g. 'pubmed_articles')
+            requests_per_second: Reindex throttle (None for unthrottled)
+            allow_writes: Keep accepting writes during the copy
+        
+        Returns:
+            Name of the new versioned index
+        """
+        client = self.es_client.client
+        
+        if client.indices.exists_alias(name=index_name):
+            logger.info(f"{index_name} is already an alias")
+            return self.get_alias_targets(index_name)[0]
+        
+        new_index = self.create_versioned_index(index_name)
+        with self.block_writes([] if allow_writes else [index_name]):
+            try:
+                with self.bulk_load(new_index, max_num_segments=1):
+                    self.reindex(index_name, new_index, requests_per_second=requests_per_second)
+            except Exception:
+                logger.error(f"Migration of {index_name} failed - dropping {new_index}")
+                self.delete_index(new_index)
+                raise
+            
+            client.indices.update_aliases(body={
+                "actions": [
+                    {"remove_index": {"index": index_name}},
+                    {"add": {"index": new_index, "alias": index_name}}
+                ]
+            })
+        logger.info(f"Migrated {index_name} to alias -> {new_index}")
+        return new_index
+    
+    @staticmethod
+    def drop_combined_full_text_script() -> Dict:
+        """Painless script that removes ``full_text`` copies of title + abstract.
+        
+        Documents indexed before 'search_text' existed stored ``full_text`` as
+        "<title>. <abstract>"; the copy_to field now covers that. Real body
+        text is kept.
+        
+        Returns:
+            Script dictionary for IndexManager.reindex / rebuild_index
+        """
+        return {
+            "lang": "painless",
+            "source": (
+                "def s = ctx._source; "
+                "if (s.full_text != null) { "
+                "  String combined = ((s.title == null ? '' : s.title) + '. ' "
+                "    + (s.abstract == null ? '' : s.abstract)).trim(); "
+                "  if (s.full_text == '' || s.full_text == combined) { s.remove('full_text'); } "
+                "}"
+            )
+        }
+    
+    @staticmethod
+    def pub_year_script() -> Dict:
+        """Painless script that sets the integer ``pub_year`` from the year fields.
+        
+        Takes the first 4-digit year (1800-2199) found in publication_year,
+        year, start_year, publication_date, start_date or the metadata
+        variants; documents without one are left untouched. Uses no regex,
+        which is disabled on some clusters.
+        
+        Returns:
+            Script dictionary for IndexManager.update_by_query / reindex
+        """
+        return {
+            "lang": "painless",
+            "source": (
+                "def s = ctx._source; "
+                "def m = s.metadata instanceof Map ? s.metadata : [:]; "
+                "def candidates = [s.publication_year, s.year, s.start_year, "
+                "  s.publication_date, s.start_date, m.publication_year, m.year]; "
+                "Integer found = null; "
+                "for (def c : candidates) { "
+                "  if (c == null) { continue; } "
+                "  if (c instanceof Number) { found = ((Number) c).intValue(); break; } "
+                "  String v = c.toString(); "
+                "  int run = 0; "
+                "  for (int i = 0; i < v.length(); i++) { "
+                "    if (Character.isDigit(v.charAt(i))) { "
+                "      run++; "
+                "      if (run == 4 && (i + 1 == v.length() || !Character.isDigit(v.charAt(i + 1)))) { "
+                "        int y = Integer.parseInt(v.substring(i - 3, i + 1)); "
+                "        if (y >= 1800 && y < 2200) { found = y; break; } "
+                "      } "
+                "    } else { run = 0; } "
+                "  } "
+                "  if (found != null) { break; } "
+                "} "
+                "if (found == null) { ctx.op = 'noop'; } else { s.pub_year = found; }"
+            )
+        }
+    
+    def embedding_mapping(self, dims: int = 768) -> Dict:
+        """Build the embedding field mapping for the configured element type.
+        
+        Elasticsearch stores 'byte' vectors natively; 'float16' has no ES
+        element type, so floats are kept and the HNSW graph is int8-quantized
+        instead. OpenSearch uses knn_vector: lucene for float/byte and the
+        faiss fp16 scalar-quantization encoder for 'float16'.
+        
+        Args:
+            dims: Embedding dimensions
+        
+        Returns:
+            Field mapping
+        """
+        element_type = self.embedding_element_type
+        self.es_client.client  # connect, so the backend is known
+        
+        if self.es_client._is_opensearch:
+            mapping = {
+                "type": "knn_vector",
+                "dimension": dims,
+                "method": {"name": "hnsw", "engine": "lucene", "space_type": "cosinesimil"}
+            }
+            if element_type == "byte":
+                mapping["data_type"] = "byte"
+            elif element_type == "float16":
+                mapping["method"] = {
+                    "name": "hnsw",
+                    "engine": "faiss",
+                    "space_type": "cosinesimil",
+                    "parameters": {"encoder": {"name": "sq", "parameters": {"type": "fp16"}}}
+                }
+            return mapping
+        
+        mapping = {
+            "type": "dense_vector",
+            "dims": dims,
+            "index": True,
+            "similarity": "cosine"
+        }
+        if element_type == "byte":
+            mapping["element_type"] = "byte"
+        elif element_type == "float16":
+            mapping["index_options"] = {"type": "int8_hnsw"}
+        return mapping
+    
+    def _with_embedding_mapping(self, settings: Dict) -> Dict:
+        """Apply the configured embedding mapping to index settings.
+        
+        Float embeddings keep the mapping of the settings as they are; only
+        quantized storage ('byte', 'float16') replaces it.
+        
+        Args:
+            settings: Index settings and mappings
+        
+        Returns:
+            Copy of the settings with the embedding field (if any) replaced
+        """
+        properties = settings.get("mappings", {}).get("properties", {})
+        if "embedding" not in properties or self.embedding_element_type == "float":
+            return settings
+        
+        settings = copy.deepcopy(settings)
+        embedding = settings["mappings"]["properties"]["embedding"]
+        settings["mappings"]["properties"]["embedding"] = self.embedding_mapping(
+            embedding.get("dims") or embedding.get("dimension") or 768
+        )
+        if self.es_client._is_opensearch:
+            settings.setdefault("settings", {})["index.knn"] = True
+        return settings
+    
     def _get_default_settings(self, index_name: str) -> Dict:
         """Get default settings for an index based on name.
         
@@ -305,23 +946,30 @@ class IndexManager:
     def setup_default_indices(self, force: bool = False):
         """Setup default PubMed and Clinical Trials indices.
         
+        Each index is created as ``<name>_v1`` behind an alias ``<name>``.
+        
         Args:
-            force: If True, recreate existing indices
+            force: If True, rebuild existing indices with the current settings
+                (data is reindexed into a new version once, reads keep working)
         """
         logger.info("Setting up default indices...")
         
-        # Create PubMed index
-        self.create_index(
-            "pubmed_articles",
-            self.PUBMED_INDEX_SETTINGS,
-            force=force
-        )
-        
-        # Create Clinical Trials index
-        self.create_index(
-            "clinical_trials",
-            self.CLINICAL_TRIALS_INDEX_SETTINGS,
-            force=force
-        )
+        for alias, settings in (
+            ("pubmed_articles", self.PUBMED_INDEX_SETTINGS),
+            ("clinical_trials", self.CLINICAL_TRIALS_INDEX_SETTINGS)
+        ):
+            exists = self.index_exists(alias)
+            
+            if not exists:
+                new_index = self.create_versioned_index(alias, settings)
+                self.swap_alias(alias, new_index)
+            elif force:
+                if self.get_alias_targets(alias):
+                    self.rebuild_index(alias, settings)
+                else:
+                    # The migrated copy already uses the current settings
+                    self.migrate_to_alias(alias)
+            else:
+                logger.warning(f"Index already exists: {alias}")
         
         logger.info("Default indices setup complete")
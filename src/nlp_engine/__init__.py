@@ -3,9 +3,13 @@
 from .model_loader import ModelLoader
 from .embedding_generator import EmbeddingGenerator
 from .text_processor import TextProcessor
+from .quantizer import EmbeddingQuantizer
+from .embedding_cache import EmbeddingCache
 
 __all__ = [
     'ModelLoader',
     'EmbeddingGenerator',
-    'TextProcessor'
+    'TextProcessor',
+    'EmbeddingQuantizer',
+    'EmbeddingCache'
 ]
@@ -0,0 +1,177 @@
+"""Persistent content-hash cache of document embeddings."""
+
+import hashlib
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+
+from src.utils.config import settings
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Keys per SELECT ... IN (...) - stays below SQLite's host parameter limit
+LOOKUP_CHUNK = 500
+
+
+class EmbeddingCache:
+    """SQLite store of embeddings keyed by (model, revision, sha256(text)).
+    
+    Vectors are stored as float16 blobs (1.5 KB for 768 dims). The
+    database runs in WAL mode, so several ingestion processes can share
+    one cache file.
+    """
+    
+    def __init__(self, path: Optional[str] = None):
+        """Initialize cache.
+        
+        Args:
+            path: SQLite file (default: EMBEDDING_CACHE_PATH setting)
+        """
+        self.path = Path(path or settings.embedding_cache_path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=60, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            " model TEXT NOT NULL,"
+            " revision TEXT NOT NULL,"
+            " text_hash BLOB NOT NULL,"
+            " dims INTEGER NOT NULL,"
+            " vector BLOB NOT NULL,"
+            " PRIMARY KEY (model, revision, text_hash)"
+            ") WITHOUT ROWID"
+        )
+        self._conn.commit()
+        
+        self.hits = 0
+        self.misses = 0
+        
+        logger.info(f"Embedding cache opened: {self.path}")
+    
+    @staticmethod
+    def text_hash(text: str) -> bytes:
+        """Hash the exact text that is encoded.
+        
+        Args:
+            text: Model input text
+        
+        Returns:
+            SHA-256 digest
+        """
+        return hashlib.sha256(text.encode("utf-8")).digest()
+    
+    @staticmethod
+    def as_stored(embedding: np.ndarray) -> np.ndarray:
+        """Round an embedding to the precision it is cached with.
+        
+        Freshly computed vectors go through this too, so a text gets the
+        same vector (and content hash downstream) whether it was cached.
+        
+        Args:
+            embedding: Embedding vector
+        
+        Returns:
+            float32 copy rounded to float16 precision
+        """
+        return np.asarray(embedding, dtype=np.float16).astype(np.float32)
+    
+    def get_many(self, model: str, revision: str, hashes: Iterable[bytes]) -> Dict[bytes, np.ndarray]:
+        """Look up cached embeddings.
+        
+        Args:
+            model: Model name
+            revision: Model revision (and anything else that changes the output)
+            hashes: Text hashes
+        
+        Returns:
+            Mapping of text hash to float32 embedding, for the hashes found
+        """
+        hashes = list(dict.fromkeys(hashes))
+        found = {}
+        
+        with self._lock:
+            for i in range(0, len(hashes), LOOKUP_CHUNK):
+                chunk = hashes[i:i + LOOKUP_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    "SELECT text_hash, vector FROM embeddings "
+                    f"WHERE model = ? AND revision = ? AND text_hash IN ({placeholders})",
+                    [model, revision, *chunk]
+                )
+                for text_hash, vector in rows:
+                    found[bytes(text_hash)] = np.frombuffer(vector, dtype=np.float16).astype(np.float32)
+        
+        self.hits += len(found)
+        self.misses += len(hashes) - len(found)
+        return found
+    
+    def put_many(self, model: str, revision: str, embeddings: Dict[bytes, np.ndarray]):
+        """Store embeddings.
+        
+        Args:
+            model: Model name
+            revision: Model revision
+            embeddings: Mapping of text hash to embedding
+        """
+        rows = [
+            (model, revision, text_hash, len(embedding), np.asarray(embedding, dtype=np.float16).tobytes())
+            for text_hash, embedding in embeddings.items()
+        ]
+        if not rows:
+            return
+        
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, revision, text_hash, dims, vector) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+            self._conn.commit()
+    
+    def purge(self, model: str, keep_revision: str) -> int:
+        """Delete entries of other revisions of a model.
+        
+        Args:
+            model: Model name
+            keep_revision: Revision whose entries are kept
+        
+        Returns:
+            Number of rows deleted
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM embeddings WHERE model = ? AND revision != ?",
+                (model, keep_revision)
+            )
+            self._conn.commit()
+        logger.info(f"Purged {cursor.rowcount} cached embeddings of old {model} revisions")
+        return cursor.rowcount
+    
+    def stats(self) -> Dict:
+        """Get cache statistics.
+        
+        Returns:
+            Dictionary with entry count and hit/miss counters of this instance
+        """
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        
+        lookups = self.hits + self.misses
+        return {
+            "entries": entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+    
+    def close(self):
+        """Close the database."""
+        with self._lock:
+            self._conn.close()
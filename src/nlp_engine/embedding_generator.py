@@ -2,10 +2,12 @@
 
 import torch
 import numpy as np
-from typing import List, Union, Optional, Dict
+from typing import List, Union, Optional, Dict, Tuple
 from tqdm import tqdm
 
+from src.utils.config import settings
 from src.utils.logger import get_logger
+from .embedding_cache import EmbeddingCache
 from .model_loader import ModelLoader
 
 logger = get_logger(__name__)
@@ -19,7 +21,8 @@ class EmbeddingGenerator:
         model_type: str = "biobert",
         batch_size: int = 8,
         max_length: int = 512,
-        model_loader: Optional[ModelLoader] = None
+        model_loader: Optional[ModelLoader] = None,
+        cache: Optional[EmbeddingCache] = None
     ):
         """Initialize embedding generator.
         
@@ -28,10 +31,13 @@ class EmbeddingGenerator:
             batch_size: Batch size for processing
             max_length: Maximum sequence length
             model_loader: Optional ModelLoader instance
+            cache: Optional embedding cache consulted by generate_batch_embeddings
         """
         self.model_type = model_type.lower()
         self.batch_size = batch_size
         self.max_length = max_length
+        self.cache = cache
+        self._cache_namespace: Optional[Tuple[str, str]] = None
         
         # Initialize model loader but don't load models yet
         self.model_loader = model_loader or ModelLoader()
@@ -56,6 +62,33 @@ class EmbeddingGenerator:
             
         logger.info(f"Model {self.model_type} loaded on {self.device}")
 
+    def _get_cache_namespace(self) -> Tuple[str, str]:
+        """Get the (model, revision) key part for cache entries.
+        
+        The revision includes the pooling and max length, since both change
+        the output for the same text.
+        
+        Returns:
+            Tuple of (model_name, revision)
+        """
+        if self._cache_namespace is None:
+            if self.model_type == "biobert":
+                model_name = settings.biobert_model
+            elif self.model_type == "clinicalbert":
+                model_name = settings.clinicalbert_model
+            else:
+                raise ValueError(f"Unknown model type: {self.model_type}. Use 'biobert' or 'clinicalbert'")
+            
+            revision = self.model_loader.get_model_revision(model_name)
+            if revision is None:
+                # Not downloaded yet - loading it records the revision
+                self._load_model()
+                revision = self.model_loader.get_model_revision(model_name) or "unknown"
+            
+            self._cache_namespace = (model_name, f"{revision}:cls:{self.max_length}")
+        
+        return self._cache_namespace
+    
     def encode_text(
         self,
         text: Union[str, List[str]],
@@ -153,6 +186,9 @@ class EmbeddingGenerator:
             logger.warning("Empty document text, returning zero embedding")
             return np.zeros(768, dtype=np.float32)
         
+        if self.cache is not None:
+            return self.generate_batch_embeddings([document], fields, show_progress=False)[0]
+        
         # Generate embedding
         embedding = self.encode_text(combined_text)[0]
         
@@ -172,7 +208,7 @@ class EmbeddingGenerator:
             show_progress: Show progress bar
             
         Returns:
-            List of embeddings
+            List of embeddings (rounded to float16 precision when a cache is used)
         """
         if fields is None:
             fields = ['title', 'abstract']
@@ -188,10 +224,33 @@ class EmbeddingGenerator:
             combined_text = " ".join(text_parts)
             texts.append(combined_text if combined_text.strip() else " ")
         
-        # Generate embeddings
-        embeddings = self.encode_text(texts, show_progress=show_progress)
-        
-        return [emb for emb in embeddings]
+        if self.cache is None:
+            embeddings = self.encode_text(texts, show_progress=show_progress)
+            return [emb for emb in embeddings]
+        
+        # Only encode texts that are not cached yet
+        model_name, revision = self._get_cache_namespace()
+        hashes = [EmbeddingCache.text_hash(text) for text in texts]
+        cached = self.cache.get_many(model_name, revision, hashes)
+        
+        missing = {}
+        for text_hash, text in zip(hashes, texts):
+            if text_hash not in cached:
+                missing.setdefault(text_hash, text)
+        
+        if missing:
+            computed = self.encode_text(list(missing.values()), show_progress=show_progress)
+            new_embeddings = {
+                text_hash: EmbeddingCache.as_stored(embedding)
+                for text_hash, embedding in zip(missing.keys(), computed)
+            }
+            self.cache.put_many(model_name, revision, new_embeddings)
+            cached.update(new_embeddings)
+        
+        logger.debug(
+            f"Embeddings: {len(texts) - len(missing)} cached, {len(missing)} computed"
+        )
+        return [cached[text_hash] for text_hash in hashes]
     
     def compute_similarity(
         self,
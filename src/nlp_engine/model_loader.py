@@ -166,6 +166,24 @@ class ModelLoader:
             logger.error(f"Failed to load QA model: {e}", exc_info=True)
             raise
     
+    def get_model_revision(self, model_name: str) -> Optional[str]:
+        """Get the commit hash of a downloaded model without loading it.
+        
+        Args:
+            model_name: Hugging Face model name
+        
+        Returns:
+            Commit hash, or None if the model is neither cached nor loaded
+        """
+        ref = Path(self.cache_dir) / f"models--{model_name.replace('/', '--')}" / "refs" / "main"
+        if ref.exists():
+            return ref.read_text().strip()
+        
+        if model_name in self._models:
+            return getattr(self._models[model_name].config, "_commit_hash", None)
+        
+        return None
+    
     def get_device(self) -> str:
         """Get current device.
         
@@ -0,0 +1,232 @@
+"""Scalar quantization of embeddings for compact index storage."""
+
+import json
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+
+import numpy as np
+
+from src.utils.config import settings
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+ELEMENT_TYPES = ("float", "float16", "byte")
+
+
+class EmbeddingQuantizer:
+    """Symmetric int8 quantizer shared by indexing and query encoding.
+    
+    A single global scale is used so that cosine similarity between
+    quantized vectors tracks the float similarity (a per-dimension scale
+    would re-weight dimensions). The scale is calibrated once on a sample
+    of document embeddings, clipping outliers at a high percentile.
+    """
+    
+    def __init__(
+        self,
+        scale: float = 1.0,
+        element_type: str = "byte",
+        percentile: float = 99.9,
+        model_name: Optional[str] = None
+    ):
+        """Initialize quantizer.
+        
+        Args:
+            scale: Absolute value mapped to 127
+            element_type: Index element type ('float', 'float16' or 'byte')
+            percentile: Percentile of |x| used by calibrate()
+            model_name: Embedding model the calibration belongs to
+        """
+        if element_type not in ELEMENT_TYPES:
+            raise ValueError(f"Unknown element type: {element_type}. Use one of {ELEMENT_TYPES}")
+        
+        self.scale = float(scale)
+        self.element_type = element_type
+        self.percentile = percentile
+        self.model_name = model_name
+    
+    def calibrate(self, embeddings: np.ndarray) -> "EmbeddingQuantizer":
+        """Fit the scale on a sample of embeddings.
+        
+        Args:
+            embeddings: Array of shape [n, dims]
+        
+        Returns:
+            self
+        """
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        self.scale = float(np.percentile(np.abs(embeddings), self.percentile)) or 1.0
+        logger.info(
+            f"Quantizer calibrated on {len(embeddings)} vectors "
+            f"(p{self.percentile} |x| = {self.scale:.4f})"
+        )
+        return self
+    
+    def quantize(self, embeddings: np.ndarray) -> np.ndarray:
+        """Quantize float embeddings to int8.
+        
+        Args:
+            embeddings: Array of shape [dims] or [n, dims]
+        
+        Returns:
+            int8 array of the same shape
+        """
+        scaled = np.asarray(embeddings, dtype=np.float32) * (127.0 / self.scale)
+        return np.clip(np.rint(scaled), -127, 127).astype(np.int8)
+    
+    def dequantize(self, quantized: np.ndarray) -> np.ndarray:
+        """Map int8 values back to approximate float embeddings.
+        
+        Args:
+            quantized: int8 array
+        
+        Returns:
+            float32 array
+        """
+        return quantized.astype(np.float32) * (self.scale / 127.0)
+    
+    def encode(self, embedding: np.ndarray, hex_bytes: bool = False) -> Union[List, str]:
+        """Encode one embedding for a bulk request in the index element type.
+        
+        Args:
+            embedding: Float embedding of shape [dims]
+            hex_bytes: Send byte vectors as a hex string (Elasticsearch >= 8.14),
+                2 characters per dimension instead of a JSON int list
+        
+        Returns:
+            JSON-serializable vector value
+        """
+        if self.element_type == "byte":
+            quantized = self.quantize(embedding)
+            return quantized.tobytes().hex() if hex_bytes else quantized.tolist()
+        
+        if self.element_type == "float16":
+            # Stored as fp16 by the engine; extra digits would only bloat the JSON
+            return np.asarray(embedding, dtype=np.float16).astype(np.float32).round(5).tolist()
+        
+        return np.asarray(embedding, dtype=np.float32).tolist()
+    
+    def bulk_encoder(self, es_client: Optional[Any] = None) -> Callable[[np.ndarray], Union[List, str]]:
+        """Get an encoder for DocumentIndexer(vector_encoder=...).
+        
+        Hex byte vectors are only used against Elasticsearch 8.14 or later.
+        
+        Args:
+            es_client: ElasticsearchClient the documents are sent to
+        
+        Returns:
+            Function mapping a float embedding to its bulk value
+        """
+        hex_bytes = (
+            self.element_type == "byte"
+            and es_client is not None
+            and es_client.version_at_least(8, 14)
+            and not es_client._is_opensearch
+        )
+        return lambda embedding: self.encode(embedding, hex_bytes=hex_bytes)
+    
+    def encode_query(self, embedding: np.ndarray) -> List:
+        """Encode a query embedding to match the indexed element type.
+        
+        Args:
+            embedding: Float query embedding
+        
+        Returns:
+            Query vector as a list
+        """
+        if self.element_type == "byte":
+            return self.quantize(embedding).tolist()
+        return np.asarray(embedding, dtype=np.float32).tolist()
+    
+    def reindex_script(self, field: str = "embedding") -> Dict:
+        """Painless script that quantizes stored float vectors during _reindex.
+        
+        Used when migrating an existing float index to a 'byte' mapping.
+        
+        Args:
+            field: Embedding field name
+        
+        Returns:
+            Script dictionary for IndexManager.reindex / rebuild_index
+        """
+        return {
+            "lang": "painless",
+            "source": (
+                f"def v = ctx._source['{field}']; "
+                "if (v instanceof List && v.size() > 0 && (v[0] instanceof Double || v[0] instanceof Float)) { "
+                "  def q = new ArrayList(); "
+                "  for (def x : v) { "
+                "    long r = Math.round(((Number) x).doubleValue() * params.factor); "
+                "    q.add((int) Math.max(-127L, Math.min(127L, r))); "
+                "  } "
+                f"  ctx._source['{field}'] = q; "
+                "}"
+            ),
+            "params": {"factor": 127.0 / self.scale}
+        }
+    
+    def save(self, path: Optional[Path] = None) -> Path:
+        """Persist the calibration.
+        
+        Args:
+            path: Target JSON file (default: settings.embedding_quantizer_path)
+        
+        Returns:
+            Path written
+        """
+        path = Path(path or settings.embedding_quantizer_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({
+                "scale": self.scale,
+                "element_type": self.element_type,
+                "percentile": self.percentile,
+                "model_name": self.model_name
+            }, f, indent=2)
+        logger.info(f"Saved quantizer calibration to: {path}")
+        return path
+    
+    @classmethod
+    def load(cls, path: Optional[Path] = None) -> "EmbeddingQuantizer":
+        """Load a saved calibration.
+        
+        Args:
+            path: JSON file (default: settings.embedding_quantizer_path)
+        
+        Returns:
+            EmbeddingQuantizer instance
+        """
+        path = Path(path or settings.embedding_quantizer_path)
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(**data)
+    
+    @classmethod
+    def from_settings(cls) -> "EmbeddingQuantizer":
+        """Build the quantizer for the configured element type.
+        
+        'float' and 'float16' need no calibration. For 'byte' the scale
+        decides where components are clipped to +-127, and BioBERT
+        components often exceed 1, so a calibration file is required.
+        
+        Returns:
+            EmbeddingQuantizer instance
+        
+        Raises:
+            FileNotFoundError: 'byte' is configured without a calibration file
+        """
+        element_type = settings.embedding_element_type
+        path = Path(settings.embedding_quantizer_path)
+        
+        if path.exists():
+            quantizer = cls.load(path)
+            quantizer.element_type = element_type
+            return quantizer
+        
+        if element_type == "byte":
+            raise FileNotFoundError(
+                f"EMBEDDING_ELEMENT_TYPE=byte needs a quantizer calibration at {path} - "
+                f"run scripts/quantization_report.py --save first"
+            )
+        return cls(element_type=element_type)
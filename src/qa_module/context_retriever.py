@@ -3,6 +3,7 @@
 from typing import List, Dict, Optional
 from src.search_engine import HybridSearchEngine
 from src.utils.logger import get_logger
+from src.utils.records import Passage
 from src.utils.web_search import WebSearchTool
 
 logger = get_logger(__name__)
@@ -72,31 +73,31 @@ class ContextRetriever:
             
             # Create passages from different sections
             if abstract:
-                passages.append({
-                    'text': abstract[:self.passage_length],
-                    'title': title,
-                    'doc_id': doc.get('id'),
-                    'source_type': source_type,
-                    'section': 'abstract',
-                    'score': doc.get('score', 0.0),
-                    'journal': source.get('journal'),
-                    'publication_date': source.get('publication_date') or source.get('start_date')
-                })
+                passages.append(Passage(
+                    text=abstract[:self.passage_length],
+                    title=title,
+                    doc_id=doc.get('id'),
+                    source_type=source_type,
+                    section='abstract',
+                    score=doc.get('score', 0.0),
+                    journal=source.get('journal'),
+                    publication_date=source.get('publication_date') or source.get('start_date')
+                ))
             
             if full_text and len(full_text) > len(abstract):
                 # Split full text into chunks
                 chunks = self._chunk_text(full_text, self.passage_length)
                 for i, chunk in enumerate(chunks[:3]):  # Max 3 chunks per doc
-                    passages.append({
-                        'text': chunk,
-                        'title': title,
-                        'doc_id': doc.get('id'),
-                        'source_type': source_type,
-                        'section': f'full_text_{i+1}',
-                        'score': doc.get('score', 0.0) * 0.8,  # Slightly lower score for full text
-                        'journal': source.get('journal'),
-                        'publication_date': source.get('publication_date') or source.get('start_date')
-                    })
+                    passages.append(Passage(
+                        text=chunk,
+                        title=title,
+                        doc_id=doc.get('id'),
+                        source_type=source_type,
+                        section=f'full_text_{i+1}',
+                        score=doc.get('score', 0.0) * 0.8,  # Slightly lower score for full text
+                        journal=source.get('journal'),
+                        publication_date=source.get('publication_date') or source.get('start_date')
+                    ))
         
         # Sort by score and return top k
         passages.sort(key=lambda x: x['score'], reverse=True)
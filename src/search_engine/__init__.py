@@ -3,9 +3,21 @@
 from .hybrid_search import HybridSearchEngine
 from .reranker import CrossEncoderReranker
 from .query_processor import QueryProcessor
+from .spell_corrector import SpellCorrector
+from .synonym_expander import SynonymExpander
+from .suggester import QuerySuggester, QueryLog
+from .facets import FacetService
+from .pagination import SearchPager, CursorError
 
 __all__ = [
     'HybridSearchEngine',
     'CrossEncoderReranker',
-    'QueryProcessor'
+    'QueryProcessor',
+    'SpellCorrector',
+    'SynonymExpander',
+    'QuerySuggester',
+    'QueryLog',
+    'FacetService',
+    'SearchPager',
+    'CursorError'
 ]
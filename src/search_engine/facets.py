@@ -0,0 +1,269 @@
+"""Facet counts for the search filters, cached per index write generation."""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from src.indexing import DocumentIndexer
+from src.utils.config import settings
+from src.utils.logger import get_logger
+from .query_processor import LEGACY_SEARCH_FIELDS
+
+logger = get_logger(__name__)
+
+# One aggregation per UI filter (see QueryProcessor.build_filter_clauses)
+FACET_AGGREGATIONS = {
+    "article_types": {"terms": {"field": "metadata.article_type.keyword", "size": 50}},
+    "subjects": {"terms": {"field": "metadata.subject.keyword", "size": 50}},
+    "availability": {
+        "filters": {
+            "filters": {
+                "full_text": {"exists": {"field": "full_text"}},
+                "open_access": {"term": {"metadata.is_open_access": True}}
+            }
+        }
+    },
+    "years": {"histogram": {"field": "pub_year", "interval": 1, "min_doc_count": 1}},
+    "sources": {"terms": {"field": "_index", "size": 20}}
+}
+
+# Index names searched by the API; their facets without a query or filter
+# are precomputed
+GLOBAL_INDICES = ("pubmed_articles", "clinical_trials", "pubmed_articles,clinical_trials")
+
+
+class FacetService:
+    """Filter counts for a query, computed with one aggregation request.
+    
+    Results are cached per (indices, corrected query, filters) together with
+    the write generation of the indices (see DocumentIndexer.generation):
+    an entry is used while no document was written through this process and
+    its TTL has not expired, the TTL covering writes by other processes
+    (ingestion scripts).
+    
+    Counts without a query or filter do not depend on the request. They are
+    computed at startup and recomputed in the background shortly after
+    every write, so they are always served from memory.
+    """
+    
+    def __init__(
+        self,
+        search_engine,
+        ttl: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        refresh_delay: Optional[float] = None
+    ):
+        """Initialize facet service.
+        
+        Args:
+            search_engine: HybridSearchEngine whose client and query
+                processor are used
+            ttl: Seconds a result is reused (default: FACET_CACHE_TTL setting)
+            max_entries: Cached (query, filters) results, least recently used
+                dropped first (default: FACET_CACHE_SIZE setting)
+            refresh_delay: Seconds between a write and the recomputation of
+                the global counts, so the write is searchable and bursts of
+                writes cause one refresh (default: FACET_REFRESH_DELAY setting)
+        """
+        self.search_engine = search_engine
+        self.ttl = ttl if ttl is not None else settings.facet_cache_ttl
+        self.max_entries = max_entries if max_entries is not None else settings.facet_cache_size
+        self.refresh_delay = refresh_delay if refresh_delay is not None else settings.facet_refresh_delay
+        
+        # key -> (generation, expiry, result)
+        self._cache: "OrderedDict[Tuple, Tuple[int, float, Dict]]" = OrderedDict()
+        self._global: Dict[str, Tuple[int, float, Dict]] = {}
+        self._refresh_timers: Dict[str, threading.Timer] = {}
+        self._last_write: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        
+        DocumentIndexer.add_write_listener(self._on_write)
+    
+    def warm(self):
+        """Compute the global counts of every searchable index."""
+        for index_name in GLOBAL_INDICES:
+            try:
+                self._refresh_global(index_name)
+            except Exception as e:
+                logger.warning(f"Could not precompute facets of {index_name}: {e}")
+    
+    def get_facets(
+        self,
+        index_name: str,
+        query: str = "",
+        date_from: Optional[int] = None,
+        date_to: Optional[int] = None,
+        article_types: Optional[List[str]] = None,
+        subject: Optional[str] = None,
+        availability: Optional[str] = None
+    ) -> Dict:
+        """Get the filter counts of the documents matching a search.
+        
+        Args:
+            index_name: Index to search (or 'all' for all indices)
+            query: Search query (empty: all documents)
+            date_from: Start year
+            date_to: End year
+            article_types: Article types filter
+            subject: Subject filter
+            availability: Availability filter
+        
+        Returns:
+            Dictionary with 'total', 'facets' (facet -> list of 'value' and
+            'count') and 'cached'
+        """
+        if index_name == "all":
+            index_name = "pubmed_articles,clinical_trials"
+        
+        generation = DocumentIndexer.generation(index_name)
+        filters = dict(
+            date_from=date_from, date_to=date_to, article_types=article_types,
+            subject=subject, availability=availability
+        )
+        filter_clauses = self.search_engine.query_processor.build_filter_clauses(**filters)
+        text = self.search_engine.query_processor.correct_query(query) if query else ""
+        
+        if not text and not filter_clauses:
+            return self._global_facets(index_name, generation)
+        
+        key = (index_name, text, json.dumps(filter_clauses, sort_keys=True))
+        now = time.monotonic()
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None and entry[0] == generation and entry[1] > now:
+                self._cache.move_to_end(key)
+                return {**entry[2], "cached": True}
+        
+        result = self._compute(index_name, text, filter_clauses, filters)
+        
+        with self._lock:
+            if self._searchable(index_name, now):
+                self._cache[key] = (generation, now + self.ttl, result)
+                self._cache.move_to_end(key)
+                while len(self._cache) > self.max_entries:
+                    self._cache.popitem(last=False)
+        return {**result, "cached": False}
+    
+    def clear(self):
+        """Drop all cached counts and pending refreshes."""
+        with self._lock:
+            for timer in self._refresh_timers.values():
+                timer.cancel()
+            self._refresh_timers.clear()
+            self._cache.clear()
+            self._global.clear()
+    
+    def close(self):
+        """Stop listening to writes and drop all cached counts."""
+        DocumentIndexer.remove_write_listener(self._on_write)
+        self.clear()
+    
+    def _global_facets(self, index_name: str, generation: int) -> Dict:
+        """Serve precomputed counts, refreshing them in the background if stale."""
+        with self._lock:
+            entry = self._global.get(index_name)
+        if entry is None:
+            return {**self._refresh_global(index_name), "cached": False}
+        if entry[0] != generation or entry[1] <= time.monotonic():
+            self._schedule_refresh(index_name, 0.0)
+        return {**entry[2], "cached": True}
+    
+    def _refresh_global(self, index_name: str) -> Dict:
+        """Recompute and store the counts of an index without query or filter."""
+        generation = DocumentIndexer.generation(index_name)
+        result = self._compute(index_name, "", [], {})
+        with self._lock:
+            self._global[index_name] = (generation, time.monotonic() + self.ttl, result)
+        logger.info(f"Facets of {index_name} refreshed ({result['total']} documents)")
+        return result
+    
+    def _schedule_refresh(self, index_name: str, delay: float):
+        """Refresh global counts on a background thread (once per index at a time)."""
+        with self._lock:
+            if index_name in self._refresh_timers:
+                return
+            timer = threading.Timer(delay, self._run_refresh, args=(index_name,))
+            timer.daemon = True
+            self._refresh_timers[index_name] = timer
+        timer.start()
+    
+    def _run_refresh(self, index_name: str):
+        with self._lock:
+            # Writes from now on schedule another refresh
+            self._refresh_timers.pop(index_name, None)
+        try:
+            self._refresh_global(index_name)
+        except Exception as e:
+            logger.warning(f"Could not refresh facets of {index_name}: {e}")
+    
+    def _on_write(self, written: str):
+        """Write listener: recompute the global counts that include the index."""
+        with self._lock:
+            self._last_write[written] = time.monotonic()
+            affected = [name for name in self._global if written in name.split(",")]
+        for index_name in affected:
+            self._schedule_refresh(index_name, self.refresh_delay)
+    
+    def _searchable(self, index_name: str, now: float) -> bool:
+        """Whether all writes to the indices were searchable when counting started."""
+        return all(
+            now - self._last_write.get(name, float("-inf")) >= self.refresh_delay
+            for name in index_name.split(",")
+        )
+    
+    def _compute(self, index_name: str, text: str, filter_clauses: List[Dict], filters: Dict) -> Dict:
+        """Run the aggregation request.
+        
+        The query is the one keyword search sends, including its fuzzy
+        retry when nothing matches exactly.
+        """
+        if text:
+            fields = None if self.search_engine.has_search_text(index_name) else LEGACY_SEARCH_FIELDS
+            body = self.search_engine.query_processor.build_elasticsearch_query(text, fields, **filters)
+        else:
+            body = {"query": {"bool": {"filter": filter_clauses}}}
+        body.update({"size": 0, "track_total_hits": True, "aggs": FACET_AGGREGATIONS})
+        
+        response = self.search_engine.es_client.client.search(index=index_name, body=body)
+        if text and self._total(response) == 0:
+            body.update(self.search_engine.query_processor.build_elasticsearch_query(
+                text, fields, fuzzy=True, **filters
+            ))
+            response = self.search_engine.es_client.client.search(index=index_name, body=body)
+        
+        aggregations = response.get("aggregations", {})
+        
+        def buckets(name: str) -> List[Dict]:
+            return [
+                {"value": bucket["key"], "count": bucket["doc_count"]}
+                for bucket in aggregations.get(name, {}).get("buckets", [])
+            ]
+        
+        sources: Dict[str, int] = {}
+        for bucket in buckets("sources"):
+            source = "clinical_trials" if bucket["value"].startswith("clinical_trials") else "pubmed"
+            sources[source] = sources.get(source, 0) + bucket["count"]
+        
+        availability = aggregations.get("availability", {}).get("buckets", {})
+        return {
+            "total": self._total(response),
+            "facets": {
+                "article_types": buckets("article_types"),
+                "subjects": buckets("subjects"),
+                "availability": [
+                    {"value": name, "count": bucket["doc_count"]} for name, bucket in availability.items()
+                ],
+                "years": [
+                    {"value": int(bucket["value"]), "count": bucket["count"]} for bucket in buckets("years")
+                ],
+                "sources": [{"value": name, "count": count} for name, count in sources.items()]
+            }
+        }
+    
+    @staticmethod
+    def _total(response: Dict) -> int:
+        """Total hits of a response (an object since Elasticsearch 7)."""
+        total = response["hits"]["total"]
+        return total["value"] if isinstance(total, dict) else int(total)
@@ -1,16 +1,27 @@
 """Hybrid search combining BM25 and semantic search."""
 
 import numpy as np
-from typing import List, Dict, Optional, Tuple
+from typing import Iterator, List, Dict, Optional, Set, Tuple
 from elasticsearch import Elasticsearch
 
+from src.utils.config import settings
 from src.utils.logger import get_logger
 from src.indexing import ElasticsearchClient
-from src.nlp_engine import EmbeddingGenerator
-from .query_processor import QueryProcessor
+from src.nlp_engine import EmbeddingGenerator, EmbeddingQuantizer
+from src.utils.records import SearchHit
+from .query_processor import LEGACY_SEARCH_FIELDS, QueryProcessor
 
 logger = get_logger(__name__)
 
+# How keyword and vector retrieval are combined (see hybrid_search)
+HYBRID_MODES = ("fusion", "native", "rescore", "rescore_client")
+
+# Reciprocal rank fusion constant (Elasticsearch default)
+RRF_RANK_CONSTANT = 60
+
+# Errors that mean "this backend cannot run the request", not "try again"
+UNSUPPORTED_STATUSES = {400, 403, 404, 405}
+
 
 class HybridSearchEngine:
     """Hybrid search engine combining keyword (BM25) and semantic search."""
@@ -20,7 +31,10 @@ class HybridSearchEngine:
         es_client: Optional[ElasticsearchClient] = None,
         embedding_generator: Optional[EmbeddingGenerator] = None,
         query_processor: Optional[QueryProcessor] = None,
-        alpha: float = 0.5
+        alpha: float = 0.5,
+        quantizer: Optional[EmbeddingQuantizer] = None,
+        mode: Optional[str] = None,
+        rescore_window: Optional[int] = None
     ):
         """Initialize hybrid search engine.
         
@@ -29,11 +43,31 @@ class HybridSearchEngine:
             embedding_generator: Embedding generator for semantic search
             query_processor: Query processor for query enhancement
             alpha: Weight for BM25 score (1-alpha for semantic score)
+            quantizer: Quantizer for indices with byte embeddings
+                (default: from the EMBEDDING_* settings)
+            mode: Default hybrid mode, one of HYBRID_MODES
+                (default: SEARCH_HYBRID_MODE setting)
+            rescore_window: BM25 hits re-scored by vector similarity in the
+                rescore modes (default: SEARCH_RESCORE_WINDOW setting)
         """
         self.es_client = es_client or ElasticsearchClient()
         self.embedding_generator = embedding_generator or EmbeddingGenerator(model_type="biobert")
         self.query_processor = query_processor or QueryProcessor()
         self.alpha = alpha
+        self.quantizer = quantizer or EmbeddingQuantizer.from_settings()
+        self.mode = mode or settings.search_hybrid_mode
+        self.rescore_window = rescore_window or settings.search_rescore_window
+        if self.mode not in HYBRID_MODES:
+            raise ValueError(f"Unknown hybrid mode: {self.mode}. Use one of {HYBRID_MODES}")
+        
+        # (index, field) -> (mapping type, element type)
+        self._vector_fields: Dict[Tuple[str, str], Tuple[str, str]] = {}
+        # index -> whether it has the 'search_text' copy_to field
+        self._search_text: Dict[str, bool] = {}
+        # index -> whether the cluster can fuse keyword and kNN results itself
+        self._native_hybrid: Dict[str, bool] = {}
+        # OpenSearch normalization search pipelines created so far
+        self._search_pipelines: Set[str] = set()
         
         logger.info(f"HybridSearchEngine initialized with alpha={alpha}")
     
@@ -48,45 +82,46 @@ class HybridSearchEngine:
         article_types: Optional[List[str]] = None,
         subject: Optional[str] = None,
         availability: Optional[str] = None,
-        sort_by: str = "relevance"
+        sort_by: str = "relevance",
+        fuzzy: bool = False
     ) -> List[Dict]:
         """Perform keyword-based search (BM25).
         
+        Terms are matched exactly; when nothing matches, the query is retried
+        once with fuzzy matching.
+        
         Args:
             index_name: Index to search
             query: Search query
             size: Number of results to return
-            fields: Fields to search
+            fields: Fields to search besides the boosted title (default:
+                'search_text', or the legacy fields on older indices)
             date_from: Start year
             date_to: End year
             article_types: Article types filter
             subject: Subject filter
             availability: Availability filter
             sort_by: Sort criteria
+            fuzzy: Match terms within an edit distance from the start
             
         Returns:
             List of search results with scores
         """
+        if fields is None and not self.has_search_text(index_name):
+            fields = LEGACY_SEARCH_FIELDS
+        
         # Build Elasticsearch query
         es_query = self.query_processor.build_elasticsearch_query(
             query, fields, date_from=date_from, date_to=date_to,
-            article_types=article_types, subject=subject, availability=availability
+            article_types=article_types, subject=subject, availability=availability,
+            fuzzy=fuzzy
         )
         es_query['size'] = size
         
         # Add sorting
-        if sort_by == "date_desc":
-            es_query['sort'] = [
-                {"publication_year": {"order": "desc", "unmapped_type": "integer"}},
-                {"year": {"order": "desc", "unmapped_type": "integer"}},
-                "_score"
-            ]
-        elif sort_by == "date_asc":
-            es_query['sort'] = [
-                {"publication_year": {"order": "asc", "unmapped_type": "integer"}},
-                {"year": {"order": "asc", "unmapped_type": "integer"}},
-                "_score"
-            ]
+        sort = self.query_processor.build_sort(sort_by)
+        if sort:
+            es_query['sort'] = sort
         
         logger.debug(f"Keyword search query: {es_query}")
         
@@ -99,17 +134,164 @@ class HybridSearchEngine:
         # Extract results
         results = []
         for hit in response['hits']['hits']:
-            result = {
-                'id': hit['_id'],
-                'score': hit['_score'],
-                'source': hit['_source']
-            }
+            result = SearchHit(
+                id=hit['_id'],
+                score=hit['_score'] or 0.0,
+                source=hit['_source']
+            )
             results.append(result)
         
+        if not results and not fuzzy:
+            logger.info("No exact keyword matches - retrying with fuzzy matching")
+            return self.keyword_search(
+                index_name, query, size=size, fields=fields, date_from=date_from,
+                date_to=date_to, article_types=article_types, subject=subject,
+                availability=availability, sort_by=sort_by, fuzzy=True
+            )
+        
         logger.info(f"Keyword search returned {len(results)} results")
         
         return results
     
+    def keyword_page(
+        self,
+        index_name: str,
+        pit_id: str,
+        query: str,
+        size: int = 20,
+        sort_by: str = "relevance",
+        search_after: Optional[List] = None,
+        keep_alive: str = "5m",
+        fuzzy: bool = False,
+        date_from: Optional[int] = None,
+        date_to: Optional[int] = None,
+        article_types: Optional[List[str]] = None,
+        subject: Optional[str] = None,
+        availability: Optional[str] = None,
+        source_includes: Optional[List[str]] = None
+    ) -> Tuple[List[Dict], str, Optional[List]]:
+        """Fetch one page of keyword results from a point in time.
+        
+        Hits are sorted by the sort option, then by the ``id`` keyword, so
+        the sort values of the last hit identify the position for the next
+        page (``search_after``) whatever the ties.
+        
+        Args:
+            index_name: Indices behind the PIT (for the query fields)
+            pit_id: Point in time opened on index_name
+            query: Search query
+            size: Hits per page
+            sort_by: 'relevance', 'date_desc' or 'date_asc'
+            search_after: Sort values of the last hit of the previous page
+            keep_alive: PIT keep-alive until the next page
+            fuzzy: Match terms within an edit distance
+            date_from: Start year
+            date_to: End year
+            article_types: Article types filter
+            subject: Subject filter
+            availability: Availability filter
+            source_includes: Source fields to return (default: all)
+        
+        Returns:
+            (results, PIT ID to use for the next page, sort values of the
+            last hit or None if this was the last page)
+        """
+        fields = None if self.has_search_text(index_name) else LEGACY_SEARCH_FIELDS
+        es_query = self.query_processor.build_elasticsearch_query(
+            query, fields, date_from=date_from, date_to=date_to,
+            article_types=article_types, subject=subject, availability=availability,
+            fuzzy=fuzzy
+        )
+        es_query['size'] = size
+        es_query['sort'] = (self.query_processor.build_sort(sort_by) or ["_score"]) + [
+            {"id": {"order": "asc", "unmapped_type": "keyword"}}
+        ]
+        es_query['track_total_hits'] = False
+        es_query['track_scores'] = True
+        es_query['pit'] = {'id': pit_id, 'keep_alive': keep_alive}
+        if search_after:
+            es_query['search_after'] = search_after
+        if source_includes is not None:
+            es_query['_source'] = source_includes
+        
+        response = self.es_client.client.search(body=es_query)
+        hits = response['hits']['hits']
+        results = [
+            SearchHit(id=hit['_id'], score=hit['_score'] or 0.0, source=hit['_source'])
+            for hit in hits
+        ]
+        last_sort = hits[-1]['sort'] if len(hits) == size else None
+        return results, response.get('pit_id', pit_id), last_sort
+    
+    def iter_keyword_results(
+        self,
+        index_name: str,
+        query: str,
+        sort_by: str = "relevance",
+        limit: Optional[int] = None,
+        page_size: int = 1000,
+        source_includes: Optional[List[str]] = None,
+        keep_alive: str = "2m",
+        date_from: Optional[int] = None,
+        date_to: Optional[int] = None,
+        article_types: Optional[List[str]] = None,
+        subject: Optional[str] = None,
+        availability: Optional[str] = None
+    ) -> Iterator[Dict]:
+        """Stream all keyword matches of a query, page by page.
+        
+        Pages are read from one point in time with search_after (see
+        keyword_page), so memory use does not depend on the number of
+        matches. The PIT is released when the iterator is exhausted or closed.
+        
+        Args:
+            index_name: Index to search (or 'all' for all indices)
+            query: Search query (spell-corrected like in hybrid_search)
+            sort_by: 'relevance', 'date_desc' or 'date_asc'
+            limit: Maximum number of results (default: all)
+            page_size: Hits per request
+            source_includes: Source fields to return (default: all)
+            keep_alive: PIT keep-alive between pages
+            date_from: Start year
+            date_to: End year
+            article_types: Article types filter
+            subject: Subject filter
+            availability: Availability filter
+        
+        Yields:
+            Search results in sort order
+        """
+        if index_name == 'all':
+            index_name = 'pubmed_articles,clinical_trials'
+        keyword_query = self.query_processor.correct_query(query)
+        
+        pit_id = self.es_client.open_point_in_time(index_name, keep_alive=keep_alive)
+        try:
+            search_after = None
+            fuzzy = False
+            count = 0
+            while limit is None or count < limit:
+                size = page_size if limit is None else min(page_size, limit - count)
+                results, pit_id, next_after = self.keyword_page(
+                    index_name, pit_id, keyword_query, size=size, sort_by=sort_by,
+                    search_after=search_after, keep_alive=keep_alive, fuzzy=fuzzy,
+                    date_from=date_from, date_to=date_to, article_types=article_types,
+                    subject=subject, availability=availability,
+                    source_includes=source_includes
+                )
+                if not results and count == 0 and not fuzzy:
+                    logger.info("No exact keyword matches - retrying with fuzzy matching")
+                    fuzzy = True
+                    continue
+                
+                yield from results
+                count += len(results)
+                if next_after is None:
+                    break
+                search_after = next_after
+        finally:
+            self.es_client.close_point_in_time(pit_id)
+    
     def semantic_search(
         self,
         index_name: str,
@@ -140,61 +322,10 @@ class HybridSearchEngine:
         Returns:
             List of search results with similarity scores
         """
-        # Generate query embedding
-        query_embedding = self.embedding_generator.encode_text(query)[0]
-        
-        # Build filter clause
-        filter_clauses = []
-        if date_from or date_to:
-            range_filter = {}
-            if date_from:
-                range_filter['gte'] = str(date_from)
-            if date_to:
-                range_filter['lte'] = str(date_to)
-            
-            filter_clauses.append({
-                "bool": {
-                    "should": [
-                        {"range": {"publication_year.keyword": range_filter}},
-                        {"range": {"year.keyword": range_filter}},
-                        {"range": {"start_year.keyword": range_filter}},
-                        {"range": {"metadata.publication_year.keyword": range_filter}},
-                        {"range": {"metadata.year.keyword": range_filter}}
-                    ],
-                    "minimum_should_match": 1
-                }
-            })
-
-        # Article Type Filter
-        if article_types and len(article_types) > 0:
-            filter_clauses.append({
-                "terms": {
-                    "metadata.article_type.keyword": article_types
-                }
-            })
-            
-        # Subject Filter
-        if subject and subject != 'all':
-            filter_clauses.append({
-                "term": {
-                    "metadata.subject.keyword": subject
-                }
-            })
-            
-        # Availability Filter
-        if availability and availability != 'all':
-            if availability == 'full_text':
-                filter_clauses.append({
-                    "exists": {
-                        "field": "full_text"
-                    }
-                })
-            elif availability == 'open_access':
-                 filter_clauses.append({
-                    "term": {
-                        "metadata.is_open_access": True
-                    }
-                })
+        filter_clauses = self.query_processor.build_filter_clauses(
+            date_from=date_from, date_to=date_to, article_types=article_types,
+            subject=subject, availability=availability
+        )
 
         # Build cosine similarity query
         base_query = {'match_all': {}}
@@ -205,24 +336,9 @@ class HybridSearchEngine:
                 }
             }
 
-        # Build script for vector similarity
-        # ES uses cosineSimilarity, OpenSearch requires manual dot product in Painless
-        is_opensearch = getattr(self.es_client, '_is_opensearch', False)
-        
-        if is_opensearch:
-            # Manual dot product for OpenSearch compatibility
-            script_source = (
-                f"double dot = 0; "
-                f"if (doc.containsKey('{embedding_field}') && doc['{embedding_field}'].size() > 0) {{ "
-                f"  for (int i = 0; i < params.query_vector.length; i++) {{ "
-                f"    dot += (double)params.query_vector[i] * (double)doc['{embedding_field}'][i]; "
-                f"  }} "
-                f"}} "
-                f"return dot + 1.0;"
-            )
-        else:
-            # Standard Elasticsearch cosine similarity
-            script_source = f"cosineSimilarity(params.query_vector, '{embedding_field}') + 1.0"
+        # Vector similarity script (+1 keeps scores non-negative)
+        script_source = self._similarity_script(index_name, embedding_field)
+        query_vector = self._query_vector(index_name, query, embedding_field)
 
         es_query = {
             'size': size,
@@ -232,7 +348,7 @@ class HybridSearchEngine:
                     'script': {
                         'source': script_source,
                         'params': {
-                            'query_vector': query_embedding.tolist()
+                            'query_vector': query_vector
                         }
                     }
                 }
@@ -240,18 +356,9 @@ class HybridSearchEngine:
         }
         
         # Add sorting - only if we want to override similarity
-        if sort_by == "date_desc":
-            es_query['sort'] = [
-                {"publication_year": {"order": "desc", "unmapped_type": "integer"}},
-                {"year": {"order": "desc", "unmapped_type": "integer"}},
-                "_score"
-            ]
-        elif sort_by == "date_asc":
-            es_query['sort'] = [
-                {"publication_year": {"order": "asc", "unmapped_type": "integer"}},
-                {"year": {"order": "asc", "unmapped_type": "integer"}},
-                "_score"
-            ]
+        sort = self.query_processor.build_sort(sort_by)
+        if sort:
+            es_query['sort'] = sort
             
         logger.debug(f"Semantic search for: {query}")
         
@@ -265,11 +372,11 @@ class HybridSearchEngine:
             # Extract results
             results = []
             for hit in response['hits']['hits']:
-                result = {
-                    'id': hit['_id'],
-                    'score': hit['_score'] - 1.0 if '_score' in hit else 0.0,
-                    'source': hit['_source']
-                }
+                result = SearchHit(
+                    id=hit['_id'],
+                    score=hit['_score'] - 1.0 if '_score' in hit else 0.0,
+                    source=hit['_source']
+                )
                 results.append(result)
             
             logger.info(f"Semantic search returned {len(results)} results")
@@ -293,10 +400,21 @@ class HybridSearchEngine:
         article_types: Optional[List[str]] = None,
         subject: Optional[str] = None,
         availability: Optional[str] = None,
-        sort_by: str = "relevance"
+        sort_by: str = "relevance",
+        mode: Optional[str] = None
     ) -> List[Dict]:
         """Perform hybrid search combining BM25 and semantic search.
         
+        In 'fusion' mode a keyword and a vector query are sent separately and
+        their min-max normalized scores are combined here. In 'native' mode
+        one request carries both and the cluster fuses them (Elasticsearch RRF
+        retriever, OpenSearch hybrid query with a normalization pipeline), so
+        only the top hits are transferred; backends that cannot do this fall
+        back to 'fusion'. The rescore modes skip the full vector search: the
+        top BM25 hits are re-scored by cosine to the query embedding, either
+        in a rescore window on the cluster ('rescore') or here from their
+        stored embeddings ('rescore_client').
+        
         Args:
             index_name: Index to search (or 'all' for all indices)
             query: Search query
@@ -308,26 +426,59 @@ class HybridSearchEngine:
             subject: Subject filter
             availability: Availability filter
             sort_by: Sort criteria
+            mode: Hybrid mode, one of HYBRID_MODES (overrides default)
             
         Returns:
             List of search results with combined scores
         """
         alpha = alpha if alpha is not None else self.alpha
+        mode = mode or self.mode
+        if mode not in HYBRID_MODES:
+            raise ValueError(f"Unknown hybrid mode: {mode}. Use one of {HYBRID_MODES}")
         
-        logger.info(f"Hybrid search: '{query}' (alpha={alpha}, sort={sort_by})")
+        logger.info(f"Hybrid search: '{query}' (alpha={alpha}, sort={sort_by}, mode={mode})")
         
         # Handle 'all' index - search both indices
         if index_name == 'all':
             index_name = 'pubmed_articles,clinical_trials'
         
-        # Process query
-        processed = self.query_processor.process_query(query)
-        expanded_query = processed['expanded']
+        # Spell-correct the keyword query (synonyms are added as separate
+        # clauses by QueryProcessor.build_elasticsearch_query)
+        keyword_query = self.query_processor.correct_query(query)
+        
+        if mode in ("rescore", "rescore_client"):
+            results = self.rescore_search(
+                index_name, keyword_query, query, size=size, alpha=alpha,
+                server_side=mode == "rescore",
+                date_from=date_from, date_to=date_to,
+                article_types=article_types, subject=subject, availability=availability
+            )
+            if not results:
+                results = self.rescore_search(
+                    index_name, keyword_query, query, size=size, alpha=alpha,
+                    server_side=mode == "rescore", fuzzy=True,
+                    date_from=date_from, date_to=date_to,
+                    article_types=article_types, subject=subject, availability=availability
+                )
+            final_results = self._sort_results(results, sort_by)[:size]
+            logger.info(f"Rescore hybrid search returned {len(final_results)} results")
+            return final_results
+        
+        if mode == "native":
+            native_results = self.native_hybrid_search(
+                index_name, keyword_query, query, size=size, alpha=alpha,
+                date_from=date_from, date_to=date_to,
+                article_types=article_types, subject=subject, availability=availability
+            )
+            if native_results is not None:
+                final_results = self._sort_results(native_results, sort_by)
+                logger.info(f"Native hybrid search returned {len(final_results)} results")
+                return final_results
         
         # Perform both searches with date filters
         # Note: we use relevance sorting for the sub-searches to get top relevant candidates
         keyword_results = self.keyword_search(
-            index_name, expanded_query, size=size*2, 
+            index_name, keyword_query, size=size*2, 
             date_from=date_from, date_to=date_to, 
             article_types=article_types, subject=subject, availability=availability,
             sort_by="relevance"
@@ -371,39 +522,492 @@ class HybridSearchEngine:
                         break
             
             if source:
-                combined_results.append({
-                    'id': doc_id,
-                    'score': combined_score,
-                    'keyword_score': kw_score,
-                    'semantic_score': sem_score,
-                    'source': source
-                })
-        
-        # Sort by combined score or date
+                combined_results.append(SearchHit(
+                    id=doc_id,
+                    score=combined_score,
+                    keyword_score=kw_score,
+                    semantic_score=sem_score,
+                    source=source
+                ))
+        
+        # Sort by combined score or date and return top results
+        final_results = self._sort_results(combined_results, sort_by)[:size]
+        
+        logger.info(f"Hybrid search returned {len(final_results)} results")
+        
+        return final_results
+    
+    def rescore_search(
+        self,
+        index_name: str,
+        keyword_query: str,
+        query: str,
+        size: int = 20,
+        alpha: Optional[float] = None,
+        window: Optional[int] = None,
+        server_side: bool = True,
+        fuzzy: bool = False,
+        embedding_field: str = 'embedding',
+        date_from: Optional[int] = None,
+        date_to: Optional[int] = None,
+        article_types: Optional[List[str]] = None,
+        subject: Optional[str] = None,
+        availability: Optional[str] = None
+    ) -> List[Dict]:
+        """Re-score the top BM25 hits by cosine similarity to the query.
+        
+        Both sides score the hits in the rescore window as
+        ``alpha * bm25 / max_bm25 + (1 - alpha) * (cosine + 1) / 2``, so each
+        term lies in [0, 1] and alpha weighs them the same way (and ranks the
+        same) on the cluster and here. ``max_bm25`` is the top BM25 score,
+        fetched by a one-hit query before the server-side rescore. Client-side,
+        the stored embeddings are fetched and scored with one matrix product.
+        A failed server-side rescore falls back to the client-side one.
+        
+        Args:
+            index_name: Index, alias or comma-separated list
+            keyword_query: Query text for BM25 (usually the spell-corrected query)
+            query: Query text to embed
+            size: Number of results to return
+            alpha: Weight for BM25 score (overrides default)
+            window: Number of BM25 hits to re-score (default: rescore_window)
+            server_side: Re-score on the cluster instead of here
+            fuzzy: Match terms within an edit distance
+            embedding_field: Name of embedding field in documents
+            date_from: Start year
+            date_to: End year
+            article_types: Article types filter
+            subject: Subject filter
+            availability: Availability filter
+        
+        Returns:
+            Up to ``window`` results, best first
+        """
+        alpha = alpha if alpha is not None else self.alpha
+        window = max(window or self.rescore_window, size)
+        
+        fields = None if self.has_search_text(index_name) else LEGACY_SEARCH_FIELDS
+        es_query = self.query_processor.build_elasticsearch_query(
+            keyword_query, fields, date_from=date_from, date_to=date_to,
+            article_types=article_types, subject=subject, availability=availability,
+            fuzzy=fuzzy
+        )
+        es_query['size'] = window
+        query_vector = self._query_vector(index_name, query, embedding_field)
+        
+        if server_side:
+            rescore_query = {
+                'window_size': window,
+                'query': {
+                    'rescore_query': {
+                        'script_score': {
+                            'query': {'match_all': {}},
+                            'script': {
+                                'source': self._similarity_script(index_name, embedding_field),
+                                'params': {'query_vector': query_vector}
+                            }
+                        }
+                    },
+                    # The script returns cosine + 1
+                    'rescore_query_weight': (1.0 - alpha) / 2,
+                    'score_mode': 'total'
+                }
+            }
+            try:
+                # BM25 is unbounded: scale it by the best score of this query
+                probe = dict(es_query, size=1, _source=False, track_total_hits=False)
+                top = self.es_client.client.search(index=index_name, body=probe)['hits']['hits']
+                if not top:
+                    return []
+                max_score = top[0].get('_score') or 0.0
+                rescore_query['query']['query_weight'] = (
+                    alpha / max_score if max_score > 0 else alpha
+                )
+                response = self.es_client.client.search(
+                    index=index_name,
+                    body=dict(
+                        es_query, size=size, _source={'excludes': [embedding_field]},
+                        rescore=rescore_query
+                    )
+                )
+                return [
+                    SearchHit(id=hit['_id'], score=hit.get('_score') or 0.0, source=hit['_source'])
+                    for hit in response['hits']['hits']
+                ]
+            except Exception as e:
+                logger.warning(f"Server-side rescore on {index_name} failed, re-scoring locally: {e}")
+        
+        response = self.es_client.client.search(index=index_name, body=es_query)
+        hits = response['hits']['hits']
+        if not hits:
+            return []
+        
+        _, element_type = self._get_vector_field(index_name, embedding_field)
+        dims = len(query_vector)
+        matrix = np.zeros((len(hits), dims), dtype=np.float32)
+        for row, hit in enumerate(hits):
+            stored = self._decode_vector(hit['_source'].pop(embedding_field, None), element_type)
+            if stored is not None and stored.shape == (dims,):
+                matrix[row] = stored
+        
+        # Cosine is scale-invariant, so int8 vectors need no dequantization
+        query_array = np.asarray(query_vector, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(query_array)
+        cosine = (matrix @ query_array) / np.maximum(norms, 1e-12)
+        
+        bm25 = [hit.get('_score') or 0.0 for hit in hits]
+        max_score = max(bm25)
+        keyword_scores = [score / max_score if max_score > 0 else score for score in bm25]
+        semantic_scores = ((cosine + 1.0) / 2).tolist()
+        
+        results = [
+            SearchHit(
+                id=hit['_id'],
+                score=alpha * kw_score + (1 - alpha) * sem_score,
+                keyword_score=kw_score,
+                semantic_score=sem_score,
+                source=hit['_source']
+            )
+            for hit, kw_score, sem_score in zip(hits, keyword_scores, semantic_scores)
+        ]
+        results.sort(key=lambda x: x['score'], reverse=True)
+        return results
+    
+    @staticmethod
+    def _decode_vector(value, element_type: str) -> Optional[np.ndarray]:
+        """Turn a stored embedding (float list, int8 list or hex string) into an array.
+        
+        Args:
+            value: Embedding as found in _source
+            element_type: Element type of the mapping
+        
+        Returns:
+            Vector, or None if the document has no embedding
+        """
+        if value is None or len(value) == 0:
+            return None
+        if isinstance(value, str):
+            # Hex-encoded int8 vector (Elasticsearch byte fields)
+            return np.frombuffer(bytes.fromhex(value), dtype=np.int8).astype(np.float32)
+        return np.asarray(value, dtype=np.float32)
+    
+    def native_hybrid_search(
+        self,
+        index_name: str,
+        keyword_query: str,
+        query: str,
+        size: int = 20,
+        alpha: Optional[float] = None,
+        embedding_field: str = 'embedding',
+        date_from: Optional[int] = None,
+        date_to: Optional[int] = None,
+        article_types: Optional[List[str]] = None,
+        subject: Optional[str] = None,
+        availability: Optional[str] = None
+    ) -> Optional[List[Dict]]:
+        """Run keyword and kNN retrieval in one request, fused by the cluster.
+        
+        Elasticsearch (8.14+) combines them with the RRF retriever, where
+        alpha has no effect; OpenSearch (2.10+) runs a hybrid query through a
+        min-max normalization pipeline weighted by alpha.
+        
+        Args:
+            index_name: Index, alias or comma-separated list
+            keyword_query: Query text for BM25 (usually the spell-corrected query)
+            query: Query text to embed
+            size: Number of results to return
+            alpha: Weight for BM25 score (OpenSearch only)
+            embedding_field: Name of embedding field in documents
+            date_from: Start year
+            date_to: End year
+            article_types: Article types filter
+            subject: Subject filter
+            availability: Availability filter
+        
+        Returns:
+            Search results by fused score, or None if the backend cannot fuse
+            natively (the caller then uses client-side fusion)
+        """
+        if not self._native_hybrid_supported(index_name, embedding_field):
+            return None
+        
+        alpha = alpha if alpha is not None else self.alpha
+        filter_clauses = self.query_processor.build_filter_clauses(
+            date_from=date_from, date_to=date_to, article_types=article_types,
+            subject=subject, availability=availability
+        )
+        fields = None if self.has_search_text(index_name) else LEGACY_SEARCH_FIELDS
+        keyword_clause = self.query_processor.build_elasticsearch_query(
+            keyword_query, fields, date_from=date_from, date_to=date_to,
+            article_types=article_types, subject=subject, availability=availability
+        )['query']
+        query_vector = self._query_vector(index_name, query, embedding_field)
+        
+        # Same candidate depth per retriever as client-side fusion
+        window = size * 2
+        knn_filter = {'bool': {'filter': filter_clauses}} if filter_clauses else None
+        
+        try:
+            if self.es_client._is_opensearch:
+                knn = {'vector': query_vector, 'k': window}
+                if knn_filter:
+                    knn['filter'] = knn_filter
+                response = self.es_client.client.search(
+                    index=index_name,
+                    body={
+                        'size': size,
+                        'query': {
+                            'hybrid': {
+                                'queries': [keyword_clause, {'knn': {embedding_field: knn}}]
+                            }
+                        }
+                    },
+                    params={'search_pipeline': self._normalization_pipeline(alpha)}
+                )
+            else:
+                knn = {
+                    'field': embedding_field,
+                    'query_vector': query_vector,
+                    'k': window,
+                    'num_candidates': min(max(window * 5, 100), 10000)
+                }
+                if knn_filter:
+                    knn['filter'] = knn_filter
+                response = self.es_client.client.search(
+                    index=index_name,
+                    body={
+                        'size': size,
+                        'retriever': {
+                            'rrf': {
+                                'retrievers': [
+                                    {'standard': {'query': keyword_clause}},
+                                    {'knn': knn}
+                                ],
+                                'rank_window_size': window,
+                                'rank_constant': RRF_RANK_CONSTANT
+                            }
+                        }
+                    }
+                )
+        except Exception as e:
+            if self._error_status(e) in UNSUPPORTED_STATUSES:
+                self._native_hybrid[index_name] = False
+            logger.warning(f"Native hybrid search on {index_name} failed, using client-side fusion: {e}")
+            return None
+        
+        return [
+            SearchHit(id=hit['_id'], score=hit.get('_score') or 0.0, source=hit['_source'])
+            for hit in response['hits']['hits']
+        ]
+    
+    def _native_hybrid_supported(self, index_name: str, embedding_field: str) -> bool:
+        """Check (and cache) whether the cluster can fuse results for an index.
+        
+        Args:
+            index_name: Index, alias or comma-separated list
+            embedding_field: Name of embedding field in documents
+        
+        Returns:
+            True if the backend version and the vector mapping allow it
+        """
+        if index_name in self._native_hybrid:
+            return self._native_hybrid[index_name]
+        
+        field_type, _ = self._get_vector_field(index_name, embedding_field)
+        if self.es_client._is_opensearch:
+            supported = field_type == 'knn_vector' and self.es_client.version_at_least(2, 10)
+        else:
+            supported = field_type == 'dense_vector' and self.es_client.version_at_least(8, 14)
+        
+        if not supported:
+            logger.info(
+                f"Native hybrid search not available for {index_name} "
+                f"(version {self.es_client.version}, vector type '{field_type}') - using client-side fusion"
+            )
+        self._native_hybrid[index_name] = supported
+        return supported
+    
+    def _normalization_pipeline(self, alpha: float) -> str:
+        """Create (once) the OpenSearch search pipeline for a BM25 weight.
+        
+        Args:
+            alpha: Weight for BM25 score
+        
+        Returns:
+            Pipeline name
+        """
+        weight = round(min(max(alpha, 0.0), 1.0), 2)
+        name = f"hybrid-minmax-{int(round(weight * 100))}"
+        if name in self._search_pipelines:
+            return name
+        
+        self.es_client.client.transport.perform_request(
+            'PUT',
+            f'/_search/pipeline/{name}',
+            body={
+                'description': f'Min-max normalized hybrid scores, BM25 weight {weight}',
+                'phase_results_processors': [{
+                    'normalization-processor': {
+                        'normalization': {'technique': 'min_max'},
+                        'combination': {
+                            'technique': 'arithmetic_mean',
+                            'parameters': {'weights': [weight, round(1.0 - weight, 2)]}
+                        }
+                    }
+                }]
+            }
+        )
+        self._search_pipelines.add(name)
+        return name
+    
+    def _similarity_script(self, index_name: str, embedding_field: str) -> str:
+        """Painless source scoring documents by cosine to params.query_vector, plus 1.
+        
+        knn_vector / dense_vector fields support cosineSimilarity; plain float
+        arrays on OpenSearch need a manual dot product in Painless.
+        
+        Args:
+            index_name: Index, alias or comma-separated list
+            embedding_field: Name of embedding field in documents
+        
+        Returns:
+            Script source
+        """
+        is_opensearch = getattr(self.es_client, '_is_opensearch', False)
+        field_type, _ = self._get_vector_field(index_name, embedding_field)
+        
+        if field_type in ('dense_vector', 'knn_vector'):
+            doc_value = f"doc['{embedding_field}']" if field_type == 'knn_vector' else f"'{embedding_field}'"
+            return f"cosineSimilarity(params.query_vector, {doc_value}) + 1.0"
+        if is_opensearch:
+            # Manual dot product for OpenSearch compatibility
+            return (
+                f"double dot = 0; "
+                f"if (doc.containsKey('{embedding_field}') && doc['{embedding_field}'].size() > 0) {{ "
+                f"  for (int i = 0; i < params.query_vector.length; i++) {{ "
+                f"    dot += (double)params.query_vector[i] * (double)doc['{embedding_field}'][i]; "
+                f"  }} "
+                f"}} "
+                f"return dot + 1.0;"
+            )
+        # Standard Elasticsearch cosine similarity
+        return f"cosineSimilarity(params.query_vector, '{embedding_field}') + 1.0"
+    
+    def _query_vector(self, index_name: str, query: str, embedding_field: str) -> List:
+        """Embed a query in the representation stored in the index.
+        
+        Args:
+            index_name: Index, alias or comma-separated list
+            query: Query text
+            embedding_field: Name of embedding field in documents
+        
+        Returns:
+            Query vector (int8 values for byte-mapped fields)
+        """
+        query_embedding = self.embedding_generator.encode_text(query)[0]
+        _, element_type = self._get_vector_field(index_name, embedding_field)
+        if element_type == 'byte':
+            return self.quantizer.quantize(query_embedding).tolist()
+        return query_embedding.tolist()
+    
+    @staticmethod
+    def _sort_results(results: List[Dict], sort_by: str) -> List[Dict]:
+        """Sort results by score or by year (ties broken by score).
+        
+        Args:
+            results: Search results
+            sort_by: 'relevance', 'date_desc' or 'date_asc'
+        
+        Returns:
+            Sorted results
+        """
         if sort_by == "date_desc":
-            combined_results.sort(
-                key=lambda x: (
-                    x['source'].get('publication_year') or x['source'].get('year') or 0,
-                    x['score']
-                ), 
+            return sorted(
+                results,
+                key=lambda x: (x['source'].get('pub_year') or 0, x['score']),
                 reverse=True
             )
-        elif sort_by == "date_asc":
-            combined_results.sort(
-                key=lambda x: (
-                    x['source'].get('publication_year') or x['source'].get('year') or 9999,
-                    -x['score']
-                )
+        if sort_by == "date_asc":
+            return sorted(
+                results,
+                key=lambda x: (x['source'].get('pub_year') or 9999, -x['score'])
             )
-        else:
-            combined_results.sort(key=lambda x: x['score'], reverse=True)
+        return sorted(results, key=lambda x: x['score'], reverse=True)
+    
+    @staticmethod
+    def _error_status(error: Exception) -> Optional[int]:
+        """Extract the HTTP status from an Elasticsearch/OpenSearch client error."""
+        meta = getattr(error, 'meta', None)
+        status = getattr(meta, 'status', None) or getattr(error, 'status_code', None)
+        return status if isinstance(status, int) else None
+    
+    def _get_vector_field(self, index_name: str, field: str) -> Tuple[str, str]:
+        """Look up (and cache) how the embedding field is mapped.
         
-        # Return top results
-        final_results = combined_results[:size]
+        Args:
+            index_name: Index, alias or comma-separated list
+            field: Embedding field name
         
-        logger.info(f"Hybrid search returned {len(final_results)} results")
+        Returns:
+            Tuple of (mapping type, element type); ('', 'float') if unknown
+        """
+        key = (index_name, field)
+        if key in self._vector_fields:
+            return self._vector_fields[key]
         
-        return final_results
+        info = ('', 'float')
+        try:
+            response = self.es_client.client.indices.get_field_mapping(index=index_name, fields=field)
+            types = set()
+            for index_mapping in response.values():
+                mapping = index_mapping.get('mappings', {}).get(field, {}).get('mapping', {})
+                for definition in mapping.values():
+                    element_type = definition.get('element_type') or definition.get('data_type') or 'float'
+                    types.add((definition.get('type', ''), element_type))
+            
+            if len(types) > 1:
+                logger.warning(f"Indices in {index_name} map '{field}' differently: {sorted(types)}")
+            if types:
+                info = sorted(types)[0]
+        except Exception as e:
+            logger.warning(f"Could not read mapping of {index_name}.{field}: {e}")
+            return info
+        
+        self._vector_fields[key] = info
+        return info
+    
+    def has_search_text(self, index_name: str) -> bool:
+        """Check (and cache) whether an index maps the 'search_text' field.
+        
+        Indices created before it was introduced are queried on the legacy
+        fields until they are rebuilt (scripts/rebuild_index.py
+        --drop-combined-full-text).
+        
+        Args:
+            index_name: Index, alias or comma-separated list
+        
+        Returns:
+            True if every index behind the name has the field
+        """
+        if index_name in self._search_text:
+            return self._search_text[index_name]
+        
+        try:
+            response = self.es_client.client.indices.get_field_mapping(
+                index=index_name, fields='search_text'
+            )
+            found = bool(response) and all(
+                'search_text' in index_mapping.get('mappings', {})
+                for index_mapping in response.values()
+            )
+        except Exception as e:
+            logger.warning(f"Could not read mapping of {index_name}.search_text: {e}")
+            return False
+        
+        if not found:
+            logger.info(f"{index_name} has no 'search_text' field - using legacy query fields")
+        self._search_text[index_name] = found
+        return found
     
     def _normalize_scores(self, scores: List[float]) -> List[float]:
         """Normalize scores to [0, 1] range using min-max normalization.
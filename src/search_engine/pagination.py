@@ -0,0 +1,307 @@
+"""Cursor pagination of search results."""
+
+import base64
+import hashlib
+import json
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.utils.config import settings
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+CURSOR_VERSION = 1
+
+
+class CursorError(ValueError):
+    """Raised for a malformed cursor or one issued for another search."""
+
+
+class SearchPager:
+    """Page through search results with opaque cursors.
+    
+    Keyword-only searches (alpha 1, all weight on BM25) are paged on the
+    cluster: a point in time keeps the view of the indices stable and each
+    page continues ``search_after`` the last hit, so a page costs one page of
+    hits however deep it is. Their cursor carries the PIT ID and the sort
+    values of the last hit.
+    
+    Hybrid ranking needs both retrieval legs and the fusion, so it cannot be
+    resumed on the cluster. The first page computes the fused list down to
+    ``depth`` candidates (sorted by date for date-sorted searches, like an
+    unpaged search), optionally reranks it once, and keeps it in memory for
+    ``ttl`` seconds under a random ID; later pages are slices of it. If the
+    list has expired (or the cursor was issued by another worker) it is
+    recomputed.
+    
+    A cursor embeds a fingerprint of the search and is only accepted for
+    the same query, index, filters and options.
+    """
+    
+    def __init__(
+        self,
+        search_engine,
+        ttl: Optional[float] = None,
+        depth: Optional[int] = None,
+        max_entries: Optional[int] = None
+    ):
+        """Initialize search pager.
+        
+        Args:
+            search_engine: HybridSearchEngine to page through
+            ttl: Seconds a cursor stays valid between pages: PIT keep-alive
+                and lifetime of cached lists (default: SEARCH_CURSOR_TTL setting)
+            depth: Fused candidates kept per hybrid search
+                (default: SEARCH_CURSOR_DEPTH setting)
+            max_entries: Cached candidate lists, oldest dropped first
+                (default: SEARCH_CURSOR_CACHE_SIZE setting)
+        """
+        self.search_engine = search_engine
+        self.ttl = ttl if ttl is not None else settings.search_cursor_ttl
+        self.depth = depth if depth is not None else settings.search_cursor_depth
+        self.max_entries = max_entries if max_entries is not None else settings.search_cursor_cache_size
+        
+        # list ID -> (expiry, candidates)
+        self._lists: "OrderedDict[str, Tuple[float, List[Dict]]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    @property
+    def keep_alive(self) -> str:
+        """PIT keep-alive for the TTL."""
+        return f"{max(1, int(self.ttl))}s"
+    
+    def page(
+        self,
+        index_name: str,
+        query: str,
+        size: int = 20,
+        cursor: Optional[str] = None,
+        alpha: Optional[float] = None,
+        sort_by: str = "relevance",
+        mode: Optional[str] = None,
+        date_from: Optional[int] = None,
+        date_to: Optional[int] = None,
+        article_types: Optional[List[str]] = None,
+        subject: Optional[str] = None,
+        availability: Optional[str] = None,
+        rerank: Optional[Callable[[List[Dict]], List[Dict]]] = None
+    ) -> Tuple[List[Dict], Optional[str]]:
+        """Get a page of results.
+        
+        Args:
+            index_name: Index to search (or 'all' for all indices)
+            query: Search query
+            size: Results per page
+            cursor: Cursor returned with the previous page (None: first page)
+            alpha: Weight for BM25 score (default: the engine's)
+            sort_by: 'relevance', 'date_desc' or 'date_asc'
+            mode: Hybrid mode, one of HYBRID_MODES
+            date_from: Start year
+            date_to: End year
+            article_types: Article types filter
+            subject: Subject filter
+            availability: Availability filter
+            rerank: Reorders the whole hybrid candidate list once, when it is
+                computed (relevance-sorted hybrid searches only; keyword-only
+                pages are returned in BM25 order)
+        
+        Returns:
+            (results, cursor of the next page or None after the last page)
+        
+        Raises:
+            CursorError: The cursor is malformed or belongs to another search
+        """
+        if index_name == "all":
+            index_name = "pubmed_articles,clinical_trials"
+        alpha = alpha if alpha is not None else self.search_engine.alpha
+        sort_by = sort_by or "relevance"
+        filters = dict(
+            date_from=date_from, date_to=date_to, article_types=article_types,
+            subject=subject, availability=availability
+        )
+        
+        if sort_by != "relevance" or alpha >= 1.0:
+            rerank = None
+        
+        fingerprint = self._fingerprint(
+            index_name, query, alpha, sort_by, mode, filters, rerank is not None
+        )
+        state = self._decode(cursor, fingerprint) if cursor else None
+        
+        if alpha >= 1.0:
+            return self._keyword_page(index_name, query, size, sort_by, fingerprint, state, filters)
+        return self._hybrid_page(
+            index_name, query, size, alpha, sort_by, mode, fingerprint, state, filters, rerank
+        )
+    
+    def _keyword_page(
+        self,
+        index_name: str,
+        query: str,
+        size: int,
+        sort_by: str,
+        fingerprint: str,
+        state: Optional[Dict],
+        filters: Dict
+    ) -> Tuple[List[Dict], Optional[str]]:
+        """Page with a point in time and search_after."""
+        if state is not None and state.get("k") != "pit":
+            raise CursorError("Cursor was not issued for this search")
+        
+        es_client = self.search_engine.es_client
+        keyword_query = self.search_engine.query_processor.correct_query(query)
+        
+        def fetch(pit_id: str, search_after: Optional[List], fuzzy: bool):
+            return self.search_engine.keyword_page(
+                index_name, pit_id, keyword_query, size=size, sort_by=sort_by,
+                search_after=search_after, keep_alive=self.keep_alive, fuzzy=fuzzy,
+                **filters
+            )
+        
+        if state is None:
+            pit_id = es_client.open_point_in_time(index_name, keep_alive=self.keep_alive)
+            try:
+                results, pit_id, last_sort = fetch(pit_id, None, False)
+                fuzzy = False
+                if not results:
+                    # Like keyword_search: retry with fuzzy matching when
+                    # nothing matches exactly
+                    fuzzy = True
+                    results, pit_id, last_sort = fetch(pit_id, None, True)
+            except Exception:
+                es_client.close_point_in_time(pit_id)
+                raise
+        else:
+            fuzzy = bool(state.get("fuzzy"))
+            try:
+                results, pit_id, last_sort = fetch(state["pit"], state["after"], fuzzy)
+            except Exception as e:
+                # The PIT expired; the sort values are a valid position in a new one
+                logger.info(f"Reopening point in time for the next page: {e}")
+                pit_id = es_client.open_point_in_time(index_name, keep_alive=self.keep_alive)
+                try:
+                    results, pit_id, last_sort = fetch(pit_id, state["after"], fuzzy)
+                except Exception:
+                    es_client.close_point_in_time(pit_id)
+                    raise
+        
+        if last_sort is None:
+            es_client.close_point_in_time(pit_id)
+            return results, None
+        return results, self._encode({
+            "k": "pit", "f": fingerprint, "pit": pit_id, "after": last_sort, "fuzzy": fuzzy
+        })
+    
+    def _hybrid_page(
+        self,
+        index_name: str,
+        query: str,
+        size: int,
+        alpha: float,
+        sort_by: str,
+        mode: Optional[str],
+        fingerprint: str,
+        state: Optional[Dict],
+        filters: Dict,
+        rerank: Optional[Callable[[List[Dict]], List[Dict]]]
+    ) -> Tuple[List[Dict], Optional[str]]:
+        """Page through a cached fused candidate list."""
+        if state is not None and state.get("k") != "list":
+            raise CursorError("Cursor was not issued for this search")
+        
+        offset = 0
+        candidates = None
+        if state is not None:
+            offset = int(state["o"])
+            candidates = self._get_list(state["id"])
+            if candidates is None:
+                logger.info("Cursor results expired - recomputing the hybrid search")
+        
+        if candidates is None:
+            results = self.search_engine.hybrid_search(
+                index_name, query, size=self.depth, alpha=alpha, sort_by=sort_by, mode=mode,
+                **filters
+            )
+            candidates = [self._compact(hit) for hit in results]
+            if rerank is not None and candidates:
+                candidates = rerank(candidates)
+            list_id = secrets.token_urlsafe(12)
+            self._put_list(list_id, candidates)
+        else:
+            list_id = state["id"]
+        
+        # Copies: callers (e.g. the reranker) may annotate the hits
+        page = [hit.copy() for hit in candidates[offset:offset + size]]
+        if offset + size >= len(candidates):
+            return page, None
+        return page, self._encode({"k": "list", "f": fingerprint, "id": list_id, "o": offset + size})
+    
+    @staticmethod
+    def _compact(hit: Dict) -> Dict:
+        """Drop the embedding from a cached hit's source."""
+        if "embedding" not in hit["source"]:
+            return hit
+        hit = hit.copy()
+        hit["source"] = {key: value for key, value in hit["source"].items() if key != "embedding"}
+        return hit
+    
+    def _get_list(self, list_id: str) -> Optional[List[Dict]]:
+        with self._lock:
+            entry = self._lists.get(list_id)
+            if entry is None or entry[0] <= time.monotonic():
+                self._lists.pop(list_id, None)
+                return None
+            # Each page extends the lifetime, like the PIT keep-alive
+            self._lists[list_id] = (time.monotonic() + self.ttl, entry[1])
+            self._lists.move_to_end(list_id)
+            return entry[1]
+    
+    def _put_list(self, list_id: str, candidates: List[Dict]):
+        now = time.monotonic()
+        with self._lock:
+            self._lists[list_id] = (now + self.ttl, candidates)
+            while self._lists:
+                oldest_id, (expiry, _) = next(iter(self._lists.items()))
+                if expiry > now and len(self._lists) <= self.max_entries:
+                    break
+                del self._lists[oldest_id]
+    
+    @staticmethod
+    def _fingerprint(*parts) -> str:
+        """Short hash identifying a search."""
+        data = json.dumps(parts, sort_keys=True, default=str).encode("utf-8")
+        return hashlib.sha256(data).hexdigest()[:16]
+    
+    @staticmethod
+    def _encode(state: Dict) -> str:
+        data = json.dumps({"v": CURSOR_VERSION, **state}, separators=(",", ":")).encode("utf-8")
+        return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+    
+    @staticmethod
+    def _decode(cursor: str, fingerprint: str) -> Dict:
+        try:
+            data = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            state = json.loads(data)
+        except ValueError:
+            raise CursorError("Malformed cursor")
+        if not isinstance(state, dict) or state.get("v") != CURSOR_VERSION:
+            raise CursorError("Malformed cursor")
+        if state.get("f") != fingerprint:
+            raise CursorError("Cursor was not issued for this search")
+        if state.get("k") == "pit":
+            valid = isinstance(state.get("pit"), str) and isinstance(state.get("after"), list)
+        elif state.get("k") == "list":
+            offset = state.get("o")
+            valid = (
+                isinstance(state.get("id"), str)
+                and isinstance(offset, int) and not isinstance(offset, bool) and offset >= 0
+            )
+        else:
+            valid = False
+        if not valid:
+            raise CursorError("Malformed cursor")
+        return state
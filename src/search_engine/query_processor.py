@@ -3,37 +3,77 @@
 import re
 from typing import List, Dict, Optional
 from src.utils.logger import get_logger
+from .spell_corrector import SpellCorrector
+from .synonym_expander import SynonymExpander
 
 logger = get_logger(__name__)
 
+# Fields matched alongside the boosted title. 'search_text' is the copy_to
+# target of title, abstract and full_text (indexed only, not in _source)
+SEARCH_FIELDS = ['search_text', 'keywords^1.5']
+
+# Same for indices created before 'search_text' existed
+LEGACY_SEARCH_FIELDS = ['abstract', 'keywords^1.5', 'full_text']
+
+# Suggestions offered when no spell index has been built
+COMMON_MISSPELLINGS = {
+    'diabetis': 'diabetes',
+    'cancor': 'cancer',
+    'inflamation': 'inflammation',
+    'treatmnt': 'treatment',
+    'medicin': 'medicine',
+}
+
+# Built-in abbreviation/synonym groups, used when no lexicon has been
+# compiled (and always included by scripts/build_synonym_lexicon.py)
+MEDICAL_SYNONYMS = [
+    ['covid', 'covid-19', 'coronavirus', 'sars-cov-2'],
+    ['dm', 'diabetes mellitus'],
+    ['htn', 'hypertension', 'high blood pressure'],
+    ['mi', 'myocardial infarction', 'heart attack'],
+    ['copd', 'chronic obstructive pulmonary disease'],
+    ['ckd', 'chronic kidney disease'],
+    ['cad', 'coronary artery disease'],
+    ['chf', 'congestive heart failure'],
+    ['uti', 'urinary tract infection'],
+    ['tb', 'tuberculosis'],
+    ['hiv', 'human immunodeficiency virus'],
+    ['aids', 'acquired immunodeficiency syndrome'],
+]
+
+# Synonyms per matched phrase sent to the engine (MeSH descriptors can
+# have dozens of entry terms)
+MAX_QUERY_SYNONYMS = 10
+
 
 class QueryProcessor:
     """Process and enhance search queries."""
     
-    def __init__(self):
-        """Initialize query processor."""
-        # Medical abbreviations and expansions
-        self.medical_expansions = {
-            'covid': 'COVID-19 coronavirus SARS-CoV-2',
-            'covid-19': 'COVID-19 coronavirus SARS-CoV-2',
-            'dm': 'diabetes mellitus',
-            'htn': 'hypertension high blood pressure',
-            'mi': 'myocardial infarction heart attack',
-            'copd': 'chronic obstructive pulmonary disease',
-            'ckd': 'chronic kidney disease',
-            'cad': 'coronary artery disease',
-            'chf': 'congestive heart failure',
-            'uti': 'urinary tract infection',
-            'tb': 'tuberculosis',
-            'hiv': 'human immunodeficiency virus',
-            'aids': 'acquired immunodeficiency syndrome',
-            'copd': 'chronic obstructive pulmonary disease',
-        }
+    def __init__(
+        self,
+        spell_corrector: Optional[SpellCorrector] = None,
+        synonym_expander: Optional[SynonymExpander] = None
+    ):
+        """Initialize query processor.
+        
+        Args:
+            spell_corrector: Corrector for query words
+                (default: the spell index at SPELL_INDEX_PATH, if built)
+            synonym_expander: Abbreviation/synonym expansion (default: the
+                lexicon at SYNONYM_LEXICON_PATH, or MEDICAL_SYNONYMS)
+        """
+        self.spell_corrector = spell_corrector or SpellCorrector.from_settings()
+        self.synonym_expander = (
+            synonym_expander
+            or SynonymExpander.from_settings()
+            or SynonymExpander.build(MEDICAL_SYNONYMS)
+        )
         
         # Common stopwords (minimal for medical queries)
         self.stopwords = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for'}
     
-    def clean_query(self, query: str) -> str:
+    @staticmethod
+    def clean_query(query: str) -> str:
         """Clean and normalize query text.
         
         Args:
@@ -53,8 +93,27 @@ class QueryProcessor:
         
         return query
     
+    def synonym_groups(self, query: str) -> List[List[str]]:
+        """Find the known phrases of a query and their synonyms.
+        
+        Args:
+            query: Input query
+        
+        Returns:
+            One group per matched phrase: the phrase, then its synonyms
+        """
+        cleaned = self.clean_query(query)
+        return [
+            [segment] + synonyms
+            for segment, synonyms in self.synonym_expander.expand(cleaned)
+            if synonyms
+        ]
+    
     def expand_query(self, query: str) -> str:
-        """Expand medical abbreviations in query.
+        """Expand medical abbreviations and synonyms in query.
+        
+        Known phrases are followed by their synonyms (longest match first,
+        so multi-word abbreviations and terms expand as a whole).
         
         Args:
             query: Input query
@@ -63,15 +122,11 @@ class QueryProcessor:
             Expanded query
         """
         cleaned = self.clean_query(query)
-        words = cleaned.split()
         
         expanded_parts = []
-        for word in words:
-            # Check if word is a known abbreviation
-            if word in self.medical_expansions:
-                expanded_parts.append(self.medical_expansions[word])
-            else:
-                expanded_parts.append(word)
+        for segment, synonyms in self.synonym_expander.expand(cleaned):
+            expanded_parts.append(segment)
+            expanded_parts.extend(synonyms[:MAX_QUERY_SYNONYMS])
         
         expanded = ' '.join(expanded_parts)
         logger.debug(f"Query expansion: '{query}' -> '{expanded}'")
@@ -95,8 +150,22 @@ class QueryProcessor:
         
         return keywords
     
+    def correct_query(self, query: str) -> str:
+        """Clean a query and correct its misspelled words.
+        
+        Args:
+            query: Input query
+        
+        Returns:
+            Cleaned query, corrected against the spell index if one is loaded
+        """
+        cleaned = self.clean_query(query)
+        if self.spell_corrector is None:
+            return cleaned
+        return self.spell_corrector.correct(cleaned)
+    
     def suggest_corrections(self, query: str) -> List[str]:
-        """Suggest query corrections (basic implementation).
+        """Suggest query corrections.
         
         Args:
             query: Input query
@@ -104,22 +173,15 @@ class QueryProcessor:
         Returns:
             List of suggested corrections
         """
-        # This is a placeholder - in production, use a proper spell checker
-        # or medical terminology dictionary
-        suggestions = []
-        
         cleaned = self.clean_query(query)
         
-        # Check for common misspellings
-        misspellings = {
-            'diabetis': 'diabetes',
-            'cancor': 'cancer',
-            'inflamation': 'inflammation',
-            'treatmnt': 'treatment',
-            'medicin': 'medicine',
-        }
+        if self.spell_corrector is not None:
+            corrected = self.spell_corrector.correct(cleaned)
+            return [corrected] if corrected != cleaned else []
         
-        for wrong, correct in misspellings.items():
+        # Without a spell index, only check for common misspellings
+        suggestions = []
+        for wrong, correct in COMMON_MISSPELLINGS.items():
             if wrong in cleaned:
                 corrected = cleaned.replace(wrong, correct)
                 suggestions.append(corrected)
@@ -135,89 +197,140 @@ class QueryProcessor:
         date_to: Optional[int] = None,
         article_types: Optional[List[str]] = None,
         subject: Optional[str] = None,
-        availability: Optional[str] = None
+        availability: Optional[str] = None,
+        fuzzy: bool = False
     ) -> Dict:
         """Build Elasticsearch query DSL with optional filters.
         
+        Terms are matched exactly: queries are spell-corrected before they
+        are sent (see correct_query), and fuzzy term expansion is expensive
+        across several text fields, so it is only a fallback. Each known
+        phrase adds one optional clause matching any of its synonyms as a
+        phrase, instead of appending the synonyms to the query text.
+        
         Args:
             query: Search query
-            fields: Fields to search
+            fields: Fields to search besides the boosted title
+                (default: SEARCH_FIELDS)
             boost_title: Boost factor for title field
             date_from: Start year
             date_to: End year
             article_types: List of article types to include
             subject: Subject filter (human, animal, etc.)
             availability: Availability filter (full_text, free, etc.)
+            fuzzy: Also match terms within an edit distance (fuzziness AUTO)
             
         Returns:
             Elasticsearch query dictionary
         """
         if fields is None:
-            fields = ['title', 'abstract', 'keywords']
-        
-        # Expand query
-        expanded_query = self.expand_query(query)
+            fields = SEARCH_FIELDS
+        search_fields = [f'title^{boost_title}'] + [
+            field for field in fields if field.split('^')[0] != 'title'
+        ]
         
         # Build multi-match query
-        must_match = {
-            'bool': {
-                'should': [
-                    {
-                        'multi_match': {
-                            'query': expanded_query,
-                            'fields': [
-                                f'title^{boost_title}',
-                                'abstract',
-                                'keywords^1.5',
-                                'full_text'
-                            ],
-                            'type': 'best_fields',
-                            'operator': 'or',
-                            'fuzziness': 'AUTO'
-                        }
-                    },
-                    {
-                        'match_phrase': {
-                            'title': {
-                                'query': query,
-                                'boost': boost_title * 1.5
+        multi_match = {
+            'query': self.clean_query(query),
+            'fields': search_fields,
+            'type': 'best_fields',
+            'operator': 'or'
+        }
+        if fuzzy:
+            multi_match['fuzziness'] = 'AUTO'
+        
+        should_clauses = [
+            {
+                'multi_match': multi_match
+            },
+            {
+                'match_phrase': {
+                    'title': {
+                        'query': query,
+                        'boost': boost_title * 1.5
+                    }
+                }
+            }
+        ]
+        
+        # One clause per synonym group: any of its phrases may match
+        for group in self.synonym_groups(query):
+            should_clauses.append({
+                'bool': {
+                    'should': [
+                        {
+                            'multi_match': {
+                                'query': phrase,
+                                'fields': search_fields,
+                                'type': 'phrase'
                             }
                         }
-                    }
-                ],
+                        for phrase in group[:MAX_QUERY_SYNONYMS + 1]
+                    ]
+                }
+            })
+        
+        must_match = {
+            'bool': {
+                'should': should_clauses,
                 'minimum_should_match': 1
             }
         }
 
-        # Build filter clause
+        filter_clauses = self.build_filter_clauses(
+            date_from=date_from, date_to=date_to, article_types=article_types,
+            subject=subject, availability=availability
+        )
+        
+        es_query = {
+            'query': {
+                'bool': {
+                    'must': [must_match]
+                }
+            }
+        }
+        
+        if filter_clauses:
+            es_query['query']['bool']['filter'] = filter_clauses
+        
+        return es_query
+    
+    def build_filter_clauses(
+        self,
+        date_from: Optional[int] = None,
+        date_to: Optional[int] = None,
+        article_types: Optional[List[str]] = None,
+        subject: Optional[str] = None,
+        availability: Optional[str] = None
+    ) -> List[Dict]:
+        """Build the filter clauses shared by keyword and semantic search.
+        
+        Years are filtered with one numeric range on ``pub_year`` (integer,
+        set at ingest time), which the engine can cache like any other filter.
+        
+        Args:
+            date_from: Start year
+            date_to: End year
+            article_types: List of article types to include
+            subject: Subject filter (human, animal, etc.)
+            availability: Availability filter (full_text, open_access)
+        
+        Returns:
+            List of filter clauses (empty if no filter applies)
+        """
         filter_clauses = []
         
         # Date Filter
         if date_from or date_to:
             range_filter = {}
             if date_from:
-                range_filter['gte'] = str(date_from)
+                range_filter['gte'] = int(date_from)
             if date_to:
-                range_filter['lte'] = str(date_to)
-            
-            # Target both potential year fields
-            filter_clauses.append({
-                "bool": {
-                    "should": [
-                        {"range": {"publication_year.keyword": range_filter}},
-                        {"range": {"year.keyword": range_filter}},
-                        {"range": {"start_year.keyword": range_filter}},
-                        {"range": {"metadata.publication_year.keyword": range_filter}},
-                        {"range": {"metadata.year.keyword": range_filter}}
-                    ],
-                    "minimum_should_match": 1
-                }
-            })
+                range_filter['lte'] = int(date_to)
+            filter_clauses.append({"range": {"pub_year": range_filter}})
             
         # Article Type Filter
-        if article_types and len(article_types) > 0:
-            # Map frontend types to potential backend values if needed
-            # For now assume direct mapping to metadata.article_type
+        if article_types:
             filter_clauses.append({
                 "terms": {
                     "metadata.article_type.keyword": article_types
@@ -241,24 +354,32 @@ class QueryProcessor:
                     }
                 })
             elif availability == 'open_access':
-                 filter_clauses.append({
+                filter_clauses.append({
                     "term": {
                         "metadata.is_open_access": True
                     }
                 })
 
-        es_query = {
-            'query': {
-                'bool': {
-                    'must': [must_match]
-                }
-            }
-        }
+        return filter_clauses
         
-        if filter_clauses:
-            es_query['query']['bool']['filter'] = filter_clauses
+    @staticmethod
+    def build_sort(sort_by: str) -> Optional[List]:
+        """Build the sort clause for a sort option.
             
-        return es_query
+        Args:
+            sort_by: 'relevance', 'date_desc' or 'date_asc'
+        
+        Returns:
+            Sort clause, or None to sort by score
+        """
+        if sort_by not in ("date_desc", "date_asc"):
+            return None
+        
+        order = "desc" if sort_by == "date_desc" else "asc"
+        return [
+            {"pub_year": {"order": order, "unmapped_type": "integer", "missing": "_last"}},
+            "_score"
+        ]
     
     def process_query(self, query: str) -> Dict:
         """Process query and return enhanced version with metadata.
@@ -270,14 +391,18 @@ class QueryProcessor:
             Dictionary with processed query information
         """
         cleaned = self.clean_query(query)
-        expanded = self.expand_query(query)
-        keywords = self.extract_keywords(query)
+        corrected = self.correct_query(query)
+        expanded = self.expand_query(corrected)
+        synonyms = self.synonym_groups(corrected)
+        keywords = self.extract_keywords(corrected)
         suggestions = self.suggest_corrections(query)
         
         result = {
             'original': query,
             'cleaned': cleaned,
+            'corrected': corrected,
             'expanded': expanded,
+            'synonyms': synonyms,
             'keywords': keywords,
             'suggestions': suggestions
         }
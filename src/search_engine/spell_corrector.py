@@ -0,0 +1,311 @@
+"""Symmetric-delete spell correction over the index vocabulary."""
+
+import hashlib
+import re
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Union
+
+import numpy as np
+
+from src.utils.config import settings
+from src.utils.logger import get_logger
+from src.utils.packed_arrays import StringTable, load_arrays, save_arrays
+
+logger = get_logger(__name__)
+
+# Words that are candidates for correction (no digits, so gene and drug
+# codes like 'covid-19' or 'il-6' are left alone)
+WORD_PATTERN = re.compile(r"[a-z]+(?:['\-][a-z]+)*")
+
+ARRAYS = ("counts", "delete_hashes", "delete_terms")
+
+
+def _hash(text: str) -> int:
+    """Stable 64-bit hash of a delete variant."""
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def _deletes(word: str, max_distance: int) -> set:
+    """All strings obtained by deleting up to max_distance characters (word included)."""
+    variants = {word}
+    frontier = [word]
+    for _ in range(max_distance):
+        next_frontier = []
+        for item in frontier:
+            if len(item) <= 1:
+                continue
+            for i in range(len(item)):
+                variant = item[:i] + item[i + 1:]
+                if variant not in variants:
+                    variants.add(variant)
+                    next_frontier.append(variant)
+        frontier = next_frontier
+    return variants
+
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+    """Optimal string alignment distance, capped at max_distance + 1.
+    
+    Args:
+        a: First string
+        b: Second string
+        max_distance: Distances above this are not computed exactly
+    
+    Returns:
+        Number of insertions, deletions, substitutions and adjacent
+        transpositions, or max_distance + 1 if larger
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if (
+                previous2 is not None and i > 1 and j > 1
+                and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]
+            ):
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        # A transposition reaches back two rows, so both must exceed the cap
+        if min(current) > max_distance and min(previous) > max_distance:
+            return max_distance + 1
+        previous2, previous = previous, current
+    return min(previous[-1], max_distance + 1)
+
+
+class SpellCorrector:
+    """SymSpell-style corrector for query words.
+    
+    Offline, every vocabulary term is reduced to the set of strings obtained
+    by deleting up to ``max_edit_distance`` characters from its first
+    ``prefix_length`` characters; the 64-bit hashes of these deletes are
+    stored sorted, next to the ID of their term. A query word generates its
+    own deletes, and the terms sharing one of them are the only candidates
+    whose edit distance is checked. The closest candidate wins, ties going
+    to the most frequent term.
+    
+    The index is one packed array file loaded memory-mapped, so startup is
+    instant and the pages are shared between API worker processes.
+    """
+    
+    def __init__(
+        self,
+        terms: StringTable,
+        counts: np.ndarray,
+        delete_hashes: np.ndarray,
+        delete_terms: np.ndarray,
+        max_edit_distance: int = 2,
+        prefix_length: int = 7,
+        min_length: int = 4
+    ):
+        """Initialize spell corrector.
+        
+        Args:
+            terms: Sorted vocabulary terms
+            counts: Frequency of each term (uint32)
+            delete_hashes: Sorted hashes of the delete variants (uint64)
+            delete_terms: Term ID of each delete variant (uint32)
+            max_edit_distance: Largest correction distance
+            prefix_length: Characters of a word used for delete variants
+            min_length: Shorter words (mostly abbreviations) are left alone
+        """
+        self._terms = terms
+        self._counts = counts
+        self._delete_hashes = delete_hashes
+        self._delete_terms = delete_terms
+        self.max_edit_distance = max_edit_distance
+        self.prefix_length = prefix_length
+        self.min_length = min_length
+    
+    def __len__(self) -> int:
+        return len(self._counts)
+    
+    @classmethod
+    def build(
+        cls,
+        frequencies: Dict[str, int],
+        max_edit_distance: int = 2,
+        prefix_length: int = 7,
+        min_count: int = 2
+    ) -> "SpellCorrector":
+        """Build the delete index from term frequencies.
+        
+        Args:
+            frequencies: Term -> number of occurrences
+            max_edit_distance: Largest correction distance
+            prefix_length: Characters of a term used for delete variants
+            min_count: Rarer terms are dropped (they are mostly typos)
+        
+        Returns:
+            SpellCorrector instance
+        """
+        terms = sorted(term for term, count in frequencies.items() if count >= min_count and term)
+        counts = np.array([min(frequencies[term], 2 ** 32 - 1) for term in terms], dtype=np.uint32)
+        
+        # Accumulated in typed arrays: millions of entries for a large vocabulary
+        hashes = array("Q")
+        term_ids = array("I")
+        for term_id, term in enumerate(terms):
+            for variant in _deletes(term[:prefix_length], max_edit_distance):
+                hashes.append(_hash(variant))
+                term_ids.append(term_id)
+        
+        delete_hashes = np.frombuffer(hashes, dtype=np.uint64)
+        order = np.argsort(delete_hashes, kind="stable")
+        
+        logger.info(f"Spell index built: {len(terms)} terms, {len(hashes)} delete variants")
+        return cls(
+            StringTable.from_strings(terms),
+            counts,
+            delete_hashes[order],
+            np.frombuffer(term_ids, dtype=np.uint32)[order],
+            max_edit_distance=max_edit_distance,
+            prefix_length=prefix_length
+        )
+    
+    def save(self, path: Union[str, Path]):
+        """Write the index and its parameters to one file.
+        
+        Args:
+            path: Output file
+        """
+        arrays = self._terms.to_arrays("terms")
+        arrays.update({name: getattr(self, f"_{name}") for name in ARRAYS})
+        save_arrays(path, arrays, meta={
+            "max_edit_distance": self.max_edit_distance,
+            "prefix_length": self.prefix_length,
+            "min_length": self.min_length,
+            "terms": len(self),
+        })
+        logger.info(f"Spell index saved to {path}")
+    
+    @classmethod
+    def load(cls, path: Union[str, Path], mmap: bool = True) -> "SpellCorrector":
+        """Load a saved spell index.
+        
+        Args:
+            path: File written by save()
+            mmap: Memory-map the file instead of reading it
+        
+        Returns:
+            SpellCorrector instance
+        """
+        arrays, meta = load_arrays(path, mmap=mmap)
+        return cls(
+            StringTable.from_arrays(arrays, "terms"),
+            *(arrays[name] for name in ARRAYS),
+            max_edit_distance=meta["max_edit_distance"],
+            prefix_length=meta["prefix_length"],
+            min_length=meta.get("min_length", 4)
+        )
+    
+    @classmethod
+    def from_settings(cls) -> Optional["SpellCorrector"]:
+        """Load the spell index at SPELL_INDEX_PATH, if it was built.
+        
+        Returns:
+            SpellCorrector instance, or None
+        """
+        path = Path(settings.spell_index_path)
+        if not path.exists():
+            logger.info(f"No spell index at {path} - query spelling is not corrected")
+            return None
+        return cls.load(path)
+    
+    def term(self, term_id: int) -> str:
+        """Get a vocabulary term by ID."""
+        return self._terms[term_id]
+    
+    def count(self, word: str) -> int:
+        """Frequency of a word in the vocabulary (0 if unknown)."""
+        term_id = self._terms.index(word)
+        return int(self._counts[term_id]) if term_id >= 0 else 0
+    
+    def lookup(self, word: str) -> Optional[str]:
+        """Find the best correction of a word.
+        
+        Args:
+            word: Lowercase word
+        
+        Returns:
+            The word itself if it is known, the closest frequent term within
+            max_edit_distance, or None
+        """
+        if self.count(word):
+            return word
+        
+        variants = _deletes(word[:self.prefix_length], self.max_edit_distance)
+        hashes = np.fromiter((_hash(v) for v in variants), dtype=np.uint64, count=len(variants))
+        starts = np.searchsorted(self._delete_hashes, hashes, side="left")
+        ends = np.searchsorted(self._delete_hashes, hashes, side="right")
+        
+        candidates = set()
+        for start, end in zip(starts.tolist(), ends.tolist()):
+            if end > start:
+                candidates.update(self._delete_terms[start:end].tolist())
+        
+        best = None
+        best_key = (self.max_edit_distance + 1, 0)
+        for term_id in candidates:
+            term = self.term(term_id)
+            distance = edit_distance(word, term, self.max_edit_distance)
+            key = (distance, -int(self._counts[term_id]))
+            if distance <= self.max_edit_distance and key < best_key:
+                best, best_key = term, key
+        return best
+    
+    def corrections(self, text: str) -> Dict[str, str]:
+        """Corrections for the misspelled words of a cleaned query.
+        
+        Args:
+            text: Lowercase, whitespace-separated query
+        
+        Returns:
+            Misspelled word -> correction
+        """
+        corrections = {}
+        for word in set(text.split()):
+            if len(word) < self.min_length or not WORD_PATTERN.fullmatch(word):
+                continue
+            corrected = self.lookup(word)
+            if corrected and corrected != word:
+                corrections[word] = corrected
+        return corrections
+    
+    def correct(self, text: str) -> str:
+        """Correct the misspelled words of a cleaned query.
+        
+        Args:
+            text: Lowercase, whitespace-separated query
+        
+        Returns:
+            Corrected query (unchanged words keep their position)
+        """
+        corrections = self.corrections(text)
+        if not corrections:
+            return text
+        return " ".join(corrections.get(word, word) for word in text.split())
+
+
+def count_words(texts: Iterable[str], frequencies: Optional[Dict[str, int]] = None) -> Dict[str, int]:
+    """Add the correctable words of some texts to a frequency table.
+    
+    Args:
+        texts: Texts (titles, abstracts, MeSH terms)
+        frequencies: Table to update (default: a new one)
+    
+    Returns:
+        Term -> number of occurrences
+    """
+    frequencies = {} if frequencies is None else frequencies
+    for text in texts:
+        if not text:
+            continue
+        for word in WORD_PATTERN.findall(text.lower()):
+            frequencies[word] = frequencies.get(word, 0) + 1
+    return frequencies
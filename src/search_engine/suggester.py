@@ -0,0 +1,274 @@
+"""Query autocomplete from a compact, memory-mapped prefix index."""
+
+import threading
+from itertools import groupby
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple, Union
+
+import numpy as np
+
+from src.utils.logger import get_logger
+from src.utils.packed_arrays import StringTable, load_arrays, save_arrays
+
+logger = get_logger(__name__)
+
+# Origin of a suggestion (stored as its position)
+KINDS = ("query", "term", "title")
+
+# Longest query kept in the query log
+MAX_QUERY_LENGTH = 200
+
+
+def normalize_prefix(text: str) -> str:
+    """Lowercase and collapse whitespace (the form suggestions are keyed by)."""
+    return " ".join(text.lower().split())
+
+
+class QuerySuggester:
+    """Prefix completion over titles, MeSH terms and popular queries.
+    
+    Suggestions are stored as a sorted array of normalized keys, so the keys
+    starting with a prefix form one contiguous range found by binary search.
+    Short prefixes match huge ranges; for every prefix whose range holds more
+    than ``heavy_threshold`` keys the top-k suggestions are precomputed, so a
+    lookup never ranks more than that many candidates.
+    """
+    
+    def __init__(
+        self,
+        keys: StringTable,
+        texts: StringTable,
+        scores: np.ndarray,
+        kinds: np.ndarray,
+        heavy_prefixes: StringTable,
+        heavy_top: np.ndarray
+    ):
+        """Initialize suggester.
+        
+        Args:
+            keys: Sorted normalized suggestion keys
+            texts: Display text of each key
+            scores: Ranking score of each key (float32)
+            kinds: Index into KINDS of each key (uint8)
+            heavy_prefixes: Sorted prefixes with precomputed results
+            heavy_top: Top key IDs per heavy prefix, -1 padded (int32)
+        """
+        self._keys = keys
+        self._texts = texts
+        self._scores = scores
+        self._kinds = kinds
+        self._heavy_prefixes = heavy_prefixes
+        self._heavy_top = heavy_top
+    
+    def __len__(self) -> int:
+        return len(self._keys)
+    
+    @property
+    def top_k(self) -> int:
+        """Largest number of suggestions per lookup."""
+        return self._heavy_top.shape[1]
+    
+    @classmethod
+    def build(
+        cls,
+        entries: Dict[str, Tuple[str, float, int]],
+        top_k: int = 20,
+        heavy_threshold: int = 256
+    ) -> "QuerySuggester":
+        """Build the prefix index.
+        
+        Args:
+            entries: Normalized key -> (display text, score, kind)
+            top_k: Suggestions precomputed per heavy prefix
+            heavy_threshold: Prefixes matching more keys are precomputed
+        
+        Returns:
+            QuerySuggester instance
+        """
+        keys = sorted(entries)
+        scores = np.array([entries[key][1] for key in keys], dtype=np.float32)
+        
+        # Only keys under a heavy prefix can be under a longer heavy prefix
+        heavy: List[Tuple[str, List[int]]] = []
+        positions = list(range(len(keys)))
+        length = 1
+        while positions:
+            candidates = (i for i in positions if len(keys[i]) >= length)
+            positions = []
+            for prefix, group in groupby(candidates, key=lambda i: keys[i][:length]):
+                group = list(group)
+                if len(group) > heavy_threshold:
+                    top = sorted(group, key=lambda i: (-scores[i], i))[:top_k]
+                    heavy.append((prefix, top))
+                    positions.extend(group)
+            length += 1
+        heavy.sort()
+        
+        heavy_top = np.full((len(heavy), top_k), -1, dtype=np.int32)
+        for row, (_, top) in enumerate(heavy):
+            heavy_top[row, :len(top)] = top
+        
+        logger.info(f"Suggest index built: {len(keys)} keys, {len(heavy)} precomputed prefixes")
+        return cls(
+            StringTable.from_strings(keys),
+            StringTable.from_strings(entries[key][0] for key in keys),
+            scores,
+            np.array([entries[key][2] for key in keys], dtype=np.uint8),
+            StringTable.from_strings(prefix for prefix, _ in heavy),
+            heavy_top
+        )
+    
+    def save(self, path: Union[str, Path]):
+        """Write the index to one file (atomically replaced).
+        
+        Args:
+            path: Output file
+        """
+        arrays = {
+            **self._keys.to_arrays("keys"),
+            **self._texts.to_arrays("texts"),
+            **self._heavy_prefixes.to_arrays("heavy_prefixes"),
+            "scores": self._scores,
+            "kinds": self._kinds,
+            "heavy_top": self._heavy_top,
+        }
+        save_arrays(path, arrays, meta={"keys": len(self), "top_k": self.top_k})
+        logger.info(f"Suggest index saved to {path}")
+    
+    @classmethod
+    def load(cls, path: Union[str, Path], mmap: bool = True) -> "QuerySuggester":
+        """Load a saved index.
+        
+        Args:
+            path: File written by save()
+            mmap: Memory-map the file instead of reading it
+        
+        Returns:
+            QuerySuggester instance
+        """
+        arrays, _ = load_arrays(path, mmap=mmap)
+        return cls(
+            StringTable.from_arrays(arrays, "keys"),
+            StringTable.from_arrays(arrays, "texts"),
+            arrays["scores"],
+            arrays["kinds"],
+            StringTable.from_arrays(arrays, "heavy_prefixes"),
+            arrays["heavy_top"]
+        )
+    
+    def suggest(self, prefix: str, limit: int = 10) -> List[Dict]:
+        """Complete a prefix.
+        
+        Args:
+            prefix: Text typed so far
+            limit: Number of suggestions (at most top_k)
+        
+        Returns:
+            Suggestions with 'text', 'kind' and 'score', best first
+        """
+        key = normalize_prefix(prefix)
+        limit = min(limit, self.top_k)
+        if not key or limit <= 0:
+            return []
+        if prefix[-1].isspace():
+            # A finished word: complete the next one
+            key += " "
+        
+        row = self._heavy_prefixes.index(key)
+        if row >= 0:
+            ids = [i for i in self._heavy_top[row, :limit].tolist() if i >= 0]
+        else:
+            encoded = key.encode("utf-8")
+            lo = self._keys.bisect_left(encoded)
+            # 0xff never occurs in UTF-8, so this bounds every key with the prefix
+            hi = self._keys.bisect_left(encoded + b"\xff", lo)
+            scores = self._scores[lo:hi]
+            if hi - lo > limit:
+                candidates = np.argpartition(-scores, limit)[:limit]
+            else:
+                candidates = np.arange(hi - lo)
+            ids = sorted((lo + int(i) for i in candidates), key=lambda i: (-self._scores[i], i))
+        
+        return [
+            {
+                "text": self._texts[i],
+                "kind": KINDS[self._kinds[i]],
+                "score": float(self._scores[i])
+            }
+            for i in ids
+        ]
+
+
+class QueryLog:
+    """Append-only log of search queries, one per line.
+    
+    Read by scripts/build_suggest_index.py to suggest popular queries.
+    Logging never fails a search: write errors are reported once. Once the
+    log reaches ``max_bytes`` it is moved to ``<path>.1`` (replacing the
+    previous one) and a new log is started, so at most about twice
+    ``max_bytes`` of queries are kept.
+    """
+    
+    def __init__(self, path: Union[str, Path], max_bytes: int = 10 * 1024 * 1024):
+        """Initialize query log.
+        
+        Args:
+            path: Log file (created on first write)
+            max_bytes: Size at which the log is rotated (0 = never)
+        """
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self._file = None
+        self._lock = threading.Lock()
+        self._failed = False
+    
+    @staticmethod
+    def backup_path(path: Union[str, Path]) -> Path:
+        """Path the log is rotated to."""
+        path = Path(path)
+        return path.with_name(path.name + ".1")
+    
+    def record(self, query: str):
+        """Append a query."""
+        text = " ".join(query.split())
+        if not text or len(text) > MAX_QUERY_LENGTH or self._failed:
+            return
+        try:
+            with self._lock:
+                if self._file is not None and 0 < self.max_bytes <= self._file.tell():
+                    self._rotate()
+                if self._file is None:
+                    self.path.parent.mkdir(parents=True, exist_ok=True)
+                    self._file = open(self.path, "a", encoding="utf-8", buffering=1)
+                self._file.write(text + "\n")
+        except OSError as e:
+            self._failed = True
+            logger.warning(f"Query log {self.path} disabled: {e}")
+    
+    def _rotate(self):
+        """Move a full log aside (unless another worker already did)."""
+        self._file.close()
+        self._file = None
+        if self.path.exists() and self.path.stat().st_size >= self.max_bytes:
+            self.path.replace(self.backup_path(self.path))
+    
+    def close(self):
+        """Close the log file."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+    
+    @staticmethod
+    def iter_queries(path: Union[str, Path]) -> Iterator[str]:
+        """Read logged queries, the rotated log first (nothing if there is no log)."""
+        if not path:
+            return
+        for log_path in (QueryLog.backup_path(path), Path(path)):
+            if not log_path.exists():
+                continue
+            with open(log_path, "r", encoding="utf-8", errors="ignore") as f:
+                for line in f:
+                    line = line.strip()
+                    if line:
+                        yield line
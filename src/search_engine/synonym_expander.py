@@ -0,0 +1,258 @@
+"""Phrase-level synonym and abbreviation expansion with an Aho-Corasick automaton."""
+
+from collections import deque
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from src.utils.config import settings
+from src.utils.logger import get_logger
+from src.utils.packed_arrays import StringTable, load_arrays, save_arrays
+
+logger = get_logger(__name__)
+
+ARRAYS = (
+    "edge_keys", "edge_targets", "fail", "output_link", "node_phrase",
+    "phrase_lengths", "phrase_group_offsets", "phrase_groups",
+    "group_offsets", "group_phrases",
+)
+
+
+class SynonymExpander:
+    """Longest-match expansion of query phrases into their synonym groups.
+    
+    The lexicon is a list of synonym groups (e.g. an abbreviation with its
+    long forms, or a MeSH descriptor with its entry terms). Every phrase of
+    a group is a pattern of an Aho-Corasick automaton over words, so one
+    pass over the query finds all known phrases; overlapping matches are
+    resolved leftmost-longest ('heart attack' wins over 'attack').
+    
+    The automaton is stored as flat arrays (transitions as sorted
+    ``state << 32 | word`` keys) in one packed array file loaded
+    memory-mapped, so a MeSH-scale lexicon loads in well under a millisecond.
+    """
+    
+    def __init__(self, words: StringTable, phrases: StringTable, arrays: Dict[str, np.ndarray]):
+        """Initialize synonym expander.
+        
+        Args:
+            words: Sorted words of all phrases (word ID = position)
+            phrases: Phrase texts (phrase ID = position)
+            arrays: Automaton and group arrays, keyed by ARRAYS
+        """
+        self._words = words
+        self._phrases = phrases
+        for name in ARRAYS:
+            setattr(self, f"_{name}", arrays[name])
+    
+    def __len__(self) -> int:
+        """Number of synonym groups."""
+        return len(self._group_offsets) - 1
+    
+    @classmethod
+    def build(cls, groups: Iterable[Sequence[str]]) -> "SynonymExpander":
+        """Compile a lexicon.
+        
+        Args:
+            groups: Synonym groups of normalized (lowercase, single-spaced)
+                phrases; groups with fewer than two phrases are skipped
+        
+        Returns:
+            SynonymExpander instance
+        """
+        phrase_ids: Dict[str, int] = {}
+        group_members: List[List[int]] = []
+        for group in groups:
+            members = []
+            for phrase in group:
+                phrase = " ".join(phrase.split())
+                if phrase and phrase not in members:
+                    members.append(phrase)
+            if len(members) < 2:
+                continue
+            group_members.append([phrase_ids.setdefault(p, len(phrase_ids)) for p in members])
+        
+        phrases = list(phrase_ids)
+        phrase_groups: List[List[int]] = [[] for _ in phrases]
+        for group_id, members in enumerate(group_members):
+            for phrase_id in members:
+                phrase_groups[phrase_id].append(group_id)
+        
+        words = sorted({word for phrase in phrases for word in phrase.split()})
+        word_ids = {word: i for i, word in enumerate(words)}
+        
+        # Trie over word IDs
+        children: List[Dict[int, int]] = [{}]
+        node_phrase = [-1]
+        for phrase_id, phrase in enumerate(phrases):
+            node = 0
+            for word in phrase.split():
+                word_id = word_ids[word]
+                if word_id not in children[node]:
+                    children[node][word_id] = len(children)
+                    children.append({})
+                    node_phrase.append(-1)
+                node = children[node][word_id]
+            node_phrase[node] = phrase_id
+        
+        # Failure links (longest proper suffix in the trie) and output links
+        # (nearest failure ancestor that ends a phrase), breadth first
+        fail = [0] * len(children)
+        output_link = [-1] * len(children)
+        queue = deque(children[0].values())
+        while queue:
+            node = queue.popleft()
+            for word_id, child in children[node].items():
+                state = fail[node]
+                while state and word_id not in children[state]:
+                    state = fail[state]
+                target = children[state].get(word_id, 0) if node else 0
+                fail[child] = target if target != child else 0
+                output_link[child] = (
+                    fail[child] if node_phrase[fail[child]] >= 0 else output_link[fail[child]]
+                )
+                queue.append(child)
+        
+        edges = sorted(
+            ((node << 32) | word_id, child)
+            for node, edges in enumerate(children)
+            for word_id, child in edges.items()
+        )
+        
+        arrays = {
+            "edge_keys": np.array([key for key, _ in edges], dtype=np.uint64),
+            "edge_targets": np.array([child for _, child in edges], dtype=np.uint32),
+            "fail": np.array(fail, dtype=np.uint32),
+            "output_link": np.array(output_link, dtype=np.int32),
+            "node_phrase": np.array(node_phrase, dtype=np.int32),
+            "phrase_lengths": np.array([len(p.split()) for p in phrases], dtype=np.uint16),
+        }
+        arrays["phrase_group_offsets"], arrays["phrase_groups"] = cls._flatten(phrase_groups)
+        arrays["group_offsets"], arrays["group_phrases"] = cls._flatten(group_members)
+        
+        logger.info(f"Synonym lexicon compiled: {len(group_members)} groups, {len(phrases)} phrases")
+        return cls(StringTable.from_strings(words), StringTable.from_strings(phrases), arrays)
+    
+    @staticmethod
+    def _flatten(lists: List[List[int]]) -> Tuple[np.ndarray, np.ndarray]:
+        """Store lists of IDs as offsets plus one value array."""
+        offsets = np.zeros(len(lists) + 1, dtype=np.uint32)
+        offsets[1:] = np.cumsum([len(items) for items in lists], dtype=np.uint32)
+        values = np.array([item for items in lists for item in items], dtype=np.uint32)
+        return offsets, values
+    
+    def save(self, path: Union[str, Path]):
+        """Write the compiled lexicon to one file.
+        
+        Args:
+            path: Output file
+        """
+        arrays = {**self._words.to_arrays("words"), **self._phrases.to_arrays("phrases")}
+        arrays.update({name: getattr(self, f"_{name}") for name in ARRAYS})
+        save_arrays(path, arrays, meta={"groups": len(self), "phrases": len(self._phrases)})
+        logger.info(f"Synonym lexicon saved to {path}")
+    
+    @classmethod
+    def load(cls, path: Union[str, Path], mmap: bool = True) -> "SynonymExpander":
+        """Load a compiled lexicon.
+        
+        Args:
+            path: File written by save()
+            mmap: Memory-map the file instead of reading it
+        
+        Returns:
+            SynonymExpander instance
+        """
+        arrays, _ = load_arrays(path, mmap=mmap)
+        return cls(
+            StringTable.from_arrays(arrays, "words"),
+            StringTable.from_arrays(arrays, "phrases"),
+            arrays
+        )
+    
+    @classmethod
+    def from_settings(cls) -> Optional["SynonymExpander"]:
+        """Load the lexicon at SYNONYM_LEXICON_PATH, if it was compiled.
+        
+        Returns:
+            SynonymExpander instance, or None
+        """
+        path = Path(settings.synonym_lexicon_path)
+        if not path.exists():
+            logger.info(f"No compiled synonym lexicon at {path} - using the built-in expansions")
+            return None
+        return cls.load(path)
+    
+    def _step(self, state: int, word_id: int) -> int:
+        """Follow the transition for a word, falling back along failure links."""
+        if word_id < 0:
+            return 0
+        while True:
+            key = np.uint64((state << 32) | word_id)
+            i = int(np.searchsorted(self._edge_keys, key))
+            if i < len(self._edge_keys) and self._edge_keys[i] == key:
+                return int(self._edge_targets[i])
+            if state == 0:
+                return 0
+            state = int(self._fail[state])
+    
+    def find(self, words: Sequence[str]) -> List[Tuple[int, int, int]]:
+        """Find known phrases, leftmost-longest and non-overlapping.
+        
+        Args:
+            words: Normalized query words
+        
+        Returns:
+            (start, end, phrase ID) tuples, in query order
+        """
+        matches = []
+        state = 0
+        for end, word in enumerate(words, 1):
+            state = self._step(state, self._words.index(word))
+            node = state if self._node_phrase[state] >= 0 else int(self._output_link[state])
+            while node > 0:
+                phrase_id = int(self._node_phrase[node])
+                matches.append((end - int(self._phrase_lengths[phrase_id]), end, phrase_id))
+                node = int(self._output_link[node])
+        
+        matches.sort(key=lambda match: (match[0], match[0] - match[1]))
+        selected = []
+        position = 0
+        for start, end, phrase_id in matches:
+            if start >= position:
+                selected.append((start, end, phrase_id))
+                position = end
+        return selected
+    
+    def synonyms(self, phrase_id: int) -> List[str]:
+        """Other phrases of the groups a phrase belongs to."""
+        synonyms = []
+        groups = self._phrase_groups[self._phrase_group_offsets[phrase_id]:self._phrase_group_offsets[phrase_id + 1]]
+        for group_id in groups.tolist():
+            members = self._group_phrases[self._group_offsets[group_id]:self._group_offsets[group_id + 1]]
+            for member in members.tolist():
+                text = self._phrases[member]
+                if member != phrase_id and text not in synonyms:
+                    synonyms.append(text)
+        return synonyms
+    
+    def expand(self, text: str) -> List[Tuple[str, List[str]]]:
+        """Split a normalized query into segments with their synonyms.
+        
+        Args:
+            text: Lowercase, whitespace-separated query
+        
+        Returns:
+            (segment, synonyms) pairs in query order; a segment is a known
+            phrase (with its synonyms) or a single unmatched word (with none)
+        """
+        words = text.split()
+        segments = []
+        position = 0
+        for start, end, phrase_id in self.find(words):
+            segments.extend((word, []) for word in words[position:start])
+            segments.append((" ".join(words[start:end]), self.synonyms(phrase_id)))
+            position = end
+        segments.extend((word, []) for word in words[position:])
+        return segments
@@ -69,6 +69,17 @@ class Settings(BaseSettings):
     )
     model_cache_dir: str = Field(default="./models", alias="MODEL_CACHE_DIR")
     
+    # Embedding storage: 'float', 'float16' or 'byte' (int8, needs a calibrated quantizer)
+    embedding_element_type: str = Field(default="float", alias="EMBEDDING_ELEMENT_TYPE")
+    embedding_quantizer_path: str = Field(
+        default="./models/embedding_quantizer.json",
+        alias="EMBEDDING_QUANTIZER_PATH"
+    )
+    embedding_cache_path: str = Field(
+        default="./data/cache/embeddings.sqlite",
+        alias="EMBEDDING_CACHE_PATH"
+    )
+    
     @property
     def biobert_model(self) -> str:
         """Get BioBERT model name."""
@@ -88,6 +99,47 @@ class Settings(BaseSettings):
     pubmed_api_key: str = Field(default="", alias="PUBMED_API_KEY")
     pubmed_email: str = Field(default="", alias="PUBMED_EMAIL")
     
+    # Data processing (0 = one worker process per core, 1 = serial)
+    processing_workers: int = Field(default=0, alias="PROCESSING_WORKERS")
+    processing_chunk_size: int = Field(default=250, alias="PROCESSING_CHUNK_SIZE")
+    
+    # Search: 'fusion' (keyword and vector queries fused client-side),
+    # 'native' (fused by the cluster in one request, where supported) or
+    # 'rescore' / 'rescore_client' (top BM25 hits re-scored by vector similarity
+    # on the cluster / in the API; faster, but only documents with a keyword
+    # match can be found)
+    search_hybrid_mode: str = Field(default="fusion", alias="SEARCH_HYBRID_MODE")
+    search_rescore_window: int = Field(default=100, alias="SEARCH_RESCORE_WINDOW")
+    # Cursor pagination: seconds a cursor stays valid between pages, fused
+    # hybrid candidates kept per search, and cached candidate lists
+    search_cursor_ttl: float = Field(default=300.0, alias="SEARCH_CURSOR_TTL")
+    search_cursor_depth: int = Field(default=200, alias="SEARCH_CURSOR_DEPTH")
+    search_cursor_cache_size: int = Field(default=256, alias="SEARCH_CURSOR_CACHE_SIZE")
+    # Streamed exports (/api/v1/export): row limit and hits per cluster request
+    export_max_rows: int = Field(default=100000, alias="EXPORT_MAX_ROWS")
+    export_page_size: int = Field(default=1000, alias="EXPORT_PAGE_SIZE")
+    # /document/{id}: cached documents per worker, and seconds an entry is
+    # served before its version is checked again
+    document_cache_size: int = Field(default=1024, alias="DOCUMENT_CACHE_SIZE")
+    document_cache_ttl: float = Field(default=30.0, alias="DOCUMENT_CACHE_TTL")
+    # Symmetric-delete spell index (scripts/build_spell_index.py)
+    spell_index_path: str = Field(default="./data/spell_index.bin", alias="SPELL_INDEX_PATH")
+    # Compiled synonym/abbreviation lexicon (scripts/build_synonym_lexicon.py)
+    synonym_lexicon_path: str = Field(default="./data/synonym_lexicon.bin", alias="SYNONYM_LEXICON_PATH")
+    # Autocomplete prefix index (scripts/build_suggest_index.py), checked for
+    # a rebuilt file every SUGGEST_RELOAD_SECONDS. Searches can be appended to
+    # a query log it is built from (off by default: queries may contain
+    # patient data), rotated at QUERY_LOG_MAX_BYTES
+    suggest_index_path: str = Field(default="./data/suggest_index.bin", alias="SUGGEST_INDEX_PATH")
+    suggest_reload_seconds: float = Field(default=30.0, alias="SUGGEST_RELOAD_SECONDS")
+    query_log_path: str = Field(default="", alias="QUERY_LOG_PATH")
+    query_log_max_bytes: int = Field(default=10 * 1024 * 1024, alias="QUERY_LOG_MAX_BYTES")
+    # Facet counts (/api/v1/facets): cached results per query and filters,
+    # and delay between a write and the recount of the unfiltered facets
+    facet_cache_ttl: float = Field(default=300.0, alias="FACET_CACHE_TTL")
+    facet_cache_size: int = Field(default=1024, alias="FACET_CACHE_SIZE")
+    facet_refresh_delay: float = Field(default=2.0, alias="FACET_REFRESH_DELAY")
+    
     # DeepSeek
     deepseek_api_key: str = Field(default="", alias="DEEPSEEK_API_KEY")
     
@@ -0,0 +1,166 @@
+"""Memory-mappable bundles of NumPy arrays and compact string tables.
+
+Lookup structures built offline (spell index, synonym lexicon, suggestion
+index) are saved as a single file: a JSON header describing each array,
+followed by the aligned raw array data. Loading maps the file once and
+slices views out of it, so even large structures load in well under a
+millisecond and their pages are shared between API worker processes.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
+
+import numpy as np
+
+MAGIC = b"PKARR1\n"
+ALIGNMENT = 64
+
+
+def _align(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def save_arrays(path: Union[str, Path], arrays: Dict[str, np.ndarray], meta: Optional[Dict[str, Any]] = None):
+    """Write arrays (and JSON metadata) to one file.
+    
+    The file is written next to its destination and renamed into place, so
+    readers never see a partial file.
+    
+    Args:
+        path: Output file
+        arrays: Arrays by name
+        meta: JSON-serializable metadata
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    
+    arrays = {name: np.ascontiguousarray(array) for name, array in arrays.items()}
+    entries = {}
+    offset = 0
+    for name, array in arrays.items():
+        offset = _align(offset)
+        entries[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+        offset += array.nbytes
+    
+    header = json.dumps({"arrays": entries, "meta": meta or {}}).encode("utf-8")
+    data_start = _align(len(MAGIC) + 8 + len(header))
+    
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(len(header).to_bytes(8, "little"))
+        f.write(header)
+        for name, array in arrays.items():
+            f.write(b"\0" * (data_start + entries[name]["offset"] - f.tell()))
+            f.write(array.tobytes())
+    os.replace(tmp_path, path)
+
+
+def load_arrays(path: Union[str, Path], mmap: bool = True) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+    """Load a file written by save_arrays().
+    
+    Args:
+        path: File to load
+        mmap: Memory-map the file instead of reading it
+    
+    Returns:
+        (arrays by name, metadata)
+    """
+    if mmap:
+        # Plain ndarray views: indexing an np.memmap goes through Python-level
+        # subclass hooks and is several times slower
+        buffer = np.memmap(path, dtype=np.uint8, mode="r").view(np.ndarray)
+    else:
+        buffer = np.fromfile(path, dtype=np.uint8)
+    
+    if buffer[:len(MAGIC)].tobytes() != MAGIC:
+        raise ValueError(f"{path} is not a packed array file")
+    header_length = int.from_bytes(buffer[len(MAGIC):len(MAGIC) + 8].tobytes(), "little")
+    header_start = len(MAGIC) + 8
+    header = json.loads(buffer[header_start:header_start + header_length].tobytes())
+    data_start = _align(header_start + header_length)
+    
+    arrays = {}
+    for name, entry in header["arrays"].items():
+        dtype = np.dtype(entry["dtype"])
+        start = data_start + entry["offset"]
+        count = int(np.prod(entry["shape"], dtype=np.int64))
+        arrays[name] = buffer[start:start + count * dtype.itemsize].view(dtype).reshape(entry["shape"])
+    return arrays, header["meta"]
+
+
+class StringTable:
+    """Strings stored as one UTF-8 byte array plus offsets.
+    
+    Lookups by value (``index``, ``bisect_left``) need the strings in sorted
+    order; code point order of ``str`` matches the byte order of UTF-8, so
+    the comparisons run on the raw bytes.
+    """
+    
+    def __init__(self, data: np.ndarray, offsets: np.ndarray):
+        """Initialize string table.
+        
+        Args:
+            data: Concatenated UTF-8 bytes (uint8)
+            offsets: Start of each string in ``data``, plus the end (uint64)
+        """
+        self._data = data
+        self._offsets = offsets
+        self._buffer = memoryview(data)
+    
+    @classmethod
+    def from_strings(cls, strings: Iterable[str]) -> "StringTable":
+        """Build a table, keeping the order of the strings.
+        
+        Args:
+            strings: Strings to store
+        
+        Returns:
+            StringTable instance
+        """
+        encoded = [value.encode("utf-8") for value in strings]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.uint64)
+        offsets[1:] = np.cumsum([len(value) for value in encoded], dtype=np.uint64)
+        return cls(np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets)
+    
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray], name: str) -> "StringTable":
+        """Get a table stored by to_arrays() under a name."""
+        return cls(arrays[name], arrays[f"{name}_offsets"])
+    
+    def to_arrays(self, name: str) -> Dict[str, np.ndarray]:
+        """Arrays of the table, for save_arrays()."""
+        return {name: self._data, f"{name}_offsets": self._offsets}
+    
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+    
+    def __getitem__(self, i: int) -> str:
+        return self.raw(i).decode("utf-8")
+    
+    def raw(self, i: int) -> bytes:
+        """UTF-8 bytes of one string."""
+        return self._buffer[int(self._offsets[i]):int(self._offsets[i + 1])].tobytes()
+    
+    def bisect_left(self, value: Union[str, bytes], lo: int = 0, hi: Optional[int] = None) -> int:
+        """Position of the first string >= value (sorted tables only)."""
+        if isinstance(value, str):
+            value = value.encode("utf-8")
+        hi = len(self) if hi is None else hi
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.raw(mid) < value:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+    
+    def index(self, value: str) -> int:
+        """Position of a string, or -1 (sorted tables only)."""
+        encoded = value.encode("utf-8")
+        i = self.bisect_left(encoded)
+        if i < len(self) and self.raw(i) == encoded:
+            return i
+        return -1
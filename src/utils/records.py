@@ -0,0 +1,358 @@
+"""Typed, compact records for documents, search hits and passages.
+
+Records are msgspec Structs: fixed slots, no per-instance ``__dict__`` and
+no GC tracking. ``keywords``, which the dict documents carry as a copy of
+other fields, is only stored once it differs from them or is accessed.
+Every record also behaves like the dict it replaces: it is registered as a
+MutableMapping and supports ``get``, ``[]``, item assignment and deletion,
+``in``, ``keys``/``items``, ``pop``, ``setdefault``, ``update`` and ``copy``,
+and values returned by ``[]`` are the stored objects, so in-place changes
+(``rec['metadata']['x'] = 1``) are kept.
+"""
+
+from collections.abc import MutableMapping
+from typing import Any, ClassVar, Dict, Iterator, List, Optional, Tuple
+
+import msgspec
+
+# Marks a missing default of pop()
+_MISSING = object()
+
+
+class Record(msgspec.Struct, kw_only=True, omit_defaults=True, gc=False):
+    """Base record with a dict-compatible view.
+    
+    Keys are the struct fields and any ad-hoc keys assigned by callers
+    (kept in ``extra``).
+    """
+    
+    extra: Optional[Dict[str, Any]] = None
+    
+    # Fields computed from other fields while they are None
+    _derived_keys: ClassVar[Tuple[str, ...]] = ()
+    # Fields left out of the dict view while they are None
+    _absent_when_none: ClassVar[Tuple[str, ...]] = ()
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Record":
+        """Build a record from a dict document.
+        
+        Unknown keys go to ``extra``.
+        
+        Args:
+            data: Document dictionary
+        
+        Returns:
+            Record instance
+        """
+        fields = {}
+        extra = {}
+        for key, value in data.items():
+            if key in cls.__struct_fields__ and key != "extra":
+                fields[key] = value
+            else:
+                extra[key] = value
+        
+        if extra:
+            fields["extra"] = extra
+        record = cls(**cls._compact(fields))
+        for key in cls._derived_keys:
+            # Not stored while it equals the value it is derived from
+            if getattr(record, key) is not None and getattr(record, key) == record._derive(key):
+                setattr(record, key, None)
+        return record
+    
+    @classmethod
+    def _compact(cls, fields: Dict[str, Any]) -> Dict[str, Any]:
+        """Drop duplicated values before construction (per record type)."""
+        return fields
+    
+    def _derive(self, key: str) -> Any:
+        """Compute a derived key (per record type)."""
+        raise KeyError(key)
+    
+    def keys(self) -> List[str]:
+        """Keys of the dict view."""
+        keys = [
+            name for name in self.__struct_fields__
+            if name != "extra"
+            and not (name in self._absent_when_none and getattr(self, name) is None)
+        ]
+        if self.extra:
+            keys.extend(self.extra)
+        return keys
+    
+    def __getitem__(self, key: str) -> Any:
+        if key != "extra" and key in self.__struct_fields__:
+            value = getattr(self, key)
+            if value is None:
+                if key in self._absent_when_none:
+                    raise KeyError(key)
+                if key in self._derived_keys:
+                    return self._derive(key)
+            return value
+        if self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+    
+    def __setitem__(self, key: str, value: Any):
+        if key != "extra" and key in self.__struct_fields__:
+            setattr(self, key, value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+    
+    def __delitem__(self, key: str):
+        if self.extra and key in self.extra:
+            del self.extra[key]
+        elif key in self._absent_when_none:
+            if getattr(self, key) is None:
+                raise KeyError(key)
+            setattr(self, key, None)
+        elif key != "extra" and key in self.__struct_fields__:
+            raise TypeError(f"'{key}' is a field of {type(self).__name__} and cannot be removed")
+        else:
+            raise KeyError(key)
+    
+    def __contains__(self, key: str) -> bool:
+        try:
+            self[key]
+            return True
+        except KeyError:
+            return False
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+    
+    def __len__(self) -> int:
+        return len(self.keys())
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        """Dict-style lookup with a default."""
+        try:
+            return self[key]
+        except KeyError:
+            return default
+    
+    def pop(self, key: str, default: Any = _MISSING) -> Any:
+        """Remove a key and return its value (like dict.pop)."""
+        try:
+            value = self[key]
+        except KeyError:
+            if default is _MISSING:
+                raise
+            return default
+        del self[key]
+        return value
+    
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        """Return a key's value, setting it to default first if it is missing."""
+        try:
+            return self[key]
+        except KeyError:
+            self[key] = default
+            return default
+    
+    def update(self, *args: Any, **kwargs: Any):
+        """Set keys from a mapping or (key, value) pairs (like dict.update)."""
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+    
+    def items(self) -> List[Tuple[str, Any]]:
+        """(key, value) pairs of the dict view."""
+        return [(key, self[key]) for key in self.keys()]
+    
+    def values(self) -> List[Any]:
+        """Values of the dict view."""
+        return [self[key] for key in self.keys()]
+    
+    def copy(self) -> "Record":
+        """Shallow copy (like dict.copy)."""
+        return msgspec.structs.replace(self, extra=dict(self.extra) if self.extra else None)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Materialize the dict view (the legacy document layout)."""
+        return {key: self[key] for key in self.keys()}
+
+
+MutableMapping.register(Record)
+
+
+def _drop_combined_full_text(fields: Dict[str, Any]):
+    """Drop a legacy ``full_text`` that only repeats title and abstract."""
+    full_text = fields.get("full_text")
+    if full_text is not None and (
+        not full_text
+        or full_text == f"{fields.get('title') or ''}. {fields.get('abstract') or ''}".strip()
+    ):
+        del fields["full_text"]
+
+
+class ArticleRecord(Record, kw_only=True, omit_defaults=True, gc=False):
+    """Normalized PubMed article."""
+    
+    id: str
+    source: str = "pubmed"
+    type: str = "article"
+    title: str = ""
+    abstract: str = ""
+    authors: List[str] = []
+    journal: str = ""
+    publication_year: str = ""
+    pub_year: Optional[int] = None
+    publication_month: str = ""
+    publication_date: str = ""
+    mesh_terms: List[str] = []
+    keywords: Optional[List[str]] = None
+    doi: str = ""
+    full_text: Optional[str] = None
+    metadata: Dict[str, Any] = {}
+    embedding: Any = None
+    
+    _derived_keys: ClassVar[Tuple[str, ...]] = ("keywords",)
+    _absent_when_none: ClassVar[Tuple[str, ...]] = ("full_text", "embedding")
+    
+    @classmethod
+    def _compact(cls, fields: Dict[str, Any]) -> Dict[str, Any]:
+        _drop_combined_full_text(fields)
+        return fields
+    
+    def _derive(self, key: str) -> Any:
+        if key == "keywords":
+            # The normalizer uses the MeSH term list itself as keywords
+            return self.mesh_terms
+        raise KeyError(key)
+
+
+class TrialRecord(Record, kw_only=True, omit_defaults=True, gc=False):
+    """Normalized clinical trial."""
+    
+    id: str
+    source: str = "clinicaltrials"
+    type: str = "clinical_trial"
+    title: str = ""
+    abstract: str = ""
+    conditions: List[str] = []
+    interventions: List[Dict[str, Any]] = []
+    primary_outcomes: List[str] = []
+    secondary_outcomes: List[str] = []
+    phases: List[str] = []
+    status: str = ""
+    enrollment: Optional[int] = None
+    start_date: Optional[str] = None
+    completion_date: Optional[str] = None
+    last_update_date: Optional[str] = None
+    publication_date: Optional[str] = None
+    publication_year: str = ""
+    pub_year: Optional[int] = None
+    sponsor: str = ""
+    locations: List[str] = []
+    keywords: Optional[List[str]] = None
+    full_text: Optional[str] = None
+    metadata: Dict[str, Any] = {}
+    embedding: Any = None
+    
+    _derived_keys: ClassVar[Tuple[str, ...]] = ("keywords",)
+    _absent_when_none: ClassVar[Tuple[str, ...]] = ("full_text", "embedding")
+    
+    @classmethod
+    def _compact(cls, fields: Dict[str, Any]) -> Dict[str, Any]:
+        _drop_combined_full_text(fields)
+        return fields
+    
+    def _derive(self, key: str) -> Any:
+        if key == "keywords":
+            # A new list, like the normalizer's: stored so in-place changes are kept
+            self.keywords = self.conditions + [
+                item["name"] for item in self.interventions if item.get("name")
+            ]
+            return self.keywords
+        raise KeyError(key)
+
+
+class SearchHit(Record, kw_only=True, omit_defaults=True, gc=False):
+    """One search result (keyword, semantic or fused)."""
+    
+    id: str
+    score: float = 0.0
+    source: Dict[str, Any] = {}
+    keyword_score: Optional[float] = None
+    semantic_score: Optional[float] = None
+    rerank_score: Optional[float] = None
+    final_score: Optional[float] = None
+    
+    _absent_when_none: ClassVar[Tuple[str, ...]] = (
+        "keyword_score", "semantic_score", "rerank_score", "final_score"
+    )
+
+
+class Passage(Record, kw_only=True, omit_defaults=True, gc=False):
+    """Context passage for question answering."""
+    
+    text: str
+    title: str = ""
+    doc_id: Optional[str] = None
+    source_type: str = ""
+    section: str = "abstract"
+    score: float = 0.0
+    journal: Optional[str] = None
+    publication_date: Optional[str] = None
+
+
+RECORD_TYPES = {
+    "articles": ArticleRecord,
+    "trials": TrialRecord,
+}
+
+
+def to_builtins(value: Any) -> Any:
+    """JSON fallback for records and NumPy values (``default=`` / ``enc_hook=``).
+    
+    Args:
+        value: Value the JSON encoder cannot serialize natively
+    
+    Returns:
+        JSON-serializable value
+    """
+    if isinstance(value, Record):
+        return value.to_dict()
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def materialize(value: Any) -> Any:
+    """Replace records inside lists and dicts by their dict views.
+    
+    msgspec encodes structs natively from their stored fields, which omits
+    derived keys and default values; this restores the legacy layout.
+    
+    Args:
+        value: Value possibly containing records
+    
+    Returns:
+        Value with plain dicts in place of records
+    """
+    if isinstance(value, Record):
+        return {key: materialize(item) for key, item in value.items()}
+    if isinstance(value, dict):
+        return {key: materialize(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [materialize(item) for item in value]
+    return value
+
+
+_json_encoder = msgspec.json.Encoder(enc_hook=to_builtins)
+
+
+def encode_json(value: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON with msgspec.
+    
+    Args:
+        value: Builtins, records or NumPy values
+    
+    Returns:
+        JSON bytes
+    """
+    return _json_encoder.encode(materialize(value))
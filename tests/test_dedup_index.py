@@ -0,0 +1,106 @@
+"""Unit tests for the cross-run deduplication index."""
+
+import pytest
+
+from src.data_pipeline.dedup_index import BloomFilter, DedupIndex
+
+
+@pytest.fixture
+def dedup(tmp_path):
+    """Dedup index in a temporary directory."""
+    index = DedupIndex(tmp_path / "dedup.sqlite", expected_records=1000)
+    yield index
+    index.close()
+
+
+@pytest.mark.unit
+class TestBloomFilter:
+    """Test the Bloom filter."""
+    
+    def test_no_false_negatives(self):
+        """Test every added key is reported as present."""
+        bloom = BloomFilter(1000)
+        keys = [f"pubmed:{i}" for i in range(1000)]
+        for key in keys:
+            bloom.add(key)
+        
+        assert all(key in bloom for key in keys)
+        assert bloom.count == 1000
+    
+    def test_false_positive_rate(self):
+        """Test the false positive rate stays near the target at capacity."""
+        bloom = BloomFilter(5000, error_rate=0.01)
+        for i in range(5000):
+            bloom.add(f"pubmed:{i}")
+        
+        false_positives = sum(f"trial:{i}" in bloom for i in range(10000))
+        assert false_positives / 10000 < 0.03
+
+
+@pytest.mark.unit
+class TestDedupIndex:
+    """Test the persistent seen-set."""
+    
+    def test_filter_unseen(self, dedup):
+        """Test only IDs never marked are kept, in order."""
+        dedup.mark_seen_many("pubmed", {"2": None, "4": None})
+        
+        assert dedup.filter_unseen("pubmed", ["1", "2", "3", 4]) == ["1", "3"]
+        assert dedup.filter_unseen("clinicaltrials", ["2"]) == ["2"]
+    
+    def test_filter_changed(self, dedup):
+        """Test IDs with a new fingerprint are kept."""
+        dedup.mark_seen_many("pubmed", {"1": "a", "2": "b"})
+        
+        assert dedup.filter_changed("pubmed", {"1": "a", "2": "c", "3": "d"}) == ["2", "3"]
+    
+    def test_unknown_fingerprint_keeps_stored_one(self, dedup):
+        """Test marking with None does not erase a known fingerprint."""
+        dedup.mark_seen_many("pubmed", {"1": "a"})
+        dedup.mark_seen_many("pubmed", {"1": None})
+        
+        assert dedup.filter_changed("pubmed", {"1": "a"}) == []
+    
+    def test_persistence(self, tmp_path):
+        """Test marked IDs survive reopening the index."""
+        path = tmp_path / "dedup.sqlite"
+        index = DedupIndex(path, expected_records=1000)
+        index.mark_seen_many("pubmed", {"1": "a"})
+        index.close()
+        
+        reopened = DedupIndex(path, expected_records=1000)
+        try:
+            assert reopened.filter_unseen("pubmed", ["1", "2"]) == ["2"]
+        finally:
+            reopened.close()
+    
+    def test_bloom_grows(self, dedup):
+        """Test the filter is rebuilt larger once it outgrows its capacity."""
+        capacity = dedup._bloom.capacity
+        dedup.mark_seen_many("pubmed", {str(i): None for i in range(capacity + 1)})
+        
+        assert dedup._bloom.capacity > capacity
+        assert dedup.filter_unseen("pubmed", ["0", str(capacity), "x"]) == ["x"]
+    
+    def test_stats(self, dedup):
+        """Test stored counts and session skip rates."""
+        dedup.mark_seen_many("pubmed", {"1": None})
+        dedup.filter_unseen("pubmed", ["1", "2", "3", "4"])
+        
+        stats = dedup.stats()
+        assert stats["stored"] == {"pubmed": 1}
+        assert stats["session"]["pubmed"] == {"checked": 4, "skipped": 1, "skip_rate": 0.25}
+    
+    def test_fingerprint(self):
+        """Test fingerprints follow content and trial update dates."""
+        article = {"title": "A", "abstract": "B", "pmid": "1"}
+        
+        assert DedupIndex.fingerprint("pubmed", article) == DedupIndex.fingerprint(
+            "pubmed", dict(article, pmid="2")
+        )
+        assert DedupIndex.fingerprint("pubmed", article) != DedupIndex.fingerprint(
+            "pubmed", dict(article, abstract="C")
+        )
+        assert DedupIndex.fingerprint(
+            "clinicaltrials", {"last_update_date": "2024-01-02"}
+        ) == "updated:2024-01-02"
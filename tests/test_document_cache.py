@@ -0,0 +1,151 @@
+"""Unit tests for the document cache and conditional document requests."""
+
+from email.utils import formatdate
+
+import pytest
+from starlette.requests import Request
+
+from src.api.routes import _not_modified
+from src.indexing.document_cache import DocumentCache
+
+
+class FakeIndexer:
+    """Indexer serving one document per ID from a dict."""
+    
+    def __init__(self, documents):
+        # ID -> _mget entry
+        self.documents = documents
+        self.fetches = 0
+    
+    def get_versions_many(self, index_name, doc_ids):
+        return {
+            doc_id: {
+                "index": self.documents[doc_id]["_index"],
+                "version": self.documents[doc_id]["_version"],
+                "seq_no": self.documents[doc_id]["_seq_no"],
+                "primary_term": self.documents[doc_id]["_primary_term"],
+                "content_hash": None
+            }
+            for doc_id in doc_ids if doc_id in self.documents
+        }
+    
+    def get_many_across(self, pairs, source_excludes=None):
+        self.fetches += 1
+        return [self.documents.get(doc_id) for _, doc_id in pairs]
+
+
+def make_entry(index="pubmed_articles_v1", seq_no=5, version=1, title="A"):
+    """Build an _mget entry."""
+    return {
+        "_index": index, "_id": "1", "_version": version, "_seq_no": seq_no,
+        "_primary_term": 1, "_source": {"title": title}
+    }
+
+
+def make_request(headers):
+    """Build a GET request with the given headers."""
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "headers": [(name.lower().encode(), value.encode()) for name, value in headers.items()]
+    })
+
+
+@pytest.mark.unit
+class TestDocumentCacheEtag:
+    """Test document entity tags and revalidation."""
+    
+    def test_etag_includes_index_and_version(self):
+        """Test the same sequence number in another index gives another ETag."""
+        etag = DocumentCache.etag(make_entry())
+        
+        assert etag.startswith('"') and etag.endswith('"')
+        assert etag != DocumentCache.etag(make_entry(index="pubmed_articles_v2"))
+        assert etag != DocumentCache.etag(make_entry(version=2))
+        assert etag != DocumentCache.etag(make_entry(), include_embedding=True)
+    
+    def test_etag_without_sequence_numbers(self):
+        """Test clusters without sequence numbers fall back to the version."""
+        entry = make_entry()
+        del entry["_seq_no"]
+        
+        assert DocumentCache.etag(entry) != DocumentCache.etag(dict(entry, _version=2))
+    
+    def test_revalidation_keeps_unchanged_document(self):
+        """Test an expired entry is reused while its version is unchanged."""
+        indexer = FakeIndexer({"1": make_entry()})
+        cache = DocumentCache(indexer, max_entries=10, ttl=0)
+        try:
+            first = cache.get("pubmed_articles", "1")
+            second = cache.get("pubmed_articles", "1")
+        finally:
+            cache.close()
+        
+        assert second is first
+        assert indexer.fetches == 1
+    
+    def test_revalidation_detects_rebuilt_index(self):
+        """Test a document moved to a rebuilt index is fetched again."""
+        indexer = FakeIndexer({"1": make_entry()})
+        cache = DocumentCache(indexer, max_entries=10, ttl=0)
+        try:
+            first = cache.get("pubmed_articles", "1")
+            indexer.documents["1"] = make_entry(index="pubmed_articles_v2", title="B")
+            second = cache.get("pubmed_articles", "1")
+        finally:
+            cache.close()
+        
+        assert second.source == {"title": "B"}
+        assert second.etag != first.etag
+        assert indexer.fetches == 2
+    
+    def test_missing_document(self):
+        """Test a missing document is None."""
+        cache = DocumentCache(FakeIndexer({}), max_entries=10, ttl=60)
+        try:
+            assert cache.get("pubmed_articles", "1") is None
+        finally:
+            cache.close()
+
+
+@pytest.mark.unit
+class TestNotModified:
+    """Test If-None-Match and If-Modified-Since handling."""
+    
+    ETAG = '"pubmed_articles_v1.1.5.v1"'
+    LAST_MODIFIED = 1700000000.5
+    
+    def check(self, headers):
+        return _not_modified(make_request(headers), self.ETAG, self.LAST_MODIFIED)
+    
+    def test_no_conditions(self):
+        """Test an unconditional request is served."""
+        assert not self.check({})
+    
+    def test_if_none_match(self):
+        """Test matching, weak, listed and wildcard entity tags."""
+        assert self.check({"If-None-Match": self.ETAG})
+        assert self.check({"If-None-Match": f"W/{self.ETAG}"})
+        assert self.check({"If-None-Match": f'"other", {self.ETAG}'})
+        assert self.check({"If-None-Match": "*"})
+        assert not self.check({"If-None-Match": '"other"'})
+    
+    def test_if_none_match_takes_precedence(self):
+        """Test If-Modified-Since is ignored when If-None-Match is present."""
+        headers = {
+            "If-None-Match": '"other"',
+            "If-Modified-Since": formatdate(self.LAST_MODIFIED + 60, usegmt=True)
+        }
+        
+        assert not self.check(headers)
+    
+    def test_if_modified_since(self):
+        """Test dates are compared at one-second resolution."""
+        assert self.check({"If-Modified-Since": formatdate(self.LAST_MODIFIED, usegmt=True)})
+        assert self.check({"If-Modified-Since": formatdate(self.LAST_MODIFIED + 60, usegmt=True)})
+        earlier = formatdate(self.LAST_MODIFIED - 60, usegmt=True)
+        assert not self.check({"If-Modified-Since": earlier})
+    
+    def test_invalid_date(self):
+        """Test an unparsable date is ignored."""
+        assert not self.check({"If-Modified-Since": "yesterday"})
@@ -0,0 +1,138 @@
+"""Unit tests for bulk indexing results and partial retries."""
+
+import pytest
+
+from src.indexing.document_indexer import BulkIndexResult, DocumentIndexer
+
+
+class FakeApiError(Exception):
+    """Client error carrying an HTTP status."""
+    
+    def __init__(self, status):
+        super().__init__(f"HTTP {status}")
+        self.status_code = status
+
+
+class FakeBulkClient:
+    """Bulk API answering with scripted item statuses per document ID."""
+    
+    def __init__(self, statuses=None, errors=None):
+        # doc ID -> list of statuses, one per attempt (last one repeats)
+        self.statuses = statuses or {}
+        # Exceptions raised by the next requests
+        self.errors = list(errors or [])
+        self.requests = []
+    
+    def bulk(self, body):
+        ids = [line.split('"')[1] for line in body.splitlines()[::2]]
+        self.requests.append(ids)
+        if self.errors:
+            raise self.errors.pop(0)
+        items = []
+        for doc_id in ids:
+            statuses = self.statuses.get(doc_id, [201])
+            status = statuses.pop(0) if len(statuses) > 1 else statuses[0]
+            outcome = {"status": status}
+            if status >= 300:
+                outcome["error"] = {"type": "mapper_parsing_exception", "reason": "bad"}
+            items.append({"index": outcome})
+        return {"items": items}
+
+
+class FakeEsClient:
+    """Wrapper exposing the bulk client like ElasticsearchClient."""
+    
+    def __init__(self, client):
+        self.client = client
+
+
+def make_chunk(*doc_ids):
+    """Bulk action lines per document, starting with the ID in quotes."""
+    return [(doc_id, f'"{doc_id}"\n{{}}\n') for doc_id in doc_ids]
+
+
+def send(client, chunk, max_retries=3):
+    """Send a chunk without backoff delays."""
+    indexer = DocumentIndexer(FakeEsClient(client))
+    return indexer._send_chunk(chunk, max_retries, initial_backoff=0.0, max_backoff=0.0)
+
+
+@pytest.mark.unit
+class TestBulkIndexResult:
+    """Test the bulk result object."""
+    
+    def test_unpacks_as_counts(self):
+        """Test a result unpacks as (success, failed)."""
+        result = BulkIndexResult()
+        result.success = 3
+        result.failures.append({"id": "1", "status": 400, "error": "bad"})
+        
+        success, failed = result
+        assert (success, failed) == (3, 1)
+    
+    def test_merge(self):
+        """Test merging adds counts, failures and retries."""
+        result = BulkIndexResult()
+        other = BulkIndexResult()
+        other.success = 2
+        other.retries = 1
+        other.failures.append({"id": "x", "status": 400, "error": "bad"})
+        result.merge(other)
+        result.merge(other)
+        
+        assert (result.success, result.failed, result.retries) == (4, 2, 2)
+
+
+@pytest.mark.unit
+class TestSendChunk:
+    """Test partial retries of bulk requests."""
+    
+    def test_all_indexed(self):
+        """Test a clean response needs one request."""
+        client = FakeBulkClient()
+        result = send(client, make_chunk("a", "b"))
+        
+        assert (result.success, result.failed, result.retries) == (2, 0, 0)
+        assert client.requests == [["a", "b"]]
+    
+    def test_only_rejected_items_retried(self):
+        """Test rejected items are resent alone and failures are not retried."""
+        client = FakeBulkClient(statuses={"b": [429, 201], "c": [400]})
+        result = send(client, make_chunk("a", "b", "c"))
+        
+        assert client.requests == [["a", "b", "c"], ["b"]]
+        assert (result.success, result.failed, result.retries) == (2, 1, 1)
+        assert result.failures[0]["id"] == "c"
+        assert result.failures[0]["error"] == "mapper_parsing_exception: bad"
+    
+    def test_rejected_after_retries(self):
+        """Test items still rejected after the last retry are failures."""
+        client = FakeBulkClient(statuses={"a": [429]})
+        result = send(client, make_chunk("a"), max_retries=2)
+        
+        assert len(client.requests) == 3
+        assert result.failures == [{"id": "a", "status": 429, "error": "Rejected after 2 retries"}]
+    
+    def test_request_error_retried(self):
+        """Test a failed request with a retryable status is sent again."""
+        client = FakeBulkClient(errors=[FakeApiError(503)])
+        result = send(client, make_chunk("a", "b"))
+        
+        assert len(client.requests) == 2
+        assert result.success == 2
+    
+    def test_refused_request_not_retried(self):
+        """Test a request refused as a whole fails all its documents."""
+        client = FakeBulkClient(errors=[FakeApiError(401)])
+        result = send(client, make_chunk("a", "b"))
+        
+        assert len(client.requests) == 1
+        assert [failure["id"] for failure in result.failures] == ["a", "b"]
+    
+    def test_payload_too_large_split(self):
+        """Test a 413 response splits the chunk in halves."""
+        client = FakeBulkClient(errors=[FakeApiError(413)])
+        result = send(client, make_chunk("a", "b", "c", "d"))
+        
+        assert client.requests == [["a", "b", "c", "d"], ["a", "b"], ["c", "d"]]
+        assert result.success == 4
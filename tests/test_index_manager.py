@@ -0,0 +1,119 @@
+"""Unit tests for versioned indices and rebuilds."""
+
+import fnmatch
+
+import pytest
+
+from src.indexing.index_manager import IndexManager
+
+
+class FakeIndicesClient:
+    """Indices API over a dict of index name -> aliases."""
+    
+    def __init__(self, indices, fail_listing=False):
+        self.indices = indices
+        self.fail_listing = fail_listing
+        self.created = []
+        self.deleted = []
+    
+    def exists(self, index):
+        return index in self.indices
+    
+    def exists_alias(self, name):
+        return any(name in aliases for aliases in self.indices.values())
+    
+    def get_alias(self, name=None, index=None):
+        if index is not None and self.fail_listing:
+            raise ConnectionError("cluster unavailable")
+        return {
+            index_name: {"aliases": {alias: {} for alias in aliases}}
+            for index_name, aliases in self.indices.items()
+            if (name is None or name in aliases)
+            and (index is None or fnmatch.fnmatch(index_name, index))
+        }
+    
+    def create(self, index, body):
+        self.indices[index] = set()
+        self.created.append(index)
+    
+    def delete(self, index):
+        del self.indices[index]
+        self.deleted.append(index)
+
+
+class FakeEsClient:
+    """Wrapper exposing the indices client like ElasticsearchClient."""
+    
+    def __init__(self, indices):
+        self.client = type("Client", (), {"indices": indices})()
+
+
+def make_manager(indices, **kwargs):
+    """Index manager over fake indices."""
+    client = FakeIndicesClient(indices, **kwargs)
+    return IndexManager(FakeEsClient(client), embedding_element_type="float"), client
+
+
+@pytest.mark.unit
+class TestVersionedIndices:
+    """Test choosing and creating the next index version."""
+    
+    def test_list_versions(self):
+        """Test versions are sorted numerically and other indices ignored."""
+        manager, _ = make_manager({
+            "pubmed_articles_v10": set(), "pubmed_articles_v2": set(),
+            "pubmed_articles_vx": set(), "clinical_trials_v1": set()
+        })
+        
+        assert manager.list_versions("pubmed_articles") == [
+            "pubmed_articles_v2", "pubmed_articles_v10"
+        ]
+    
+    def test_next_version(self):
+        """Test the new index follows the highest existing version."""
+        manager, client = make_manager({
+            "pubmed_articles_v1": {"pubmed_articles"}, "pubmed_articles_v2": set()
+        })
+        
+        assert manager.create_versioned_index("pubmed_articles") == "pubmed_articles_v3"
+        assert client.created == ["pubmed_articles_v3"]
+    
+    def test_listing_error_raises(self):
+        """Test a failed listing is not taken for 'no versions'."""
+        manager, client = make_manager(
+            {"pubmed_articles_v1": {"pubmed_articles"}}, fail_listing=True
+        )
+        
+        with pytest.raises(ConnectionError):
+            manager.create_versioned_index("pubmed_articles")
+        with pytest.raises(ConnectionError):
+            manager.rebuild_index("pubmed_articles")
+        assert client.created == []
+        assert client.deleted == []
+    
+    def test_alias_target_never_reused(self):
+        """Test an alias target missing from the listing still sets the next version."""
+        manager, client = make_manager({"pubmed_articles_v4": {"pubmed_articles"}})
+        manager.list_versions = lambda alias: []
+        
+        assert manager.create_versioned_index("pubmed_articles") == "pubmed_articles_v5"
+        assert client.deleted == []
+    
+    def test_existing_index_raises(self):
+        """Test an existing index with the next name is neither reused nor dropped."""
+        manager, client = make_manager({"pubmed_articles_v1": {"pubmed_articles"}})
+        manager.list_versions = lambda alias: []
+        manager.get_alias_targets = lambda alias: []
+        
+        with pytest.raises(RuntimeError, match="already exists"):
+            manager.create_versioned_index("pubmed_articles")
+        assert client.created == []
+        assert client.deleted == []
+    
+    def test_create_failure_raises(self):
+        """Test a False from create_index is an error."""
+        manager, client = make_manager({})
+        manager.create_index = lambda index_name, settings=None, force=False: False
+        
+        with pytest.raises(RuntimeError, match="Failed to create"):
+            manager.create_versioned_index("pubmed_articles")
@@ -0,0 +1,198 @@
+"""Unit tests for cursor pagination of search results."""
+
+import base64
+import json
+
+import pytest
+
+from src.search_engine.pagination import CURSOR_VERSION, CursorError, SearchPager
+
+
+class FakeClient:
+    """Point-in-time calls of the Elasticsearch client."""
+    
+    def __init__(self):
+        self.opened = []
+        self.closed = []
+    
+    def open_point_in_time(self, index_name, keep_alive="5m"):
+        pit_id = f"pit-{len(self.opened)}"
+        self.opened.append(pit_id)
+        return pit_id
+    
+    def close_point_in_time(self, pit_id):
+        self.closed.append(pit_id)
+
+
+class FakeQueryProcessor:
+    """Query processor without spell correction."""
+    
+    def correct_query(self, query):
+        return query
+
+
+class FakeEngine:
+    """Search engine returning numbered hits."""
+    
+    alpha = 0.7
+    
+    def __init__(self, total=25):
+        self.total = total
+        self.es_client = FakeClient()
+        self.query_processor = FakeQueryProcessor()
+        self.hybrid_calls = 0
+        self.fail_pits = set()
+    
+    def hybrid_search(self, index_name, query, size=20, **kwargs):
+        self.hybrid_calls += 1
+        return [
+            {
+                "id": str(i), "score": 1.0 - i / 100,
+                "source": {"title": f"Doc {i}", "embedding": [0.1]}
+            }
+            for i in range(min(size, self.total))
+        ]
+    
+    def keyword_page(self, index_name, pit_id, query, size=20, search_after=None, **kwargs):
+        if pit_id in self.fail_pits:
+            raise RuntimeError(f"{pit_id} expired")
+        start = search_after[0] + 1 if search_after else 0
+        end = min(start + size, self.total)
+        hits = [{"id": str(i), "score": 1.0, "source": {}} for i in range(start, end)]
+        last_sort = [start + size - 1] if len(hits) == size else None
+        return hits, pit_id, last_sort
+
+
+def encode(state):
+    """Encode a cursor state like SearchPager does."""
+    data = json.dumps({"v": CURSOR_VERSION, **state}).encode("utf-8")
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+@pytest.mark.unit
+class TestCursorEncoding:
+    """Test cursor encode/decode."""
+    
+    def test_round_trip(self):
+        """Test a cursor decodes to the encoded state."""
+        cursor = SearchPager._encode({"k": "list", "f": "abc", "id": "x", "o": 10})
+        
+        assert "=" not in cursor
+        assert SearchPager._decode(cursor, "abc") == {
+            "v": CURSOR_VERSION, "k": "list", "f": "abc", "id": "x", "o": 10
+        }
+    
+    def test_other_search_rejected(self):
+        """Test a cursor is only accepted for its own search."""
+        cursor = SearchPager._encode({"k": "list", "f": "abc", "id": "x", "o": 10})
+        
+        with pytest.raises(CursorError):
+            SearchPager._decode(cursor, "def")
+    
+    @pytest.mark.parametrize("cursor", [
+        "not base64!",
+        base64.urlsafe_b64encode(b"[1, 2]").decode("ascii"),
+        encode({"k": "list", "f": "abc", "id": "x"}),
+        encode({"k": "list", "f": "abc", "o": 10}),
+        encode({"k": "list", "f": "abc", "id": "x", "o": -1}),
+        encode({"k": "list", "f": "abc", "id": "x", "o": "10"}),
+        encode({"k": "pit", "f": "abc", "after": [1]}),
+        encode({"k": "pit", "f": "abc", "pit": "p"}),
+        encode({"k": "other", "f": "abc"}),
+    ])
+    def test_malformed(self, cursor):
+        """Test malformed cursors raise CursorError."""
+        with pytest.raises(CursorError):
+            SearchPager._decode(cursor, "abc")
+    
+    def test_wrong_version(self):
+        """Test cursors of another version are rejected."""
+        cursor = base64.urlsafe_b64encode(json.dumps({"v": CURSOR_VERSION + 1}).encode()).decode()
+        
+        with pytest.raises(CursorError):
+            SearchPager._decode(cursor, "abc")
+
+
+@pytest.mark.unit
+class TestSearchPager:
+    """Test paging through results."""
+    
+    def test_hybrid_pages(self):
+        """Test hybrid pages are slices of one cached list."""
+        engine = FakeEngine(total=25)
+        pager = SearchPager(engine, ttl=60, depth=100, max_entries=10)
+        
+        ids = []
+        cursor = None
+        while True:
+            page, cursor = pager.page("pubmed_articles", "asthma", size=10, cursor=cursor)
+            ids.extend(hit["id"] for hit in page)
+            assert all("embedding" not in hit["source"] for hit in page)
+            if cursor is None:
+                break
+        
+        assert ids == [str(i) for i in range(25)]
+        assert engine.hybrid_calls == 1
+    
+    def test_rerank_once(self):
+        """Test the candidate list is reranked once, not per page."""
+        engine = FakeEngine(total=25)
+        pager = SearchPager(engine, ttl=60, depth=100, max_entries=10)
+        calls = []
+        
+        def rerank(hits):
+            calls.append(len(hits))
+            return list(reversed(hits))
+        
+        page, cursor = pager.page("pubmed_articles", "asthma", size=10, rerank=rerank)
+        assert page[0]["id"] == "24"
+        page, _ = pager.page("pubmed_articles", "asthma", size=10, cursor=cursor, rerank=rerank)
+        assert page[0]["id"] == "14"
+        assert calls == [25]
+    
+    def test_date_sorted_hybrid_uses_list(self):
+        """Test date-sorted hybrid searches page the fused list."""
+        engine = FakeEngine(total=25)
+        pager = SearchPager(engine, ttl=60, depth=100, max_entries=10)
+        
+        pager.page("pubmed_articles", "asthma", size=10, sort_by="date_desc")
+        
+        assert engine.hybrid_calls == 1
+        assert engine.es_client.opened == []
+    
+    def test_changed_search_rejected(self):
+        """Test a cursor cannot be used with another query."""
+        pager = SearchPager(FakeEngine(), ttl=60, depth=100, max_entries=10)
+        _, cursor = pager.page("pubmed_articles", "asthma", size=10)
+        
+        with pytest.raises(CursorError):
+            pager.page("pubmed_articles", "copd", size=10, cursor=cursor)
+    
+    def test_keyword_pages(self):
+        """Test keyword-only pages continue after the last hit and close the PIT."""
+        engine = FakeEngine(total=25)
+        pager = SearchPager(engine, ttl=60, depth=100, max_entries=10)
+        
+        ids = []
+        cursor = None
+        while True:
+            page, cursor = pager.page(
+                "pubmed_articles", "asthma", size=10, cursor=cursor, alpha=1.0
+            )
+            ids.extend(hit["id"] for hit in page)
+            if cursor is None:
+                break
+        
+        assert ids == [str(i) for i in range(25)]
+        assert engine.es_client.closed == ["pit-0"]
+    
+    def test_reopened_pit_closed_on_failure(self):
+        """Test a PIT reopened for an expired cursor is closed if the page fails."""
+        engine = FakeEngine(total=25)
+        pager = SearchPager(engine, ttl=60, depth=100, max_entries=10)
+        _, cursor = pager.page("pubmed_articles", "asthma", size=10, alpha=1.0)
+        engine.fail_pits.update({"pit-0", "pit-1"})
+        
+        with pytest.raises(RuntimeError):
+            pager.page("pubmed_articles", "asthma", size=10, cursor=cursor, alpha=1.0)
+        assert engine.es_client.closed == ["pit-1"]
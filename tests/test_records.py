@@ -0,0 +1,161 @@
+"""Unit tests for the typed document records."""
+
+from collections.abc import MutableMapping
+
+import pytest
+
+from src.utils.records import ArticleRecord, TrialRecord, encode_json
+
+
+def make_article(**overrides):
+    """Build an article document as the normalizer does."""
+    mesh_terms = ["Diabetes Mellitus", "Insulin"]
+    doc = {
+        "id": "12345",
+        "source": "pubmed",
+        "type": "article",
+        "title": "Insulin therapy",
+        "abstract": "An abstract.",
+        "authors": ["Doe J"],
+        "mesh_terms": mesh_terms,
+        "keywords": mesh_terms,
+        "metadata": {"pmid": "12345"},
+    }
+    doc.update(overrides)
+    return doc
+
+
+def make_trial(**overrides):
+    """Build a trial document as the normalizer does."""
+    doc = {
+        "id": "NCT00000001",
+        "source": "clinicaltrials",
+        "type": "clinical_trial",
+        "title": "A trial",
+        "conditions": ["Asthma"],
+        "interventions": [{"type": "DRUG", "name": "Budesonide", "description": ""}],
+        "keywords": ["Asthma", "Budesonide"],
+        "metadata": {"nct_id": "NCT00000001"},
+    }
+    doc.update(overrides)
+    return doc
+
+
+@pytest.mark.unit
+class TestArticleRecord:
+    """Test the dict view of ArticleRecord."""
+    
+    def test_round_trip(self):
+        """Test to_dict returns the original document."""
+        doc = make_article()
+        record = ArticleRecord.from_dict(doc)
+        
+        assert isinstance(record, MutableMapping)
+        assert record.to_dict() == {**doc, "publication_year": "", "pub_year": None,
+                                    "publication_month": "", "publication_date": "",
+                                    "journal": "", "doi": ""}
+    
+    def test_keywords_derived_from_mesh_terms(self):
+        """Test keywords equal to mesh_terms are not stored."""
+        record = ArticleRecord.from_dict(make_article())
+        
+        assert record.keywords is None
+        assert record["keywords"] is record.mesh_terms
+    
+    def test_custom_keywords_kept(self):
+        """Test keywords that differ from mesh_terms survive from_dict."""
+        record = ArticleRecord.from_dict(make_article(keywords=["custom"]))
+        
+        assert record["keywords"] == ["custom"]
+        assert record["mesh_terms"] == ["Diabetes Mellitus", "Insulin"]
+    
+    def test_set_keywords(self):
+        """Test keywords can be assigned."""
+        record = ArticleRecord.from_dict(make_article())
+        record["keywords"] = ["other"]
+        
+        assert record["keywords"] == ["other"]
+    
+    def test_metadata_mutation_persists(self):
+        """Test in-place changes to metadata are kept."""
+        record = ArticleRecord.from_dict(make_article())
+        record["metadata"]["pmcid"] = "PMC1"
+        
+        assert record["metadata"] == {"pmid": "12345", "pmcid": "PMC1"}
+    
+    def test_extra_keys(self):
+        """Test unknown keys go to extra and can be removed."""
+        record = ArticleRecord.from_dict(make_article(score=1.5))
+        
+        assert record["score"] == 1.5
+        assert record.pop("score") == 1.5
+        assert "score" not in record
+        assert record.pop("score", None) is None
+        with pytest.raises(KeyError):
+            record.pop("score")
+    
+    def test_optional_fields(self):
+        """Test absent optional fields behave like missing keys."""
+        record = ArticleRecord.from_dict(make_article())
+        
+        assert "embedding" not in record
+        assert record.setdefault("embedding", [0.1]) == [0.1]
+        assert record["embedding"] == [0.1]
+        del record["embedding"]
+        assert "embedding" not in record
+        with pytest.raises(KeyError):
+            del record["embedding"]
+    
+    def test_required_field_cannot_be_deleted(self):
+        """Test deleting a field without an absent state fails."""
+        record = ArticleRecord.from_dict(make_article())
+        
+        with pytest.raises(TypeError):
+            del record["title"]
+    
+    def test_update(self):
+        """Test update accepts mappings and keyword arguments."""
+        record = ArticleRecord.from_dict(make_article())
+        record.update({"title": "New"}, rank=3)
+        
+        assert record["title"] == "New"
+        assert record["rank"] == 3
+    
+    def test_encode_json(self):
+        """Test JSON encoding uses the dict view."""
+        record = ArticleRecord.from_dict(make_article())
+        
+        assert b'"keywords":["Diabetes Mellitus","Insulin"]' in encode_json(record)
+
+
+@pytest.mark.unit
+class TestTrialRecord:
+    """Test the dict view of TrialRecord."""
+    
+    def test_keywords_derived(self):
+        """Test keywords equal to conditions and interventions are not stored."""
+        record = TrialRecord.from_dict(make_trial())
+        
+        assert record.keywords is None
+        assert record["keywords"] == ["Asthma", "Budesonide"]
+    
+    def test_keywords_append_persists(self):
+        """Test in-place changes to derived keywords are kept."""
+        record = TrialRecord.from_dict(make_trial())
+        record["keywords"].append("Inhaled")
+        
+        assert record["keywords"] == ["Asthma", "Budesonide", "Inhaled"]
+    
+    def test_interventions_are_dicts(self):
+        """Test interventions are returned as stored."""
+        record = TrialRecord.from_dict(make_trial())
+        record["interventions"][0]["name"] = "Fluticasone"
+        
+        assert record["interventions"][0]["name"] == "Fluticasone"
+    
+    def test_metadata_kept(self):
+        """Test metadata is returned as stored."""
+        record = TrialRecord.from_dict(make_trial())
+        
+        assert record["metadata"] is record.metadata
+        assert record["metadata"]["nct_id"] == "NCT00000001"
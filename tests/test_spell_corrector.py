@@ -0,0 +1,88 @@
+"""Unit tests for query spell correction."""
+
+import pytest
+
+from src.search_engine.spell_corrector import SpellCorrector, count_words, edit_distance
+
+VOCABULARY = {
+    "diabetes": 120, "diabetic": 40, "insulin": 80, "hypertension": 60,
+    "carcinoma": 30, "carcinogen": 5, "asthma": 50, "typo": 1
+}
+
+
+@pytest.fixture
+def corrector():
+    """Spell corrector over a small vocabulary."""
+    return SpellCorrector.build(VOCABULARY)
+
+
+@pytest.mark.unit
+class TestEditDistance:
+    """Test the capped optimal string alignment distance."""
+    
+    @pytest.mark.parametrize("a, b, expected", [
+        ("insulin", "insulin", 0),
+        ("insulin", "insuln", 1),
+        ("insulin", "insulim", 1),
+        ("insulin", "isnulin", 1),
+        ("diabetes", "diabtees", 1),
+        ("asthma", "astma", 1),
+        ("asthma", "sthm", 2),
+    ])
+    def test_distance(self, a, b, expected):
+        """Test insertions, deletions, substitutions and transpositions."""
+        assert edit_distance(a, b, 2) == expected
+    
+    def test_capped(self):
+        """Test distances above the cap return cap + 1."""
+        assert edit_distance("insulin", "asthma", 2) == 3
+        assert edit_distance("a", "abcdef", 2) == 3
+
+
+@pytest.mark.unit
+class TestSpellCorrector:
+    """Test building, lookups and persistence."""
+    
+    def test_build_drops_rare_terms(self, corrector):
+        """Test terms below min_count are not in the vocabulary."""
+        assert len(corrector) == len(VOCABULARY) - 1
+        assert corrector.count("diabetes") == 120
+        assert corrector.count("typo") == 0
+    
+    def test_lookup(self, corrector):
+        """Test known words, corrections and words without a close term."""
+        assert corrector.lookup("insulin") == "insulin"
+        assert corrector.lookup("insuln") == "insulin"
+        assert corrector.lookup("hypretension") == "hypertension"
+        assert corrector.lookup("xylophone") is None
+    
+    def test_ties_go_to_frequent_term(self, corrector):
+        """Test equally close candidates resolve to the most frequent."""
+        assert corrector.lookup("diabetis") == "diabetes"
+    
+    def test_correct_query(self, corrector):
+        """Test only misspelled, long enough words without digits change."""
+        assert corrector.correct("diabtes and insuln") == "diabetes and insulin"
+        assert corrector.correct("il-6 covid-19 astma") == "il-6 covid-19 asthma"
+        assert corrector.correct("asthma") == "asthma"
+        assert corrector.corrections("carcinoma typo") == {}
+    
+    def test_save_and_load(self, corrector, tmp_path):
+        """Test a saved index gives the same corrections."""
+        path = tmp_path / "spell.bin"
+        corrector.save(path)
+        
+        for mmap in (True, False):
+            loaded = SpellCorrector.load(path, mmap=mmap)
+            assert len(loaded) == len(corrector)
+            assert loaded.max_edit_distance == corrector.max_edit_distance
+            assert loaded.prefix_length == corrector.prefix_length
+            assert loaded.correct("diabtes hypretension") == "diabetes hypertension"
+
+
+@pytest.mark.unit
+def test_count_words():
+    """Test words are counted lowercased, without digits."""
+    frequencies = count_words(["Type 2 Diabetes", "diabetes and IL-6", None])
+    
+    assert frequencies == {"type": 1, "diabetes": 2, "and": 1, "il": 1}
@@ -0,0 +1,105 @@
+"""Unit tests for query autocomplete and the query log."""
+
+import pytest
+
+from src.search_engine.suggester import KINDS, QueryLog, QuerySuggester, normalize_prefix
+
+
+def make_entries(texts, kind="term"):
+    """Build suggester entries with a score per display text."""
+    return {
+        normalize_prefix(text): (text, float(score), KINDS.index(kind))
+        for text, score in texts.items()
+    }
+
+
+def brute_force(entries, prefix, limit):
+    """Expected suggestions: matching keys by score, then key order."""
+    matches = sorted(
+        (key for key in entries if key.startswith(prefix)),
+        key=lambda key: (-entries[key][1], key)
+    )
+    return [entries[key][0] for key in matches[:limit]]
+
+
+@pytest.mark.unit
+class TestQuerySuggester:
+    """Test prefix lookups."""
+    
+    def test_prefix_range(self):
+        """Test only keys starting with the prefix are returned, best first."""
+        entries = make_entries({
+            "Diabetes": 5, "Diabetes Mellitus": 9, "Diabetic Foot": 2,
+            "Dialysis": 7, "Asthma": 8
+        })
+        suggester = QuerySuggester.build(entries, top_k=5)
+        
+        texts = [item["text"] for item in suggester.suggest("diab")]
+        assert texts == ["Diabetes Mellitus", "Diabetes", "Diabetic Foot"]
+        assert suggester.suggest("dia", limit=2)[0]["text"] == "Diabetes Mellitus"
+        assert suggester.suggest("zzz") == []
+        assert suggester.suggest("") == []
+    
+    def test_trailing_space_completes_next_word(self):
+        """Test a finished word only matches longer phrases."""
+        entries = make_entries({"Diabetes": 5, "Diabetes Mellitus": 9, "Diabetes Insipidus": 3})
+        suggester = QuerySuggester.build(entries, top_k=5)
+        
+        texts = [item["text"] for item in suggester.suggest("diabetes ")]
+        assert texts == ["Diabetes Mellitus", "Diabetes Insipidus"]
+    
+    def test_heavy_prefixes_match_brute_force(self):
+        """Test precomputed prefixes return the same results as a scan."""
+        texts = {f"term {i:03d}": (i * 37) % 101 for i in range(300)}
+        texts.update({f"other {i}": i for i in range(10)})
+        entries = make_entries(texts)
+        suggester = QuerySuggester.build(entries, top_k=10, heavy_threshold=20)
+        
+        for prefix in ("t", "term", "term 0", "term 1", "term 25", "o", "other 1"):
+            result = [item["text"] for item in suggester.suggest(prefix, limit=10)]
+            assert result == brute_force(entries, prefix, 10), prefix
+    
+    def test_save_and_load(self, tmp_path):
+        """Test a saved index gives the same suggestions."""
+        entries = make_entries({"Asthma": 3, "Asthmatic Bronchitis": 1}, kind="query")
+        suggester = QuerySuggester.build(entries, top_k=5)
+        path = tmp_path / "suggest.bin"
+        suggester.save(path)
+        
+        loaded = QuerySuggester.load(path)
+        assert len(loaded) == 2
+        assert loaded.suggest("asth") == suggester.suggest("asth")
+        assert loaded.suggest("asth")[0]["kind"] == "query"
+
+
+@pytest.mark.unit
+class TestQueryLog:
+    """Test the search query log."""
+    
+    def test_record_and_read(self, tmp_path):
+        """Test queries are normalized for whitespace and read back."""
+        log = QueryLog(tmp_path / "queries.log")
+        log.record("  breast   cancer ")
+        log.record("")
+        log.record("x" * 500)
+        log.close()
+        
+        assert list(QueryLog.iter_queries(tmp_path / "queries.log")) == ["breast cancer"]
+    
+    def test_rotation(self, tmp_path):
+        """Test a full log is moved aside and both files are read."""
+        path = tmp_path / "queries.log"
+        log = QueryLog(path, max_bytes=40)
+        for i in range(20):
+            log.record(f"query {i:02d}")
+        log.close()
+        
+        assert path.stat().st_size <= 40 + len("query 00\n")
+        assert QueryLog.backup_path(path).exists()
+        queries = list(QueryLog.iter_queries(path))
+        assert queries == sorted(queries)
+        assert queries[-1] == "query 19"
+    
+    def test_disabled_path(self):
+        """Test an empty path reads nothing."""
+        assert list(QueryLog.iter_queries("")) == []
@@ -0,0 +1,80 @@
+"""Unit tests for phrase-level synonym expansion."""
+
+import pytest
+
+from src.search_engine.synonym_expander import SynonymExpander
+
+GROUPS = [
+    ["mi", "myocardial infarction", "heart attack"],
+    ["attack", "seizure"],
+    ["copd", "chronic obstructive pulmonary disease"],
+    ["pulmonary disease", "lung disease"],
+    ["htn", "hypertension", "high blood pressure"],
+    ["hypertension", "elevated blood pressure"],
+    ["single"],
+]
+
+
+@pytest.fixture
+def expander():
+    """Expander over a small lexicon."""
+    return SynonymExpander.build(GROUPS)
+
+
+@pytest.mark.unit
+class TestSynonymExpander:
+    """Test building, matching and persistence."""
+    
+    def test_build_skips_single_phrase_groups(self, expander):
+        """Test groups need at least two phrases."""
+        assert len(expander) == 6
+        assert expander.expand("single") == [("single", [])]
+    
+    def test_expand(self, expander):
+        """Test phrases are found in query order with their synonyms."""
+        segments = expander.expand("mi treatment in copd")
+        
+        assert segments == [
+            ("mi", ["myocardial infarction", "heart attack"]),
+            ("treatment", []),
+            ("in", []),
+            ("copd", ["chronic obstructive pulmonary disease"]),
+        ]
+    
+    def test_longest_match_wins(self, expander):
+        """Test overlapping phrases resolve leftmost-longest."""
+        segments = expander.expand("acute heart attack")
+        assert segments == [("acute", []), ("heart attack", ["mi", "myocardial infarction"])]
+        
+        segments = expander.expand("chronic obstructive pulmonary disease")
+        assert segments == [("chronic obstructive pulmonary disease", ["copd"])]
+    
+    def test_suffix_match(self, expander):
+        """Test a phrase inside a longer unmatched prefix is found."""
+        segments = expander.expand("chronic pulmonary disease")
+        
+        assert segments == [("chronic", []), ("pulmonary disease", ["lung disease"])]
+    
+    def test_phrase_in_several_groups(self, expander):
+        """Test synonyms of all groups of a phrase are merged."""
+        segments = expander.expand("hypertension")
+        
+        assert segments == [
+            ("hypertension", ["htn", "high blood pressure", "elevated blood pressure"])
+        ]
+    
+    def test_unknown_words(self, expander):
+        """Test words outside the lexicon are single segments."""
+        assert expander.expand("") == []
+        assert expander.expand("gene therapy") == [("gene", []), ("therapy", [])]
+    
+    def test_save_and_load(self, expander, tmp_path):
+        """Test a saved lexicon gives the same expansions."""
+        path = tmp_path / "synonyms.bin"
+        expander.save(path)
+        
+        for mmap in (True, False):
+            loaded = SynonymExpander.load(path, mmap=mmap)
+            assert len(loaded) == len(expander)
+            for query in ("acute heart attack", "chronic pulmonary disease", "htn and copd"):
+                assert loaded.expand(query) == expander.expand(query)